@@ -0,0 +1,118 @@
+"""Store flow versions as JSON-patch deltas with periodic snapshots
+
+Revision ID: flow_version_patches
+Revises: 628074c68476
+Create Date: 2025-10-18
+
+Compacts existing history: versions 1, 1 + N, 1 + 2N, ... (and the oldest
+retained version of each flow, and the first version after a gap in the
+numbering) keep their full snapshot, all others are rewritten as RFC 6902
+patches from the previous version.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+from app.core.json_patch import apply_patch, make_patch
+
+# revision identifiers, used by Alembic.
+revision: str = "flow_version_patches"
+down_revision: str | Sequence[str] | None = "628074c68476"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Must match app.db.repository.FLOW_VERSION_SNAPSHOT_INTERVAL
+SNAPSHOT_INTERVAL = 10
+
+flow_versions = sa.table(
+    "flow_versions",
+    sa.column("id", postgresql.UUID(as_uuid=True)),
+    sa.column("flow_id", postgresql.UUID(as_uuid=True)),
+    sa.column("version_number", sa.Integer),
+    sa.column("definition_snapshot", postgresql.JSONB),
+    sa.column("definition_patch", postgresql.JSONB),
+)
+
+
+def _flow_ids(bind: sa.engine.Connection) -> list:
+    return list(bind.execute(sa.select(flow_versions.c.flow_id).distinct()).scalars())
+
+
+def _versions(bind: sa.engine.Connection, flow_id: object) -> list:
+    return list(
+        bind.execute(
+            sa.select(
+                flow_versions.c.id,
+                flow_versions.c.version_number,
+                flow_versions.c.definition_snapshot,
+                flow_versions.c.definition_patch,
+            )
+            .where(flow_versions.c.flow_id == flow_id)
+            .order_by(flow_versions.c.version_number)
+        ).all()
+    )
+
+
+def compaction_patches(rows: Sequence) -> list[tuple[object, list]]:
+    """``(id, patch)`` for each version, ordered by number, to store as a patch.
+
+    A version keeps its snapshot when it starts an interval, is the oldest
+    retained one, or follows a gap: replay refuses chains with missing numbers.
+    """
+    patches = []
+    previous = None
+    previous_number = None
+    for row in rows:
+        keep_snapshot = (
+            previous is None
+            or row.version_number != previous_number + 1
+            or (row.version_number - 1) % SNAPSHOT_INTERVAL == 0
+        )
+        if not keep_snapshot:
+            patches.append((row.id, make_patch(previous, row.definition_snapshot)))
+        previous = row.definition_snapshot
+        previous_number = row.version_number
+    return patches
+
+
+def upgrade() -> None:
+    op.add_column(
+        "flow_versions",
+        sa.Column("definition_patch", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    )
+    op.alter_column("flow_versions", "definition_snapshot", nullable=True)
+
+    bind = op.get_bind()
+    for flow_id in _flow_ids(bind):
+        for row_id, patch in compaction_patches(_versions(bind, flow_id)):
+            bind.execute(
+                flow_versions.update()
+                .where(flow_versions.c.id == row_id)
+                .values(definition_snapshot=None, definition_patch=patch)
+            )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    for flow_id in _flow_ids(bind):
+        definition = None
+        for row in _versions(bind, flow_id):
+            if row.definition_snapshot is not None:
+                definition = row.definition_snapshot
+                continue
+            if definition is None:
+                # Broken chain; nothing to rebuild from
+                bind.execute(flow_versions.delete().where(flow_versions.c.id == row.id))
+                continue
+            definition = apply_patch(definition, row.definition_patch or [])
+            bind.execute(
+                flow_versions.update()
+                .where(flow_versions.c.id == row.id)
+                .values(definition_snapshot=definition, definition_patch=None)
+            )
+
+    op.alter_column("flow_versions", "definition_snapshot", nullable=False)
+    op.drop_column("flow_versions", "definition_patch")
@@ -0,0 +1,47 @@
+"""Add cold_sessions table for idle flow state tiered out of Redis
+
+Revision ID: cold_sessions
+Revises: flow_version_patches
+Create Date: 2025-10-19
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "cold_sessions"
+down_revision: str | Sequence[str] | None = "flow_version_patches"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "cold_sessions",
+        sa.Column("session_key", sa.String(length=64), nullable=False),
+        sa.Column("user_key", sa.String(length=64), nullable=False),
+        sa.Column("state", sa.LargeBinary(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("session_key"),
+    )
+    op.create_index("ix_cold_sessions_user_key", "cold_sessions", ["user_key"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_cold_sessions_user_key", table_name="cold_sessions")
+    op.drop_table("cold_sessions")
@@ -0,0 +1,62 @@
+"""Add composite indexes backing keyset pagination of chat and handoff lists
+
+Revision ID: keyset_pagination_indexes
+Revises: cold_sessions
+Create Date: 2025-10-20
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "keyset_pagination_indexes"
+down_revision: str | Sequence[str] | None = "cold_sessions"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# (name, table, columns, partial on live rows); column order and direction
+# match the ORDER BY of the list queries so each page is one index range scan
+INDEXES = [
+    (
+        "ix_chat_threads_tenant_last_message",
+        "chat_threads",
+        ["tenant_id", sa.text("last_message_at DESC"), sa.text("id DESC")],
+        True,
+    ),
+    ("ix_messages_thread_created", "messages", ["thread_id", "created_at", "id"], True),
+    (
+        "ix_contacts_tenant_created",
+        "contacts",
+        ["tenant_id", sa.text("created_at DESC"), sa.text("id DESC")],
+        True,
+    ),
+    (
+        "ix_handoff_requests_tenant_created",
+        "handoff_requests",
+        ["tenant_id", sa.text("created_at DESC"), sa.text("id DESC")],
+        False,
+    ),
+]
+
+
+def upgrade() -> None:
+    """Build the indexes without locking writes on the (large) chat tables."""
+    with op.get_context().autocommit_block():
+        for name, table, columns, live_only in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_concurrently=True,
+                postgresql_where=sa.text("deleted_at IS NULL") if live_only else None,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in INDEXES:
+            op.drop_index(name, table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,41 @@
+"""Add the cross-tenant recency index behind the admin conversation list
+
+Revision ID: conversation_list_index
+Revises: keyset_pagination_indexes
+Create Date: 2025-10-21
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "conversation_list_index"
+down_revision: str | Sequence[str] | None = "keyset_pagination_indexes"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Index live threads by recency across tenants (admin list_conversations)."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_chat_threads_last_message",
+            "chat_threads",
+            [sa.text("last_message_at DESC"), sa.text("id DESC")],
+            postgresql_concurrently=True,
+            postgresql_where=sa.text("deleted_at IS NULL"),
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_chat_threads_last_message",
+            "chat_threads",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
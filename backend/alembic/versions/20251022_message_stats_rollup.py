@@ -0,0 +1,72 @@
+"""Add the hourly message stats rollup table
+
+Revision ID: message_stats_rollup
+Revises: conversation_list_index
+Create Date: 2025-10-22
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "message_stats_rollup"
+down_revision: str | Sequence[str] | None = "conversation_list_index"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "message_stats_hourly",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("tenant_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("channel_instance_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("flow_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("bucket_start", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("inbound_messages", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("outbound_messages", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("threads_started", sa.Integer(), server_default="0", nullable=False),
+        sa.Column(
+            "updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.ForeignKeyConstraint(["tenant_id"], ["tenants.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(
+            ["channel_instance_id"], ["channel_instances.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "tenant_id",
+            "channel_instance_id",
+            "flow_id",
+            "bucket_start",
+            name="uq_message_stats_hourly_bucket",
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
+    op.create_index(
+        "ix_message_stats_hourly_tenant_bucket",
+        "message_stats_hourly",
+        ["tenant_id", "bucket_start"],
+    )
+    # The rollup job scans messages by time window
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_messages_created_at",
+            "messages",
+            ["created_at"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_messages_created_at", "messages", postgresql_concurrently=True, if_exists=True
+        )
+    op.drop_index("ix_message_stats_hourly_tenant_bucket", "message_stats_hourly")
+    op.drop_table("message_stats_hourly")
@@ -0,0 +1,115 @@
+"""Range-partition messages by month on created_at
+
+Revision ID: partition_messages
+Revises: message_stats_rollup
+Create Date: 2025-10-23
+
+The existing rows are copied into the partitioned table inside the
+migration; on large installations run it in a maintenance window.
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "partition_messages"
+down_revision: str | Sequence[str] | None = "message_stats_rollup"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+MONTHS_AHEAD = 3
+
+FOREIGN_KEYS = """
+    ALTER TABLE messages
+        ADD FOREIGN KEY (tenant_id) REFERENCES tenants (id) ON DELETE CASCADE,
+        ADD FOREIGN KEY (channel_instance_id) REFERENCES channel_instances (id) ON DELETE CASCADE,
+        ADD FOREIGN KEY (thread_id) REFERENCES chat_threads (id) ON DELETE CASCADE,
+        ADD FOREIGN KEY (contact_id) REFERENCES contacts (id) ON DELETE SET NULL
+"""
+
+
+def _create_indexes() -> None:
+    op.execute(
+        "CREATE INDEX ix_messages_thread_created ON messages (thread_id, created_at, id) "
+        "WHERE deleted_at IS NULL"
+    )
+    op.execute("CREATE INDEX ix_messages_created_at ON messages (created_at)")
+
+
+def _move_aside() -> None:
+    """Rename the current table and its indexes out of the way."""
+    op.execute("ALTER TABLE messages RENAME TO messages_old")
+    op.execute("ALTER TABLE messages_old RENAME CONSTRAINT messages_pkey TO messages_old_pkey")
+    for index in ("ix_messages_thread_created", "ix_messages_created_at"):
+        op.execute(f"ALTER INDEX IF EXISTS {index} RENAME TO {index}_old")
+
+
+def upgrade() -> None:
+    # A partitioned table's unique keys must include created_at, so a foreign
+    # key into messages has to reference (id, created_at); attachments and
+    # quoted messages only store the id and lose theirs. archive_partition
+    # deletes the attachments of the months it drops.
+    op.execute(
+        "ALTER TABLE message_attachments "
+        "DROP CONSTRAINT IF EXISTS message_attachments_message_id_fkey"
+    )
+    op.execute("ALTER TABLE messages DROP CONSTRAINT IF EXISTS messages_quoted_message_id_fkey")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_message_attachments_message_id "
+        "ON message_attachments (message_id)"
+    )
+
+    _move_aside()
+    op.execute(
+        "CREATE TABLE messages (LIKE messages_old INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+        "PARTITION BY RANGE (created_at)"
+    )
+    op.execute("ALTER TABLE messages ADD PRIMARY KEY (id, created_at)")
+    op.execute(FOREIGN_KEYS)
+    op.execute("CREATE TABLE messages_default PARTITION OF messages DEFAULT")
+    # One partition per UTC month from the oldest message through MONTHS_AHEAD
+    op.execute(
+        f"""
+        DO $$
+        DECLARE
+            month timestamp;
+            last_month timestamp := date_trunc('month', now() AT TIME ZONE 'UTC')
+                + interval '{MONTHS_AHEAD} months';
+        BEGIN
+            SELECT date_trunc('month', coalesce(min(created_at), now()) AT TIME ZONE 'UTC')
+                INTO month FROM messages_old;
+            WHILE month <= last_month LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF messages FOR VALUES FROM (%L) TO (%L)',
+                    'messages_' || to_char(month, '"y"YYYY"m"MM'),
+                    month AT TIME ZONE 'UTC',
+                    (month + interval '1 month') AT TIME ZONE 'UTC'
+                );
+                month := month + interval '1 month';
+            END LOOP;
+        END $$;
+        """
+    )
+    op.execute("INSERT INTO messages SELECT * FROM messages_old")
+    op.execute("DROP TABLE messages_old")
+    _create_indexes()
+
+
+def downgrade() -> None:
+    _move_aside()
+    op.execute("CREATE TABLE messages (LIKE messages_old INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+    op.execute("ALTER TABLE messages ADD PRIMARY KEY (id)")
+    op.execute(FOREIGN_KEYS)
+    op.execute("INSERT INTO messages SELECT * FROM messages_old")
+    op.execute("DROP TABLE messages_old CASCADE")
+    _create_indexes()
+    op.execute("DROP INDEX IF EXISTS ix_message_attachments_message_id")
+    op.execute(
+        "ALTER TABLE messages ADD CONSTRAINT messages_quoted_message_id_fkey "
+        "FOREIGN KEY (quoted_message_id) REFERENCES messages (id)"
+    )
+    op.execute(
+        "ALTER TABLE message_attachments ADD CONSTRAINT message_attachments_message_id_fkey "
+        "FOREIGN KEY (message_id) REFERENCES messages (id) ON DELETE CASCADE"
+    )
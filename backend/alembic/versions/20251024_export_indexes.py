@@ -0,0 +1,70 @@
+"""Add (tenant_id, created_at, id) indexes backing the streaming exports
+
+Revision ID: export_indexes
+Revises: partition_messages
+Create Date: 2025-10-24
+
+messages is partitioned, and CREATE INDEX CONCURRENTLY is not allowed on a
+partitioned table. So the index is created invalid ON ONLY the parent,
+built concurrently on each partition, and then attached. The parent
+index becomes valid once every partition has its index attached.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "export_indexes"
+down_revision: str | Sequence[str] | None = "partition_messages"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+MESSAGES_INDEX = "ix_messages_tenant_created"
+LIVE_ONLY = "WHERE deleted_at IS NULL"
+
+
+def upgrade() -> None:
+    """Build the indexes without locking writes on the chat tables."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_chat_threads_tenant_created",
+            "chat_threads",
+            ["tenant_id", "created_at", "id"],
+            postgresql_concurrently=True,
+            postgresql_where=sa.text("deleted_at IS NULL"),
+            if_not_exists=True,
+        )
+
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS {MESSAGES_INDEX} "
+            f"ON ONLY messages (tenant_id, created_at, id) {LIVE_ONLY}"
+        )
+        partitions = op.get_bind().execute(
+            sa.text(
+                "SELECT c.relname FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = 'messages'::regclass ORDER BY c.relname"
+            )
+        )
+        for (partition,) in partitions.all():
+            index = f"{partition}_tenant_created_idx"
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index} "
+                f"ON {partition} (tenant_id, created_at, id) {LIVE_ONLY}"
+            )
+            op.execute(f"ALTER INDEX {MESSAGES_INDEX} ATTACH PARTITION {index}")
+
+
+def downgrade() -> None:
+    # Dropping the parent index drops the attached partition indexes with it
+    op.execute(f"DROP INDEX IF EXISTS {MESSAGES_INDEX}")
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_chat_threads_tenant_created",
+            "chat_threads",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
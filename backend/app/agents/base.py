@@ -7,6 +7,7 @@ from typing import TYPE_CHECKING, Any
 
 from app.core.agent_base import Agent
 from app.core.messages import AgentResult, InboundMessage, OutboundMessage
+from app.core.state import async_store
 from app.flow_core.constants import ESCALATION_CONTEXT_CLEAR_DELAY_SECONDS
 from app.flow_core.runner import FlowTurnRunner
 from app.flow_core.state import FlowContext
@@ -44,10 +45,11 @@ class BaseAgent(Agent):
             delay_seconds: How long to wait before clearing
         """
         await asyncio.sleep(delay_seconds)
+        store = async_store(self.deps.store)
 
         if hasattr(self.deps.store, "clear_chat_history"):
             try:
-                deleted_keys = self.deps.store.clear_chat_history(user_id, agent_type)
+                deleted_keys = await store.clear_chat_history(user_id, agent_type)
                 logger.info(
                     "Cleared %d chat history keys for user %s after %ds grace period",
                     deleted_keys,
@@ -62,7 +64,7 @@ class BaseAgent(Agent):
                 )
 
         if hasattr(self.deps.store, "clear_escalation_timestamp"):
-            self.deps.store.clear_escalation_timestamp(user_id, agent_type)
+            await store.clear_escalation_timestamp(user_id, agent_type)
 
     def _escalate(self, reason: str, summary: dict[str, Any]) -> AgentResult:
         self.deps.handoff.escalate(self.user_id, reason, summary)
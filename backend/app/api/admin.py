@@ -7,22 +7,34 @@ Provides CRUD operations for tenants, channels, and flows with proper cascade de
 
 from __future__ import annotations
 
+import asyncio
 import hmac
 import logging
 import time
 from collections.abc import Generator
-from datetime import datetime, timedelta
-from typing import Any
+from datetime import UTC, datetime, timedelta
+from typing import Any, Literal
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from fastapi.security import HTTPBearer
 from pydantic import BaseModel, Field
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from app.core.app_context import get_app_context
-from app.core.redis_keys import redis_keys
+from app.core.etags import (
+    Validators,
+    conditional_body,
+    conditional_get,
+    latest,
+    make_etag,
+    tenant_flows_resource,
+    tenant_resource,
+)
+from app.core.pagination import InvalidCursorError, PageKey, decode_cursor, split_page
+from app.core.redis_key_index import clear_user_keys_async
+from app.core.session_cache import publish_invalidation
 from app.core.state import RedisStore
 
 # Thought tracing removed - using Langfuse for observability
@@ -33,13 +45,20 @@ from app.db.repository import (
     delete_tenant_cascade,
     get_active_tenants_with_counts,
     get_channel_instances_by_tenant,
+    get_contact_external_ids_by_tenant,
     get_flow_by_id,
     get_flows_by_tenant,
+    get_message_stats,
+    get_message_stats_totals,
     get_tenant_by_id,
+    get_tenant_flows_validators,
+    get_tenant_validators,
+    list_conversation_summaries,
     update_flow_definition,
     update_tenant,
 )
-from app.db.session import db_session
+from app.db.session import db_read_session, db_session
+from app.services.tenant_reset_service import TenantResetJob, get_tenant_reset_progress
 from app.settings import get_settings
 
 logger = logging.getLogger(__name__)
@@ -143,6 +162,7 @@ class ConversationsResponse(BaseModel):
     conversations: list[ConversationInfo]
     total_count: int
     active_count: int
+    next_cursor: str | None = None
 
 
 class ResetConversationRequest(BaseModel):
@@ -331,6 +351,12 @@ def get_db() -> Generator[Session, None, None]:
         yield session
 
 
+def get_read_db() -> Generator[Session, None, None]:
+    """Read-only session dependency, served by the read replica when it is fresh."""
+    with db_read_session() as session:
+        yield session
+
+
 # API endpoints
 @router.post("/auth", response_model=AdminLoginResponse)
 async def admin_login(request: Request, login_req: AdminLoginRequest) -> AdminLoginResponse:
@@ -450,11 +476,29 @@ async def list_tenants(request: Request, db: Session = Depends(get_db)) -> list[
 
 @router.get("/tenants/{tenant_id}", response_model=TenantResponse)
 async def get_tenant(
-    tenant_id: UUID, db: Session = Depends(get_db)
-) -> TenantResponse:
+    request: Request, response: Response, tenant_id: UUID, db: Session = Depends(get_db)
+) -> TenantResponse | Response:
     """Get a single tenant's configuration (public access for tenant owners)."""
     # No auth required - tenants can view their own config
 
+    def validate() -> Validators | None:
+        row = get_tenant_validators(db, tenant_id)
+        if row is None:
+            return None
+        return Validators(
+            make_etag("tenant", tenant_id, *row),
+            latest(
+                row.updated_at,
+                row.config_updated_at,
+                row.channels_updated_at,
+                row.flows_updated_at,
+            ),
+        )
+
+    not_modified = await conditional_get(request, response, tenant_resource(tenant_id), validate)
+    if not_modified is not None:
+        return not_modified
+
     try:
         tenant = get_tenant_by_id(db, tenant_id)
         if not tenant:
@@ -731,11 +775,21 @@ async def create_tenant_channel(
 
 @router.get("/tenants/{tenant_id}/flows", response_model=list[FlowResponse])
 async def list_tenant_flows(
-    request: Request, tenant_id: UUID, db: Session = Depends(get_db)
-) -> list[FlowResponse]:
+    request: Request, response: Response, tenant_id: UUID, db: Session = Depends(get_db)
+) -> list[FlowResponse] | Response:
     """List flows for a tenant."""
     require_admin_auth(request)
 
+    def validate() -> Validators:
+        row = get_tenant_flows_validators(db, tenant_id)
+        return Validators(make_etag("tenant-flows", tenant_id, *row), row.updated_at)
+
+    not_modified = await conditional_get(
+        request, response, tenant_flows_resource(tenant_id), validate
+    )
+    if not_modified is not None:
+        return not_modified
+
     flows = get_flows_by_tenant(db, tenant_id)
     return [
         FlowResponse(
@@ -831,10 +885,51 @@ async def admin_health(request: Request) -> dict[str, str]:
     return {"status": "healthy", "service": "controller"}
 
 
+@router.get("/metrics")
+async def get_runtime_metrics(request: Request) -> dict[str, Any]:
+    """In-process runtime metrics for this worker, plus derived per-flow rates."""
+    require_admin_auth(request)
+
+    from app.core.metrics import metrics
+
+    snapshot = metrics.snapshot()
+    counters = snapshot["counters"]
+
+    tool_call_rates: dict[str, dict[str, float]] = {}
+    for series in counters.get("tool_call_responses_total", []):
+        flow_id = series["labels"].get("flow_id", "unknown")
+        total = series["value"] or 1
+        tool_call_rates[flow_id] = {
+            "responses": series["value"],
+            "repair_rate": metrics.get("tool_call_repairs_total", flow_id=flow_id) / total,
+            "metadata_default_rate": (
+                metrics.get("tool_call_metadata_defaults_total", flow_id=flow_id) / total
+            ),
+            "retry_rate": metrics.get("tool_call_retries_total", flow_id=flow_id) / total,
+        }
+
+    # Work aborted because a newer message superseded the turn, per stage
+    cancelled_work: dict[str, dict[str, float]] = {}
+    for series in snapshot["summaries"].get("cancelled_work_elapsed_ms", []):
+        stage = series["labels"].get("stage", "unknown")
+        cancelled_work[stage] = {
+            "operations": series["count"],
+            "elapsed_ms_at_cancel": series["sum"],
+        }
+
+    return {**snapshot, "tool_call_rates": tool_call_rates, "cancelled_work": cancelled_work}
+
+
 @router.get("/conversations", response_model=ConversationsResponse)
 async def list_conversations(
-    request: Request, active_only: bool = False, limit: int = 100, db: Session = Depends(get_db)
-) -> ConversationsResponse:
+    request: Request,
+    response: Response,
+    *,
+    active_only: bool = False,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: str | None = None,
+    db: Session = Depends(get_read_db),
+) -> ConversationsResponse | Response:
     """
     List actual customer conversations from ChatThread data.
 
@@ -845,53 +940,52 @@ async def list_conversations(
     1. Shows ChatThread data (actual customer conversations)
     2. One conversation per customer per channel
     3. Batch Redis lookups for active status
-    4. Proper message counts from actual messages
+    4. Message counts and flow names aggregated in the same query as the threads
+    5. Keyset pagination: pass ``next_cursor`` back as ``cursor``
+    6. ETag of the page body, cached for ETAG_VOLATILE_TTL_SECONDS: polls within
+       that window get a 304 without touching Postgres or the session keys
     """
     require_admin_auth(request)
 
+    resource = f"conversations:{active_only}:{limit}:{cursor or ''}"
+    not_modified = await conditional_get(request, response, resource)
+    if not_modified is not None:
+        return not_modified
+
     try:
-        from sqlalchemy.orm import selectinload
+        after = decode_cursor(cursor) if cursor else None
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
+    try:
         from app.core.redis_keys import redis_keys
         from app.core.state import RedisStore
-        from app.db.models import ChatThread, Flow
-
-        # Query actual customer conversations (ChatThread)
-        query = (
-            db.query(ChatThread)
-            .options(selectinload(ChatThread.contact), selectinload(ChatThread.channel_instance))
-            .filter(ChatThread.deleted_at.is_(None))
-            .order_by(ChatThread.last_message_at.desc())
-            .limit(limit)
-        )
 
-        threads = query.all()
+        rows, next_cursor = split_page(
+            list_conversation_summaries(db, limit=limit + 1, after=after),
+            limit,
+            lambda row: PageKey(row.last_message_at, row.id),
+        )
 
         # Check Redis for active flow sessions
         app_context = get_app_context(request.app)  # type: ignore[arg-type]
         active_status = {}
         redis_keys_to_check = []
 
-        for thread in threads:
-            if thread.contact and thread.contact.external_id:
+        for row in rows:
+            if row.external_id:
                 # Build session key for flow state check
-                user_id = thread.contact.external_id  # e.g., "whatsapp:+5511999999999"
-                flow_id = thread.flow_id or "default"
+                user_id = row.external_id  # e.g., "whatsapp:+5511999999999"
+                flow_id = row.flow_id or "default"
                 session_id = f"flow:{user_id}:{flow_id}"
-
-                user_parts = user_id.split(":", 1)
-                if len(user_parts) == 2:
-                    channel, phone = user_parts
-                    state_key = redis_keys.conversation_state_key(channel, session_id)
-                else:
-                    state_key = redis_keys.conversation_state_key(user_id, session_id)
-
-                redis_keys_to_check.append((str(thread.id), state_key))
+                state_key = redis_keys.conversation_state_key(user_id, session_id)
+                redis_keys_to_check.append((row.id, state_key))
 
         # Batch Redis lookup for active status
         if isinstance(app_context.store, RedisStore) and redis_keys_to_check:
             redis_client = app_context.store._r
-            pipe = redis_client.pipeline()
+            # Keys span many cluster slots; no MULTI
+            pipe = redis_client.pipeline(transaction=False)
             for _, redis_key in redis_keys_to_check:
                 pipe.exists(redis_key)
             results = pipe.execute()
@@ -901,45 +995,44 @@ async def list_conversations(
 
         # Build conversation list from actual customer threads
         conversations = []
-        for thread in threads:
-            thread_id = str(thread.id)
-            is_active = active_status.get(thread_id, False)
+        for row in rows:
+            is_active = active_status.get(row.id, False)
 
             # Skip inactive if active_only is True
             if active_only and not is_active:
                 continue
 
-            # Use contact's external_id as user_id (e.g., "whatsapp:+5511999999999")
-            user_id = thread.contact.external_id if thread.contact else f"unknown:{thread.id}"
-
-            # Count actual messages in thread
-            message_count = len(thread.messages) if thread.messages else 0
-
-            # Determine flow name from thread's flow_id
-            flow_name = None
-            if thread.flow_id:
-                flow = db.query(Flow).filter(Flow.id == thread.flow_id).first()
-                flow_name = flow.name if flow else None
-
             conversations.append(
                 ConversationInfo(
-                    user_id=user_id,
+                    # Contact's external_id, e.g. "whatsapp:+5511999999999"
+                    user_id=row.external_id or f"unknown:{row.id}",
                     agent_type="flow",  # Most conversations are flow-based
-                    session_id=f"thread:{thread.id}",
-                    last_activity=thread.last_message_at,
-                    message_count=message_count,
+                    session_id=f"thread:{row.id}",
+                    last_activity=row.last_message_at,
+                    message_count=row.message_count,
                     is_active=is_active,
-                    tenant_id=str(thread.tenant_id),
+                    tenant_id=str(row.tenant_id),
                     is_historical=not is_active,
-                    flow_name=flow_name,
+                    flow_name=row.flow_name,
                 )
             )
 
         active_count = sum(1 for conv in conversations if conv.is_active)
 
-        return ConversationsResponse(
-            conversations=conversations, total_count=len(conversations), active_count=active_count
+        result = ConversationsResponse(
+            conversations=conversations,
+            total_count=len(conversations),
+            active_count=active_count,
+            next_cursor=next_cursor,
         )
+        not_modified = await conditional_body(
+            request,
+            response,
+            resource,
+            result.model_dump_json(),
+            ttl_seconds=get_settings().etag_volatile_ttl_seconds,
+        )
+        return not_modified or result
 
     except Exception as e:
         logger.exception("Failed to retrieve customer conversations")
@@ -949,34 +1042,25 @@ async def list_conversations(
 
 
 @router.get("/conversations/stats")
-async def get_conversation_stats(request: Request, db: Session = Depends(get_db)) -> dict[str, Any]:
+async def get_conversation_stats(
+    request: Request, db: Session = Depends(get_read_db)
+) -> dict[str, Any]:
     """
     Get conversation statistics without loading full data.
-    Much faster for dashboard metrics.
+    Read from the hourly stats rollup, so the cost does not grow with message history.
     """
     require_admin_auth(request)
 
     try:
-        # Use aggregation queries for fast stats
-        stats_query = text("""
-            SELECT 
-                COUNT(*) as total_traces,
-                COUNT(DISTINCT tenant_id) as unique_tenants,
-                MAX(last_activity_at) as most_recent_activity,
-                AVG(total_thoughts) as avg_thoughts_per_conversation
-            FROM agent_conversation_traces 
-            WHERE deleted_at IS NULL
-        """)
-
-        result = db.execute(stats_query).fetchone()
-
+        totals = get_message_stats_totals(db)
         return {
-            "total_conversations": result.total_traces if result else 0,
-            "unique_tenants": result.unique_tenants if result else 0,
-            "most_recent_activity": result.most_recent_activity if result else None,
-            "avg_thoughts_per_conversation": float(result.avg_thoughts_per_conversation)
-            if result and result.avg_thoughts_per_conversation
-            else 0.0,
+            "total_conversations": int(totals.threads),
+            "total_messages": int(totals.messages),
+            "unique_tenants": totals.tenants,
+            "most_recent_activity": totals.latest_bucket,
+            "avg_messages_per_conversation": (
+                int(totals.messages) / int(totals.threads) if totals.threads else 0.0
+            ),
         }
 
     except Exception as e:
@@ -984,8 +1068,67 @@ async def get_conversation_stats(request: Request, db: Session = Depends(get_db)
         raise HTTPException(status_code=500, detail=f"Failed to get conversation stats: {e!s}")
 
 
+@router.get("/stats/messages")
+async def get_message_stats_series(
+    request: Request,
+    *,
+    tenant_id: UUID | None = None,
+    channel_instance_id: UUID | None = None,
+    flow_id: UUID | None = None,
+    granularity: Literal["hour", "day"] = "hour",
+    since: datetime | None = None,
+    until: datetime | None = None,
+    db: Session = Depends(get_read_db),
+) -> dict[str, Any]:
+    """
+    Message and thread counts per hour or day from the stats rollup.
+
+    Defaults to the last 24 hours (hourly) or 30 days (daily). Buckets are
+    UTC and lag live traffic by up to one rollup interval.
+    """
+    require_admin_auth(request)
+
+    until = until or datetime.now(UTC)
+    since = since or until - (timedelta(days=30) if granularity == "day" else timedelta(days=1))
+    try:
+        rows = get_message_stats(
+            db,
+            start=since,
+            end=until,
+            granularity=granularity,
+            tenant_id=tenant_id,
+            channel_instance_id=channel_instance_id,
+            flow_id=flow_id,
+        )
+    except Exception as e:
+        logger.exception("Failed to get message stats")
+        raise HTTPException(status_code=500, detail=f"Failed to get message stats: {e!s}")
+
+    buckets = [
+        {
+            "bucket": row.bucket,
+            "inbound_messages": int(row.inbound_messages),
+            "outbound_messages": int(row.outbound_messages),
+            "threads_started": int(row.threads_started),
+        }
+        for row in rows
+    ]
+    return {
+        "granularity": granularity,
+        "since": since,
+        "until": until,
+        "buckets": buckets,
+        "totals": {
+            key: sum(bucket[key] for bucket in buckets)
+            for key in ("inbound_messages", "outbound_messages", "threads_started")
+        },
+    }
+
+
 @router.get("/tenants/summary")
-async def get_tenants_summary(request: Request, db: Session = Depends(get_db)) -> dict[str, Any]:
+async def get_tenants_summary(
+    request: Request, db: Session = Depends(get_read_db)
+) -> dict[str, Any]:
     """
     Get tenant summary with optimized queries.
     """
@@ -1044,42 +1187,36 @@ async def reset_conversation_context(
         )
 
     try:
-        redis_client = app_context.store._r
-        deleted_keys = 0
-
-        # Use the centralized key builder for consistent patterns
+        # Extract flow_id from agent_type if it's a flow
+        flow_id = None
         if reset_req.agent_type:
-            # Extract flow_id from agent_type if it's a flow
-            flow_id = None
             if reset_req.agent_type.startswith("flow."):
                 flow_id = reset_req.agent_type  # e.g., "flow.atendimento_luminarias"
             elif reset_req.agent_type.startswith("flow:"):
                 # Handle the malformed agent_type we've been dealing with
                 flow_id = reset_req.agent_type[5:]  # Remove "flow:" prefix
 
-            patterns_to_delete = redis_keys.get_conversation_patterns(
-                user_id=reset_req.user_id, flow_id=flow_id
-            )
-        else:
-            # Reset all conversations for user
-            patterns_to_delete = redis_keys.get_conversation_patterns(
-                user_id=reset_req.user_id, flow_id=None
-            )
-
-        # Delete keys using patterns
-        for pattern in patterns_to_delete:
-            if "*" in pattern:
-                # Use pattern matching for wildcard patterns
-                keys = redis_client.keys(pattern)
-                if keys:
-                    deleted_count = redis_client.delete(*keys)
-                    deleted_keys += deleted_count
-                    logger.info(f"Deleted {deleted_count} keys matching pattern: {pattern}")
-            # Direct key deletion
-            elif redis_client.exists(pattern):
-                redis_client.delete(pattern)
-                deleted_keys += 1
-                logger.info(f"Deleted direct key: {pattern}")
+        # Indexed keys are unlinked directly; legacy keys are found with SCAN
+        store = app_context.store.aio
+        deleted_keys = await clear_user_keys_async(
+            store.redis_client,
+            store.key_builder,
+            reset_req.user_id,
+            flow_id=flow_id,
+            scan_legacy=get_settings().redis_legacy_key_scan,
+        )
+        await publish_invalidation(
+            store.redis_client, store.key_builder.namespace, user_id=reset_req.user_id
+        )
+        # Sessions tiered out of Redis would otherwise come back on the next message
+        cold_sessions = app_context.cold_sessions
+        if cold_sessions is not None:
+            if flow_id:
+                await asyncio.to_thread(
+                    cold_sessions.discard, [f"flow:{reset_req.user_id}:{flow_id}"]
+                )
+            else:
+                await asyncio.to_thread(cold_sessions.delete_user, reset_req.user_id)
 
         # NOTE: We do NOT delete database records (ChatThreads, Messages, or Traces)
         # Those are valuable for debugging and customer support.
@@ -1098,6 +1235,62 @@ async def reset_conversation_context(
         raise HTTPException(status_code=500, detail=f"Failed to reset conversation: {e!s}")
 
 
+@router.post("/tenants/{tenant_id}/conversations/reset", status_code=status.HTTP_202_ACCEPTED)
+async def reset_tenant_conversations(
+    request: Request, tenant_id: UUID, db: Session = Depends(get_db)
+) -> dict[str, str]:
+    """Reset the Redis context of every conversation of a tenant in the background.
+
+    Returns a job id; poll ``/conversations/reset-jobs/{job_id}`` for progress.
+    """
+    require_admin_auth(request)
+
+    app_context = get_app_context(request.app)  # type: ignore[arg-type]
+    if not isinstance(app_context.store, RedisStore):
+        raise HTTPException(
+            status_code=503, detail="Conversation management requires Redis storage"
+        )
+    if not get_tenant_by_id(db, tenant_id):
+        raise HTTPException(status_code=404, detail="Tenant not found")
+
+    # Contacts cover users whose state predates the tenant key index
+    user_ids: list[str] = []
+    after = None
+    while batch := get_contact_external_ids_by_tenant(db, tenant_id, limit=500, after=after):
+        user_ids.extend(contact.external_id for contact in batch)
+        after = PageKey(batch[-1].created_at, batch[-1].id)
+
+    store = app_context.store.aio
+    job = TenantResetJob(
+        store.redis_client,
+        store.key_builder,
+        str(tenant_id),
+        user_ids,
+        scan_legacy=get_settings().redis_legacy_key_scan,
+        cold_store=app_context.cold_sessions,
+    )
+    job_id = await job.start()
+    return {"job_id": job_id, "status": "pending"}
+
+
+@router.get("/conversations/reset-jobs/{job_id}")
+async def get_tenant_reset_job(request: Request, job_id: str) -> dict[str, str]:
+    """Progress of a tenant-wide conversation reset."""
+    require_admin_auth(request)
+
+    app_context = get_app_context(request.app)  # type: ignore[arg-type]
+    if not isinstance(app_context.store, RedisStore):
+        raise HTTPException(
+            status_code=503, detail="Conversation management requires Redis storage"
+        )
+
+    store = app_context.store.aio
+    progress = await get_tenant_reset_progress(store.redis_client, store.key_builder, job_id)
+    if progress is None:
+        raise HTTPException(status_code=404, detail="Reset job not found")
+    return {"job_id": job_id, **progress}
+
+
 # /agent-traces endpoint removed - thought tracing functionality replaced by Langfuse
 
 
@@ -5,11 +5,19 @@ from datetime import datetime
 from typing import Any
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Path, Query
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from sqlalchemy import desc
 from sqlalchemy.orm import Session
 
+from app.api.admin import require_admin_auth
+from app.core.pagination import (
+    NEXT_CURSOR_HEADER,
+    InvalidCursorError,
+    PageKey,
+    decode_cursor,
+    split_page,
+)
 from app.db.base import Base
 from app.db.models import (
     ChatThread,
@@ -19,9 +27,16 @@ from app.db.models import (
     MessageStatus,
     ThreadStatus,
 )
-from app.db.session import get_db_session
+from app.db.session import get_db_session, get_read_db_session
 from app.services.chat_service import (
     ChatService,
+    ThreadNotFoundError,
+)
+from app.services.export_service import (
+    MEDIA_TYPES,
+    ExportFormat,
+    stream_message_export,
+    stream_thread_export,
 )
 
 logger = logging.getLogger(__name__)
@@ -64,19 +79,61 @@ class ThreadDetailResponse(ThreadResponse):
     messages: list[MessageResponse]
 
 
+def _page_key(cursor: str | None) -> PageKey | None:
+    """Decode a ``cursor`` query parameter, rejecting tampered values with 400."""
+    if not cursor:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+def _message_response(m: Message) -> MessageResponse:
+    return MessageResponse(
+        id=m.id,
+        direction=m.direction,
+        status=m.status,
+        text=m.text,
+        created_at=m.created_at,
+        sent_at=m.sent_at,
+        delivered_at=m.delivered_at,
+        read_at=m.read_at,
+        provider_message_id=m.provider_message_id,
+    )
+
+
 @router.get("/tenants/{tenant_id}/threads", response_model=list[ThreadResponse])
 def list_threads(
+    response: Response,
     tenant_id: UUID = Path(...),
+    *,
     channel_instance_id: UUID | None = Query(None),
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
-    session: Session = Depends(get_db_session),
+    cursor: str | None = Query(None, description="Value of a previous X-Next-Cursor header"),
+    session: Session = Depends(get_read_db_session),
 ) -> list[ThreadResponse]:
-    """List chat threads for a tenant, optionally filtered by channel instance."""
+    """List chat threads for a tenant, optionally filtered by channel instance.
+
+    When more threads follow, the ``X-Next-Cursor`` response header holds the
+    cursor of the next page; paging by cursor costs the same on every page.
+    """
+    after = _page_key(cursor)
     service = ChatService(session)
-    threads = service.get_threads(
-        tenant_id, channel_instance_id=channel_instance_id, limit=limit, offset=offset
+    threads, next_cursor = split_page(
+        service.get_threads(
+            tenant_id,
+            channel_instance_id=channel_instance_id,
+            limit=limit + 1,
+            offset=0 if after else offset,
+            after=after,
+        ),
+        limit,
+        lambda t: PageKey(t.last_message_at, t.id),
     )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return [
         ThreadResponse(
             id=t.id,
@@ -102,12 +159,10 @@ def list_threads(
 def get_thread_detail(
     tenant_id: UUID = Path(...),
     thread_id: UUID = Path(...),
-    session=Depends(get_db_session),
+    session=Depends(get_read_db_session),
 ) -> Any:
     """Get detailed thread information including all messages."""
     try:
-        Base.metadata.create_all(bind=session.get_bind())
-
         thread = (
             session.query(ChatThread)
             .join(Contact)
@@ -127,6 +182,7 @@ def get_thread_detail(
             session.query(Message)
             .filter(
                 Message.thread_id == thread_id,
+                Message.created_at >= thread.created_at,
                 Message.deleted_at.is_(None),
             )
             .order_by(Message.id)
@@ -148,20 +204,7 @@ def get_thread_detail(
                 consent_opt_in_at=thread.contact.consent_opt_in_at,
                 consent_revoked_at=thread.contact.consent_revoked_at,
             ),
-            messages=[
-                MessageResponse(
-                    id=m.id,
-                    direction=m.direction,
-                    status=m.status,
-                    text=m.text,
-                    created_at=m.created_at,
-                    sent_at=m.sent_at,
-                    delivered_at=m.delivered_at,
-                    read_at=m.read_at,
-                    provider_message_id=m.provider_message_id,
-                )
-                for m in messages
-            ],
+            messages=[_message_response(m) for m in messages],
         )
     except HTTPException:
         raise
@@ -169,28 +212,54 @@ def get_thread_detail(
         raise HTTPException(status_code=500, detail=f"Failed to get thread detail: {exc}")
 
 
+@router.get(
+    "/tenants/{tenant_id}/threads/{thread_id}/messages", response_model=list[MessageResponse]
+)
+def list_thread_messages(
+    response: Response,
+    tenant_id: UUID = Path(...),
+    thread_id: UUID = Path(...),
+    *,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: str | None = Query(None, description="Value of a previous X-Next-Cursor header"),
+    session: Session = Depends(get_read_db_session),
+) -> list[MessageResponse]:
+    """Page through a thread's messages, oldest first."""
+    after = _page_key(cursor)
+    try:
+        messages = ChatService(session).get_messages(
+            tenant_id, thread_id, limit=limit + 1, after=after
+        )
+    except ThreadNotFoundError:
+        raise HTTPException(status_code=404, detail="Thread not found")
+    page, next_cursor = split_page(messages, limit, lambda m: PageKey(m.created_at, m.id))
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return [_message_response(m) for m in page]
+
+
 @router.get("/tenants/{tenant_id}/contacts", response_model=list[ContactResponse])
 def list_contacts(
+    response: Response,
     tenant_id: UUID = Path(...),
+    *,
     limit: int = Query(100, ge=1, le=500),
     offset: int = Query(0, ge=0),
-    session=Depends(get_db_session),
+    cursor: str | None = Query(None, description="Value of a previous X-Next-Cursor header"),
+    session=Depends(get_read_db_session),
 ) -> Any:
-    """List contacts for a tenant."""
+    """List contacts for a tenant, newest first (see ``list_threads`` for cursors)."""
+    after = _page_key(cursor)
     try:
-        Base.metadata.create_all(bind=session.get_bind())
-
-        contacts = (
-            session.query(Contact)
-            .filter(
-                Contact.tenant_id == tenant_id,
-                Contact.deleted_at.is_(None),
-            )
-            .order_by(desc(Contact.created_at))
-            .offset(offset)
-            .limit(limit)
-            .all()
+        contacts, next_cursor = split_page(
+            ChatService(session).get_contacts(
+                tenant_id, limit=limit + 1, offset=0 if after else offset, after=after
+            ),
+            limit,
+            lambda c: PageKey(c.created_at, c.id),
         )
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
 
         return [
             ContactResponse(
@@ -208,6 +277,49 @@ def list_contacts(
         raise HTTPException(status_code=500, detail=f"Failed to list contacts: {exc}")
 
 
+def _export_response(chunks: Any, name: str, fmt: ExportFormat) -> StreamingResponse:
+    extension = "csv" if fmt == "csv" else "ndjson"
+    return StreamingResponse(
+        chunks,
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{extension}"'},
+    )
+
+
+# Exports hold every conversation of a tenant; only admins may download them
+@router.get("/tenants/{tenant_id}/exports/threads", dependencies=[Depends(require_admin_auth)])
+def export_threads(
+    tenant_id: UUID = Path(...),
+    format: ExportFormat = Query("ndjson"),
+    cursor: str | None = Query(None, description="cursor of the last row already received"),
+) -> StreamingResponse:
+    """Stream every thread of a tenant with its contact, oldest first, as NDJSON or CSV.
+
+    Each row has a ``cursor``; pass the last one received to resume a broken download.
+    """
+    after = _page_key(cursor)
+    return _export_response(
+        stream_thread_export(tenant_id, format, after=after), f"threads-{tenant_id}", format
+    )
+
+
+@router.get("/tenants/{tenant_id}/exports/messages", dependencies=[Depends(require_admin_auth)])
+def export_messages(
+    tenant_id: UUID = Path(...),
+    format: ExportFormat = Query("ndjson"),
+    since: datetime | None = Query(None, description="Only messages created at or after"),
+    until: datetime | None = Query(None, description="Only messages created before"),
+    cursor: str | None = Query(None, description="cursor of the last row already received"),
+) -> StreamingResponse:
+    """Stream a tenant's messages, oldest first, as NDJSON or CSV (see ``export_threads``)."""
+    after = _page_key(cursor)
+    return _export_response(
+        stream_message_export(tenant_id, format, since=since, until=until, after=after),
+        f"messages-{tenant_id}",
+        format,
+    )
+
+
 class UpdateThreadStatusRequest(BaseModel):
     status: ThreadStatus
 
@@ -6,12 +6,19 @@ import asyncio
 import logging
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Path, Request
+from fastapi import APIRouter, Depends, HTTPException, Path, Request, Response
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
 from app.agents.flow_chat_agent import FlowChatAgent, FlowChatResponse
 from app.core.app_context import get_app_context
+from app.core.etags import (
+    Validators,
+    is_not_modified,
+    make_etag,
+    not_modified_response,
+    set_validators,
+)
 from app.core.llm import LLMClient
 from app.db.models import FlowChatMessage as DBFlowChatMessage
 from app.db.session import get_db_session
@@ -146,17 +153,31 @@ async def send_message(
 # Flow version endpoints
 @router_versions.get("", response_model=list[dict])
 def list_flow_versions(
-    flow_id: UUID = Path(...), limit: int = 20, session: Session = Depends(get_db_session)
-) -> list[dict]:
-    """List version history for a flow."""
-    from app.db.repository import get_flow_versions
+    request: Request,
+    response: Response,
+    flow_id: UUID = Path(...),
+    limit: int = 20,
+    session: Session = Depends(get_db_session),
+) -> list[dict] | Response:
+    """List version history for a flow (metadata only).
+
+    Definitions are stored as patches; fetch a single version to get its
+    reconstructed definition. Versions are immutable, so the ETag only
+    follows the latest version number.
+    """
+    from app.db.repository import get_flow_versions, get_latest_flow_version_number
+
+    latest_number = get_latest_flow_version_number(session, flow_id)
+    validators = Validators(make_etag("flow-versions", flow_id, limit, latest_number))
+    if is_not_modified(request.headers, validators):
+        return not_modified_response(validators)
+    set_validators(response, validators)
 
     versions = get_flow_versions(session, flow_id, limit=limit)
     return [
         {
             "id": str(v.id),
             "version_number": v.version_number,
-            "definition": v.definition,
             "change_description": v.change_description,
             "created_by": v.created_by,
             "created_at": v.created_at.isoformat() if v.created_at else None,
@@ -167,21 +188,36 @@ def list_flow_versions(
 
 @router_versions.get("/{version_number}", response_model=dict)
 def get_flow_version(
+    request: Request,
+    response: Response,
     flow_id: UUID = Path(...),
     version_number: int = Path(...),
     session: Session = Depends(get_db_session),
-) -> dict:
-    """Get a specific version of a flow."""
-    from app.db.repository import get_flow_version_by_number
+) -> dict | Response:
+    """Get a specific version of a flow.
+
+    A version never changes after it is written; a client holding it gets a
+    304 before its definition is replayed from snapshot and patches.
+    """
+    from app.db.repository import get_flow_version_by_number, get_flow_version_definition
 
     version = get_flow_version_by_number(session, flow_id, version_number)
     if not version:
         raise HTTPException(status_code=404, detail="Version not found")
 
+    validators = Validators(make_etag("flow-version", version.id), version.created_at)
+    if is_not_modified(request.headers, validators):
+        return not_modified_response(validators)
+    set_validators(response, validators)
+
+    definition = get_flow_version_definition(session, flow_id, version_number)
+    if definition is None:
+        raise HTTPException(status_code=500, detail="Version history is incomplete")
+
     return {
         "id": str(version.id),
         "version_number": version.version_number,
-        "definition": version.definition,
+        "definition": definition,
         "change_description": version.change_description,
         "created_by": version.created_by,
         "created_at": version.created_at.isoformat() if version.created_at else None,
@@ -5,10 +5,11 @@ from pathlib import Path
 from typing import Any
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Path
+from fastapi import APIRouter, Depends, HTTPException, Path, Request, Response
 from sqlalchemy.orm import Session
 
-from app.db.repository import get_flow_by_id
+from app.core.etags import Validators, conditional_get, flow_resource, make_etag
+from app.db.repository import get_flow_by_id, get_flow_validators
 from app.db.session import get_db_session
 from app.flow_core.compiler import CompiledFlow as _CompiledFlow
 from app.flow_core.compiler import compile_flow
@@ -152,11 +153,29 @@ async def get_example_flow_compiled() -> dict[str, Any]:
         ) from exc
 
 
-@router.get("/{flow_id}/compiled")
+@router.get("/{flow_id}/compiled", response_model=None)
 async def get_flow_compiled(
-    flow_id: UUID = Path(...), session: Session = Depends(get_db_session)
-) -> dict[str, Any]:
-    """Return a specific flow compiled to CompiledFlow format."""
+    request: Request,
+    response: Response,
+    flow_id: UUID = Path(...),
+    session: Session = Depends(get_db_session),
+) -> dict[str, Any] | Response:
+    """Return a specific flow compiled to CompiledFlow format.
+
+    Conditional: the ETag follows the flow's ``version``, so an unchanged flow
+    is answered with 304 without loading or compiling its definition.
+    """
+
+    def validate() -> Validators | None:
+        row = get_flow_validators(session, flow_id)
+        if row is None:
+            return None
+        return Validators(make_etag("flow-compiled", flow_id, *row), row.updated_at)
+
+    not_modified = await conditional_get(request, response, flow_resource(flow_id), validate)
+    if not_modified is not None:
+        return not_modified
+
     try:
         # Get flow from database
         flow_record = get_flow_by_id(session, flow_id)
@@ -18,6 +18,7 @@ from fastapi import APIRouter, Depends, HTTPException, Path, Query
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
+from app.core.pagination import InvalidCursorError, PageKey, decode_cursor, split_page
 from app.db.models import HandoffRequest
 from app.db.session import get_db_session
 from app.services.handoff_service import HandoffService
@@ -73,24 +74,35 @@ class HandoffListResponse(BaseModel):
     offset: int
     limit: int
     has_more: bool
+    next_cursor: str | None = None
 
 
 @router.get("/tenants/{tenant_id}", response_model=HandoffListResponse)
 async def get_handoff_requests(
     tenant_id: UUID = Path(..., description="Tenant ID"),
+    *,
     acknowledged: bool | None = Query(
         None,
         description="Filter by acknowledgment status. None=all, True=acknowledged, False=pending",
     ),
     limit: int = Query(50, ge=1, le=200, description="Number of handoffs to return"),
     offset: int = Query(0, ge=0, description="Number of handoffs to skip"),
+    cursor: str | None = Query(
+        None, description="Opaque cursor from a previous page's next_cursor (replaces offset)"
+    ),
     session: Session = Depends(get_db_session),
 ) -> HandoffListResponse:
     """
     Get handoff requests for the current tenant.
 
-    Supports filtering by acknowledgment status and pagination.
+    Supports filtering by acknowledgment status and pagination. Prefer
+    ``cursor`` over ``offset``: it costs the same on every page.
     """
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
     try:
         handoff_service = HandoffService()
 
@@ -99,13 +111,13 @@ async def get_handoff_requests(
             tenant_id=tenant_id,
             acknowledged=acknowledged,
             limit=limit + 1,  # Get one extra to check if there are more
-            offset=offset,
+            offset=0 if after else offset,
+            after=after,
         )
 
         # Check if there are more results
-        has_more = len(handoffs) > limit
-        if has_more:
-            handoffs = handoffs[:-1]  # Remove the extra item
+        handoffs, next_cursor = split_page(handoffs, limit, lambda h: PageKey(h.created_at, h.id))
+        has_more = next_cursor is not None
 
         # Convert to response models
         handoff_responses = [HandoffRequestResponse.from_orm(handoff) for handoff in handoffs]
@@ -119,6 +131,7 @@ async def get_handoff_requests(
             offset=offset,
             limit=limit,
             has_more=has_more,
+            next_cursor=next_cursor,
         )
 
     except Exception as e:
@@ -7,12 +7,18 @@ if TYPE_CHECKING:
     from fastapi import FastAPI
 
     from app.config.provider import ConfigProvider
+    from app.core.etags import ETagCache
     from app.core.llm import LLMClient
     from app.core.session import SessionPolicy
+    from app.core.session_cache import SessionContextCache
     from app.core.state import ConversationStore
+    from app.flow_core.services.semantic_router import SemanticRouter
+    from app.services.message_archival import MessagePartitionJob
     from app.services.processing_cancellation_manager import ProcessingCancellationManager
     from app.services.rag.rag_service import RAGService
-    from app.services.rate_limiter import RateLimiter
+    from app.services.rate_limiter import AdmissionController, RateLimiter
+    from app.services.session_tiering import PostgresColdSessionStore, SessionTieringSweeper
+    from app.services.stats_rollup import StatsRollupJob
 
 
 @dataclass(slots=True)
@@ -23,8 +29,16 @@ class AppContext:
     llm_model: str
     session_policy: SessionPolicy | None = None
     rate_limiter: RateLimiter | None = None
+    admission: AdmissionController | None = None
     cancellation_manager: ProcessingCancellationManager | None = None
     rag_service: RAGService | None = None
+    semantic_router: SemanticRouter | None = None
+    session_cache: SessionContextCache | None = None
+    cold_sessions: PostgresColdSessionStore | None = None
+    session_tiering: SessionTieringSweeper | None = None
+    stats_rollup: StatsRollupJob | None = None
+    message_partitions: MessagePartitionJob | None = None
+    etag_cache: ETagCache | None = None
 
 
 def set_app_context(app: FastAPI, ctx: AppContext) -> None:
@@ -0,0 +1,129 @@
+"""Async Redis access for hot-path callers.
+
+Production stores expose a ``redis.asyncio`` client backed by one shared
+connection pool per store. Stores without one (in-memory stores, scripts and
+test doubles holding a synchronous client) are wrapped in ``AsyncRedisFacade``
+so async callers have a single code path.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+try:
+    import redis.asyncio as aioredis
+except Exception:  # pragma: no cover - optional import
+    aioredis = None  # type: ignore[assignment]
+
+DEFAULT_MAX_CONNECTIONS = 50
+FACADE_POLL_INTERVAL_S = 0.05
+
+
+def create_async_client(
+    redis_url: str, *, max_connections: int | None = None, cluster: bool = False
+) -> Any:
+    """Create a ``redis.asyncio`` client with its own connection pool.
+
+    With ``cluster`` a ``RedisCluster`` client is returned; ``max_connections``
+    then applies per cluster node.
+    """
+    if aioredis is None:  # pragma: no cover - import guard
+        msg = "redis-py is not installed. Please add 'redis' to dependencies."
+        raise RuntimeError(msg)
+    if cluster:
+        return aioredis.RedisCluster.from_url(
+            redis_url, max_connections=max_connections or DEFAULT_MAX_CONNECTIONS
+        )
+    pool = aioredis.ConnectionPool.from_url(
+        redis_url, max_connections=max_connections or DEFAULT_MAX_CONNECTIONS
+    )
+    return aioredis.Redis(connection_pool=pool)
+
+
+def async_redis_client(store: Any) -> Any:
+    """Return an awaitable Redis client for ``store``.
+
+    Uses the store's shared async client when it has one, otherwise wraps its
+    synchronous client. Returns None for stores without Redis.
+    """
+    # Looked up on the class so mocks and duck-typed stores fall through
+    if getattr(type(store), "async_redis_client", None) is not None:
+        return store.async_redis_client
+    sync_client = getattr(store, "_r", None)
+    if sync_client is None:
+        return None
+    return AsyncRedisFacade(sync_client)
+
+
+class AsyncRedisFacade:
+    """Awaitable view over a synchronous Redis client.
+
+    Every command runs inline; this is a compatibility shim for stores that
+    have no async client, not a way to avoid blocking the event loop.
+    """
+
+    def __init__(self, client: Any) -> None:
+        self._client = client
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._client, name)
+        if not callable(attr):
+            return attr
+
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            return attr(*args, **kwargs)
+
+        return call
+
+    def pipeline(self, transaction: bool = True) -> _PipelineFacade:
+        # Simple fakes only implement ``pipeline()``, which defaults to MULTI/EXEC
+        if transaction:
+            return _PipelineFacade(self._client.pipeline())
+        return _PipelineFacade(self._client.pipeline(transaction=False))
+
+    def pubsub(self, **kwargs: Any) -> _PubSubFacade:
+        return _PubSubFacade(self._client.pubsub(**kwargs))
+
+
+class _PipelineFacade:
+    def __init__(self, pipeline: Any) -> None:
+        self._pipeline = pipeline
+
+    def __getattr__(self, name: str) -> Any:
+        command = getattr(self._pipeline, name)
+
+        def queue(*args: Any, **kwargs: Any) -> _PipelineFacade:
+            command(*args, **kwargs)
+            return self
+
+        return queue
+
+    async def execute(self) -> list[Any]:
+        return list(self._pipeline.execute())
+
+
+class _PubSubFacade:
+    def __init__(self, pubsub: Any) -> None:
+        self._pubsub = pubsub
+
+    async def subscribe(self, *channels: str) -> None:
+        self._pubsub.subscribe(*channels)
+
+    async def get_message(
+        self, ignore_subscribe_messages: bool = False, timeout: float | None = 0.0
+    ) -> dict[str, Any] | None:
+        # Synchronous clients are polled without blocking; wait in small steps
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + (timeout or 0.0)
+        while True:
+            message = self._pubsub.get_message(timeout=0)
+            if message is not None or loop.time() >= deadline:
+                return message
+            await asyncio.sleep(FACADE_POLL_INTERVAL_S)
+
+    async def aclose(self) -> None:
+        self._pubsub.close()
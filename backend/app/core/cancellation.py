@@ -0,0 +1,104 @@
+"""Cooperative cancellation for in-flight turn work.
+
+A ``CancellationToken`` is created per turn and triggered when a newer message
+arrives for the same session (see ``ProcessingCancellationManager``). Awaitables
+started through ``CancellationToken.run`` are wrapped in asyncio tasks that are
+cancelled immediately, which aborts the underlying HTTP requests of async LLM
+and RAG clients instead of letting them finish and discarding the result.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable
+from typing import TypeVar
+
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class ProcessingCancelledException(Exception):
+    """Exception raised when processing is cancelled due to newer message."""
+
+
+class CancellationToken:
+    """Cancellation signal shared by all work of a single turn."""
+
+    def __init__(self, session_id: str) -> None:
+        self.session_id = session_id
+        self._reason: str | None = None
+        self._inflight: dict[asyncio.Future[object], tuple[str, float]] = {}
+
+    @property
+    def cancelled(self) -> bool:
+        return self._reason is not None
+
+    @property
+    def reason(self) -> str | None:
+        return self._reason
+
+    def cancel(self, reason: str = "newer_message") -> None:
+        """Trigger cancellation and abort all in-flight operations."""
+        if self._reason is not None:
+            return
+        self._reason = reason
+
+        now = time.perf_counter()
+        aborted = 0
+        for task, (stage, started_at) in list(self._inflight.items()):
+            if task.done():
+                continue
+            task.cancel()
+            aborted += 1
+            metrics.inc("cancelled_work_total", stage=stage)
+            metrics.observe("cancelled_work_elapsed_ms", (now - started_at) * 1000, stage=stage)
+
+        logger.info(
+            f"[{self.session_id}] Cancellation requested ({reason}); "
+            f"aborted {aborted} in-flight operation(s)"
+        )
+
+    def raise_if_cancelled(self, stage: str) -> None:
+        """Raise ``ProcessingCancelledException`` when the token was triggered."""
+        if self._reason is not None:
+            metrics.inc("turns_cancelled_total", stage=stage)
+            raise ProcessingCancelledException(
+                f"Processing cancelled at {stage}: {self._reason} for session {self.session_id}"
+            )
+
+    async def run(self, awaitable: Awaitable[T], *, stage: str) -> T:
+        """Await ``awaitable`` as a task that is cancelled together with the token.
+
+        Args:
+            awaitable: Coroutine or future to run (e.g. an LLM or RAG call)
+            stage: Label used in logs and cancellation metrics
+
+        Raises:
+            ProcessingCancelledException: If the token is (or becomes) cancelled
+        """
+        if self._reason is not None:
+            # Never start work for an already cancelled turn
+            if asyncio.iscoroutine(awaitable):
+                awaitable.close()
+            self.raise_if_cancelled(stage)
+
+        task: asyncio.Future[T] = asyncio.ensure_future(awaitable)
+        self._inflight[task] = (stage, time.perf_counter())  # type: ignore[index]
+        try:
+            return await task
+        except asyncio.CancelledError:
+            if not task.done():
+                # The caller itself was cancelled; do not leave the work running
+                task.cancel()
+                raise
+            if self._reason is None:
+                raise
+            self.raise_if_cancelled(stage)
+            raise
+        finally:
+            self._inflight.pop(task, None)  # type: ignore[arg-type]
@@ -0,0 +1,283 @@
+"""Conditional GETs (ETag / Last-Modified) for admin resources.
+
+The admin UI polls flow definitions, tenant configs and conversation lists
+that rarely change, and a flow definition can be hundreds of KB of JSON. A
+resource's validators are derived from what already changes on every
+write: ``Flow.version``, ``updated_at`` columns, immutable version ids. The
+endpoint computes them with one cheap query (``validate``) and answers
+``If-None-Match`` / ``If-Modified-Since`` with a 304 before running the
+heavy query.
+
+Validators are also cached in Redis (``ETagCache``), so a poll of an
+unchanged resource costs one read and no database work. Commits touching
+flows, tenants, their configs or channels drop the affected entries
+(``app/db/etag_events.py``) and bump the entry's generation, so validators
+computed before a concurrent commit are not cached; ETAG_CACHE_TTL_SECONDS
+bounds staleness from writes that bypass the ORM. Resources with no cheap validator (the
+conversation list, whose active flags live in Redis) cache an ETag of the
+response body instead, for ETAG_VOLATILE_TTL_SECONDS.
+
+Without Redis every request runs ``validate``; 304s still work.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any
+from uuid import UUID
+
+from fastapi import Request, Response
+
+from app.core.metrics import metrics
+from app.core.redis_keys import redis_keys
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 300
+
+# A resource's entry is a hash of its validators and a generation counter
+# bumped by every invalidation. Puts carrying the generation read before
+# validating only land if no invalidation happened since ('' = unconditional).
+_PUT = """
+if ARGV[1] ~= '' and (redis.call('HGET', KEYS[1], 'gen') or '0') ~= ARGV[1] then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'validators', ARGV[2])
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+return 1
+"""
+_INVALIDATE = """
+redis.call('HDEL', KEYS[1], 'validators')
+redis.call('HINCRBY', KEYS[1], 'gen', 1)
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+return 1
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class Validators:
+    """Cache validators of one representation of a resource."""
+
+    etag: str
+    last_modified: datetime | None = None
+
+
+def flow_resource(flow_id: UUID | str) -> str:
+    return f"flow:{flow_id}"
+
+
+def tenant_resource(tenant_id: UUID | str) -> str:
+    return f"tenant:{tenant_id}"
+
+
+def tenant_flows_resource(tenant_id: UUID | str) -> str:
+    return f"tenant:{tenant_id}:flows"
+
+
+def make_etag(*parts: Any) -> str:
+    """Weak ETag over ``parts`` (ids, version numbers, timestamps).
+
+    Weak because the JSON bodies are semantically, not byte-for-byte,
+    equivalent across serializations.
+    """
+    raw = "\x1f".join("" if part is None else str(part) for part in parts)
+    return f'W/"{hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()}"'
+
+
+def latest(*moments: datetime | None) -> datetime | None:
+    """Most recent of ``moments`` ignoring NULLs (naive values are taken as UTC)."""
+    aware = [m if m.tzinfo else m.replace(tzinfo=UTC) for m in moments if m is not None]
+    return max(aware, default=None)
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison of ``etag`` against an ``If-None-Match`` header."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return _opaque(etag) in {_opaque(tag) for tag in if_none_match.split(",")}
+
+
+def is_not_modified(headers: Mapping[str, str], validators: Validators) -> bool:
+    """Whether the client's cached copy is current (RFC 9110 §13.2.2 order).
+
+    ``If-Modified-Since`` is only consulted without ``If-None-Match``.
+    """
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag_matches(if_none_match, validators.etag)
+    if_modified_since = headers.get("if-modified-since")
+    if not if_modified_since or validators.last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=UTC)
+    # HTTP dates have whole-second precision
+    modified = latest(validators.last_modified)
+    return modified is not None and modified.replace(microsecond=0) <= since
+
+
+def set_validators(response: Response, validators: Validators) -> None:
+    response.headers["ETag"] = validators.etag
+    modified = latest(validators.last_modified)
+    if modified is not None:
+        response.headers["Last-Modified"] = format_datetime(modified.astimezone(UTC), usegmt=True)
+    # Revalidate on every use; the 304 is cheap
+    response.headers["Cache-Control"] = "private, no-cache"
+
+
+def not_modified_response(validators: Validators) -> Response:
+    response = Response(status_code=304)
+    set_validators(response, validators)
+    return response
+
+
+class ETagCache:
+    """Validators of API resources in Redis, keyed by resource name."""
+
+    def __init__(
+        self, client: Any, sync_client: Any, *, ttl_seconds: int = DEFAULT_TTL_SECONDS
+    ) -> None:
+        self._client = client
+        self._sync_client = sync_client
+        self._ttl_seconds = ttl_seconds
+
+    async def get(self, resource: str) -> tuple[Validators | None, str]:
+        """Cached validators of ``resource`` and the generation they were read at."""
+        try:
+            raw, generation = await self._client.hmget(
+                redis_keys.etag_key(resource), ["validators", "gen"]
+            )
+        except Exception as e:
+            logger.debug("ETag cache read failed for %s: %s", resource, e)
+            return None, "0"
+        if isinstance(generation, bytes):
+            generation = generation.decode()
+        generation = generation or "0"
+        if raw is None:
+            return None, generation
+        data = json.loads(raw)
+        modified = data.get("last_modified")
+        validators = Validators(
+            data["etag"], datetime.fromisoformat(modified) if modified else None
+        )
+        return validators, generation
+
+    async def put(
+        self,
+        resource: str,
+        validators: Validators,
+        *,
+        ttl_seconds: int | None = None,
+        generation: str | None = None,
+    ) -> None:
+        """Cache ``validators``; with ``generation``, only if not invalidated since."""
+        modified = validators.last_modified
+        raw = json.dumps(
+            {"etag": validators.etag, "last_modified": modified.isoformat() if modified else None}
+        )
+        try:
+            await self._client.eval(
+                _PUT,
+                1,
+                redis_keys.etag_key(resource),
+                generation or "",
+                raw,
+                ttl_seconds or self._ttl_seconds,
+            )
+        except Exception as e:
+            logger.debug("ETag cache write failed for %s: %s", resource, e)
+
+    def invalidate(self, resources: Iterable[str]) -> None:
+        """Drop cached validators (sync: runs from the ORM's after_commit hook)."""
+        # One call per key: the keys hash to different cluster slots
+        for resource in resources:
+            try:
+                self._sync_client.eval(
+                    _INVALIDATE, 1, redis_keys.etag_key(resource), self._ttl_seconds
+                )
+            except Exception as e:
+                logger.warning("Failed to invalidate cached ETag of %s: %s", resource, e)
+
+
+def _etag_cache(request: Request) -> ETagCache | None:
+    ctx = getattr(request.app.state, "ctx", None)
+    return getattr(ctx, "etag_cache", None)
+
+
+def _not_modified(resource: str, validators: Validators, source: str) -> Response:
+    metrics.inc("http_not_modified_total", resource=resource.split(":", 1)[0], source=source)
+    return not_modified_response(validators)
+
+
+async def conditional_get(
+    request: Request,
+    response: Response,
+    resource: str,
+    validate: Callable[[], Validators | None] | None = None,
+    *,
+    ttl_seconds: int | None = None,
+) -> Response | None:
+    """Answer a GET of ``resource`` with 304 when the client's copy is current.
+
+    Validators come from the Redis cache, else from ``validate`` (cached for
+    the next request). Returns the 304 response, or None after setting
+    ETag/Last-Modified on ``response``; the caller then builds the body.
+    Also None when ``validate`` finds nothing, so the caller's 404 applies.
+    """
+    cache = _etag_cache(request)
+    validators, generation = await cache.get(resource) if cache is not None else (None, "0")
+    source = "cache"
+    if validators is None:
+        if validate is None:
+            return None
+        validators = validate()
+        source = "db"
+        if validators is None:
+            return None
+        if cache is not None:
+            # Skipped if a commit invalidated the resource while validating
+            await cache.put(resource, validators, ttl_seconds=ttl_seconds, generation=generation)
+    if is_not_modified(request.headers, validators):
+        return _not_modified(resource, validators, source)
+    set_validators(response, validators)
+    return None
+
+
+async def conditional_body(
+    request: Request,
+    response: Response,
+    resource: str,
+    body: str | bytes,
+    *,
+    ttl_seconds: int | None = None,
+) -> Response | None:
+    """Validators from a computed response body, for resources without a cheap validator.
+
+    The ETag is cached, so ``conditional_get(request, response, resource)``
+    answers later polls without recomputing the body until it expires.
+    """
+    raw = body.encode() if isinstance(body, str) else body
+    validators = Validators(make_etag(hashlib.blake2b(raw, digest_size=16).hexdigest()))
+    cache = _etag_cache(request)
+    if cache is not None:
+        await cache.put(resource, validators, ttl_seconds=ttl_seconds)
+    if is_not_modified(request.headers, validators):
+        return _not_modified(resource, validators, "body")
+    set_validators(response, validators)
+    return None
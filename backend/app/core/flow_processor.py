@@ -12,6 +12,7 @@ from typing import Any
 from uuid import UUID
 
 from app.core.app_context import AppContext
+from app.core.cancellation import CancellationToken, ProcessingCancelledException
 from app.core.llm import LLMClient
 from app.core.session import SessionManager
 from app.flow_core.compiler import FlowCompiler
@@ -74,17 +75,40 @@ class FlowProcessor:
 
         logger.info("FlowProcessor initialized")
 
-    async def process_flow(self, request: FlowRequest, app_context: AppContext) -> FlowResponse:
+    async def process_flow(
+        self, request: FlowRequest, app_context: AppContext, *, commit: bool = True
+    ) -> FlowResponse:
         """Process a flow request with external action handling.
 
+        The turn is bound to a cancellation token: when a newer message arrives
+        for the session, in-flight RAG/LLM work is aborted and a cancelled
+        response is returned without persisting the context.
+
         Args:
             request: Flow processing request
             app_context: Application context
+            commit: When False, run the turn speculatively: skip the buffer
+                cancellation check and do not persist the context. The result
+                can later be persisted with ``commit_speculative``.
 
         Returns:
             Flow response with truthful action results
         """
         session_id = self._build_session_id(request)
+        async with self._cancellation_manager.cancellation_scope(session_id) as cancel_token:
+            return await self._process_flow(
+                request, app_context, commit=commit, cancel_token=cancel_token
+            )
+
+    async def _process_flow(
+        self,
+        request: FlowRequest,
+        app_context: AppContext,
+        *,
+        commit: bool,
+        cancel_token: CancellationToken,
+    ) -> FlowResponse:
+        session_id = self._build_session_id(request)
 
         logger.info("=" * 80)
         logger.info("🎯 FLOW PROCESSOR: Processing request")
@@ -102,11 +126,26 @@ class FlowProcessor:
         existing_context = None
 
         try:
-            # Check for cancellation
-            self._cancellation_manager.check_cancellation_and_raise(session_id, "flow_processing")
+            # Turn start: the pending-message check and the context load share
+            # one Redis round trip; the context save at the end is another
+            uow = self._cancellation_manager.unit_of_work()
+            pending = (
+                self._cancellation_manager.queue_message_count(uow, session_id) if commit else None
+            )
+            loaded_context = self._session_manager.queue_load_context(uow, session_id)
+            await uow.execute()
+
+            # Check for cancellation (speculative turns run while the buffer is still open)
+            if pending is not None:
+                self._cancellation_manager.raise_if_pending(
+                    session_id, pending.result(), "flow_processing"
+                )
 
             # Get or create flow context
-            existing_context = self._session_manager.get_context(session_id)
+            existing_context = loaded_context.result()
+            base_context_version = (
+                existing_context.updated_at.isoformat() if existing_context else None
+            )
 
             # Compile flow (prefer typed field; support legacy metadata fallback)
             flow_definition = request.flow_definition or request.flow_metadata.get(
@@ -128,12 +167,40 @@ class FlowProcessor:
 
             # Check admin status
             is_admin = self._check_admin_status(request)
+
+            # Admin turns may execute external actions (flow edits), which must
+            # never run speculatively
+            if not commit and is_admin:
+                logger.info("Skipping speculative turn for admin session %s", session_id)
+                return FlowResponse(
+                    result=FlowProcessingResult.ERROR,
+                    message="",
+                    context=None,
+                    metadata={"speculation_skipped": "admin"},
+                )
             
             # Get RAG service from app context if available
             rag_service = app_context.rag_service if app_context and hasattr(app_context, "rag_service") else None
 
+            # Decision edge embeddings are computed once per compiled flow version
+            semantic_router = getattr(app_context, "semantic_router", None) if app_context else None
+            if semantic_router and not is_admin:
+                try:
+                    await cancel_token.run(semantic_router.prepare(compiled_flow), stage="routing")
+                except ProcessingCancelledException:
+                    raise
+                except Exception as e:
+                    logger.warning(f"Semantic routing unavailable for this turn: {e}")
+                    semantic_router = None
+
             # Create runner with shared action registry and RAG service
-            runner = FlowTurnRunner(self._llm, compiled_flow, self._action_registry, rag_service)
+            runner = FlowTurnRunner(
+                self._llm,
+                compiled_flow,
+                self._action_registry,
+                rag_service,
+                semantic_router=semantic_router,
+            )
 
             # Initialize context
             ctx = runner.initialize_context(existing_context)
@@ -163,6 +230,7 @@ class FlowProcessor:
                 user_message=request.user_message,
                 project_context=request.project_context,
                 is_admin=is_admin,
+                cancel_token=cancel_token,
             )
 
             # Add assistant response to conversation history
@@ -183,11 +251,32 @@ class FlowProcessor:
                     )
 
             # Save updated context with conversation history
-            self._session_manager.save_context(session_id, ctx)
+            cancel_token.raise_if_cancelled("saving")
+            if commit:
+                self._session_manager.queue_save_context(
+                    uow, session_id, ctx, tenant_id=str(request.tenant_id)
+                )
+                try:
+                    await uow.execute(transaction=True)
+                except Exception as e:
+                    logger.error("Failed to save flow context: %s", e)
 
             # Build response based on actual results
-            return self._build_response(result, ctx)
-
+            response = self._build_response(result, ctx)
+            if not commit and response.metadata is not None:
+                response.metadata["speculative"] = True
+                response.metadata["speculative_session_id"] = session_id
+                response.metadata["base_context_version"] = base_context_version
+            return response
+
+        except ProcessingCancelledException as e:
+            logger.info(f"Flow processing cancelled for session {session_id}: {e}")
+            return FlowResponse(
+                result=FlowProcessingResult.ERROR,
+                message="",
+                context=existing_context,
+                metadata={"cancelled": True, "session_id": session_id},
+            )
         except Exception as e:
             logger.error("❌ Flow processing failed", exc_info=True)
             return FlowResponse(
@@ -197,6 +286,26 @@ class FlowProcessor:
                 metadata={"error": str(e)},
             )
 
+    async def commit_speculative(self, response: FlowResponse) -> bool:
+        """Persist the context of a speculative turn if its base state is unchanged.
+
+        Returns:
+            True when committed, False when the stored context moved on since the
+            speculative turn loaded it (the caller should process normally).
+        """
+        metadata = response.metadata or {}
+        session_id = metadata.get("speculative_session_id")
+        if not session_id or response.context is None:
+            return False
+
+        # Compare-and-set: a save landing after the check must not be overwritten
+        if not await self._session_manager.save_context_if_unchanged_async(
+            session_id, response.context, metadata.get("base_context_version")
+        ):
+            logger.info("Speculative turn for %s is stale; context changed", session_id)
+            return False
+        return True
+
     def _build_session_id(self, request: FlowRequest) -> str:
         """Build session ID from request."""
         flow_id = request.flow_metadata.get("selected_flow_id", "default")
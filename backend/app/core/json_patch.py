@@ -0,0 +1,186 @@
+"""Minimal RFC 6902 JSON Patch support.
+
+Used to store flow versions as deltas. ``make_patch`` produces ``add``,
+``remove`` and ``replace`` operations (lists are diffed by trimming the common
+prefix and suffix, which keeps single node/edge insertions and deletions to one
+operation). ``apply_patch`` implements every operation of the RFC.
+"""
+
+from __future__ import annotations
+
+import copy
+from typing import Any
+
+JsonPatch = list[dict[str, Any]]
+
+
+class JsonPatchError(ValueError):
+    """Raised when a patch cannot be applied to a document."""
+
+
+def make_patch(source: Any, target: Any) -> JsonPatch:
+    """Return the operations that transform ``source`` into ``target``."""
+    operations: JsonPatch = []
+    _diff(source, target, "", operations)
+    return operations
+
+
+def apply_patch(document: Any, patch: JsonPatch, *, in_place: bool = False) -> Any:
+    """Apply ``patch`` and return the result.
+
+    ``document`` is copied first unless ``in_place`` is set (useful when
+    replaying a chain of patches over a document the caller already owns).
+    """
+    result = document if in_place else copy.deepcopy(document)
+    for operation in patch:
+        result = _apply_operation(result, operation)
+    return result
+
+
+def escape_pointer_token(token: str) -> str:
+    return token.replace("~", "~0").replace("/", "~1")
+
+
+def _same(a: Any, b: Any) -> bool:
+    # Strict JSON equality: True/1 and 1/1.0 are different values
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, dict):
+        return a.keys() == b.keys() and all(_same(value, b[key]) for key, value in a.items())
+    if isinstance(a, list):
+        return len(a) == len(b) and all(map(_same, a, b))
+    return bool(a == b)
+
+
+def _diff(source: Any, target: Any, path: str, operations: JsonPatch) -> None:
+    if _same(source, target):
+        return
+    if isinstance(source, dict) and isinstance(target, dict):
+        for key in source:
+            if key not in target:
+                operations.append({"op": "remove", "path": f"{path}/{escape_pointer_token(key)}"})
+        for key, value in target.items():
+            child = f"{path}/{escape_pointer_token(key)}"
+            if key in source:
+                _diff(source[key], value, child, operations)
+            else:
+                operations.append({"op": "add", "path": child, "value": copy.deepcopy(value)})
+        return
+    if isinstance(source, list) and isinstance(target, list):
+        _diff_list(source, target, path, operations)
+        return
+    operations.append({"op": "replace", "path": path, "value": copy.deepcopy(target)})
+
+
+def _diff_list(source: list[Any], target: list[Any], path: str, operations: JsonPatch) -> None:
+    prefix = 0
+    limit = min(len(source), len(target))
+    while prefix < limit and _same(source[prefix], target[prefix]):
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and _same(
+        source[len(source) - 1 - suffix], target[len(target) - 1 - suffix]
+    ):
+        suffix += 1
+
+    old = source[prefix : len(source) - suffix]
+    new = target[prefix : len(target) - suffix]
+    overlap = min(len(old), len(new))
+    for offset in range(overlap):
+        _diff(old[offset], new[offset], f"{path}/{prefix + offset}", operations)
+    # Remove from the end so earlier indexes stay valid
+    for offset in range(len(old) - 1, overlap - 1, -1):
+        operations.append({"op": "remove", "path": f"{path}/{prefix + offset}"})
+    for offset in range(overlap, len(new)):
+        operations.append(
+            {"op": "add", "path": f"{path}/{prefix + offset}", "value": copy.deepcopy(new[offset])}
+        )
+
+
+def _parse_pointer(pointer: str) -> list[str]:
+    if pointer == "":
+        return []
+    if not pointer.startswith("/"):
+        raise JsonPatchError(f"Invalid JSON pointer: {pointer!r}")
+    return [token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")]
+
+
+def _list_index(container: list[Any], segment: str, *, allow_end: bool) -> int:
+    if allow_end and segment == "-":
+        return len(container)
+    if not segment.isdigit() or (segment != "0" and segment.startswith("0")):
+        raise JsonPatchError(f"Invalid list index: {segment!r}")
+    index = int(segment)
+    if index > len(container) or (index == len(container) and not allow_end):
+        raise JsonPatchError(f"List index out of range: {index}")
+    return index
+
+
+def _resolve(document: Any, tokens: list[str]) -> Any:
+    current = document
+    for token in tokens:
+        if isinstance(current, dict):
+            if token not in current:
+                raise JsonPatchError(f"Path not found: {token!r}")
+            current = current[token]
+        elif isinstance(current, list):
+            current = current[_list_index(current, token, allow_end=False)]
+        else:
+            raise JsonPatchError(f"Cannot traverse into {type(current).__name__}")
+    return current
+
+
+def _add(document: Any, tokens: list[str], value: Any) -> Any:
+    if not tokens:
+        return value
+    parent = _resolve(document, tokens[:-1])
+    if isinstance(parent, dict):
+        parent[tokens[-1]] = value
+    elif isinstance(parent, list):
+        parent.insert(_list_index(parent, tokens[-1], allow_end=True), value)
+    else:
+        raise JsonPatchError(f"Cannot add into {type(parent).__name__}")
+    return document
+
+
+def _remove(document: Any, tokens: list[str]) -> tuple[Any, Any]:
+    if not tokens:
+        raise JsonPatchError("Cannot remove the document root")
+    parent = _resolve(document, tokens[:-1])
+    if isinstance(parent, dict):
+        if tokens[-1] not in parent:
+            raise JsonPatchError(f"Path not found: {tokens[-1]!r}")
+        return document, parent.pop(tokens[-1])
+    if isinstance(parent, list):
+        return document, parent.pop(_list_index(parent, tokens[-1], allow_end=False))
+    raise JsonPatchError(f"Cannot remove from {type(parent).__name__}")
+
+
+def _apply_operation(document: Any, operation: dict[str, Any]) -> Any:
+    op = operation.get("op")
+    tokens = _parse_pointer(operation.get("path", ""))
+
+    if op == "add":
+        return _add(document, tokens, copy.deepcopy(operation["value"]))
+    if op == "remove":
+        return _remove(document, tokens)[0]
+    if op == "replace":
+        _resolve(document, tokens)
+        if not tokens:
+            return copy.deepcopy(operation["value"])
+        document, _ = _remove(document, tokens)
+        return _add(document, tokens, copy.deepcopy(operation["value"]))
+    if op in ("move", "copy"):
+        source = _parse_pointer(operation.get("from", ""))
+        if op == "move":
+            if tokens[: len(source)] == source and tokens != source:
+                raise JsonPatchError("Cannot move a value into one of its children")
+            document, value = _remove(document, source)
+        else:
+            value = copy.deepcopy(_resolve(document, source))
+        return _add(document, tokens, value)
+    if op == "test":
+        if not _same(_resolve(document, tokens), operation.get("value")):
+            raise JsonPatchError(f"Test failed at {operation.get('path')!r}")
+        return document
+    raise JsonPatchError(f"Unknown operation: {op!r}")
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import json
 from typing import TYPE_CHECKING, Any
 
@@ -36,8 +37,37 @@ class LangChainToolsLLM(LLMClient):
         return str(class_name)
 
     def extract(self, prompt: str, tools: list[type[object]]) -> dict[str, Any]:
+        generation = self._start_generation(prompt, tools)
+        try:
+            with_tools = self._chat.bind_tools(tools)
+            result = with_tools.invoke(prompt)
+            return self._build_output(result, generation)
+        except Exception as e:
+            self._fail_generation(generation, e)
+            raise
+
+    async def aextract(self, prompt: str, tools: list[type[object]]) -> dict[str, Any]:
+        """Async variant of ``extract``.
+
+        Cancelling the awaiting task aborts the underlying HTTP request, which
+        lets superseded turns stop paying for in-flight model calls.
+        """
+        generation = self._start_generation(prompt, tools)
+        try:
+            with_tools = self._chat.bind_tools(tools)
+            result = await with_tools.ainvoke(prompt)
+            return self._build_output(result, generation)
+        except asyncio.CancelledError:
+            generation.update(output="CANCELLED", metadata={"cancelled": True})
+            generation.end()
+            raise
+        except Exception as e:
+            self._fail_generation(generation, e)
+            raise
+
+    def _start_generation(self, prompt: str, tools: list[type[object]]) -> Any:
         # Start Langfuse generation with proper cost tracking
-        generation = self._langfuse.start_observation(
+        return self._langfuse.start_observation(
             name="langchain_extract",
             as_type="generation",
             model=self.model_name,
@@ -49,77 +79,73 @@ class LangChainToolsLLM(LLMClient):
             },
         )
 
-        try:
-            with_tools = self._chat.bind_tools(tools)
-            result = with_tools.invoke(prompt)
-
-            content = getattr(result, "content", None)
-            raw_calls: list[dict[str, Any]] = getattr(result, "tool_calls", [])
-
-            # Extract token usage if available
-            usage = getattr(result, "usage_metadata", None) or getattr(
-                result, "response_metadata", {}
-            ).get("usage", {})
-
-            calls: list[dict[str, Any]] = []
-            for tc in raw_calls:
-                name = tc.get("name")
-                args_raw = tc.get("args", {}) or {}
-                args: dict[str, Any] | None
-                if isinstance(args_raw, str):
-                    try:
-                        parsed = json.loads(args_raw)
-                        args = parsed if isinstance(parsed, dict) else {}
-                    except Exception:
-                        args = {}
-                elif isinstance(args_raw, dict):
-                    args = args_raw
-                else:
+    def _fail_generation(self, generation: Any, error: Exception) -> None:
+        generation.update(
+            output=f"ERROR: {error}",
+            metadata={"error": str(error), "error_type": type(error).__name__},
+        )
+        generation.end()
+
+    def _build_output(self, result: Any, generation: Any) -> dict[str, Any]:
+        content = getattr(result, "content", None)
+        raw_calls: list[dict[str, Any]] = getattr(result, "tool_calls", [])
+
+        # Extract token usage if available
+        usage = getattr(result, "usage_metadata", None) or getattr(
+            result, "response_metadata", {}
+        ).get("usage", {})
+
+        calls: list[dict[str, Any]] = []
+        for tc in raw_calls:
+            name = tc.get("name")
+            args_raw = tc.get("args", {}) or {}
+            args: dict[str, Any] | None
+            if isinstance(args_raw, str):
+                try:
+                    parsed = json.loads(args_raw)
+                    args = parsed if isinstance(parsed, dict) else {}
+                except Exception:
                     args = {}
-                calls.append({"name": name, "arguments": args})
-
-            out: dict[str, Any] = {"content": content, "tool_calls": calls}
-
-            # Expose a preferred tool call's args at top level for convenience
-            if calls:
-                chosen = None
-                # Prefer our simplified essential tools in this order
-                preferred = ("PerformAction",)
-                for name in preferred:
-                    chosen = next((c for c in calls if c.get("name") == name), None)
-                    if chosen:
-                        break
-                if chosen is None:
-                    chosen = calls[0]
-                flat_args = dict(chosen.get("arguments") or {})
-                if "__tool_name__" not in flat_args:
-                    flat_args["__tool_name__"] = str(chosen.get("name", ""))
-                out.update(flat_args)
-
-            # Update generation with output and usage data
-            generation.update(
-                output=content or json.dumps(out),
-                usage={
-                    "input_tokens": usage.get("input_tokens") or usage.get("prompt_tokens", 0),
-                    "output_tokens": usage.get("output_tokens")
-                    or usage.get("completion_tokens", 0),
-                    "total_tokens": usage.get("total_tokens", 0),
-                }
-                if usage
-                else None,
-                metadata={
-                    "selected_tool": flat_args.get("__tool_name__") if calls else None,
-                    "tools_called": len(calls),
-                    "has_content": bool(content),
-                },
-            )
-            generation.end()
-
-            return out
+            elif isinstance(args_raw, dict):
+                args = args_raw
+            else:
+                args = {}
+            calls.append({"name": name, "arguments": args})
+
+        out: dict[str, Any] = {"content": content, "tool_calls": calls}
+
+        # Expose a preferred tool call's args at top level for convenience
+        if calls:
+            chosen = None
+            # Prefer our simplified essential tools in this order
+            preferred = ("PerformAction",)
+            for name in preferred:
+                chosen = next((c for c in calls if c.get("name") == name), None)
+                if chosen:
+                    break
+            if chosen is None:
+                chosen = calls[0]
+            flat_args = dict(chosen.get("arguments") or {})
+            if "__tool_name__" not in flat_args:
+                flat_args["__tool_name__"] = str(chosen.get("name", ""))
+            out.update(flat_args)
+
+        # Update generation with output and usage data
+        generation.update(
+            output=content or json.dumps(out),
+            usage={
+                "input_tokens": usage.get("input_tokens") or usage.get("prompt_tokens", 0),
+                "output_tokens": usage.get("output_tokens") or usage.get("completion_tokens", 0),
+                "total_tokens": usage.get("total_tokens", 0),
+            }
+            if usage
+            else None,
+            metadata={
+                "selected_tool": flat_args.get("__tool_name__") if calls else None,
+                "tools_called": len(calls),
+                "has_content": bool(content),
+            },
+        )
+        generation.end()
 
-        except Exception as e:
-            generation.update(
-                output=f"ERROR: {e}", metadata={"error": str(e), "error_type": type(e).__name__}
-            )
-            generation.end()
-            raise
+        return out
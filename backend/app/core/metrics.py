@@ -0,0 +1,115 @@
+"""Lightweight in-process metrics registry.
+
+Counters, gauges and timing summaries keyed by metric name plus a set of string labels
+(e.g. ``flow_id``). Values live in process memory and are exposed through the
+admin API as a JSON snapshot; there is no external metrics backend dependency.
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Any
+
+LabelKey = tuple[tuple[str, str], ...]
+
+
+@dataclass(slots=True)
+class TimingSummary:
+    """Running summary for a timing/size observation."""
+
+    count: int = 0
+    total: float = 0.0
+    min: float = 0.0
+    max: float = 0.0
+
+    def observe(self, value: float) -> None:
+        if self.count == 0:
+            self.min = value
+            self.max = value
+        else:
+            self.min = min(self.min, value)
+            self.max = max(self.max, value)
+        self.count += 1
+        self.total += value
+
+    def as_dict(self) -> dict[str, float]:
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "avg": self.total / self.count if self.count else 0.0,
+            "min": self.min,
+            "max": self.max,
+        }
+
+
+def _label_key(labels: dict[str, Any]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items() if v is not None))
+
+
+class MetricsRegistry:
+    """Thread-safe registry of labelled counters, gauges and timing summaries."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: dict[str, dict[LabelKey, float]] = {}
+        self._gauges: dict[str, dict[LabelKey, float]] = {}
+        self._summaries: dict[str, dict[LabelKey, TimingSummary]] = {}
+
+    def inc(self, name: str, amount: float = 1, **labels: Any) -> None:
+        """Increment a counter."""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    def set_gauge(self, name: str, value: float, **labels: Any) -> None:
+        """Set a gauge to its latest sampled value."""
+        key = _label_key(labels)
+        with self._lock:
+            self._gauges.setdefault(name, {})[key] = value
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        """Record an observation (typically a duration in milliseconds)."""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._summaries.setdefault(name, {})
+            summary = series.get(key)
+            if summary is None:
+                summary = series[key] = TimingSummary()
+            summary.observe(value)
+
+    def get(self, name: str, **labels: Any) -> float:
+        """Return the current value of a counter (0 when never incremented)."""
+        with self._lock:
+            return self._counters.get(name, {}).get(_label_key(labels), 0)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return all metrics as plain JSON-serializable data."""
+        with self._lock:
+            counters = {
+                name: [{"labels": dict(key), "value": value} for key, value in series.items()]
+                for name, series in self._counters.items()
+            }
+            gauges = {
+                name: [{"labels": dict(key), "value": value} for key, value in series.items()]
+                for name, series in self._gauges.items()
+            }
+            summaries = {
+                name: [
+                    {"labels": dict(key), **summary.as_dict()} for key, summary in series.items()
+                ]
+                for name, series in self._summaries.items()
+            }
+        return {"counters": counters, "gauges": gauges, "summaries": summaries}
+
+    def reset(self) -> None:
+        """Drop all recorded values (used by tests)."""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._summaries.clear()
+
+
+# Process-wide registry
+metrics = MetricsRegistry()
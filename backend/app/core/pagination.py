@@ -0,0 +1,61 @@
+"""Opaque cursors for keyset pagination.
+
+OFFSET pagination makes Postgres read and discard every skipped row, so
+page N of a busy tenant costs N times page 1. List endpoints instead hand
+out a cursor holding the sort key of the last row returned and the next
+page starts strictly after it, walking the composite index from there.
+
+A cursor is the URL-safe base64 of ``[sort_value, id]``; clients must treat
+it as opaque.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from collections.abc import Callable, Sequence
+from datetime import datetime
+from typing import NamedTuple
+from uuid import UUID
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a client sends a cursor this server did not issue."""
+
+
+class PageKey(NamedTuple):
+    """Sort key of a row: the ordering column (may be NULL) and the row id."""
+
+    sort_value: datetime | None
+    id: UUID
+
+
+def encode_cursor(key: PageKey) -> str:
+    payload = [key.sort_value.isoformat() if key.sort_value else None, str(key.id)]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> PageKey:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_value, row_id = json.loads(raw)
+        return PageKey(
+            datetime.fromisoformat(sort_value) if sort_value is not None else None,
+            UUID(row_id),
+        )
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as e:
+        raise InvalidCursorError(f"Invalid pagination cursor: {cursor!r}") from e
+
+
+def split_page[T](
+    rows: Sequence[T], limit: int, key_of: Callable[[T], PageKey]
+) -> tuple[list[T], str | None]:
+    """Trim a ``limit + 1`` fetch to one page; returns the page and the next cursor."""
+    page = list(rows[:limit])
+    if len(rows) <= limit or not page:
+        return page, None
+    return page, encode_cursor(key_of(page[-1]))
@@ -0,0 +1,101 @@
+"""Redis Cluster support.
+
+Set ``REDIS_CLUSTER=true`` to connect with cluster clients. Keys of one contact
+share a hash tag (see ``RedisKeyBuilder.hash_tag``), so the MULTI/EXEC blocks
+the application sends touch a single slot; commands that can't (tenant
+indexes, PUBLISH) are split off by ``split_by_slot``.
+"""
+
+from __future__ import annotations
+
+import functools
+import logging
+from typing import Any
+
+try:
+    import redis
+    import redis.asyncio as aioredis
+except Exception:  # pragma: no cover - optional import
+    redis = None  # type: ignore[assignment]
+    aioredis = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+# Commands whose first argument is not a key
+KEYLESS_COMMANDS = frozenset({"publish"})
+
+
+def create_sync_client(redis_url: str, *, cluster: bool = False) -> Any:
+    """Create a synchronous Redis (or Redis Cluster) client."""
+    if redis is None:  # pragma: no cover - import guard
+        msg = "redis-py is not installed. Please add 'redis' to dependencies."
+        raise RuntimeError(msg)
+    if cluster:
+        return redis.RedisCluster.from_url(redis_url)
+    return redis.from_url(redis_url)
+
+
+def is_cluster_client(client: Any) -> bool:
+    if redis is None:  # pragma: no cover - import guard
+        return False
+    return isinstance(client, redis.RedisCluster | aioredis.RedisCluster)
+
+
+def open_pubsub(client: Any, **kwargs: Any) -> Any | None:
+    """Pub/sub connection of ``client``, or None if the client has no pub/sub.
+
+    Older redis-py releases have no ``pubsub`` on ``redis.asyncio.RedisCluster``;
+    features fed by pub/sub (session cache invalidation, cross-worker turn
+    cancellation) are then disabled, with one warning per client type.
+    """
+    pubsub = getattr(client, "pubsub", None)
+    if pubsub is None:
+        _warn_pubsub_unavailable(type(client).__name__)
+        return None
+    return pubsub(**kwargs)
+
+
+@functools.cache
+def _warn_pubsub_unavailable(client_type: str) -> None:
+    logger.warning(
+        "%s has no pub/sub support in this redis-py version: the session context "
+        "cache and cross-worker turn cancellation are disabled",
+        client_type,
+    )
+
+
+def hash_slot_key(key: Any) -> str:
+    """The part of ``key`` Redis Cluster hashes: its ``{tag}`` if present, else all of it."""
+    text = key.decode() if isinstance(key, bytes) else str(key)
+    start = text.find("{")
+    if start != -1:
+        end = text.find("}", start + 1)
+        if end > start + 1:
+            return text[start + 1 : end]
+    return text
+
+
+def split_by_slot(
+    commands: list[tuple[str, tuple[Any, ...]]],
+) -> tuple[list[int], list[int]]:
+    """Split command indexes into those sharing the first command's slot and the rest.
+
+    The first group can run in one MULTI/EXEC on a cluster; keyless commands
+    and commands on other slots go to a separate, non-transactional pipeline.
+    """
+    slot: str | None = None
+    same: list[int] = []
+    other: list[int] = []
+    for index, (command, args) in enumerate(commands):
+        if command in KEYLESS_COMMANDS or not args:
+            other.append(index)
+            continue
+        keys = args if command in ("delete", "unlink", "exists") else args[:1]
+        slots = {hash_slot_key(key) for key in keys}
+        if slot is None and len(slots) == 1:
+            slot = next(iter(slots))
+        if slots == {slot}:
+            same.append(index)
+        else:
+            other.append(index)
+    return same, other
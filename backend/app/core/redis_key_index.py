@@ -0,0 +1,161 @@
+"""Targeted Redis key deletion without ``KEYS``.
+
+Stores record every key they write for a user in a per-user index set, and
+the users seen for a tenant in a per-tenant set, so resets delete exactly
+those keys with batched UNLINKs. Keys written before the indexes existed, and
+keys owned by other libraries (LangChain chat history), are found with a
+cursor-based SCAN that never blocks the server for a full keyspace walk.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import AsyncIterator, Iterable, Iterator
+from typing import TYPE_CHECKING, Any
+
+from app.core.redis_cluster import is_cluster_client
+
+if TYPE_CHECKING:
+    from app.core.redis_keys import RedisKeyBuilder
+
+logger = logging.getLogger(__name__)
+
+# Keys examined per SCAN call; bounds the work Redis does per command
+SCAN_COUNT = 500
+# Keys per UNLINK call
+UNLINK_BATCH_SIZE = 500
+# Pseudo users whose keys (dedup markers, reply ids) are not indexed
+UNINDEXED_USERS = frozenset({"system"})
+
+
+def is_indexed_user(user_id: str) -> bool:
+    return user_id not in UNINDEXED_USERS
+
+
+def decode_key(key: Any) -> str:
+    return key.decode() if isinstance(key, bytes) else str(key)
+
+
+def index_commands(
+    key_builder: RedisKeyBuilder,
+    user_id: str,
+    key: str,
+    ttl_seconds: int | None,
+    *,
+    tenant_id: str | None = None,
+) -> list[tuple[str, tuple[Any, ...]]]:
+    """Commands that record ``key`` in the user's index (and the user in the tenant's).
+
+    Sent in the same pipeline as the write itself. Index sets expire with the
+    keys they track and are refreshed on every write, so they never outlive
+    the newest key; stale members are harmless because UNLINK ignores them.
+    """
+    if not is_indexed_user(user_id):
+        return []
+    index_key = key_builder.user_key_index(user_id)
+    commands: list[tuple[str, tuple[Any, ...]]] = [("sadd", (index_key, key))]
+    if ttl_seconds:
+        commands.append(("expire", (index_key, ttl_seconds)))
+    if tenant_id:
+        tenant_key = key_builder.tenant_user_index(tenant_id)
+        commands.append(("sadd", (tenant_key, user_id)))
+        if ttl_seconds:
+            commands.append(("expire", (tenant_key, ttl_seconds)))
+    return commands
+
+
+def _scan_done(cursor: Any) -> bool:
+    return int(cursor) == 0
+
+
+def scan_keys(client: Any, pattern: str, *, count: int = SCAN_COUNT) -> Iterator[Any]:
+    """Yield keys matching ``pattern`` using SCAN with a bounded COUNT."""
+    if is_cluster_client(client):
+        # Cluster clients walk every primary node
+        yield from client.scan_iter(match=pattern, count=count)
+        return
+    cursor: Any = 0
+    while True:
+        cursor, keys = client.scan(cursor=cursor, match=pattern, count=count)
+        yield from keys
+        if _scan_done(cursor):
+            return
+
+
+async def scan_keys_async(
+    client: Any, pattern: str, *, count: int = SCAN_COUNT
+) -> AsyncIterator[Any]:
+    if is_cluster_client(client):
+        async for key in client.scan_iter(match=pattern, count=count):
+            yield key
+        return
+    cursor: Any = 0
+    while True:
+        cursor, keys = await client.scan(cursor=cursor, match=pattern, count=count)
+        for key in keys:
+            yield key
+        if _scan_done(cursor):
+            return
+
+
+def _batches(keys: Iterable[Any], size: int) -> Iterator[list[Any]]:
+    batch: list[Any] = []
+    for key in keys:
+        batch.append(key)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def unlink_keys(client: Any, keys: Iterable[Any], *, batch_size: int = UNLINK_BATCH_SIZE) -> int:
+    """UNLINK ``keys`` in batches; returns the number of keys that existed."""
+    return sum(int(client.unlink(*batch)) for batch in _batches(keys, batch_size))
+
+
+async def unlink_keys_async(
+    client: Any, keys: Iterable[Any], *, batch_size: int = UNLINK_BATCH_SIZE
+) -> int:
+    deleted = 0
+    for batch in _batches(keys, batch_size):
+        deleted += int(await client.unlink(*batch))
+    return deleted
+
+
+async def clear_user_keys_async(
+    client: Any,
+    key_builder: RedisKeyBuilder,
+    user_id: str,
+    *,
+    flow_id: str | None = None,
+    scan_legacy: bool = True,
+) -> int:
+    """Delete a user's conversation keys (optionally only those of ``flow_id``).
+
+    Indexed keys are deleted directly; ``scan_legacy`` additionally SCANs for
+    keys matching ``RedisKeyBuilder.get_conversation_patterns``.
+
+    Returns:
+        Number of keys deleted
+    """
+    index_key = key_builder.user_key_index(user_id)
+    indexed = {decode_key(member) for member in await client.smembers(index_key)}
+    if flow_id:
+        indexed = {key for key in indexed if flow_id in key}
+
+    targets = set(indexed)
+    for pattern in key_builder.get_conversation_patterns(user_id=user_id, flow_id=flow_id):
+        if "*" not in pattern:
+            targets.add(pattern)
+        elif scan_legacy:
+            async for key in scan_keys_async(client, pattern):
+                targets.add(decode_key(key))
+
+    deleted = await unlink_keys_async(client, sorted(targets))
+    if flow_id is None:
+        await client.unlink(index_key)
+    elif indexed:
+        await client.srem(index_key, *indexed)
+    logger.info("Deleted %d Redis keys for user %s", deleted, user_id)
+    return deleted
@@ -0,0 +1,133 @@
+"""Move conversation keys to the hash-tagged layout.
+
+Keys written before Redis Cluster support used the bare user id
+(``chatai:state:whatsapp:+55...:flow:...``); they now carry it as a hash tag
+(``chatai:state:{whatsapp:+55...}:flow:...``). Older flow state was also filed
+under the channel name instead of the contact, which this corrects by deriving
+the user from the session id.
+
+Keys are copied with DUMP/RESTORE (keeping their TTL) rather than RENAME, which
+a cluster rejects across slots, so the migration can run before or after the
+switch. Keys that are rebuilt on the next write (version tokens, untagged key
+index sets) are deleted; ephemeral keys (debounce buffers, dedup and retry
+markers) expire within minutes and are left alone.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Any
+
+from app.core.redis_key_index import decode_key, index_commands, scan_keys
+from app.core.redis_keys import SYSTEM_USER, RedisKeyBuilder
+
+logger = logging.getLogger(__name__)
+
+# TTL given to the rebuilt key index sets (the store's default state TTL)
+DEFAULT_INDEX_TTL_SECONDS = 30 * 24 * 3600
+
+
+@dataclass(slots=True)
+class MigrationReport:
+    scanned: int = 0
+    migrated: int = 0
+    deleted: int = 0
+    # Old keys dropped because the tagged key was already written
+    superseded: int = 0
+
+
+def migration_target(
+    key_builder: RedisKeyBuilder, key: str
+) -> tuple[str | None, str | None] | None:
+    """Where ``key`` moves to.
+
+    Returns:
+        ``(user_id, new_key)``; ``new_key`` is None when the key is only
+        deleted. None when the key is already in the new layout (or unrelated).
+    """
+    namespace = key_builder.namespace
+    head, _, rest = key.partition(":")
+    if head != namespace or not rest:
+        return None
+    family, _, rest = rest.partition(":")
+    if not rest or rest.startswith("{"):
+        return None
+
+    if family == "keys":
+        return (None, None) if rest.startswith("user:") and not rest.startswith("user:{") else None
+    if family == "events":
+        return rest, key_builder.events_key(rest)
+    if family == "escalation":
+        user_id, _, agent_type = rest.rpartition(":")
+        return (user_id, key_builder.escalation_key(user_id, agent_type)) if user_id else None
+    if family != "state" or rest.startswith(f"{SYSTEM_USER}:"):
+        return None
+
+    if ":meta:" in rest:
+        user_id, _, agent_type = rest.partition(":meta:")
+        return user_id, key_builder.conversation_meta_key(user_id, agent_type)
+    if rest.endswith(":v"):
+        return None, None
+    parsed = key_builder.parse_conversation_key(key)
+    if parsed is None:
+        return None
+    session_id = parsed["session_id"]
+    user_id = parsed["user_id"]
+    if session_id.startswith("flow:"):
+        user_id = RedisKeyBuilder.session_user_id(session_id) or user_id
+    return user_id, key_builder.conversation_state_key(user_id, session_id)
+
+
+def migrate_keys(
+    client: Any,
+    key_builder: RedisKeyBuilder,
+    *,
+    dry_run: bool = False,
+    index_ttl: int | None = DEFAULT_INDEX_TTL_SECONDS,
+) -> MigrationReport:
+    """Scan the namespace and move every old-layout key (``client`` is a sync client)."""
+    report = MigrationReport()
+    for raw_key in scan_keys(client, f"{key_builder.namespace}:*"):
+        key = decode_key(raw_key)
+        report.scanned += 1
+        target = migration_target(key_builder, key)
+        if target is None:
+            continue
+        user_id, new_key = target
+
+        if new_key is None:
+            report.deleted += 1
+            if not dry_run:
+                client.unlink(key)
+            continue
+        if dry_run:
+            report.migrated += 1
+            continue
+        if client.exists(new_key):
+            report.superseded += 1
+            client.unlink(key)
+            continue
+
+        ttl_ms = client.pttl(key)
+        dumped = client.dump(key)
+        if dumped is None:
+            continue  # expired while scanning
+        pipeline = client.pipeline(transaction=False)
+        pipeline.restore(new_key, max(int(ttl_ms), 0), dumped)
+        pipeline.unlink(key)
+        if user_id:
+            for command, args in index_commands(key_builder, user_id, new_key, index_ttl):
+                getattr(pipeline, command)(*args)
+        pipeline.execute()
+        report.migrated += 1
+
+    logger.info(
+        "Redis key migration%s: %d scanned, %d migrated, %d deleted, %d superseded",
+        " (dry run)" if dry_run else "",
+        report.scanned,
+        report.migrated,
+        report.deleted,
+        report.superseded,
+    )
+    return report
@@ -9,6 +9,10 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
+# Pseudo user owning non-conversation state (reply ids); its keys stay
+# untagged so they spread over all cluster slots
+SYSTEM_USER = "system"
+
 
 @dataclass(frozen=True)
 class RedisKeyBuilder:
@@ -17,10 +21,49 @@ class RedisKeyBuilder:
 
     This ensures all parts of the application use the same key patterns
     for the same purposes, eliminating the chaos of inconsistent keys.
+
+    Keys belonging to one contact carry the contact's user id as a Redis
+    Cluster hash tag (``{whatsapp:+55...}``), so its state, debounce buffers,
+    key index and dedup markers share a slot and can be updated together in
+    MULTI/EXEC or Lua on a sharded cluster.
     """
 
     namespace: str = "chatai"
 
+    @staticmethod
+    def hash_tag(user_id: str) -> str:
+        """
+        Build the Redis Cluster hash tag for a contact.
+
+        Args:
+            user_id: User identifier (e.g., "whatsapp:5522988544370")
+
+        Returns:
+            The user id in braces; only this part of a key is hashed
+        """
+        return f"{{{user_id}}}"
+
+    @staticmethod
+    def session_user_id(session_id: str) -> str | None:
+        """
+        Extract the user id from a flow session id.
+
+        Args:
+            session_id: Session identifier ("flow:{user_id}:{flow_id}"); user ids
+                contain ":" themselves, flow ids do not
+
+        Returns:
+            The user id, or None if the session id has no user part
+        """
+        _, _, rest = session_id.partition(":")
+        user_id, _, _ = rest.rpartition(":")
+        return user_id or None
+
+    @classmethod
+    def session_hash_tag(cls, session_id: str) -> str:
+        """Hash tag for keys scoped to a session (tagged with the session's contact)."""
+        return cls.hash_tag(cls.session_user_id(session_id) or session_id)
+
     def conversation_state_key(self, user_id: str, session_id: str) -> str:
         """
         Build conversation state key.
@@ -32,7 +75,9 @@ class RedisKeyBuilder:
         Returns:
             Redis key for conversation state
         """
-        return f"{self.namespace}:state:{user_id}:{session_id}"
+        if user_id == SYSTEM_USER:
+            return f"{self.namespace}:state:{user_id}:{session_id}"
+        return f"{self.namespace}:state:{self.hash_tag(user_id)}:{session_id}"
 
     def conversation_meta_key(self, user_id: str, agent_type: str) -> str:
         """
@@ -45,7 +90,7 @@ class RedisKeyBuilder:
         Returns:
             Redis key for conversation metadata
         """
-        return f"{self.namespace}:state:{user_id}:meta:{agent_type}"
+        return f"{self.namespace}:state:{self.hash_tag(user_id)}:meta:{agent_type}"
 
     def conversation_history_key(self, session_id: str) -> str:
         """
@@ -71,6 +116,69 @@ class RedisKeyBuilder:
         """
         return f"{self.namespace}:state:system:current_reply:{user_id}"
 
+    def user_key_index(self, user_id: str) -> str:
+        """
+        Build the key of the set indexing every key written for a user.
+
+        Args:
+            user_id: User identifier
+
+        Returns:
+            Redis key of the user's key index set
+        """
+        return f"{self.namespace}:keys:user:{self.hash_tag(user_id)}"
+
+    def events_key(self, user_id: str) -> str:
+        """Redis list of a user's conversation events."""
+        return f"{self.namespace}:events:{self.hash_tag(user_id)}"
+
+    def escalation_key(self, user_id: str, agent_type: str) -> str:
+        """Redis key holding when a user's conversation escalated."""
+        return f"{self.namespace}:escalation:{self.hash_tag(user_id)}:{agent_type}"
+
+    def retry_marker_key(self, user_id: str, message_hash: str) -> str:
+        """Redis key marking a recently processed message body (webhook retries)."""
+        return f"webhook_processed:{self.hash_tag(user_id)}:{message_hash}"
+
+    def tenant_user_index(self, tenant_id: str) -> str:
+        """
+        Build the key of the set of user ids with conversation state for a tenant.
+
+        Args:
+            tenant_id: Tenant identifier
+
+        Returns:
+            Redis key of the tenant's user index set
+        """
+        return f"{self.namespace}:keys:tenant:{tenant_id}"
+
+    def admission_bucket_key(self, tenant_id: str, scope: str, subject: str) -> str:
+        """
+        Build the key of a webhook admission token bucket.
+
+        Args:
+            tenant_id: Tenant identifier; the hash tag, so one Lua call can
+                charge the contact, channel and tenant buckets on a cluster
+            scope: Bucket scope ("contact", "channel" or "tenant")
+            subject: Contact id, channel instance id or tenant id
+
+        Returns:
+            Redis key of the token bucket hash
+        """
+        return f"{self.namespace}:admission:{self.hash_tag(tenant_id)}:{scope}:{subject}"
+
+    def session_tiering_lock_key(self) -> str:
+        """Redis lock electing the worker that sweeps idle sessions to cold storage."""
+        return f"{self.namespace}:locks:session_tiering"
+
+    def tenant_reset_job_key(self, job_id: str) -> str:
+        """Redis hash holding the progress of a tenant-wide reset job."""
+        return f"{self.namespace}:jobs:tenant_reset:{job_id}"
+
+    def etag_key(self, resource: str) -> str:
+        """Cached ETag/Last-Modified of an API resource (e.g. "flow:{id}")."""
+        return f"{self.namespace}:etag:{resource}"
+
     def get_conversation_patterns(self, user_id: str, flow_id: str | None = None) -> list[str]:
         """
         Get all Redis key patterns for a conversation to enable proper cleanup.
@@ -96,8 +204,8 @@ class RedisKeyBuilder:
                     # Match full user_id patterns
                     f"{self.namespace}:state:*{user_id}*{flow_id}*",
                     # Meta keys for flow
-                    f"{self.namespace}:state:{user_id}:meta:flow",
-                    f"{self.namespace}:state:{user_id}:meta:*",
+                    self.conversation_meta_key(user_id, "flow"),
+                    self.conversation_meta_key(user_id, "*"),
                     # History patterns
                     f"{self.namespace}:history:*{phone_number}*{flow_id}*",
                     f"{self.namespace}:history:*{user_id}*{flow_id}*",
@@ -118,7 +226,7 @@ class RedisKeyBuilder:
         patterns.append(self.current_reply_key(user_id))
 
         # Events (if any)
-        patterns.append(f"{self.namespace}:events:{user_id}")
+        patterns.append(self.events_key(user_id))
 
         return patterns
 
@@ -146,6 +254,23 @@ class RedisKeyBuilder:
         if ":meta:" in remainder:
             return None
 
+        # Hash-tagged layout: "{user_id}:session_id"
+        if remainder.startswith("{"):
+            tag_end = remainder.find("}:")
+            if tag_end == -1:
+                return None
+            user_id = remainder[1:tag_end]
+            session_id = remainder[tag_end + 2 :]
+            return {
+                "user_id": user_id,
+                "session_id": session_id,
+                "agent_type": "flow" if session_id.startswith("flow:") else session_id,
+                "flow_id": session_id.rsplit(":", 1)[-1]
+                if session_id.startswith("flow:")
+                else "unknown",
+                "redis_key": redis_key,
+            }
+
         # Look for flow pattern
         flow_match = remainder.find(":flow:")
         if flow_match != -1:
@@ -0,0 +1,148 @@
+"""Turn-scoped batching of Redis commands.
+
+Components queue the commands a turn needs (``queue``) and receive a
+``Deferred`` for each result; the owner of the turn then sends everything in a
+single pipeline with ``execute`` - reads once at the start of the turn, writes
+once at the end (as MULTI/EXEC when they must apply together).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from app.core.metrics import metrics
+from app.core.redis_cluster import is_cluster_client, split_by_slot
+
+logger = logging.getLogger(__name__)
+
+_PENDING = object()
+
+
+class Deferred[T]:
+    """Result of a queued command, available once the unit of work executed."""
+
+    __slots__ = ("_fn", "_source", "_value")
+
+    def __init__(self) -> None:
+        self._value: Any = _PENDING
+        self._source: Deferred[Any] | None = None
+        self._fn: Callable[[Any], T] | None = None
+
+    @classmethod
+    def resolved(cls, value: T) -> Deferred[T]:
+        deferred: Deferred[T] = cls()
+        deferred._value = value
+        return deferred
+
+    def map[U](self, fn: Callable[[T], U]) -> Deferred[U]:
+        """Derive a deferred value without waiting for execution."""
+        mapped: Deferred[U] = Deferred()
+        mapped._source = self
+        mapped._fn = fn
+        return mapped
+
+    def set(self, value: T) -> None:
+        self._value = value
+
+    def result(self) -> T:
+        if self._value is _PENDING and self._source is not None and self._fn is not None:
+            self._value = self._fn(self._source.result())
+        if self._value is _PENDING:
+            raise RuntimeError("Unit of work has not been executed yet")
+        return self._value  # type: ignore[no-any-return]
+
+
+class RedisUnitOfWork:
+    """Collects Redis commands and sends them in one round trip.
+
+    ``client`` is an async Redis client (or ``AsyncRedisFacade``); it may be
+    None when every participant is backed by something other than Redis, in
+    which case only ``defer``-ed awaitables run.
+    """
+
+    def __init__(self, client: Any, *, name: str = "turn") -> None:
+        self._client = client
+        self._name = name
+        self._commands: list[tuple[str, tuple[Any, ...], dict[str, Any], Deferred[Any]]] = []
+        self._awaitables: list[tuple[Awaitable[Any], Deferred[Any]]] = []
+        self._callbacks: list[Callable[[], None]] = []
+        self.round_trips = 0
+
+    def queue(
+        self,
+        command: str,
+        *args: Any,
+        parse: Callable[[Any], Any] | None = None,
+        **kwargs: Any,
+    ) -> Deferred[Any]:
+        """Queue ``command`` for the next ``execute`` and return its deferred result."""
+        deferred: Deferred[Any] = Deferred()
+        self._commands.append((command, args, kwargs, deferred))
+        return deferred.map(parse) if parse else deferred
+
+    def defer[T](self, awaitable: Awaitable[T]) -> Deferred[T]:
+        """Run ``awaitable`` during ``execute`` (participants without Redis access).
+
+        Awaitables run after the queued commands resolved, so they may read
+        those results (e.g. to fall back to another source on a miss).
+        """
+        deferred: Deferred[T] = Deferred()
+        self._awaitables.append((awaitable, deferred))
+        return deferred
+
+    def after(self, callback: Callable[[], None]) -> None:
+        """Run ``callback`` once the next ``execute`` succeeded (e.g. to update caches)."""
+        self._callbacks.append(callback)
+
+    async def execute(self, *, transaction: bool = False) -> None:
+        """Send all queued commands in one pipeline and resolve their results.
+
+        Args:
+            transaction: Wrap the batch in MULTI/EXEC so it applies atomically
+        """
+        commands, self._commands = self._commands, []
+        awaitables, self._awaitables = self._awaitables, []
+        callbacks, self._callbacks = self._callbacks, []
+
+        if commands:
+            if self._client is None:
+                raise RuntimeError("Redis commands queued on a unit of work without a client")
+            if transaction and is_cluster_client(self._client):
+                # MULTI/EXEC must stay within one slot; the rest (tenant
+                # indexes, PUBLISH) is sent alongside without a transaction
+                atomic, rest = split_by_slot([(c[0], c[1]) for c in commands])
+                batches = [(atomic, True), (rest, False)]
+            else:
+                batches = [(list(range(len(commands))), transaction)]
+            batch_results = await asyncio.gather(
+                *(
+                    self._send([commands[i] for i in indexes], tx)
+                    for indexes, tx in batches
+                    if indexes
+                )
+            )
+            sent = [indexes for indexes, _ in batches if indexes]
+            for indexes, results in zip(sent, batch_results, strict=True):
+                for index, value in zip(indexes, results, strict=True):
+                    commands[index][3].set(value)
+            self.round_trips += 1
+            metrics.inc("redis_pipeline_round_trips_total", unit=self._name)
+            metrics.observe("redis_pipeline_commands", len(commands), unit=self._name)
+
+        for awaitable, deferred in awaitables:
+            deferred.set(await awaitable)
+        for callback in callbacks:
+            callback()
+
+    async def _send(
+        self,
+        commands: list[tuple[str, tuple[Any, ...], dict[str, Any], Deferred[Any]]],
+        transaction: bool,
+    ) -> list[Any]:
+        pipeline = self._client.pipeline(transaction=transaction)
+        for command, args, kwargs, _ in commands:
+            getattr(pipeline, command)(*args, **kwargs)
+        return list(await pipeline.execute())
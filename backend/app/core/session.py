@@ -10,6 +10,7 @@ if TYPE_CHECKING:
     from app.core.agent_base import Agent
     from app.core.app_context import AppContext
     from app.core.inbound_message import InboundMessage  # type: ignore[import-untyped]
+    from app.core.redis_unit_of_work import Deferred, RedisUnitOfWork
     from app.flow_core.state import FlowContext
 
 
@@ -96,3 +97,58 @@ class SessionManager(ABC):
     @abstractmethod
     def clear_context(self, session_id: str) -> None:
         """Clear flow context for a session."""
+
+    # Async variants used by request handlers. The defaults delegate to the
+    # synchronous methods; Redis-backed managers override them.
+
+    async def get_context_async(self, session_id: str) -> FlowContext | None:
+        """Get flow context for a session without blocking the event loop."""
+        return self.get_context(session_id)
+
+    async def save_context_async(self, session_id: str, context: FlowContext) -> None:
+        """Save flow context for a session without blocking the event loop."""
+        self.save_context(session_id, context)
+
+    async def clear_context_async(self, session_id: str) -> None:
+        """Clear flow context for a session without blocking the event loop."""
+        self.clear_context(session_id)
+
+    async def save_context_if_unchanged_async(
+        self, session_id: str, context: FlowContext, base_version: str | None
+    ) -> bool:
+        """Save ``context`` only if the stored context's ``updated_at`` is ``base_version``.
+
+        ``base_version`` is the ISO ``updated_at`` of the context the caller
+        started from (None: no context). Returns False when it moved on. This
+        default compares and writes in two steps; Redis-backed managers do both
+        atomically.
+        """
+        current = await self.get_context_async(session_id)
+        current_version = current.updated_at.isoformat() if current else None
+        if current_version != base_version:
+            return False
+        await self.save_context_async(session_id, context)
+        return True
+
+    # Turn-scoped batching: queue the reads/writes of a turn on a unit of work
+    # so they share one Redis round trip with the other participants.
+
+    def queue_load_context(
+        self, uow: RedisUnitOfWork, session_id: str
+    ) -> Deferred[FlowContext | None]:
+        """Queue loading the flow context; resolved by ``uow.execute()``."""
+        return uow.defer(self.get_context_async(session_id))
+
+    def queue_save_context(
+        self,
+        uow: RedisUnitOfWork,
+        session_id: str,
+        context: FlowContext,
+        *,
+        tenant_id: str | None = None,
+    ) -> None:
+        """Queue saving the flow context; applied by ``uow.execute()``.
+
+        ``tenant_id`` lets stores index the session under its tenant.
+        """
+        uow.defer(self.save_context_async(session_id, context))
@@ -0,0 +1,211 @@
+"""In-process L1 cache of decoded ``FlowContext`` objects.
+
+Debounce aggregates bursts, so a session is often processed again on the same
+worker seconds after its previous turn. Keeping the context that turn saved
+lets the next one skip the Redis read and the JSON decoding.
+
+Entries are checked out: ``take`` removes the entry, so a turn that mutates
+its context and then fails (cancellation, errors) never leaves unsaved state
+behind; saving puts the context back. Every save stores a version token next
+to the Redis value and publishes it; other workers drop entries whose token
+differs. The cache is only consulted while the invalidation listener is
+connected; after a reconnect, entries are checked against the stored tokens
+in one MGET. Clients without pub/sub support leave the cache disabled.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from app.core.metrics import metrics
+from app.core.redis_cluster import is_cluster_client, open_pubsub
+
+if TYPE_CHECKING:
+    from app.flow_core.state import FlowContext
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 10_000
+DEFAULT_TTL_SECONDS = 60.0
+LISTEN_TIMEOUT_S = 1.0
+RECONNECT_DELAY_S = 1.0
+
+
+def invalidation_channel(namespace: str) -> str:
+    return f"{namespace}:session_cache:invalidate"
+
+
+async def publish_invalidation(
+    client: Any,
+    namespace: str,
+    *,
+    session_id: str | None = None,
+    user_id: str | None = None,
+) -> None:
+    """Evict cached contexts on every worker after writing state outside the cache.
+
+    With neither ``session_id`` nor ``user_id`` every entry is dropped.
+    """
+    message = json.dumps({"session_id": session_id, "user_id": user_id, "version": None})
+    try:
+        await client.publish(invalidation_channel(namespace), message)
+    except Exception as e:
+        logger.warning("Failed to publish session cache invalidation: %s", e)
+
+
+@dataclass(slots=True)
+class _Entry:
+    context: FlowContext
+    version: str
+    version_key: str
+    expires_at: float
+
+
+class SessionContextCache:
+    """LRU of decoded flow contexts keyed by session id (one per worker)."""
+
+    def __init__(
+        self,
+        *,
+        namespace: str = "chatai",
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+    ) -> None:
+        self.channel = invalidation_channel(namespace)
+        self.origin = uuid.uuid4().hex
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._listening = False
+        self._listener: asyncio.Task[None] | None = None
+
+    @property
+    def listening(self) -> bool:
+        """Whether invalidations are being received (the cache is only used then)."""
+        return self._listening
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def new_version() -> str:
+        return uuid.uuid4().hex
+
+    def take(self, session_id: str) -> FlowContext | None:
+        """Check out the cached context; the caller owns it until it saves again."""
+        if not self._listening:
+            return None
+        entry = self._entries.pop(session_id, None)
+        if entry is None or entry.expires_at < time.monotonic():
+            metrics.inc("session_cache_misses_total")
+            return None
+        metrics.inc("session_cache_hits_total")
+        return entry.context
+
+    def put(self, session_id: str, context: FlowContext, version: str, version_key: str) -> None:
+        """Cache ``context`` as just saved with ``version``."""
+        self._entries[session_id] = _Entry(
+            context, version, version_key, time.monotonic() + self._ttl
+        )
+        self._entries.move_to_end(session_id)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, session_id: str) -> None:
+        self._entries.pop(session_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def invalidation_message(self, session_id: str, version: str) -> str:
+        return json.dumps({"session_id": session_id, "version": version, "origin": self.origin})
+
+    def handle_invalidation(self, raw: Any) -> None:
+        try:
+            message = json.loads(raw)
+        except (TypeError, ValueError):
+            logger.warning("Ignoring malformed session cache invalidation: %r", raw)
+            return
+        if message.get("origin") == self.origin:
+            return
+
+        session_id = message.get("session_id")
+        user_id = message.get("user_id")
+        if session_id:
+            entry = self._entries.get(session_id)
+            if entry is not None and entry.version != message.get("version"):
+                del self._entries[session_id]
+                metrics.inc("session_cache_invalidations_total")
+        elif user_id:
+            prefix = f"flow:{user_id}:"
+            for cached_id in [s for s in self._entries if s.startswith(prefix)]:
+                del self._entries[cached_id]
+                metrics.inc("session_cache_invalidations_total")
+        else:
+            self.clear()
+
+    async def start(self, client: Any) -> None:
+        """Start the invalidation listener on ``client`` (an async Redis client)."""
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen(client))
+
+    async def stop(self) -> None:
+        self._listening = False
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        self.clear()
+
+    async def _listen(self, client: Any) -> None:
+        while True:
+            pubsub = open_pubsub(client)
+            if pubsub is None:
+                # Without invalidations the cache is never consulted
+                return
+            try:
+                await pubsub.subscribe(self.channel)
+                # Invalidations may have been missed while disconnected
+                await self._resync(client)
+                self._listening = True
+                while True:
+                    message = await pubsub.get_message(
+                        ignore_subscribe_messages=True, timeout=LISTEN_TIMEOUT_S
+                    )
+                    if message and message.get("type") == "message":
+                        self.handle_invalidation(message.get("data"))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Session cache listener disconnected: %s", e)
+                self._listening = False
+                await asyncio.sleep(RECONNECT_DELAY_S)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+    async def _resync(self, client: Any) -> None:
+        if not self._entries:
+            return
+        entries = list(self._entries.items())
+        keys = [entry.version_key for _, entry in entries]
+        # Version keys of different contacts live on different cluster slots
+        mget = client.mget_nonatomic if is_cluster_client(client) else client.mget
+        stored = await mget(keys)
+        for (session_id, entry), raw in zip(entries, stored, strict=True):
+            version = raw.decode() if isinstance(raw, bytes) else raw
+            # Entries replaced while waiting are newer than the snapshot
+            if version != entry.version and self._entries.get(session_id) is entry:
+                del self._entries[session_id]
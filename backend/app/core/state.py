@@ -5,8 +5,19 @@ import logging
 from datetime import timedelta
 from typing import TYPE_CHECKING, Any, Protocol
 
+from app.core.async_redis import create_async_client
+from app.core.redis_cluster import create_sync_client
+from app.core.redis_key_index import (
+    index_commands,
+    scan_keys,
+    scan_keys_async,
+    unlink_keys,
+    unlink_keys_async,
+)
+
 # Local import to avoid circular dependencies at module import time
 from app.core.redis_keys import RedisKeyBuilder
+from app.core.redis_unit_of_work import Deferred, RedisUnitOfWork
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +37,35 @@ if TYPE_CHECKING:
 
 from app.core.types import EventDict
 
+# Writes a state (and its version token) only while a string field of the
+# stored JSON still has the expected value ('' matches a missing field or key)
+_SAVE_IF_FIELD_EQUALS = """
+local raw = redis.call('GET', KEYS[1])
+local current = ''
+if raw then
+    local ok, data = pcall(cjson.decode, raw)
+    if ok and type(data) == 'table' and type(data[ARGV[1]]) == 'string' then
+        current = data[ARGV[1]]
+    end
+end
+if current ~= ARGV[2] then
+    return 0
+end
+local ttl = tonumber(ARGV[4])
+local function store(key, value)
+    if ttl > 0 then
+        redis.call('SET', key, value, 'EX', ttl)
+    else
+        redis.call('SET', key, value)
+    end
+end
+store(KEYS[1], ARGV[3])
+if ARGV[5] ~= '' then
+    store(KEYS[2], ARGV[5])
+end
+return 1
+"""
+
 
 class ConversationStore(Protocol):
     """Protocol for conversation storage.
@@ -45,6 +85,203 @@ class ConversationStore(Protocol):
     def append_event(self, user_id: str, event: EventDict) -> None: ...
 
 
+class AsyncConversationStore(Protocol):
+    """Awaitable counterpart of ``ConversationStore`` used on the request hot path."""
+
+    async def load(self, user_id: str, agent_type: str) -> AgentState | None: ...
+
+    async def save(
+        self, user_id: str, agent_type: str, state: AgentState | dict[str, Any]
+    ) -> None: ...
+
+    async def append_event(self, user_id: str, event: EventDict) -> None: ...
+
+
+def async_store(store: ConversationStore) -> Any:
+    """Return the async API of ``store``.
+
+    Redis stores share one ``redis.asyncio`` pool (``RedisStore.aio``); any
+    other store is wrapped so its synchronous methods can be awaited.
+    """
+    # Looked up on the class so mocks and duck-typed stores fall through
+    if getattr(type(store), "aio", None) is not None:
+        return store.aio  # type: ignore[attr-defined]
+    return SyncStoreAdapter(store)
+
+
+class SyncStoreAdapter:
+    """Awaitable wrapper around a synchronous store (in-memory stores, test doubles)."""
+
+    def __init__(self, store: Any) -> None:
+        self._store = store
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._store, name)
+        if not callable(attr):
+            return attr
+
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            return attr(*args, **kwargs)
+
+        return call
+
+
+def _validate_event(event: EventDict) -> None:
+    if "timestamp" not in event:
+        import time
+
+        event["timestamp"] = time.time()
+    if "type" not in event:
+        raise ValueError("Event must have a 'type' field")
+
+
+def _encode_state(state: AgentState | dict[str, Any]) -> str:
+    # state may be a dict-like as our concrete agents store dicts
+    if isinstance(state, dict):
+        payload: Any = state
+    elif hasattr(state, "to_dict"):
+        payload = state.to_dict()
+    else:
+        payload = {}
+    return json.dumps(payload)
+
+
+def _decode_state(raw: Any, user_id: str, agent_type: str) -> AgentState | None:
+    if not raw:
+        return None
+    try:
+        body = raw.decode("utf-8") if isinstance(raw, bytes | bytearray) else raw
+        data = json.loads(body)
+    except Exception as e:
+        logger.warning(f"Failed to decode state for {user_id}/{agent_type}: {e}")
+        return None
+
+    # For flow agents, try to convert to FlowContext which implements AgentState
+    if agent_type == "flow_agent" and isinstance(data, dict):
+        # Import here to avoid circular dependency
+        from app.flow_core.state import FlowContext
+
+        try:
+            # FlowContext has from_dict method
+            if hasattr(FlowContext, "from_dict"):
+                return FlowContext.from_dict(data)
+            # Otherwise return the dict - it should implement the protocol
+            # This is a temporary fallback until all agents properly implement AgentState
+            return data  # type: ignore[return-value]
+        except Exception as e:
+            logger.error(f"Failed to reconstruct FlowContext: {e}")
+            return None
+
+    # For other agent types, return the data if it implements the protocol
+    # In practice, agents return dicts that follow the AgentState protocol
+    if isinstance(data, dict):
+        return data  # type: ignore[return-value]
+
+    return None
+
+
+def _parse_timestamp(value: Any) -> float | None:
+    if value:
+        try:
+            return float(value)
+        except (ValueError, TypeError):
+            return None
+    return None
+
+
+class _RedisKeyLayout:
+    """Key layout shared by the sync and async Redis stores."""
+
+    _ns: str
+    _key_builder: RedisKeyBuilder
+    _state_ttl: int | None
+    _events_ttl: int | None
+
+    def _init_key_layout(self, namespace: str) -> None:
+        self._ns = namespace.rstrip(":")
+        # Use centralized key builder for consistency with our namespace
+        self._key_builder = RedisKeyBuilder(namespace=self._ns)
+
+    def _state_key(self, user_id: str, agent_type: str) -> str:
+        return self._key_builder.conversation_state_key(user_id, agent_type)
+
+    def _events_key(self, user_id: str) -> str:
+        return self._key_builder.events_key(user_id)
+
+    def _escalation_key(self, user_id: str, agent_type: str) -> str:
+        return self._key_builder.escalation_key(user_id, agent_type)
+
+    @property
+    def state_ttl(self) -> int | None:
+        """Seconds a state key lives after its last write (None: no expiry)."""
+        return self._state_ttl
+
+    @property
+    def _index_ttl(self) -> int | None:
+        # Key index sets must live as long as the longest-lived key they track
+        if self._state_ttl and self._events_ttl:
+            return max(self._state_ttl, self._events_ttl)
+        return None
+
+    def version_key(self, user_id: str, agent_type: str) -> str:
+        """Key of the version token stored alongside a state value."""
+        return f"{self._state_key(user_id, agent_type)}:v"
+
+    def _set_command(self, key: str, value: str) -> tuple[str, tuple[Any, ...]]:
+        if self._state_ttl:
+            return ("setex", (key, self._state_ttl, value))
+        return ("set", (key, value))
+
+    def _state_write_commands(
+        self,
+        user_id: str,
+        agent_type: str,
+        state: AgentState | dict[str, Any],
+        *,
+        tenant_id: str | None = None,
+        version: str | None = None,
+    ) -> list[tuple[str, tuple[Any, ...]]]:
+        key = self._state_key(user_id, agent_type)
+        commands = [
+            self._set_command(key, _encode_state(state)),
+            *index_commands(self._key_builder, user_id, key, self._index_ttl, tenant_id=tenant_id),
+        ]
+        if version is not None:
+            version_key = self.version_key(user_id, agent_type)
+            commands.append(self._set_command(version_key, version))
+            commands.extend(
+                index_commands(self._key_builder, user_id, version_key, self._index_ttl)
+            )
+        return commands
+
+    def _event_write_commands(
+        self, user_id: str, event: EventDict
+    ) -> list[tuple[str, tuple[Any, ...]]]:
+        key = self._events_key(user_id)
+        commands: list[tuple[str, tuple[Any, ...]]] = [("rpush", (key, json.dumps(event)))]
+        if self._events_ttl:
+            commands.append(("expire", (key, self._events_ttl)))
+        commands.extend(index_commands(self._key_builder, user_id, key, self._index_ttl))
+        return commands
+
+    def _history_patterns(self, user_id: str, agent_type: str | None) -> list[str]:
+        # Extract phone number for broader matching
+        phone_number = user_id.replace("whatsapp:", "").replace("+", "")
+
+        if agent_type and agent_type.startswith("flow."):
+            # Clear specific flow history
+            flow_id = agent_type
+            return [
+                f"{self._ns}:history:*{phone_number}*{flow_id}*",
+                f"{self._ns}:history:*{user_id}*{flow_id}*",
+            ]
+        # Clear all chat history for user
+        return [
+            f"{self._ns}:history:*{phone_number}*",
+            f"{self._ns}:history:*{user_id}*",
+        ]
+
+
 class InMemoryStore:
     def __init__(self) -> None:
         self._states: dict[tuple[str, str], AgentState | dict[str, Any]] = {}
@@ -68,21 +305,20 @@ class InMemoryStore:
 
     def append_event(self, user_id: str, event: EventDict) -> None:
         """Append typed event to the event list."""
-        # Validate event has required fields
-        if "timestamp" not in event:
-            import time
-
-            event["timestamp"] = time.time()
-        if "type" not in event:
-            raise ValueError("Event must have a 'type' field")
+        _validate_event(event)
         self._events.setdefault(user_id, []).append(event)
 
 
-class RedisStore:
+class RedisStore(_RedisKeyLayout):
     """Conversation store backed by Redis.
 
     Stores per-(user_id, agent_type) state as JSON and appends events to a list.
     Optionally exposes a LangChain RedisChatMessageHistory for message transcripts.
+
+    The methods here use a synchronous client and remain for scripts, the CLI
+    and legacy agents. Request handlers should use ``aio`` (an
+    ``AsyncRedisStore`` on a shared ``redis.asyncio`` pool) so Redis latency
+    never blocks the event loop.
     """
 
     def __init__(
@@ -92,62 +328,63 @@ class RedisStore:
         namespace: str = "chatai",
         state_ttl: timedelta | None = timedelta(days=30),
         events_ttl: timedelta | None = timedelta(days=30),
+        max_connections: int | None = None,
+        cluster: bool = False,
     ) -> None:
         if redis is None:  # pragma: no cover - import guard
             msg = "redis-py is not installed. Please add 'redis' to dependencies."
             raise RuntimeError(msg)
-        self._r = redis.from_url(redis_url)
-        self._ns = namespace.rstrip(":")
+        self._r = create_sync_client(redis_url, cluster=cluster)
+        self._redis_url = redis_url
+        self._max_connections = max_connections
+        self._cluster = cluster
+        self._init_key_layout(namespace)
         self._state_ttl = int(state_ttl.total_seconds()) if state_ttl else None
         self._events_ttl = int(events_ttl.total_seconds()) if events_ttl else None
+        self._async_client: Any = None
+        self._aio: AsyncRedisStore | None = None
 
     @property
     def redis_client(self) -> Any:
         """Public access to Redis client for advanced operations."""
         return self._r
 
-    def _state_key(self, user_id: str, agent_type: str) -> str:
-        # Use centralized key builder for consistency with our namespace
-        key_builder = RedisKeyBuilder(namespace=self._ns)
-        return key_builder.conversation_state_key(user_id, agent_type)
+    @property
+    def async_redis_client(self) -> Any:
+        """Shared ``redis.asyncio`` client, created on first use.
 
-    def _events_key(self, user_id: str) -> str:
-        return f"{self._ns}:events:{user_id}"  # Events use simple pattern
+        Created lazily so the pool binds to the running event loop rather than
+        to whatever loop (if any) existed when the store was constructed.
+        """
+        if self._async_client is None:
+            self._async_client = create_async_client(
+                self._redis_url, max_connections=self._max_connections, cluster=self._cluster
+            )
+        return self._async_client
+
+    @property
+    def aio(self) -> AsyncRedisStore:
+        """Async view of this store sharing namespace, TTLs and connection pool."""
+        if self._aio is None:
+            self._aio = AsyncRedisStore(
+                self.async_redis_client,
+                namespace=self._ns,
+                state_ttl=self._state_ttl,
+                events_ttl=self._events_ttl,
+            )
+        return self._aio
+
+    async def close_async(self) -> None:
+        """Release the async connection pool (call on application shutdown)."""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+            self._aio = None
 
     def load(self, user_id: str, agent_type: str) -> AgentState | None:
         """Load agent state with proper typing and validation."""
         raw = self._r.get(self._state_key(user_id, agent_type))
-        if not raw:
-            return None
-        try:
-            body = raw.decode("utf-8") if isinstance(raw, bytes | bytearray) else raw
-            data = json.loads(body)
-        except Exception as e:
-            logger.warning(f"Failed to decode state for {user_id}/{agent_type}: {e}")
-            return None
-
-        # For flow agents, try to convert to FlowContext which implements AgentState
-        if agent_type == "flow_agent" and isinstance(data, dict):
-            # Import here to avoid circular dependency
-            from app.flow_core.state import FlowContext
-
-            try:
-                # FlowContext has from_dict method
-                if hasattr(FlowContext, "from_dict"):
-                    return FlowContext.from_dict(data)
-                # Otherwise return the dict - it should implement the protocol
-                # This is a temporary fallback until all agents properly implement AgentState
-                return data  # type: ignore[return-value]
-            except Exception as e:
-                logger.error(f"Failed to reconstruct FlowContext: {e}")
-                return None
-
-        # For other agent types, return the data if it implements the protocol
-        # In practice, agents return dicts that follow the AgentState protocol
-        if isinstance(data, dict):
-            return data  # type: ignore[return-value]
-
-        return None
+        return _decode_state(raw, user_id, agent_type)
 
     def save(self, user_id: str, agent_type: str, state: AgentState | dict[str, Any]) -> None:
         """Save agent state or metadata dict.
@@ -155,35 +392,21 @@ class RedisStore:
         Accepts both AgentState objects (which have to_dict()) and plain dicts
         for flexibility in storing various types of data (agent state, session metadata, etc).
         """
-        # state may be a dict-like as our concrete agents store dicts
-        if isinstance(state, dict):
-            payload: Any = state
-        elif hasattr(state, "to_dict"):
-            payload = state.to_dict()
-        else:
-            payload = {}
-        body = json.dumps(payload)
-        key = self._state_key(user_id, agent_type)
-        if self._state_ttl:
-            self._r.setex(key, self._state_ttl, body)
-        else:
-            self._r.set(key, body)
+        # The write and its key index entries go out in one round trip
+        pipe = self._r.pipeline(transaction=False)
+        for command, args in self._state_write_commands(user_id, agent_type, state):
+            getattr(pipe, command)(*args)
+        pipe.execute()
 
     def append_event(self, user_id: str, event: EventDict) -> None:
         """Append typed event with validation."""
-        # Validate event has required fields
-        if "timestamp" not in event:
-            import time
-
-            event["timestamp"] = time.time()
-        if "type" not in event:
-            raise ValueError("Event must have a 'type' field")
+        _validate_event(event)
 
-        key = self._events_key(user_id)
         try:
-            self._r.rpush(key, json.dumps(event))
-            if self._events_ttl:
-                self._r.expire(key, self._events_ttl)
+            pipe = self._r.pipeline(transaction=False)
+            for command, args in self._event_write_commands(user_id, event):
+                getattr(pipe, command)(*args)
+            pipe.execute()
         except Exception:
             # best-effort logging store; ignore failures
             return
@@ -277,8 +500,7 @@ class RedisStore:
         """
         import time
 
-        key = f"{self._ns}:escalation:{user_id}:{agent_type}"
-        self._r.setex(key, 86400, str(time.time()))
+        self._r.setex(self._escalation_key(user_id, agent_type), 86400, str(time.time()))
 
     def get_escalation_timestamp(self, user_id: str, agent_type: str) -> float | None:
         """Get escalation timestamp if exists.
@@ -290,14 +512,7 @@ class RedisStore:
         Returns:
             Timestamp of escalation or None if not escalated
         """
-        key = f"{self._ns}:escalation:{user_id}:{agent_type}"
-        value = self._r.get(key)
-        if value:
-            try:
-                return float(value)
-            except (ValueError, TypeError):
-                return None
-        return None
+        return _parse_timestamp(self._r.get(self._escalation_key(user_id, agent_type)))
 
     def clear_escalation_timestamp(self, user_id: str, agent_type: str) -> None:
         """Clear escalation timestamp.
@@ -306,8 +521,7 @@ class RedisStore:
             user_id: User identifier
             agent_type: Agent type
         """
-        key = f"{self._ns}:escalation:{user_id}:{agent_type}"
-        self._r.delete(key)
+        self._r.delete(self._escalation_key(user_id, agent_type))
 
     def should_clear_context_after_escalation(
         self, user_id: str, agent_type: str, grace_period_seconds: int
@@ -344,32 +558,191 @@ class RedisStore:
         deleted_keys = 0
 
         try:
-            # Extract phone number for broader matching
-            phone_number = user_id.replace("whatsapp:", "").replace("+", "")
-
-            if agent_type and agent_type.startswith("flow."):
-                # Clear specific flow history
-                flow_id = agent_type
-                patterns = [
-                    f"{self._ns}:history:*{phone_number}*{flow_id}*",
-                    f"{self._ns}:history:*{user_id}*{flow_id}*",
-                ]
-            else:
-                # Clear all chat history for user
-                patterns = [
-                    f"{self._ns}:history:*{phone_number}*",
-                    f"{self._ns}:history:*{user_id}*",
-                ]
-
-            # Delete keys using patterns
-            for pattern in patterns:
-                keys = self._r.keys(pattern)
-                if keys:
-                    deleted_count = self._r.delete(*keys)
-                    deleted_keys += deleted_count
+            # History keys are written by LangChain and not indexed; SCAN for them
+            for pattern in self._history_patterns(user_id, agent_type):
+                deleted_keys += unlink_keys(self._r, scan_keys(self._r, pattern))
 
         except Exception as e:
             # Best-effort clearing; don't fail the handoff if clearing fails
             logger.warning("Failed to clear chat history for user %s: %s", user_id, e)
 
         return deleted_keys
+
+
+class AsyncRedisStore(_RedisKeyLayout):
+    """Async counterpart of ``RedisStore`` on a shared ``redis.asyncio`` client.
+
+    Obtain it through ``RedisStore.aio`` so every hot-path caller (session
+    manager, deduplication, escalation helpers) shares one connection pool.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        *,
+        namespace: str = "chatai",
+        state_ttl: int | None = None,
+        events_ttl: int | None = None,
+    ) -> None:
+        self._r = client
+        self._init_key_layout(namespace)
+        self._state_ttl = state_ttl
+        self._events_ttl = events_ttl
+
+    @property
+    def redis_client(self) -> Any:
+        return self._r
+
+    @property
+    def key_builder(self) -> RedisKeyBuilder:
+        return self._key_builder
+
+    async def load(self, user_id: str, agent_type: str) -> AgentState | None:
+        raw = await self._r.get(self._state_key(user_id, agent_type))
+        return _decode_state(raw, user_id, agent_type)
+
+    async def save(self, user_id: str, agent_type: str, state: AgentState | dict[str, Any]) -> None:
+        pipe = self._r.pipeline(transaction=False)
+        for command, args in self._state_write_commands(user_id, agent_type, state):
+            getattr(pipe, command)(*args)
+        await pipe.execute()
+
+    async def save_if_unchanged(
+        self,
+        user_id: str,
+        agent_type: str,
+        state: AgentState | dict[str, Any],
+        *,
+        field: str,
+        expected: str | None,
+        tenant_id: str | None = None,
+        version: str | None = None,
+    ) -> bool:
+        """Save ``state`` only if the stored state's ``field`` still equals ``expected``.
+
+        The compare and the write run in one script, so a save landing in
+        between is never overwritten. ``expected`` None matches a missing or
+        empty state. Key index entries follow in a second round trip.
+
+        Returns:
+            True if saved, False if the stored state moved on
+        """
+        key = self._state_key(user_id, agent_type)
+        version_key = self.version_key(user_id, agent_type)
+        saved = await self._r.eval(
+            _SAVE_IF_FIELD_EQUALS,
+            2,
+            key,
+            version_key,
+            field,
+            expected or "",
+            _encode_state(state),
+            self._state_ttl or 0,
+            version or "",
+        )
+        if not saved:
+            return False
+
+        pipe = self._r.pipeline(transaction=False)
+        for command, args in index_commands(
+            self._key_builder, user_id, key, self._index_ttl, tenant_id=tenant_id
+        ):
+            getattr(pipe, command)(*args)
+        if version is not None:
+            for command, args in index_commands(
+                self._key_builder, user_id, version_key, self._index_ttl
+            ):
+                getattr(pipe, command)(*args)
+        await pipe.execute()
+        return True
+
+    def queue_load(
+        self, uow: RedisUnitOfWork, user_id: str, agent_type: str
+    ) -> Deferred[AgentState | None]:
+        """Queue a state read on ``uow`` (see ``load``)."""
+        return uow.queue(
+            "get",
+            self._state_key(user_id, agent_type),
+            parse=lambda raw: _decode_state(raw, user_id, agent_type),
+        )
+
+    def queue_save(
+        self,
+        uow: RedisUnitOfWork,
+        user_id: str,
+        agent_type: str,
+        state: AgentState | dict[str, Any],
+        *,
+        tenant_id: str | None = None,
+        version: str | None = None,
+    ) -> None:
+        """Queue a state write on ``uow`` (see ``save``).
+
+        ``tenant_id`` also records the user in the tenant's key index so
+        tenant-wide resets can find it; ``version`` is stored under
+        ``version_key`` for caches of the decoded state.
+        """
+        for command, args in self._state_write_commands(
+            user_id, agent_type, state, tenant_id=tenant_id, version=version
+        ):
+            uow.queue(command, *args)
+
+    async def claim(
+        self,
+        user_id: str,
+        agent_type: str,
+        state: AgentState | dict[str, Any],
+        ttl_seconds: int,
+    ) -> bool:
+        """Store ``state`` only if the key is absent (SET NX EX).
+
+        Returns:
+            True if the key was claimed, False if it already existed
+        """
+        key = self._state_key(user_id, agent_type)
+        return bool(await self._r.set(key, _encode_state(state), nx=True, ex=ttl_seconds))
+
+    async def append_event(self, user_id: str, event: EventDict) -> None:
+        _validate_event(event)
+
+        try:
+            pipe = self._r.pipeline(transaction=False)
+            for command, args in self._event_write_commands(user_id, event):
+                getattr(pipe, command)(*args)
+            await pipe.execute()
+        except Exception:
+            # best-effort logging store; ignore failures
+            return
+
+    async def set_escalation_timestamp(self, user_id: str, agent_type: str) -> None:
+        import time
+
+        await self._r.setex(self._escalation_key(user_id, agent_type), 86400, str(time.time()))
+
+    async def get_escalation_timestamp(self, user_id: str, agent_type: str) -> float | None:
+        return _parse_timestamp(await self._r.get(self._escalation_key(user_id, agent_type)))
+
+    async def clear_escalation_timestamp(self, user_id: str, agent_type: str) -> None:
+        await self._r.delete(self._escalation_key(user_id, agent_type))
+
+    async def should_clear_context_after_escalation(
+        self, user_id: str, agent_type: str, grace_period_seconds: int
+    ) -> bool:
+        import time
+
+        escalation_time = await self.get_escalation_timestamp(user_id, agent_type)
+        if escalation_time is None:
+            return False
+        return time.time() - escalation_time >= grace_period_seconds
+
+    async def clear_chat_history(self, user_id: str, agent_type: str | None = None) -> int:
+        deleted_keys = 0
+        try:
+            for pattern in self._history_patterns(user_id, agent_type):
+                deleted_keys += await unlink_keys_async(
+                    self._r, [key async for key in scan_keys_async(self._r, pattern)]
+                )
+        except Exception as e:
+            # Best-effort clearing; don't fail the handoff if clearing fails
+            logger.warning("Failed to clear chat history for user %s: %s", user_id, e)
+        return deleted_keys
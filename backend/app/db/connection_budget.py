@@ -0,0 +1,60 @@
+"""How many Postgres connections each engine of a process may open.
+
+Every uvicorn worker builds its own engines, so pool sizes hard-coded per
+engine multiply with the worker count and can exhaust ``max_connections``.
+Instead the deployment declares one budget, ``DB_MAX_CONNECTIONS`` (all
+processes together), and ``WEB_CONCURRENCY`` workers; each worker gets an
+equal share, split between the primary engine and the pgvector engine by
+``DB_VECTOR_POOL_SHARE``. The read replica is a separate server and gets the
+same share as the primary.
+
+Background jobs run on the web workers' engines and are covered by the
+budget; CLIs and scripts open their own engines and are not.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Literal
+
+from app.settings import Settings, get_settings
+
+logger = logging.getLogger(__name__)
+
+PoolRole = Literal["primary", "replica", "vector"]
+
+
+@dataclass(frozen=True, slots=True)
+class PoolSizes:
+    pool_size: int
+    max_overflow: int
+
+    @property
+    def total(self) -> int:
+        return self.pool_size + self.max_overflow
+
+
+def split_pool(connections: int) -> PoolSizes:
+    """Keep two thirds of ``connections`` open and the rest as burst overflow."""
+    connections = max(connections, 1)
+    pool_size = max(connections * 2 // 3, 1)
+    return PoolSizes(pool_size, connections - pool_size)
+
+
+def per_process_connections(max_connections: int, workers: int) -> int:
+    return max(max_connections // max(workers, 1), 2)
+
+
+def pool_sizes(role: PoolRole, settings: Settings | None = None) -> PoolSizes:
+    """Pool size and overflow of one engine in this process."""
+    settings = settings or get_settings()
+    budget = per_process_connections(settings.db_max_connections, settings.web_concurrency)
+    if settings.db_max_connections // max(settings.web_concurrency, 1) < 2:
+        logger.warning(
+            "DB_MAX_CONNECTIONS=%d is too small for %d workers; using 2 connections per worker",
+            settings.db_max_connections,
+            settings.web_concurrency,
+        )
+    vector = min(max(round(budget * settings.db_vector_pool_share), 1), budget - 1)
+    return split_pool(vector if role == "vector" else budget - vector)
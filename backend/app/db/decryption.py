@@ -0,0 +1,157 @@
+"""Cached and batched decryption of PII columns.
+
+``EncryptedString`` values are Fernet tokens, and decrypting one costs an
+HMAC and an AES pass, so a large page or export is CPU-bound in the request
+thread. Two things cut that cost:
+
+- Each HTTP request gets a bounded LRU of ciphertext -> plaintext
+  (``DecryptionCacheMiddleware``). A contact's name and phone are stored
+  once and decrypted once per request, no matter how many threads or
+  exported message rows repeat them. Nothing outlives the request.
+- Exports select the raw tokens of just the columns they emit (see
+  ``ciphertext`` in ``app/db/types.py``) and decrypt them with
+  ``decrypt_tokens``, in batches and on an executor.
+
+Run ``scripts/bench_pii_decryption.py`` for rows per second with and
+without both.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any
+
+from cryptography.fernet import Fernet
+
+DEFAULT_CACHE_SIZE = 4096
+DEFAULT_BATCH_SIZE = 500
+
+_cache_var: ContextVar[DecryptionCache | None] = ContextVar("pii_decryption_cache", default=None)
+
+
+class DecryptionCache:
+    """Bounded LRU of decrypted values keyed by their ciphertext."""
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE) -> None:
+        self._maxsize = maxsize
+        self._values: OrderedDict[str, str] = OrderedDict()
+        # Sync endpoints and their dependencies run on different pool threads
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str) -> str | None:
+        with self._lock:
+            value = self._values.get(token)
+            if value is None:
+                self.misses += 1
+                return None
+            self._values.move_to_end(token)
+            self.hits += 1
+            return value
+
+    def put(self, token: str, value: str) -> None:
+        with self._lock:
+            self._values[token] = value
+            self._values.move_to_end(token)
+            if len(self._values) > self._maxsize:
+                self._values.popitem(last=False)
+
+    def get_or_decrypt(self, token: str, decrypt: Callable[[str], str]) -> str:
+        value = self.get(token)
+        if value is None:
+            value = decrypt(token)
+            self.put(token, value)
+        return value
+
+
+@contextmanager
+def decryption_cache(maxsize: int = DEFAULT_CACHE_SIZE) -> Iterator[DecryptionCache]:
+    """Cache decrypted values within the block (and the tasks and threads it starts)."""
+    cache = DecryptionCache(maxsize)
+    token = _cache_var.set(cache)
+    try:
+        yield cache
+    finally:
+        _cache_var.reset(token)
+
+
+def decrypt_token(fernet: Fernet, token: str) -> str:
+    """Decrypt one token, through the active request cache when there is one."""
+    cache = _cache_var.get()
+    if cache is None:
+        return fernet.decrypt(token.encode()).decode()
+    return cache.get_or_decrypt(token, lambda t: fernet.decrypt(t.encode()).decode())
+
+
+def _decrypt_batch(key: bytes, tokens: Sequence[str]) -> list[str]:
+    # Module level and keyed by the raw key so a ProcessPoolExecutor can run it
+    fernet = Fernet(key)
+    return [fernet.decrypt(token.encode()).decode() for token in tokens]
+
+
+def decrypt_tokens(
+    key: bytes,
+    tokens: Sequence[str | None],
+    *,
+    executor: Executor | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> list[str | None]:
+    """Decrypt ``tokens`` in order, each distinct token once.
+
+    Batches run on ``executor`` when given (``pii_executor()`` or a
+    ``ProcessPoolExecutor``), otherwise in the calling thread. Values the
+    active request cache already holds are not decrypted again.
+    """
+    cache = _cache_var.get()
+    plain: dict[str, str] = {}
+    pending: list[str] = []
+    for token in dict.fromkeys(t for t in tokens if t is not None):
+        cached = cache.get(token) if cache is not None else None
+        if cached is not None:
+            plain[token] = cached
+        else:
+            pending.append(token)
+
+    batches = [pending[i : i + batch_size] for i in range(0, len(pending), batch_size)]
+    if executor is None or len(batches) < 2:
+        results: Iterator[list[str]] = (_decrypt_batch(key, batch) for batch in batches)
+    else:
+        results = executor.map(_decrypt_batch, [key] * len(batches), batches)
+    for batch, values in zip(batches, results, strict=True):
+        for token, value in zip(batch, values, strict=True):
+            plain[token] = value
+            if cache is not None:
+                cache.put(token, value)
+    return [None if token is None else plain[token] for token in tokens]
+
+
+@lru_cache(maxsize=1)
+def pii_executor() -> ThreadPoolExecutor:
+    """Shared thread pool for batch decryption (``PII_DECRYPT_WORKERS`` threads)."""
+    from app.settings import get_settings
+
+    return ThreadPoolExecutor(
+        max_workers=get_settings().pii_decrypt_workers, thread_name_prefix="pii-decrypt"
+    )
+
+
+class DecryptionCacheMiddleware:
+    """ASGI middleware giving every HTTP request its own ``DecryptionCache``."""
+
+    def __init__(self, app: Any, maxsize: int = DEFAULT_CACHE_SIZE) -> None:
+        self.app = app
+        self._maxsize = maxsize
+
+    async def __call__(self, scope: Any, receive: Any, send: Any) -> None:
+        if scope["type"] != "http" or self._maxsize <= 0:
+            await self.app(scope, receive, send)
+            return
+        with decryption_cache(self._maxsize):
+            await self.app(scope, receive, send)
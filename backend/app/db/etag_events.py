@@ -0,0 +1,78 @@
+"""Drop cached ETags of resources changed by a committed transaction.
+
+Flushes collect the resources their flows, tenants, tenant configs and
+channels belong to (see ``resources_of``); after the commit the callback set
+with ``set_etag_invalidator`` (``ETagCache.invalidate`` in the app) drops
+them. Rolled back transactions drop nothing.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.etags import flow_resource, tenant_flows_resource, tenant_resource
+from app.db.models import ChannelInstance, Flow, Tenant, TenantProjectConfig
+
+logger = logging.getLogger(__name__)
+
+_PENDING_KEY = "etag_resources"
+
+
+@dataclass(slots=True)
+class _Invalidator:
+    callback: Callable[[Iterable[str]], None] | None = None
+
+
+_invalidator = _Invalidator()
+
+
+def set_etag_invalidator(invalidate: Callable[[Iterable[str]], None] | None) -> None:
+    _invalidator.callback = invalidate
+
+
+def resources_of(instance: Any) -> set[str]:
+    """Cached resources whose body depends on ``instance``."""
+    if isinstance(instance, Flow):
+        return {
+            flow_resource(instance.id),
+            tenant_flows_resource(instance.tenant_id),
+            tenant_resource(instance.tenant_id),
+        }
+    if isinstance(instance, Tenant):
+        return {tenant_resource(instance.id)}
+    if isinstance(instance, TenantProjectConfig | ChannelInstance):
+        return {tenant_resource(instance.tenant_id)}
+    return set()
+
+
+@event.listens_for(Session, "after_flush")
+def _collect(session: Session, _flush_context: Any) -> None:
+    if _invalidator.callback is None:
+        return
+    pending: set[str] = session.info.setdefault(_PENDING_KEY, set())
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        pending |= resources_of(instance)
+
+
+@event.listens_for(Session, "after_commit")
+def _flush_invalidations(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    invalidate = _invalidator.callback
+    if pending and invalidate is not None:
+        try:
+            invalidate(pending)
+        except Exception as e:
+            logger.warning("ETag invalidation failed: %s", e)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_invalidations(session: Session, previous_transaction: Any) -> None:
+    # A savepoint rollback keeps the outer changes; over-invalidating is harmless
+    if previous_transaction.parent is None:
+        session.info.pop(_PENDING_KEY, None)
@@ -72,12 +72,15 @@ from __future__ import annotations
 
 from datetime import datetime
 from enum import Enum
+from typing import Any, ClassVar
 from uuid import UUID
 
 from sqlalchemy import (
+    BigInteger,
     Boolean,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
@@ -93,7 +96,7 @@ from sqlalchemy.orm import Mapped, mapped_column, relationship
 from uuid_v7.base import uuid7
 
 from app.db.base import Base
-from app.db.types import EncryptedString
+from app.db.types import CompressedEncryptedJSON, EncryptedString
 
 # --- Enumerations
 
@@ -258,9 +261,11 @@ class FlowVersion(Base, TimestampMixin):
     id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), primary_key=True, default=uuid7)
     flow_id: Mapped[UUID] = mapped_column(ForeignKey("flows.id", ondelete="CASCADE"))
 
-    # Version tracking
+    # Version tracking. Every FLOW_VERSION_SNAPSHOT_INTERVAL versions store a full
+    # snapshot; the others store an RFC 6902 patch from the previous version
     version_number: Mapped[int] = mapped_column(Integer, nullable=False)
-    definition_snapshot: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    definition_snapshot: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+    definition_patch: Mapped[list | None] = mapped_column(JSONB, nullable=True)
     change_description: Mapped[str | None] = mapped_column(Text, nullable=True)
 
     # User tracking (optional, could be expanded later)
@@ -336,9 +341,23 @@ class ChatThread(Base, TimestampMixin):
 
 
 class Message(Base, TimestampMixin):
+    """A message of a chat thread.
+
+    ``messages`` is range-partitioned by month on ``created_at`` (see
+    ``app/db/partitions.py``), so the partition key is part of the primary key
+    and a foreign key into messages would have to reference ``(id, created_at)``.
+    ``message_attachments`` only stores ``message_id``, so it has no foreign
+    key; ``archive_partition`` deletes the attachments of a month it drops.
+    """
+
     __tablename__ = "messages"
+    __table_args__: ClassVar[dict[str, Any]] = {"postgresql_partition_by": "RANGE (created_at)"}
 
     id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), primary_key=True, default=uuid7)
+    # Partition key; set by the database and returned on insert
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), primary_key=True, server_default=func.now()
+    )
     tenant_id: Mapped[UUID] = mapped_column(ForeignKey("tenants.id", ondelete="CASCADE"))
     channel_instance_id: Mapped[UUID] = mapped_column(
         ForeignKey("channel_instances.id", ondelete="CASCADE")
@@ -360,15 +379,17 @@ class Message(Base, TimestampMixin):
     delivered_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
     read_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
 
-    # Optional quoted/replied message reference (provider id or local id)
-    quoted_message_id: Mapped[int | None] = mapped_column(ForeignKey("messages.id"))
+    # Optional quoted/replied message reference (local message id; not a foreign key, see above)
+    quoted_message_id: Mapped[UUID | None] = mapped_column(PGUUID(as_uuid=True))
 
     # Structured data for buttons/templates, etc.
     payload: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
 
     thread: Mapped[ChatThread] = relationship(back_populates="messages", foreign_keys=[thread_id])
     attachments: Mapped[list[MessageAttachment]] = relationship(
-        back_populates="message", cascade="all, delete-orphan"
+        back_populates="message",
+        cascade="all, delete-orphan",
+        primaryjoin="Message.id == foreign(MessageAttachment.message_id)",
     )
 
 
@@ -376,7 +397,9 @@ class MessageAttachment(Base, TimestampMixin):
     __tablename__ = "message_attachments"
 
     id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), primary_key=True, default=uuid7)
-    message_id: Mapped[UUID] = mapped_column(ForeignKey("messages.id", ondelete="CASCADE"))
+    # References messages.id without a foreign key (see Message); attachments of
+    # archived months are deleted by archive_partition
+    message_id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), index=True)
     media_type: Mapped[str] = mapped_column(String(40), nullable=False)  # image, audio, video, doc
     content_type: Mapped[str | None] = mapped_column(String(100))
     url: Mapped[str | None] = mapped_column(Text)  # storage location or provider URL
@@ -384,7 +407,10 @@ class MessageAttachment(Base, TimestampMixin):
     size_bytes: Mapped[int | None] = mapped_column(Integer)
     attachment_metadata: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
 
-    message: Mapped[Message] = relationship(back_populates="attachments")
+    message: Mapped[Message] = relationship(
+        back_populates="attachments",
+        primaryjoin="Message.id == foreign(MessageAttachment.message_id)",
+    )
 
 
 class FlowChatMessage(Base, TimestampMixin):
@@ -408,6 +434,58 @@ class FlowChatSession(Base, TimestampMixin):
     cleared_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
 
+class ColdSession(Base, TimestampMixin):
+    """Flow state of an idle session, moved out of Redis until its contact writes again.
+
+    Session and user ids contain phone numbers, so rows are looked up by their
+    blind indexes; the state itself is compressed and encrypted.
+    """
+
+    __tablename__ = "cold_sessions"
+
+    session_key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    user_key: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
+    state: Mapped[dict] = mapped_column(CompressedEncryptedJSON, nullable=False)
+
+
+class MessageStatsHourly(Base):
+    """Hourly message and thread counts per tenant, channel and flow.
+
+    A rollup of ``messages``/``chat_threads`` maintained by the stats rollup
+    job, so dashboards read O(buckets) rows instead of scanning messages.
+    Threads without a flow share the ``flow_id IS NULL`` row of their hour.
+    """
+
+    __tablename__ = "message_stats_hourly"
+    __table_args__ = (
+        UniqueConstraint(
+            "tenant_id",
+            "channel_instance_id",
+            "flow_id",
+            "bucket_start",
+            name="uq_message_stats_hourly_bucket",
+            postgresql_nulls_not_distinct=True,
+        ),
+        Index("ix_message_stats_hourly_tenant_bucket", "tenant_id", "bucket_start"),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    tenant_id: Mapped[UUID] = mapped_column(ForeignKey("tenants.id", ondelete="CASCADE"))
+    channel_instance_id: Mapped[UUID] = mapped_column(
+        ForeignKey("channel_instances.id", ondelete="CASCADE")
+    )
+    # No foreign key: SET NULL on flow deletion would collide with the hour's no-flow row
+    flow_id: Mapped[UUID | None] = mapped_column(PGUUID(as_uuid=True), nullable=True)
+    bucket_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    inbound_messages: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    outbound_messages: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    threads_started: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now()
+    )
+
+
 class HandoffRequest(Base, TimestampMixin):
     """Tracks human handoff requests for reliable processing and acknowledgment."""
 
@@ -0,0 +1,212 @@
+"""Monthly range partitions of the ``messages`` table.
+
+``messages`` is partitioned by ``created_at`` into one table per UTC month
+(``messages_y2025m10``) plus a ``messages_default`` catch-all, so inserts
+and recent reads touch small partitions and old months can be dropped as a
+whole instead of bloating indexes and vacuum. Partitions are created a few
+months ahead; the ones older than the retention window are detached,
+exported to gzipped CSV (message text stays Fernet-encrypted) and dropped.
+``message_attachments`` has no foreign key into ``messages``, so the
+attachments of an archived month are exported next to it and deleted in the
+same transaction as the drop.
+
+Queries on messages should bound ``created_at`` so the planner prunes the
+partitions they cannot match.
+"""
+
+from __future__ import annotations
+
+import gzip
+import logging
+import re
+from dataclasses import dataclass
+from datetime import UTC, date, datetime
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "messages"
+DEFAULT_PARTITION = "messages_default"
+_PARTITION_NAME = re.compile(r"^messages_y(\d{4})m(\d{2})$")
+
+
+def month_start(moment: datetime | date) -> date:
+    if isinstance(moment, datetime):
+        moment = moment.astimezone(UTC)
+    return date(moment.year, moment.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT_TABLE}_y{month.year:04d}m{month.month:02d}"
+
+
+def partition_month(name: str) -> date | None:
+    """Month of a partition named by ``partition_name`` (None for other tables)."""
+    match = _PARTITION_NAME.match(name)
+    return date(int(match[1]), int(match[2]), 1) if match else None
+
+
+def _bound(month: date) -> str:
+    return datetime(month.year, month.month, 1, tzinfo=UTC).isoformat()
+
+
+def list_partitions(connection: Any) -> list[str]:
+    """Names of the partitions currently attached to ``messages``."""
+    rows = connection.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = CAST(:parent AS regclass)"
+        ),
+        {"parent": PARENT_TABLE},
+    )
+    return sorted(row[0] for row in rows)
+
+
+def list_detached_partitions(connection: Any) -> list[str]:
+    """Monthly partition tables left detached by an interrupted archive run."""
+    rows = connection.execute(
+        text(
+            "SELECT c.relname FROM pg_class c "
+            "WHERE c.relkind = 'r' AND c.relname ~ '^messages_y[0-9]{4}m[0-9]{2}$' "
+            "AND NOT c.relispartition"
+        )
+    )
+    return sorted(row[0] for row in rows)
+
+
+def ensure_partitions(
+    connection: Any, *, months_ahead: int, now: datetime | None = None
+) -> list[str]:
+    """Create the default partition and the monthly ones through ``months_ahead``.
+
+    Returns the names of the partitions created.
+    """
+    existing = set(list_partitions(connection))
+    created = []
+    if DEFAULT_PARTITION not in existing:
+        connection.execute(
+            text(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {PARENT_TABLE} DEFAULT")
+        )
+        created.append(DEFAULT_PARTITION)
+
+    current = month_start(now or datetime.now(UTC))
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        name = partition_name(month)
+        if name in existing:
+            continue
+        # Fails if the default partition already holds rows of this month
+        connection.execute(
+            text(
+                f"CREATE TABLE {name} PARTITION OF {PARENT_TABLE} "
+                f"FOR VALUES FROM ('{_bound(month)}') TO ('{_bound(add_months(month, 1))}')"
+            )
+        )
+        created.append(name)
+    return created
+
+
+@dataclass(slots=True)
+class ArchivedPartition:
+    name: str
+    rows: int
+    path: Path
+    attachments: int = 0
+    attachments_path: Path | None = None
+
+
+def _export(connection: Any, query: str, path: Path) -> int:
+    """COPY ``query`` as gzipped CSV to ``path`` (atomically); returns the lines written."""
+    partial = path.with_name(f"{path.name}.partial")
+    exported = 0
+    cursor = connection.connection.driver_connection.cursor()
+    with (
+        gzip.open(partial, "wb") as out,
+        cursor.copy(f"COPY {query} TO STDOUT WITH (FORMAT csv, HEADER)") as copy,
+    ):
+        for chunk in copy:
+            out.write(chunk)
+            exported += bytes(chunk).count(b"\n")
+    partial.replace(path)
+    return exported
+
+
+def archive_partition(connection: Any, name: str, archive_dir: Path) -> ArchivedPartition:
+    """Detach a monthly partition, export it to ``<archive_dir>/<name>.csv.gz`` and drop it.
+
+    The month's attachments go to ``<name>_attachments.csv.gz`` and are
+    deleted in the transaction that drops the partition.
+
+    ``connection`` must be in autocommit mode: the detach commits on its own
+    so a failed export leaves a detached table that the next run picks up.
+    """
+    if partition_month(name) is None:
+        raise ValueError(f"Not a monthly messages partition: {name}")
+
+    if name in list_partitions(connection):
+        # DETACH ... CONCURRENTLY is not allowed next to a default partition;
+        # the plain detach locks the parent only briefly, never behind long queries
+        connection.execute(text("SET lock_timeout = '5s'"))
+        try:
+            connection.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+        finally:
+            connection.execute(text("RESET lock_timeout"))
+
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    path = archive_dir / f"{name}.csv.gz"
+    exported = _export(connection, name, path)
+    rows = connection.execute(text(f"SELECT count(*) FROM {name}")).scalar_one()
+    # Multi-line values (payload JSON) can add newlines, never remove them
+    if exported < rows + 1:
+        raise RuntimeError(f"Export of {name} is short: {exported} lines for {rows} rows")
+
+    # Attachments are deleted together with the drop below, so a rerun after
+    # a failure still finds and re-exports all of them
+    attachments_query = (
+        f"SELECT a.* FROM message_attachments a WHERE a.message_id IN (SELECT id FROM {name})"
+    )
+    attachments_path = archive_dir / f"{name}_attachments.csv.gz"
+    exported = _export(connection, f"({attachments_query})", attachments_path)
+    attachments = connection.execute(
+        text(f"SELECT count(*) FROM ({attachments_query}) AS archived")
+    ).scalar_one()
+    if exported < attachments + 1:
+        raise RuntimeError(
+            f"Export of the attachments of {name} is short: {exported} lines for {attachments} rows"
+        )
+
+    driver = connection.connection.driver_connection
+    with driver.transaction():
+        driver.execute(
+            f"DELETE FROM message_attachments WHERE message_id IN (SELECT id FROM {name})"
+        )
+        driver.execute(f"DROP TABLE {name}")
+    logger.info(
+        "Archived messages partition %s (%d rows, %d attachments) to %s",
+        name,
+        rows,
+        attachments,
+        path,
+    )
+    return ArchivedPartition(name, rows, path, attachments, attachments_path)
+
+
+def partitions_to_archive(
+    attached: list[str], detached: list[str], *, keep_months: int, now: datetime | None = None
+) -> list[str]:
+    """Monthly partitions entirely older than the last ``keep_months`` months."""
+    cutoff = add_months(month_start(now or datetime.now(UTC)), -keep_months)
+    return sorted(
+        name
+        for name in {*attached, *detached}
+        if (month := partition_month(name)) is not None and month < cutoff
+    )
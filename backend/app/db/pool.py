@@ -0,0 +1,117 @@
+"""Engine options shared by the sync and async engines.
+
+Pool sizes come from the process's connection budget (see
+``app/db/connection_budget.py``), and the pools record metrics labelled with
+the pool role:
+
+- ``db_pool_wait_ms``: time until a checkout gets a connection
+  (queue wait, plus connect and pre-ping when one is opened)
+- ``db_pool_timeouts_total``: checkouts that gave up after DB_POOL_TIMEOUT_SECONDS
+- ``db_pool_checkouts_total`` and the ``db_pool_checked_out`` gauge
+
+With ``DB_PGBOUNCER_MODE`` the engines talk to PgBouncer in transaction
+pooling mode: no server-side prepared statements and no startup ``options``
+(PgBouncer rejects them; set ``jit`` and the like on the database role).
+Session-level state such as ``SET`` or session advisory locks does not
+survive between transactions there.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+from uuid import uuid4
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.metrics import metrics
+from app.db.connection_budget import PoolRole, pool_sizes
+from app.settings import get_settings
+
+
+class _InstrumentedPoolMixin:
+    logging_name: str | None
+
+    def connect(self) -> Any:
+        role = self.logging_name
+        started = time.perf_counter()
+        try:
+            return super().connect()  # type: ignore[misc]
+        except exc.TimeoutError:
+            metrics.inc("db_pool_timeouts_total", pool=role)
+            raise
+        finally:
+            metrics.observe("db_pool_wait_ms", (time.perf_counter() - started) * 1000, pool=role)
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def _pool_options(role: PoolRole) -> dict[str, Any]:
+    sizes = pool_sizes(role)
+    metrics.set_gauge("db_pool_size", sizes.pool_size, pool=role)
+    metrics.set_gauge("db_pool_max_overflow", sizes.max_overflow, pool=role)
+    return {
+        "pool_size": sizes.pool_size,
+        "max_overflow": sizes.max_overflow,
+        "pool_timeout": get_settings().db_pool_timeout_seconds,
+        "pool_logging_name": role,
+        "pool_pre_ping": True,
+        "pool_recycle": 3600,  # Recycle connections every hour
+    }
+
+
+def sync_engine_options(role: PoolRole, *, application_name: str, options: str) -> dict[str, Any]:
+    """``create_engine`` keyword arguments for a psycopg engine."""
+    connect_args: dict[str, Any] = {
+        "connect_timeout": 10,  # 10s connection timeout
+        "application_name": application_name,
+    }
+    if get_settings().db_pgbouncer_mode:
+        connect_args["prepare_threshold"] = None
+    else:
+        connect_args["options"] = options
+    return {
+        **_pool_options(role),
+        "poolclass": InstrumentedQueuePool,
+        "connect_args": connect_args,
+    }
+
+
+def async_engine_options(role: PoolRole) -> dict[str, Any]:
+    """``create_async_engine`` keyword arguments for an asyncpg engine."""
+    connect_args: dict[str, Any] = {}
+    if get_settings().db_pgbouncer_mode:
+        connect_args = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        }
+    return {
+        **_pool_options(role),
+        "poolclass": InstrumentedAsyncQueuePool,
+        "connect_args": connect_args,
+    }
+
+
+def instrument_checkouts(engine: Any) -> None:
+    """Count checkouts and track the checked-out gauge of ``engine``'s pool."""
+    engine = getattr(engine, "sync_engine", engine)
+    role = engine.pool.logging_name
+
+    # Listeners carry over to the new pool on dispose(), hence engine.pool
+    @event.listens_for(engine.pool, "checkout")
+    def _checkout(*_args: Any) -> None:
+        metrics.inc("db_pool_checkouts_total", pool=role)
+        metrics.set_gauge("db_pool_checked_out", engine.pool.checkedout(), pool=role)
+
+    # checkin fires before the connection is back in the pool
+    @event.listens_for(engine.pool, "checkin")
+    def _checkin(*_args: Any) -> None:
+        metrics.set_gauge("db_pool_checked_out", max(engine.pool.checkedout() - 1, 0), pool=role)
@@ -0,0 +1,86 @@
+"""Health of the read replica used by ``app.db.session`` for read-only sessions.
+
+Reads are served by the replica only while its replication lag stays within
+``DATABASE_REPLICA_MAX_LAG_SECONDS``; otherwise (or when the replica cannot
+be reached) they go to the primary. The lag is measured at most once per
+check interval and shared by all request threads.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Callable
+
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Seconds the replica is behind the primary. Zero when it has replayed all the
+# WAL it received (an idle primary leaves the replay timestamp old) or when
+# the URL points at a primary, e.g. the same database in local setups.
+REPLICA_LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE extract(epoch FROM now() - pg_last_xact_replay_timestamp())
+    END
+"""
+
+
+class ReplicaHealth:
+    """Caches whether the replica is fresh enough to serve reads.
+
+    ``measure_lag`` returns the lag in seconds, or None when unknown. A thread
+    that finds another one measuring uses the previous answer instead of
+    waiting, and the replica starts out unhealthy until the first measurement.
+    """
+
+    def __init__(
+        self,
+        measure_lag: Callable[[], float | None],
+        *,
+        max_lag_seconds: float,
+        check_interval_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._measure_lag = measure_lag
+        self._max_lag = max_lag_seconds
+        self._interval = check_interval_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._checked_at: float | None = None
+        self._healthy = False
+
+    def is_healthy(self) -> bool:
+        checked_at = self._checked_at
+        if checked_at is not None and self._clock() - checked_at < self._interval:
+            return self._healthy
+        if not self._lock.acquire(blocking=False):
+            return self._healthy
+        try:
+            self._healthy = self._check()
+            self._checked_at = self._clock()
+        finally:
+            self._lock.release()
+        return self._healthy
+
+    def _check(self) -> bool:
+        try:
+            lag = self._measure_lag()
+        except Exception as e:
+            logger.warning("Read replica lag check failed, reading from primary: %s", e)
+            return False
+        if lag is None:
+            logger.warning("Read replica lag unknown, reading from primary")
+            return False
+        metrics.set_gauge("db_replica_lag_seconds", float(lag))
+        if lag > self._max_lag:
+            logger.warning(
+                "Read replica is %.1fs behind (max %.1fs), reading from primary",
+                lag,
+                self._max_lag,
+            )
+            return False
+        return True
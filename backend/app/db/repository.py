@@ -1,29 +1,49 @@
 from __future__ import annotations
 
 import logging
-from collections.abc import Sequence
+from collections.abc import Iterator, Sequence
 from datetime import UTC, datetime
+from typing import Any
 from uuid import UUID
 
-from sqlalchemy import desc, select, text
-from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import (
+    Row,
+    and_,
+    delete,
+    desc,
+    func,
+    literal_column,
+    or_,
+    select,
+    text,
+    tuple_,
+    update,
+)
+from sqlalchemy.orm import Session, defer, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
+from app.core.json_patch import apply_patch, make_patch
+from app.core.pagination import PageKey
 from app.db.models import (
     ChannelInstance,
     ChatThread,
+    ColdSession,
     Contact,
     Flow,
     FlowChatMessage,
     FlowChatRole,
     FlowChatSession,
     FlowVersion,
+    HandoffRequest,
     Message,
     MessageDirection,
+    MessageStatsHourly,
     MessageStatus,
     Tenant,
     TenantProjectConfig,
     ThreadStatus,
 )
+from app.db.types import ciphertext
 
 logger = logging.getLogger(__name__)
 
@@ -605,6 +625,16 @@ def update_flow(
 # --- Chat Repository Functions ---
 
 
+def _after_key(sort_column, id_column, key: PageKey, *, descending: bool = True):  # type: ignore[no-untyped-def]
+    """Keyset predicate selecting the rows that follow ``key`` in ``(sort, id)`` order."""
+    if not descending:
+        return tuple_(sort_column, id_column) > tuple_(key.sort_value, key.id)
+    if key.sort_value is None:
+        # DESC sorts NULLs first: the rest of the NULL run, then every dated row
+        return or_(and_(sort_column.is_(None), id_column < key.id), sort_column.is_not(None))
+    return tuple_(sort_column, id_column) < tuple_(key.sort_value, key.id)
+
+
 def get_threads_by_tenant(
     session: Session,
     tenant_id: UUID,
@@ -612,8 +642,13 @@ def get_threads_by_tenant(
     channel_instance_id: UUID | None = None,
     limit: int = 50,
     offset: int = 0,
+    after: PageKey | None = None,
 ) -> Sequence[ChatThread]:
-    """Get chat threads for a tenant with optional filtering."""
+    """Get chat threads for a tenant, most recently active first.
+
+    Pass ``after`` (the key of the last thread of the previous page) instead
+    of ``offset`` to page through ``ix_chat_threads_tenant_last_message``.
+    """
     query = (
         select(ChatThread)
         .options(selectinload(ChatThread.contact))
@@ -625,10 +660,14 @@ def get_threads_by_tenant(
 
     if channel_instance_id:
         query = query.where(ChatThread.channel_instance_id == channel_instance_id)
+    if after is not None:
+        query = query.where(_after_key(ChatThread.last_message_at, ChatThread.id, after))
 
     return (
         session.execute(
-            query.order_by(desc(ChatThread.last_message_at)).offset(offset).limit(limit)
+            query.order_by(desc(ChatThread.last_message_at), desc(ChatThread.id))
+            .offset(offset)
+            .limit(limit)
         )
         .scalars()
         .all()
@@ -639,18 +678,61 @@ def get_thread_with_messages(
     session: Session, tenant_id: UUID, thread_id: UUID
 ) -> ChatThread | None:
     """Get a thread with all messages and contact info."""
-    return session.execute(
+    thread = session.execute(
         select(ChatThread)
-        .options(
-            selectinload(ChatThread.contact),
-            selectinload(ChatThread.messages),
-        )
+        .options(selectinload(ChatThread.contact))
         .where(
             ChatThread.id == thread_id,
             ChatThread.tenant_id == tenant_id,
             ChatThread.deleted_at.is_(None),
         )
     ).scalar_one_or_none()
+    if thread is not None:
+        # Bounded by the thread's creation so only its months' partitions are read
+        messages = session.execute(
+            select(Message)
+            .where(Message.thread_id == thread.id, Message.created_at >= thread.created_at)
+            .order_by(Message.id)
+        ).scalars()
+        set_committed_value(thread, "messages", list(messages))
+    return thread
+
+
+def get_thread_by_id(session: Session, tenant_id: UUID, thread_id: UUID) -> ChatThread | None:
+    """Get a live thread of a tenant without loading its messages."""
+    return session.execute(
+        select(ChatThread).where(
+            ChatThread.id == thread_id,
+            ChatThread.tenant_id == tenant_id,
+            ChatThread.deleted_at.is_(None),
+        )
+    ).scalar_one_or_none()
+
+
+def get_messages_by_thread(
+    session: Session,
+    thread_id: UUID,
+    *,
+    limit: int = 100,
+    after: PageKey | None = None,
+    since: datetime | None = None,
+) -> Sequence[Message]:
+    """Get a page of a thread's messages, oldest first.
+
+    ``since`` (the thread's ``created_at``) lets Postgres skip the monthly
+    ``messages`` partitions older than the thread.
+    """
+    query = select(Message).where(Message.thread_id == thread_id, Message.deleted_at.is_(None))
+    if after is not None:
+        query = query.where(
+            Message.created_at >= after.sort_value,
+            _after_key(Message.created_at, Message.id, after, descending=False),
+        )
+    elif since is not None:
+        query = query.where(Message.created_at >= since)
+    return (
+        session.execute(query.order_by(Message.created_at, Message.id).limit(limit)).scalars().all()
+    )
 
 
 def get_contacts_by_tenant(
@@ -659,24 +741,92 @@ def get_contacts_by_tenant(
     *,
     limit: int = 100,
     offset: int = 0,
+    after: PageKey | None = None,
 ) -> Sequence[Contact]:
-    """Get contacts for a tenant."""
+    """Get contacts for a tenant, newest first (``after`` pages by keyset)."""
+    query = select(Contact).where(
+        Contact.tenant_id == tenant_id,
+        Contact.deleted_at.is_(None),
+    )
+    if after is not None:
+        query = query.where(_after_key(Contact.created_at, Contact.id, after))
     return (
         session.execute(
-            select(Contact)
-            .where(
-                Contact.tenant_id == tenant_id,
-                Contact.deleted_at.is_(None),
-            )
-            .order_by(desc(Contact.created_at))
-            .offset(offset)
-            .limit(limit)
+            query.order_by(desc(Contact.created_at), desc(Contact.id)).offset(offset).limit(limit)
         )
         .scalars()
         .all()
     )
 
 
+def get_contact_external_ids_by_tenant(
+    session: Session,
+    tenant_id: UUID,
+    *,
+    limit: int = 500,
+    after: PageKey | None = None,
+) -> Sequence[Row[Any]]:
+    """(id, created_at, external_id) of a tenant's contacts, newest first.
+
+    Unlike ``get_contacts_by_tenant`` only ``external_id`` is decrypted.
+    """
+    query = select(Contact.id, Contact.created_at, Contact.external_id).where(
+        Contact.tenant_id == tenant_id,
+        Contact.deleted_at.is_(None),
+    )
+    if after is not None:
+        query = query.where(_after_key(Contact.created_at, Contact.id, after))
+    return session.execute(
+        query.order_by(desc(Contact.created_at), desc(Contact.id)).limit(limit)
+    ).all()
+
+
+def list_conversation_summaries(
+    session: Session,
+    *,
+    limit: int = 100,
+    after: PageKey | None = None,
+) -> Sequence[Row[Any]]:
+    """Most recently active threads of all tenants with their contact, flow and message count.
+
+    One statement: the contact and flow come from joins and the message
+    count from a correlated ``COUNT`` that only runs for the returned rows.
+    The count is a range scan of ``ix_messages_thread_created`` that still
+    visits each message row for the ``deleted_at IS NULL`` filter; no message
+    is returned to the application.
+    """
+    message_count = (
+        select(func.count(Message.id))
+        .where(
+            Message.thread_id == ChatThread.id,
+            # Run-time partition pruning: no message predates its thread
+            Message.created_at >= ChatThread.created_at,
+            Message.deleted_at.is_(None),
+        )
+        .correlate(ChatThread)
+        .scalar_subquery()
+    )
+    query = (
+        select(
+            ChatThread.id,
+            ChatThread.tenant_id,
+            ChatThread.flow_id,
+            ChatThread.last_message_at,
+            Contact.external_id,
+            Flow.name.label("flow_name"),
+            message_count.label("message_count"),
+        )
+        .outerjoin(Contact, Contact.id == ChatThread.contact_id)
+        .outerjoin(Flow, Flow.id == ChatThread.flow_id)
+        .where(ChatThread.deleted_at.is_(None))
+    )
+    if after is not None:
+        query = query.where(_after_key(ChatThread.last_message_at, ChatThread.id, after))
+    return session.execute(
+        query.order_by(desc(ChatThread.last_message_at), desc(ChatThread.id)).limit(limit)
+    ).all()
+
+
 def update_thread_status(
     session: Session, tenant_id: UUID, thread_id: UUID, status: ThreadStatus
 ) -> ChatThread | None:
@@ -767,8 +917,186 @@ def mark_thread_reviewed_by_human(session: Session, thread_id: UUID) -> bool:
     return False
 
 
+# --- Export Repository Functions ---
+
+
+def _stream_batches(session: Session, query: Any, batch_size: int) -> Iterator[Sequence[Row[Any]]]:
+    """Run ``query`` on a server-side cursor and yield its rows ``batch_size`` at a time."""
+    result = session.execute(query.execution_options(yield_per=batch_size))
+    yield from result.partitions()
+
+
+def iter_thread_export(
+    session: Session,
+    tenant_id: UUID,
+    *,
+    after: PageKey | None = None,
+    batch_size: int = 1000,
+) -> Iterator[Sequence[Row[Any]]]:
+    """A tenant's threads with their contact, oldest first, in batches.
+
+    Encrypted contact columns come back as ciphertext for ``decrypt_tokens``;
+    ``after`` resumes past the ``(created_at, id)`` of the last exported thread.
+    """
+    query = (
+        select(
+            ChatThread.id,
+            ChatThread.created_at,
+            ChatThread.channel_instance_id,
+            ChatThread.flow_id,
+            ChatThread.status,
+            ChatThread.subject,
+            ChatThread.last_message_at,
+            ChatThread.completed_at,
+            Contact.id.label("contact_id"),
+            ciphertext(Contact.external_id).label("contact_external_id"),
+            ciphertext(Contact.display_name).label("contact_display_name"),
+            ciphertext(Contact.phone_number).label("contact_phone_number"),
+        )
+        .join(Contact, Contact.id == ChatThread.contact_id)
+        .where(ChatThread.tenant_id == tenant_id, ChatThread.deleted_at.is_(None))
+    )
+    if after is not None:
+        query = query.where(
+            _after_key(ChatThread.created_at, ChatThread.id, after, descending=False)
+        )
+    query = query.order_by(ChatThread.created_at, ChatThread.id)
+    return _stream_batches(session, query, batch_size)
+
+
+def iter_message_export(
+    session: Session,
+    tenant_id: UUID,
+    *,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    after: PageKey | None = None,
+    batch_size: int = 1000,
+) -> Iterator[Sequence[Row[Any]]]:
+    """A tenant's messages, oldest first, in batches (text as ciphertext).
+
+    ``since``/``until`` bound ``created_at`` so only the matching monthly
+    partitions are scanned; ``after`` resumes past the last exported message.
+    """
+    query = select(
+        Message.id,
+        Message.created_at,
+        Message.thread_id,
+        Message.contact_id,
+        Message.channel_instance_id,
+        Message.direction,
+        Message.status,
+        ciphertext(Message.text).label("text"),
+        Message.provider_message_id,
+        Message.sent_at,
+        Message.delivered_at,
+        Message.read_at,
+    ).where(Message.tenant_id == tenant_id, Message.deleted_at.is_(None))
+    if since is not None:
+        query = query.where(Message.created_at >= since)
+    if until is not None:
+        query = query.where(Message.created_at < until)
+    if after is not None:
+        query = query.where(
+            Message.created_at >= after.sort_value,
+            _after_key(Message.created_at, Message.id, after, descending=False),
+        )
+    return _stream_batches(session, query.order_by(Message.created_at, Message.id), batch_size)
+
+
+# --- Conditional GET Repository Functions ---
+# Cheap queries whose results change whenever the matching GET's body does;
+# they feed ETag/Last-Modified (see app/core/etags.py).
+
+
+def get_flow_validators(session: Session, flow_id: UUID) -> Row | None:
+    """``version`` and ``updated_at`` of a live flow, without its definition."""
+    return session.execute(
+        select(Flow.version, Flow.updated_at).where(Flow.id == flow_id, Flow.deleted_at.is_(None))
+    ).one_or_none()
+
+
+def get_tenant_flows_validators(session: Session, tenant_id: UUID) -> Row:
+    """Flow count and latest ``updated_at`` of a tenant (soft deletes bump the latter)."""
+    return session.execute(
+        select(
+            func.count(Flow.id).label("count"), func.max(Flow.updated_at).label("updated_at")
+        ).where(Flow.tenant_id == tenant_id)
+    ).one()
+
+
+def get_tenant_validators(session: Session, tenant_id: UUID) -> Row | None:
+    """``updated_at`` of a tenant and its config; count and last change of channels and flows."""
+
+    def scalar(column: Any, model: Any) -> Any:
+        return select(column).where(model.tenant_id == tenant_id).scalar_subquery()
+
+    live_channels = func.count(ChannelInstance.id).filter(ChannelInstance.deleted_at.is_(None))
+    live_flows = func.count(Flow.id).filter(Flow.deleted_at.is_(None))
+    return session.execute(
+        select(
+            Tenant.updated_at,
+            scalar(TenantProjectConfig.updated_at, TenantProjectConfig).label("config_updated_at"),
+            scalar(live_channels, ChannelInstance).label("channel_count"),
+            scalar(func.max(ChannelInstance.updated_at), ChannelInstance).label(
+                "channels_updated_at"
+            ),
+            scalar(live_flows, Flow).label("flow_count"),
+            scalar(func.max(Flow.updated_at), Flow).label("flows_updated_at"),
+        ).where(Tenant.id == tenant_id)
+    ).one_or_none()
+
+
+def get_latest_flow_version_number(session: Session, flow_id: UUID) -> int | None:
+    """Highest version number of a flow; new versions and pruning both move it."""
+    return session.execute(
+        select(func.max(FlowVersion.version_number)).where(FlowVersion.flow_id == flow_id)
+    ).scalar()
+
+
+# --- Handoff Repository Functions ---
+
+
+def get_handoff_requests_by_tenant(
+    session: Session,
+    tenant_id: UUID,
+    *,
+    acknowledged: bool | None = None,
+    limit: int = 100,
+    offset: int = 0,
+    after: PageKey | None = None,
+) -> Sequence[HandoffRequest]:
+    """Get handoff requests for a tenant, newest first (``after`` pages by keyset)."""
+    query = select(HandoffRequest).where(HandoffRequest.tenant_id == tenant_id)
+    if acknowledged is not None:
+        if acknowledged:
+            query = query.where(HandoffRequest.acknowledged_at.is_not(None))
+        else:
+            query = query.where(HandoffRequest.acknowledged_at.is_(None))
+    if after is not None:
+        query = query.where(_after_key(HandoffRequest.created_at, HandoffRequest.id, after))
+    return (
+        session.execute(
+            query.order_by(desc(HandoffRequest.created_at), desc(HandoffRequest.id))
+            .offset(offset)
+            .limit(limit)
+        )
+        .scalars()
+        .all()
+    )
+
+
 # --- Flow Version Repository Functions ---
 
+# Versions 1, 1 + N, 1 + 2N, ... store a full snapshot; the rest store an
+# RFC 6902 patch from the previous version
+FLOW_VERSION_SNAPSHOT_INTERVAL = 10
+FLOW_VERSION_RETENTION = 50
+
+
+def _is_snapshot_version(version_number: int) -> bool:
+    return (version_number - 1) % FLOW_VERSION_SNAPSHOT_INTERVAL == 0
+
 
 def create_flow_version(
     session: Session,
@@ -778,7 +1106,7 @@ def create_flow_version(
     change_description: str | None = None,
     created_by: str | None = None,
 ) -> FlowVersion:
-    """Create a new flow version snapshot."""
+    """Create a new flow version (stored as a patch or a periodic snapshot)."""
     # Get the highest version number for this flow
     latest_version = session.execute(
         select(FlowVersion.version_number)
@@ -788,39 +1116,68 @@ def create_flow_version(
 
     next_version = (latest_version or 0) + 1
 
+    snapshot: dict | None = definition_snapshot
+    patch: list | None = None
+    if latest_version and not _is_snapshot_version(next_version):
+        previous = get_flow_version_definition(session, flow_id, latest_version)
+        if previous is not None:
+            snapshot, patch = None, make_patch(previous, definition_snapshot)
+
     version = FlowVersion(
         flow_id=flow_id,
         version_number=next_version,
-        definition_snapshot=definition_snapshot,
+        definition_snapshot=snapshot,
+        definition_patch=patch,
         change_description=change_description,
         created_by=created_by,
     )
     session.add(version)
     session.flush()
 
-    # Clean up old versions (keep only last 50)
-    old_versions = (
+    _prune_flow_versions(session, flow_id)
+
+    return version
+
+
+def _prune_flow_versions(session: Session, flow_id: UUID) -> None:
+    """Keep the last FLOW_VERSION_RETENTION versions, re-basing the oldest kept one."""
+    oldest_kept = (
         session.execute(
             select(FlowVersion)
+            .options(defer(FlowVersion.definition_patch))
             .where(FlowVersion.flow_id == flow_id)
             .order_by(desc(FlowVersion.version_number))
-            .offset(50)
+            .offset(FLOW_VERSION_RETENTION - 1)
+            .limit(1)
         )
         .scalars()
-        .all()
+        .first()
     )
+    if oldest_kept is None:
+        return
 
-    for old_version in old_versions:
-        session.delete(old_version)
+    # Patches of the kept versions must not depend on rows that are deleted
+    if oldest_kept.definition_snapshot is None:
+        oldest_kept.definition_snapshot = get_flow_version_definition(
+            session, flow_id, oldest_kept.version_number
+        )
+        oldest_kept.definition_patch = None
+        session.flush()
 
-    return version
+    session.execute(
+        delete(FlowVersion).where(
+            FlowVersion.flow_id == flow_id,
+            FlowVersion.version_number < oldest_kept.version_number,
+        )
+    )
 
 
 def get_flow_versions(session: Session, flow_id: UUID, limit: int = 20) -> Sequence[FlowVersion]:
-    """Get flow version history."""
+    """Get flow version history (metadata only; definitions are not loaded)."""
     return (
         session.execute(
             select(FlowVersion)
+            .options(defer(FlowVersion.definition_snapshot), defer(FlowVersion.definition_patch))
             .where(FlowVersion.flow_id == flow_id)
             .order_by(desc(FlowVersion.version_number))
             .limit(limit)
@@ -833,14 +1190,62 @@ def get_flow_versions(session: Session, flow_id: UUID, limit: int = 20) -> Seque
 def get_flow_version_by_number(
     session: Session, flow_id: UUID, version_number: int
 ) -> FlowVersion | None:
-    """Get a specific flow version by number."""
+    """Get a specific flow version by number (metadata only)."""
     return session.execute(
-        select(FlowVersion).where(
-            FlowVersion.flow_id == flow_id, FlowVersion.version_number == version_number
-        )
+        select(FlowVersion)
+        .options(defer(FlowVersion.definition_snapshot), defer(FlowVersion.definition_patch))
+        .where(FlowVersion.flow_id == flow_id, FlowVersion.version_number == version_number)
     ).scalar_one_or_none()
 
 
+def get_flow_version_definition(
+    session: Session, flow_id: UUID, version_number: int
+) -> dict | None:
+    """Reconstruct a version's definition from the nearest snapshot and its patches."""
+    base_version = session.execute(
+        select(func.max(FlowVersion.version_number)).where(
+            FlowVersion.flow_id == flow_id,
+            FlowVersion.version_number <= version_number,
+            FlowVersion.definition_snapshot.is_not(None),
+        )
+    ).scalar()
+    if base_version is None:
+        return None
+
+    rows = session.execute(
+        select(
+            FlowVersion.version_number,
+            FlowVersion.definition_snapshot,
+            FlowVersion.definition_patch,
+        )
+        .where(
+            FlowVersion.flow_id == flow_id,
+            FlowVersion.version_number.between(base_version, version_number),
+        )
+        .order_by(FlowVersion.version_number)
+    ).all()
+    return replay_flow_versions(rows, version_number)
+
+
+def replay_flow_versions(rows: Sequence, version_number: int) -> dict | None:
+    """Replay ``(version_number, snapshot, patch)`` rows ordered from a snapshot."""
+    if not rows or rows[-1][0] != version_number or rows[0][1] is None:
+        return None
+
+    definition = apply_patch(rows[0][1], [])
+    expected = rows[0][0]
+    for number, snapshot, patch in rows[1:]:
+        expected += 1
+        if number != expected:
+            logger.error(f"Flow version chain has a gap before version {number}")
+            return None
+        if snapshot is not None:
+            definition = apply_patch(snapshot, [])
+        else:
+            definition = apply_patch(definition, patch or [], in_place=True)
+    return definition
+
+
 def update_flow_with_versioning(
     session: Session,
     flow_id: UUID,
@@ -1035,3 +1440,199 @@ def update_flow_definition(session: Session, flow_id: UUID, definition: dict) ->
 
     session.flush()
     return flow
+
+
+# --- Cold Session Repository Functions ---
+
+
+def upsert_cold_sessions(session: Session, rows: Sequence[dict]) -> None:
+    """Insert or replace archived session states.
+
+    Each row has ``session_key``, ``user_key`` and ``state``; a session tiered
+    again replaces its previous row.
+    """
+    if not rows:
+        return
+    from sqlalchemy.dialects.postgresql import insert
+
+    statement = insert(ColdSession).values(list(rows))
+    session.execute(
+        statement.on_conflict_do_update(
+            index_elements=[ColdSession.session_key],
+            set_={
+                "user_key": statement.excluded.user_key,
+                "state": statement.excluded.state,
+                "updated_at": func.now(),
+            },
+        )
+    )
+
+
+def pop_cold_session(session: Session, session_key: str) -> dict | None:
+    """Delete an archived session state and return it (None if not archived)."""
+    return session.execute(
+        delete(ColdSession)
+        .where(ColdSession.session_key == session_key)
+        .returning(ColdSession.state)
+    ).scalar_one_or_none()
+
+
+def delete_cold_sessions(
+    session: Session, *, session_keys: Sequence[str] = (), user_key: str | None = None
+) -> int:
+    """Delete archived states by session or for every session of a user."""
+    conditions = []
+    if session_keys:
+        conditions.append(ColdSession.session_key.in_(list(session_keys)))
+    if user_key is not None:
+        conditions.append(ColdSession.user_key == user_key)
+    if not conditions:
+        return 0
+    return session.execute(delete(ColdSession).where(or_(*conditions))).rowcount or 0
+
+
+def count_cold_sessions(session: Session) -> int:
+    return session.execute(select(func.count()).select_from(ColdSession)).scalar_one()
+
+
+# --- Stats Rollup Repository Functions ---
+
+# Key of the advisory lock electing the worker that runs the rollup
+STATS_ROLLUP_LOCK_KEY = 0x53544154
+STATS_GRANULARITIES = ("hour", "day")
+
+
+def _utc_bucket(granularity: str, column):  # type: ignore[no-untyped-def]
+    # Inlined (not bound) so the SELECT and GROUP BY expressions match
+    return func.date_trunc(literal_column(f"'{granularity}'"), column, literal_column("'UTC'"))
+
+
+def try_lock_stats_rollup(session: Session) -> bool:
+    """Take the rollup's transaction-scoped advisory lock; False if another worker holds it."""
+    return bool(
+        session.execute(
+            text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": STATS_ROLLUP_LOCK_KEY}
+        ).scalar()
+    )
+
+
+def rollup_message_stats(session: Session, start: datetime, end: datetime) -> None:
+    """Recompute the hourly stats rows of ``[start, end)`` from messages and threads.
+
+    Bounds should be whole hours. Buckets are recomputed from the source rows
+    rather than incremented, so overlapping runs and backfills are harmless.
+    """
+    from sqlalchemy.dialects.postgresql import insert
+
+    in_window = and_(
+        MessageStatsHourly.bucket_start >= start, MessageStatsHourly.bucket_start < end
+    )
+    # Buckets whose source rows were deleted go back to zero
+    session.execute(
+        update(MessageStatsHourly)
+        .where(in_window)
+        .values(inbound_messages=0, outbound_messages=0, threads_started=0)
+    )
+
+    key_columns = ["tenant_id", "channel_instance_id", "flow_id", "bucket_start"]
+    message_bucket = _utc_bucket("hour", Message.created_at)
+    message_counts = (
+        select(
+            Message.tenant_id,
+            Message.channel_instance_id,
+            ChatThread.flow_id,
+            message_bucket,
+            func.count().filter(Message.direction == MessageDirection.inbound),
+            func.count().filter(Message.direction == MessageDirection.outbound),
+        )
+        .join(ChatThread, ChatThread.id == Message.thread_id)
+        .where(
+            Message.created_at >= start,
+            Message.created_at < end,
+            Message.deleted_at.is_(None),
+        )
+        .group_by(
+            Message.tenant_id, Message.channel_instance_id, ChatThread.flow_id, message_bucket
+        )
+    )
+    statement = insert(MessageStatsHourly).from_select(
+        [*key_columns, "inbound_messages", "outbound_messages"], message_counts
+    )
+    session.execute(
+        statement.on_conflict_do_update(
+            constraint="uq_message_stats_hourly_bucket",
+            set_={
+                "inbound_messages": statement.excluded.inbound_messages,
+                "outbound_messages": statement.excluded.outbound_messages,
+                "updated_at": func.now(),
+            },
+        )
+    )
+
+    thread_bucket = _utc_bucket("hour", ChatThread.created_at)
+    thread_counts = (
+        select(
+            ChatThread.tenant_id,
+            ChatThread.channel_instance_id,
+            ChatThread.flow_id,
+            thread_bucket,
+            func.count(),
+        )
+        .where(ChatThread.created_at >= start, ChatThread.created_at < end)
+        .group_by(
+            ChatThread.tenant_id, ChatThread.channel_instance_id, ChatThread.flow_id, thread_bucket
+        )
+    )
+    statement = insert(MessageStatsHourly).from_select(
+        [*key_columns, "threads_started"], thread_counts
+    )
+    session.execute(
+        statement.on_conflict_do_update(
+            constraint="uq_message_stats_hourly_bucket",
+            set_={"threads_started": statement.excluded.threads_started, "updated_at": func.now()},
+        )
+    )
+
+
+def get_message_stats(
+    session: Session,
+    *,
+    start: datetime,
+    end: datetime,
+    granularity: str = "hour",
+    tenant_id: UUID | None = None,
+    channel_instance_id: UUID | None = None,
+    flow_id: UUID | None = None,
+) -> Sequence[Row[Any]]:
+    """Message and thread counts per hour or day (``granularity``) from the rollup."""
+    if granularity not in STATS_GRANULARITIES:
+        raise ValueError(f"Unsupported stats granularity: {granularity}")
+    bucket = _utc_bucket(granularity, MessageStatsHourly.bucket_start).label("bucket")
+    query = select(
+        bucket,
+        func.sum(MessageStatsHourly.inbound_messages).label("inbound_messages"),
+        func.sum(MessageStatsHourly.outbound_messages).label("outbound_messages"),
+        func.sum(MessageStatsHourly.threads_started).label("threads_started"),
+    ).where(MessageStatsHourly.bucket_start >= start, MessageStatsHourly.bucket_start < end)
+    if tenant_id is not None:
+        query = query.where(MessageStatsHourly.tenant_id == tenant_id)
+    if channel_instance_id is not None:
+        query = query.where(MessageStatsHourly.channel_instance_id == channel_instance_id)
+    if flow_id is not None:
+        query = query.where(MessageStatsHourly.flow_id == flow_id)
+    return session.execute(query.group_by(bucket).order_by(bucket)).all()
+
+
+def get_message_stats_totals(session: Session) -> Row[Any]:
+    """All-time totals from the rollup (threads, messages, tenants, latest active hour)."""
+    total_messages = MessageStatsHourly.inbound_messages + MessageStatsHourly.outbound_messages
+    return session.execute(
+        select(
+            func.coalesce(func.sum(MessageStatsHourly.threads_started), 0).label("threads"),
+            func.coalesce(func.sum(total_messages), 0).label("messages"),
+            func.count(func.distinct(MessageStatsHourly.tenant_id)).label("tenants"),
+            func.max(MessageStatsHourly.bucket_start)
+            .filter(total_messages > 0)
+            .label("latest_bucket"),
+        )
+    ).one()
@@ -5,36 +5,52 @@ from collections.abc import Generator, Iterator
 from contextlib import contextmanager
 from functools import lru_cache
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.orm import Session, sessionmaker
 
+from app.core.metrics import metrics
+from app.db.connection_budget import PoolRole
+from app.db.pool import instrument_checkouts, sync_engine_options
+from app.db.replica import REPLICA_LAG_SQL, ReplicaHealth
 from app.settings import get_settings
 
 logger = logging.getLogger(__name__)
 
 
+def _create_engine(url: str, role: PoolRole, *, application_name: str, options: str):
+    engine = create_engine(
+        url,
+        future=True,
+        echo=False,  # Disable SQL logging in production
+        **sync_engine_options(role, application_name=application_name, options=options),
+    )
+    instrument_checkouts(engine)
+    return engine
+
+
 @lru_cache(maxsize=1)
 def _engine():
     settings = get_settings()
-    url = settings.sqlalchemy_database_url
+    return _create_engine(
+        settings.sqlalchemy_database_url,
+        "primary",
+        application_name="chatai_backend",
+        options="-c jit=off",  # Disable JIT for faster simple queries
+    )
+
 
-    # Optimized connection pool settings for remote database
-    return create_engine(
+@lru_cache(maxsize=1)
+def _replica_engine():
+    """Engine of the read replica, or None when DATABASE_REPLICA_URL is not set."""
+    url = get_settings().database_replica_url
+    if not url or not url.strip():
+        return None
+    return _create_engine(
         url,
-        pool_pre_ping=True,
-        future=True,
-        # Connection pool optimization for remote DB
-        pool_size=20,  # Increased from default 5
-        max_overflow=30,  # Allow burst connections
-        pool_recycle=3600,  # Recycle connections every hour
-        pool_timeout=30,  # Wait up to 30s for connection
-        # Performance optimizations
-        echo=False,  # Disable SQL logging in production
-        connect_args={
-            "connect_timeout": 10,  # 10s connection timeout
-            "application_name": "chatai_backend",
-            "options": "-c jit=off",  # Disable JIT for faster simple queries
-        },
+        "replica",
+        application_name="chatai_backend_replica",
+        # Writes through a read session fail even when the URL is the primary's
+        options="-c jit=off -c default_transaction_read_only=on",
     )
 
 
@@ -43,6 +59,42 @@ def _session_factory() -> sessionmaker[Session]:
     return sessionmaker(bind=_engine(), autoflush=False, autocommit=False, future=True)
 
 
+@lru_cache(maxsize=1)
+def _replica_session_factory() -> sessionmaker[Session] | None:
+    engine = _replica_engine()
+    if engine is None:
+        return None
+    return sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+
+
+def _measure_replica_lag() -> float | None:
+    with _replica_engine().connect() as connection:
+        lag = connection.execute(text(REPLICA_LAG_SQL)).scalar()
+    return None if lag is None else float(lag)
+
+
+@lru_cache(maxsize=1)
+def _replica_health() -> ReplicaHealth:
+    settings = get_settings()
+    return ReplicaHealth(
+        _measure_replica_lag,
+        max_lag_seconds=settings.database_replica_max_lag_seconds,
+        check_interval_seconds=settings.database_replica_check_interval_seconds,
+    )
+
+
+def _read_session_factory() -> sessionmaker[Session]:
+    """The replica's session factory while it is within the max lag, else the primary's."""
+    replica = _replica_session_factory()
+    if replica is None:
+        return _session_factory()
+    if _replica_health().is_healthy():
+        metrics.inc("db_read_sessions_total", target="replica")
+        return replica
+    metrics.inc("db_read_sessions_total", target="primary")
+    return _session_factory()
+
+
 def get_db_session() -> Generator[Session, None, None]:
     session = _session_factory()()
     try:
@@ -51,6 +103,22 @@ def get_db_session() -> Generator[Session, None, None]:
         session.close()
 
 
+def get_read_db_session() -> Generator[Session, None, None]:
+    """
+    Read-only session dependency, served by the read replica when it is fresh.
+
+    Use it for endpoints that only read and can tolerate data up to
+    DATABASE_REPLICA_MAX_LAG_SECONDS old (listings, stats, exports); anything
+    that writes or must see its own writes stays on ``get_db_session``.
+    Without DATABASE_REPLICA_URL this is the primary.
+    """
+    session = _read_session_factory()()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
 def create_session() -> Session:
     """
     Create a new database session.
@@ -95,6 +163,25 @@ def db_session() -> Iterator[Session]:
             logger.error("Failed to close database session: %s", e)
 
 
+@contextmanager
+def db_read_session() -> Iterator[Session]:
+    """
+    Context manager for read-only sessions (see ``get_read_db_session``).
+
+    Usage:
+        with db_read_session() as session:
+            rows = session.execute(select(Message)).all()
+    """
+    session = _read_session_factory()()
+    try:
+        yield session
+    finally:
+        try:
+            session.close()
+        except Exception as e:
+            logger.error("Failed to close database session: %s", e)
+
+
 @contextmanager
 def db_transaction() -> Iterator[Session]:
     """
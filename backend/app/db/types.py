@@ -1,24 +1,48 @@
 from __future__ import annotations
 
+import functools
+import hashlib
+import hmac
+import json
 import os
+import zlib
 from dataclasses import dataclass
 from datetime import datetime
 from typing import TYPE_CHECKING, Any
 from uuid import UUID
 
 from cryptography.fernet import Fernet
-from sqlalchemy import String, TypeDecorator
+from sqlalchemy import LargeBinary, String, TypeDecorator, type_coerce
+
+from app.db.decryption import decrypt_token
 
 if TYPE_CHECKING:
+    from sqlalchemy.sql.elements import ColumnElement
+
     from app.db.models import MessageDirection, MessageStatus
 
 
+def pii_encryption_key() -> bytes:
+    encryption_key = os.getenv("PII_ENCRYPTION_KEY")
+    if not encryption_key:
+        raise RuntimeError(
+            "PII_ENCRYPTION_KEY environment variable is required for encrypted fields. "
+            'Generate one with: python -c "from cryptography.fernet import Fernet; print(Fernet.generate_key().decode())"'
+        )
+    return encryption_key.encode()
+
+
+@functools.cache
+def pii_fernet() -> Fernet:
+    """Fernet cipher of the encrypted column types, created on first use (after env loading)."""
+    return Fernet(pii_encryption_key())
+
+
 class EncryptedString(TypeDecorator):
     """SQLAlchemy type for encrypted string fields (GDPR/LGPD compliance)."""
     
     impl = String
     cache_ok = True
-    _fernet_cache: Fernet | None = None
     
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         super().__init__(*args, **kwargs)
@@ -26,15 +50,7 @@ class EncryptedString(TypeDecorator):
     @property
     def fernet(self) -> Fernet:
         """Lazy-load Fernet cipher to allow env vars to be loaded first."""
-        if EncryptedString._fernet_cache is None:
-            encryption_key = os.getenv("PII_ENCRYPTION_KEY")
-            if not encryption_key:
-                raise RuntimeError(
-                    "PII_ENCRYPTION_KEY environment variable is required for encrypted fields. "
-                    'Generate one with: python -c "from cryptography.fernet import Fernet; print(Fernet.generate_key().decode())"'
-                )
-            EncryptedString._fernet_cache = Fernet(encryption_key.encode())
-        return EncryptedString._fernet_cache
+        return pii_fernet()
     
     def process_bind_param(self, value: Any, dialect: Any) -> Any:
         """Encrypt value before storing in database."""
@@ -45,7 +61,7 @@ class EncryptedString(TypeDecorator):
         return value
     
     def process_result_value(self, value: Any, dialect: Any) -> Any:
-        """Decrypt value when reading from database."""
+        """Decrypt value when reading from database (cached per request, see decryption.py)."""
         if value is None:
             return None
         if isinstance(value, memoryview):
@@ -53,10 +69,45 @@ class EncryptedString(TypeDecorator):
         elif isinstance(value, bytes):
             value = value.decode()
         if isinstance(value, str):
-            return self.fernet.decrypt(value.encode()).decode()
+            return decrypt_token(self.fernet, value)
         return value
 
 
+def ciphertext(column: Any) -> ColumnElement[str]:
+    """Select an ``EncryptedString`` column's token as is, for ``decrypt_tokens``."""
+    return type_coerce(column, String)
+
+
+class CompressedEncryptedJSON(TypeDecorator):
+    """JSON value stored zlib-compressed and encrypted (bulky PII such as flow state)."""
+
+    impl = LargeBinary
+    cache_ok = True
+
+    @property
+    def fernet(self) -> Fernet:
+        return pii_fernet()
+
+    def process_bind_param(self, value: Any, dialect: Any) -> Any:
+        if value is None:
+            return None
+        raw = json.dumps(value, separators=(",", ":")).encode()
+        return self.fernet.encrypt(zlib.compress(raw))
+
+    def process_result_value(self, value: Any, dialect: Any) -> Any:
+        if value is None:
+            return None
+        return json.loads(zlib.decompress(self.fernet.decrypt(bytes(value))))
+
+
+def blind_index(value: str) -> str:
+    """Keyed hash of a PII value, for equality lookups on data stored encrypted."""
+    encryption_key = os.getenv("PII_ENCRYPTION_KEY")
+    if not encryption_key:
+        raise RuntimeError("PII_ENCRYPTION_KEY environment variable is required for blind indexes.")
+    return hmac.new(encryption_key.encode(), value.encode(), hashlib.sha256).hexdigest()
+
+
 @dataclass(frozen=True, slots=True)
 class MessageToSave:
     tenant_id: UUID
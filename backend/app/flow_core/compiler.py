@@ -3,9 +3,10 @@
 from __future__ import annotations
 
 import re
+from collections import deque
 from typing import Any
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 from .guards import DEFAULT_GUARDS, GuardFunction
 from .ir import (
@@ -99,6 +100,9 @@ class CompiledValidation:
             return False, f"Validation error: {e!s}"
 
 
+DEFAULT_NEIGHBOURHOOD_HOPS = 3
+
+
 class CompiledFlow(BaseModel):
     """Compiled flow with resolved references and optimizations."""
 
@@ -122,17 +126,52 @@ class CompiledFlow(BaseModel):
     action_nodes: list[str] = Field(default_factory=list)
     subflow_nodes: list[str] = Field(default_factory=list)
 
+    # Question node ids by priority (``nodes`` is already keyed by node id)
+    questions_by_priority: tuple[str, ...] = ()
+
+    # Forward neighbourhood size used to prune the prompt to the current frontier
+    neighbourhood_hops: int = DEFAULT_NEIGHBOURHOOD_HOPS
+
     # Validation results
     has_unreachable_nodes: bool = False
     has_cycles: bool = False
     validation_warnings: list[str] = Field(default_factory=list)
 
+    _neighbourhoods: dict[str, tuple[str, ...]] = PrivateAttr(default_factory=dict)
+
+    def neighbourhood(self, node_id: str) -> tuple[str, ...]:
+        """Nodes within ``neighbourhood_hops`` forward hops of ``node_id``, nearest first.
+
+        Computed on first use, so a turn only pays for its current node.
+        """
+        cached = self._neighbourhoods.get(node_id)
+        if cached is None:
+            visited = {node_id}
+            ordered: list[str] = []
+            queue = deque([(node_id, 0)])
+            while queue:
+                current, depth = queue.popleft()
+                if depth == self.neighbourhood_hops:
+                    continue
+                for edge in self.edges_from.get(current, []):
+                    if edge.target not in visited:
+                        visited.add(edge.target)
+                        ordered.append(edge.target)
+                        queue.append((edge.target, depth + 1))
+            cached = self._neighbourhoods[node_id] = tuple(ordered)
+        return cached
+
 
 class FlowCompiler:
     """Enhanced compiler with validation and optimization."""
 
-    def __init__(self, guard_registry: dict[str, GuardFunction] | None = None) -> None:
+    def __init__(
+        self,
+        guard_registry: dict[str, GuardFunction] | None = None,
+        neighbourhood_hops: int = DEFAULT_NEIGHBOURHOOD_HOPS,
+    ) -> None:
         self.guard_registry = guard_registry or DEFAULT_GUARDS
+        self.neighbourhood_hops = neighbourhood_hops
         self.validation_errors: list[str] = []
         self.validation_warnings: list[str] = []
 
@@ -192,9 +231,14 @@ class FlowCompiler:
             elif isinstance(node, SubflowNode):
                 subflow_nodes.append(node_id)
 
+        # Stable sort keeps declaration order between equal priorities
+        questions = [node for node in node_map.values() if isinstance(node, QuestionNode)]
+        questions_by_priority = tuple(q.id for q in sorted(questions, key=lambda q: q.priority))
+
         # Check for unreachable nodes and cycles
         has_unreachable = self._check_unreachable_nodes(flow.entry, edges_from, node_map)
-        has_cycles = self._detect_cycles(edges_from)
+        components = self._strongly_connected_components(node_map, edges_from)
+        has_cycles = self._detect_cycles(components, edges_from)
 
         # Build compiled flow
         compiled = CompiledFlow(
@@ -213,6 +257,8 @@ class FlowCompiler:
             terminal_nodes=terminal_nodes,
             action_nodes=action_nodes,
             subflow_nodes=subflow_nodes,
+            questions_by_priority=questions_by_priority,
+            neighbourhood_hops=self.neighbourhood_hops,
             has_unreachable_nodes=has_unreachable,
             has_cycles=has_cycles,
             validation_warnings=self.validation_warnings,
@@ -302,19 +348,16 @@ class FlowCompiler:
         nodes: dict[str, Node],
     ) -> bool:
         """Check for unreachable nodes using BFS."""
-        visited = set()
-        queue = [entry]
+        visited = {entry}
+        queue = deque([entry])
 
         while queue:
-            node_id = queue.pop(0)
-            if node_id in visited:
-                continue
-
-            visited.add(node_id)
+            node_id = queue.popleft()
 
             # Add all targets of outgoing edges
             for edge in edges_from.get(node_id, []):
                 if edge.target not in visited:
+                    visited.add(edge.target)
                     queue.append(edge.target)
 
         unreachable = set(nodes.keys()) - visited
@@ -326,30 +369,74 @@ class FlowCompiler:
 
         return False
 
-    def _detect_cycles(self, edges_from: dict[str, list[CompiledEdge]]) -> bool:
-        """Detect cycles in the flow graph using DFS."""
-        visited = set()
-        rec_stack = set()
-
-        def has_cycle(node_id: str) -> bool:
-            visited.add(node_id)
-            rec_stack.add(node_id)
-
-            for edge in edges_from.get(node_id, []):
-                if edge.target not in visited:
-                    if has_cycle(edge.target):
-                        return True
-                elif edge.target in rec_stack:
-                    return True
-
-            rec_stack.remove(node_id)
-            return False
-
-        for node_id in edges_from:
-            if node_id not in visited:
-                if has_cycle(node_id):
-                    self.validation_warnings.append("Cycle detected in flow graph")
-                    return True
+    def _strongly_connected_components(
+        self,
+        nodes: dict[str, Node],
+        edges_from: dict[str, list[CompiledEdge]],
+    ) -> list[list[str]]:
+        """Iterative Tarjan SCC; components are returned in reverse topological order."""
+        index: dict[str, int] = {}
+        lowlink: dict[str, int] = {}
+        on_stack: set[str] = set()
+        stack: list[str] = []
+        components: list[list[str]] = []
+        counter = 0
+
+        for root in nodes:
+            if root in index:
+                continue
+            work = [(root, 0)]
+            while work:
+                node_id, edge_pos = work.pop()
+                if edge_pos == 0:
+                    index[node_id] = lowlink[node_id] = counter
+                    counter += 1
+                    stack.append(node_id)
+                    on_stack.add(node_id)
+
+                edges = edges_from.get(node_id, [])
+                descended = False
+                while edge_pos < len(edges):
+                    target = edges[edge_pos].target
+                    edge_pos += 1
+                    if target not in index:
+                        work.append((node_id, edge_pos))
+                        work.append((target, 0))
+                        descended = True
+                        break
+                    if target in on_stack:
+                        lowlink[node_id] = min(lowlink[node_id], index[target])
+                if descended:
+                    continue
+
+                if lowlink[node_id] == index[node_id]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node_id:
+                            break
+                    components.append(component)
+
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node_id])
+
+        return components
+
+    def _detect_cycles(
+        self,
+        components: list[list[str]],
+        edges_from: dict[str, list[CompiledEdge]],
+    ) -> bool:
+        """Detect cycles from strongly connected components (no recursion)."""
+        for component in components:
+            node_id = component[0]
+            is_self_loop = any(e.target == node_id for e in edges_from.get(node_id, []))
+            if len(component) > 1 or is_self_loop:
+                self.validation_warnings.append("Cycle detected in flow graph")
+                return True
 
         return False
 
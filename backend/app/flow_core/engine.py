@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+from bisect import bisect_left, insort
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any, Literal
 
@@ -29,6 +30,57 @@ class EngineResponse:
     suggested_actions: list[str] | None = None
 
 
+class UnansweredQuestionIndex:
+    """Priority-ordered unanswered questions, updated from the answers diff.
+
+    Keeps the positions (in ``CompiledFlow.questions_by_priority``) of pending
+    questions in a sorted list. ``sync`` only touches keys whose answered state
+    changed since the previous call, so repeated lookups within a turn (and
+    across the chained transitions of one navigation) do not rescan the flow.
+    """
+
+    def __init__(self, flow: CompiledFlow) -> None:
+        self._order = flow.questions_by_priority
+        self._positions: dict[str, list[int]] = {}
+        for position, node_id in enumerate(self._order):
+            node = flow.nodes[node_id]
+            if isinstance(node, QuestionNode):
+                self._positions.setdefault(node.key, []).append(position)
+        self._answered: set[str] = set()
+        self._pending = list(range(len(self._order)))
+
+    def sync(self, answers: dict[str, Any]) -> None:
+        """Apply the difference between ``answers`` and the last synced state."""
+        answered = {
+            key
+            for key, value in answers.items()
+            if key in self._positions and value not in (None, "")
+        }
+        if answered == self._answered:
+            return
+        for key in answered - self._answered:
+            for position in self._positions[key]:
+                index = bisect_left(self._pending, position)
+                if index < len(self._pending) and self._pending[index] == position:
+                    del self._pending[index]
+        for key in self._answered - answered:
+            for position in self._positions[key]:
+                insort(self._pending, position)
+        self._answered = answered
+
+    def pending(self) -> list[str]:
+        """Unanswered question node ids by priority."""
+        return [self._order[position] for position in self._pending]
+
+    def first(self, *, exclude: str | None = None) -> str | None:
+        """Highest-priority unanswered question, optionally skipping one node."""
+        for position in self._pending:
+            node_id = self._order[position]
+            if node_id != exclude:
+                return node_id
+        return None
+
+
 class LLMFlowEngine:
     """
     Simplified flow engine that acts as a pure state machine.
@@ -51,6 +103,8 @@ class LLMFlowEngine:
         self._flow = compiled
         self._llm = llm  # Kept for compatibility but not used
         self._strict_mode = strict_mode
+        # Unanswered-question index for the context last seen by this engine
+        self._unanswered: tuple[FlowContext, UnansweredQuestionIndex] | None = None
 
     def initialize_context(self, existing_context: FlowContext | None = None) -> FlowContext:
         """Initialize or restore flow context."""
@@ -73,12 +127,37 @@ class LLMFlowEngine:
         if user_message:
             ctx.add_turn("user", user_message, ctx.current_node_id)
 
-        # Get current node
-        node = self._get_current_node(ctx)
-        if not node:
-            return self._handle_no_node(ctx)
+        # Follow transitions iteratively: each step responds or moves to another node
+        max_steps = len(self._flow.nodes) + 1
+        for _ in range(max_steps):
+            node = self._get_current_node(ctx)
+            if not node:
+                return self._handle_no_node(ctx)
+
+            response = self._process_node(ctx, node, user_message, event, project_context)
+            if response is not None:
+                return response
+            # The current node changed; later steps start without the turn input
+            user_message = None
+            event = None
+
+        logger.error(f"Navigation did not settle after {max_steps} steps in flow {self._flow.id}")
+        return EngineResponse(
+            kind="escalate",
+            message="Encontrei uma situação inesperada. Vou chamar alguém para ajudar.",
+            node_id=ctx.current_node_id,
+            metadata={"error": "navigation_loop"},
+        )
 
-        # Process based on node type
+    def _process_node(
+        self,
+        ctx: FlowContext,
+        node: Any,
+        user_message: str | None,
+        event: dict[str, Any] | None,
+        project_context: ProjectContext | None,
+    ) -> EngineResponse | None:
+        """Process the current node; ``None`` means navigation moved to another node."""
         if isinstance(node, QuestionNode):
             return self._process_question_node(ctx, node, user_message, event, project_context)
         if isinstance(node, DecisionNode):
@@ -101,7 +180,7 @@ class LLMFlowEngine:
         user_message: str | None,
         event: dict[str, Any] | None,
         project_context: ProjectContext | None = None,
-    ) -> EngineResponse:
+    ) -> EngineResponse | None:
         """Process a question node."""
         ctx.mark_node_visited(node.id)
         ctx.pending_field = node.key
@@ -113,7 +192,7 @@ class LLMFlowEngine:
                 target = event["target_node_id"]
                 if target and target in self._flow.nodes:
                     ctx.current_node_id = target
-                    return self.process(ctx, None, None, project_context)
+                    return None
 
             # Handle answer events
             if "answer" in event:
@@ -158,7 +237,7 @@ class LLMFlowEngine:
         node: DecisionNode,
         event: dict[str, Any] | None,
         project_context: ProjectContext | None = None,
-    ) -> EngineResponse:
+    ) -> EngineResponse | None:
         """Process a decision node."""
         ctx.mark_node_visited(node.id)
         ctx.pending_field = None
@@ -192,7 +271,7 @@ class LLMFlowEngine:
             target = event["target_node_id"]
             if target and target in self._flow.nodes:
                 ctx.current_node_id = target
-                return self.process(ctx, None, None, project_context)
+                return None
 
         # For automatic decisions, still present options to GPT-5 for consistency
         # GPT-5 will make the routing decision via PerformAction with navigate action
@@ -232,7 +311,7 @@ class LLMFlowEngine:
         ctx: FlowContext,
         node: Any,
         project_context: ProjectContext | None = None,
-    ) -> EngineResponse:
+    ) -> EngineResponse | None:
         """Advance from current node to next."""
         edges = self._get_edges_from_node(node.id)
 
@@ -242,16 +321,16 @@ class LLMFlowEngine:
 
         # Follow first edge (no guard evaluation in simplified version)
         ctx.current_node_id = edges[0].target
-        return self.process(ctx, None, None, project_context)
+        return None
 
     def _find_next_question(
         self,
         ctx: FlowContext,
         project_context: ProjectContext | None = None,
-    ) -> EngineResponse:
+    ) -> EngineResponse | None:
         """Find the next unanswered question."""
-        unanswered = self._get_unanswered_questions(ctx)
-        if not unanswered:
+        next_question = self.next_unanswered_question(ctx)
+        if next_question is None:
             ctx._is_complete = True  # Use internal field
             return EngineResponse(
                 kind="terminal",
@@ -259,16 +338,14 @@ class LLMFlowEngine:
                 node_id=ctx.current_node_id,
             )
 
-        # Pick first unanswered question
-        next_q = unanswered[0]
-        ctx.current_node_id = next_q["id"]
-        return self.process(ctx, None, None, project_context)
+        ctx.current_node_id = next_question
+        return None
 
     def _handle_restart(
         self,
         ctx: FlowContext,
         project_context: ProjectContext | None = None,
-    ) -> EngineResponse:
+    ) -> EngineResponse | None:
         """Handle conversation restart."""
         # Reset context
         entry_node_id = self._flow.entry
@@ -289,7 +366,7 @@ class LLMFlowEngine:
         ctx.escalation_reason = None
 
         # Process from entry
-        return self.process(ctx, None, None, project_context)
+        return None
 
     # Helper methods
 
@@ -328,23 +405,35 @@ class LLMFlowEngine:
             return str(target.label)
         return f"Go to {edge.target}"
 
+    def next_unanswered_question(
+        self, ctx: FlowContext, *, exclude: str | None = None
+    ) -> str | None:
+        """Id of the highest-priority unanswered question (optionally skipping one)."""
+        return self._unanswered_index(ctx).first(exclude=exclude)
+
+    def _unanswered_index(self, ctx: FlowContext) -> UnansweredQuestionIndex:
+        if self._unanswered is None or self._unanswered[0] is not ctx:
+            self._unanswered = (ctx, UnansweredQuestionIndex(self._flow))
+        index = self._unanswered[1]
+        index.sync(ctx.answers)
+        return index
+
     def _get_unanswered_questions(self, ctx: FlowContext) -> list[dict[str, Any]]:
         """Get all unanswered question nodes."""
         unanswered = []
-
-        for node_id, node in self._flow.nodes.items():
-            if isinstance(node, QuestionNode):
-                if node.key not in ctx.answers or ctx.answers[node.key] in (None, ""):
-                    unanswered.append(
-                        {
-                            "id": node.id,
-                            "key": node.key,
-                            "prompt": node.prompt,
-                            "priority": getattr(node, "priority", 100),
-                        }
-                    )
-
-        return sorted(unanswered, key=lambda x: x["priority"])
+        for node_id in self._unanswered_index(ctx).pending():
+            node = self._flow.nodes[node_id]
+            if not isinstance(node, QuestionNode):
+                continue
+            unanswered.append(
+                {
+                    "id": node.id,
+                    "key": node.key,
+                    "prompt": node.prompt,
+                    "priority": node.priority,
+                }
+            )
+        return unanswered
 
     def _suggest_actions(self, node: QuestionNode, ctx: FlowContext) -> list[str]:
         """Suggest possible actions for the current node."""
@@ -9,6 +9,8 @@ from __future__ import annotations
 import logging
 from typing import Any
 
+from app.core.cancellation import CancellationToken, ProcessingCancelledException
+
 from ..actions import ActionResult
 from ..services.responder import EnhancedFlowResponder
 from ..state import FlowContext
@@ -43,6 +45,8 @@ class FeedbackLoop:
         flow_graph: dict[str, Any] | None = None,
         available_edges: list[dict[str, Any]] | None = None,
         current_prompt: str | None = None,
+        *,
+        cancel_token: CancellationToken | None = None,
     ) -> dict[str, Any]:
         """Process an external action result through the LLM feedback loop.
 
@@ -52,6 +56,7 @@ class FeedbackLoop:
             context: Current flow context
             original_messages: Original messages the LLM intended to send
             original_instruction: Original instruction from the LLM
+            cancel_token: Optional token that aborts the in-flight LLM call
 
         Returns:
             Updated response from the LLM based on actual action result
@@ -93,6 +98,7 @@ class FeedbackLoop:
                 is_admin=True,
                 flow_graph=flow_graph,
                 available_edges=available_edges,
+                cancel_token=cancel_token,
             )
 
             # Convert responder output into a simulated llm_response structure
@@ -114,6 +120,8 @@ class FeedbackLoop:
             logger.info("✅ LLM feedback response generated")
             return self._extract_truthful_response(llm_response, action_result)
 
+        except ProcessingCancelledException:
+            raise
         except Exception as e:
             logger.error(f"❌ Error in feedback loop: {e}", exc_info=True)
             # Fallback to a truthful error response
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import re
+import unicodedata
+
 
 def choose_option(user_message: str, allowed_values: list[str]) -> str | None:
     """Return the best matching canonical option for a free-text message.
@@ -20,3 +23,209 @@ def choose_option(user_message: str, allowed_values: list[str]) -> str | None:
         if score > 0 and (best is None or score > best[0]):
             best = (score, val)
     return best[1] if best else None
+
+
+# Deterministic matching for constrained answers (no LLM involved)
+
+_ORDINALS: dict[str, int] = {
+    "primeiro": 1,
+    "primeira": 1,
+    "um": 1,
+    "uma": 1,
+    "segundo": 2,
+    "segunda": 2,
+    "dois": 2,
+    "duas": 2,
+    "terceiro": 3,
+    "terceira": 3,
+    "tres": 3,
+    "quarto": 4,
+    "quarta": 4,
+    "quatro": 4,
+    "quinto": 5,
+    "quinta": 5,
+    "cinco": 5,
+    "sexto": 6,
+    "sexta": 6,
+    "seis": 6,
+    "setimo": 7,
+    "setima": 7,
+    "sete": 7,
+    "oitavo": 8,
+    "oitava": 8,
+    "oito": 8,
+    "nono": 9,
+    "nona": 9,
+    "nove": 9,
+    "decimo": 10,
+    "decima": 10,
+    "dez": 10,
+    "ultimo": -1,
+    "ultima": -1,
+}
+
+_OPTION_PREFIXES = ("opcao", "opc", "op", "alternativa", "letra", "numero", "n", "item")
+
+_FILLER_WORDS = frozenset(
+    {"a", "o", "e", "eh", "quero", "prefiro", "escolho", "pode", "ser", "seria"}
+)
+
+YES_SYNONYMS: frozenset[str] = frozenset(
+    {
+        "sim",
+        "s",
+        "ss",
+        "claro",
+        "com certeza",
+        "certeza",
+        "isso",
+        "isso mesmo",
+        "exato",
+        "correto",
+        "positivo",
+        "pode ser",
+        "pode",
+        "quero",
+        "ok",
+        "okay",
+        "beleza",
+        "aham",
+        "uhum",
+        "yes",
+        "y",
+        "tenho",
+    }
+)
+
+NO_SYNONYMS: frozenset[str] = frozenset(
+    {
+        "nao",
+        "n",
+        "negativo",
+        "nunca",
+        "de jeito nenhum",
+        "nao quero",
+        "nao obrigado",
+        "nao obrigada",
+        "agora nao",
+        "nenhum",
+        "nenhuma",
+        "no",
+        "nope",
+        "nao tenho",
+    }
+)
+
+
+def fold_text(text: str) -> str:
+    """Casefold, strip accents and punctuation, and collapse whitespace."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    cleaned = re.sub(r"[^\w\s]", " ", stripped.replace("_", " "))
+    return " ".join(cleaned.split())
+
+
+def match_yes_no(user_message: str) -> bool | None:
+    """Return True/False for an unambiguous yes/no answer, otherwise None."""
+    text = fold_text(user_message)
+    if text in YES_SYNONYMS:
+        return True
+    if text in NO_SYNONYMS:
+        return False
+    return None
+
+
+def _ordinal_index(text: str, folded_options: list[str]) -> int | None:
+    words = text.split()
+    has_prefix = any(w in _OPTION_PREFIXES for w in words)
+    if len(words) == 1 and has_prefix:
+        return None
+    # Filler words are dropped unless they follow a prefix ("opção e", "letra a")
+    tokens = [
+        w
+        for i, w in enumerate(words)
+        if w not in _OPTION_PREFIXES
+        and (len(words) == 1 or w not in _FILLER_WORDS or words[i - 1] in _OPTION_PREFIXES)
+    ]
+    if len(tokens) != 1:
+        return None
+    token = tokens[0]
+
+    number: int | None = None
+    ordinal_digit = re.fullmatch(r"(\d{1,2})(?:o|a)?", token)
+    if ordinal_digit:
+        # With numbered options ("3 quartos") a bare number is a value, not a position
+        if any(re.search(r"\b\d+\b", option) for option in folded_options):
+            return None
+        number = int(ordinal_digit.group(1))
+    elif token in _ORDINALS:
+        number = _ORDINALS[token]
+    elif len(token) == 1 and token.isalpha() and has_prefix:
+        # Only "opção b" / "letra b": bare "a" and "e" are ordinary words
+        number = ord(token) - ord("a") + 1
+
+    option_count = len(folded_options)
+    if number is None:
+        return None
+    if number == -1:
+        return option_count - 1
+    if 1 <= number <= option_count:
+        return number - 1
+    return None
+
+
+def match_constrained_option(user_message: str, allowed_values: list[str]) -> str | None:
+    """Resolve a message to one of ``allowed_values`` only when unambiguous.
+
+    Unlike ``choose_option`` (best-effort scoring), this returns None whenever
+    the answer is not clearly a single option. Matches, in order:
+    exact accent-folded value, ordinal/number/letter reference ("2", "segunda",
+    "opção B"), yes/no synonyms for yes/no option lists, a single option
+    fully contained in the message, and a bare number found in a single option.
+    Numbers are positions only when no option contains a number, and letters
+    only with an option prefix ("opção b", "letra b").
+    """
+    if not allowed_values:
+        return None
+    text = fold_text(user_message)
+    if not text:
+        return None
+
+    folded = [fold_text(v) for v in allowed_values]
+
+    exact = [v for v, f in zip(allowed_values, folded, strict=True) if f == text]
+    if len(exact) == 1:
+        return exact[0]
+
+    index = _ordinal_index(text, folded)
+    # A bare letter/number is an ordinal unless it is itself one of the options
+    if index is not None and text not in folded:
+        return allowed_values[index]
+
+    yes_no = match_yes_no(user_message)
+    if yes_no is not None:
+        synonyms = YES_SYNONYMS if yes_no else NO_SYNONYMS
+        candidates = [v for v, f in zip(allowed_values, folded, strict=True) if f in synonyms]
+        if len(candidates) == 1:
+            return candidates[0]
+
+    # "quero a opção premium" -> single option mentioned with filler words only
+    contained = [
+        v
+        for v, f in zip(allowed_values, folded, strict=True)
+        if f and re.search(rf"\b{re.escape(f)}\b", text)
+    ]
+    if len(contained) == 1:
+        remainder = re.sub(rf"\b{re.escape(fold_text(contained[0]))}\b", " ", text).split()
+        if all(word in _FILLER_WORDS or word in _OPTION_PREFIXES for word in remainder):
+            return contained[0]
+
+    # A bare number that appears in exactly one option ("3" -> "3 quartos")
+    if text.isdigit():
+        numbered = [
+            v for v, f in zip(allowed_values, folded, strict=True) if re.search(rf"\b{text}\b", f)
+        ]
+        if len(numbered) == 1:
+            return numbered[0]
+
+    return None
@@ -9,17 +9,25 @@ from __future__ import annotations
 import logging
 from typing import TYPE_CHECKING, Any
 
+from app.core.cancellation import ProcessingCancelledException
+
 if TYPE_CHECKING:
+    from app.core.cancellation import CancellationToken
     from app.core.llm import LLMClient
     from app.services.rag.rag_service import RAGService
     from app.services.tenant_config_service import ProjectContext
 
+    from .services.semantic_router import SemanticRouter
+
 from .actions import ActionRegistry
+from .compiler import CompiledFlow
 from .constants import META_NAV_TYPE, META_RESTART
 from .feedback import FeedbackLoop
+from .ir import DecisionNode, QuestionNode
+from .services.fast_path import FastPathResolver, render_prompt
 from .services.responder import EnhancedFlowResponder
 from .services.tool_executor import ToolExecutionResult, ToolExecutionService
-from .state import FlowContext
+from .state import FlowContext, NodeStatus
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +52,9 @@ class FlowTurnRunner:
         compiled_flow: Any,
         action_registry: ActionRegistry | None = None,
         rag_service: RAGService | None = None,
+        *,
+        enable_fast_path: bool = True,
+        semantic_router: SemanticRouter | None = None,
     ):
         """Initialize the flow runner.
 
@@ -52,6 +63,8 @@ class FlowTurnRunner:
             compiled_flow: Compiled flow definition
             action_registry: Optional pre-created action registry (for reuse)
             rag_service: Optional RAG service for document retrieval
+            enable_fast_path: Resolve unambiguous constrained answers without the LLM
+            semantic_router: Optional embedding router for decision nodes
         """
         self._llm_client = llm_client
         self._compiled_flow = compiled_flow
@@ -62,6 +75,12 @@ class FlowTurnRunner:
         self._responder = EnhancedFlowResponder(llm_client)
         self._tool_executor = ToolExecutionService(self._action_registry)
         self._feedback_loop = FeedbackLoop(self._responder)
+        self._fast_path = (
+            FastPathResolver(compiled_flow)
+            if enable_fast_path and isinstance(compiled_flow, CompiledFlow)
+            else None
+        )
+        self._semantic_router = semantic_router if isinstance(compiled_flow, CompiledFlow) else None
 
         logger.info("FlowTurnRunner initialized with RAG support" if rag_service else "FlowTurnRunner initialized")
 
@@ -100,30 +119,18 @@ class FlowTurnRunner:
         user_message: str,
         project_context: ProjectContext | None = None,
         is_admin: bool = False,
+        cancel_token: CancellationToken | None = None,
     ) -> ToolExecutionResult:
-        """Process a single turn in the flow with external action support."""
+        """Process a single turn in the flow with external action support.
+
+        When ``cancel_token`` is triggered (a newer message arrived), in-flight
+        RAG and LLM calls are aborted and ``ProcessingCancelledException`` is
+        raised before any tool is executed.
+        """
         logger.info(f"Processing turn for user message: '{user_message}'")
         try:
-            # Build flow graph from compiled flow
-            flow_graph = (
-                {
-                    "id": self._compiled_flow.id,
-                    "entry": self._compiled_flow.entry,
-                    "nodes": [node.model_dump() for node in self._compiled_flow.nodes.values()],
-                    "edges": [
-                        {
-                            "from": from_id,
-                            "to": edge.target,
-                            "condition": edge.condition_description or edge.label or "",
-                            "priority": edge.priority,
-                        }
-                        for from_id, edges in self._compiled_flow.edges_from.items()
-                        for edge in edges
-                    ],
-                }
-                if self._compiled_flow
-                else None
-            )
+            # Build flow graph (frontier subgraph for customer turns)
+            flow_graph = self._build_flow_graph(ctx, full=is_admin)
 
             # Get available edges from current node
             available_edges = []
@@ -146,6 +153,18 @@ class FlowTurnRunner:
                 if current_node and hasattr(current_node, "data_key"):
                     pending_field = current_node.data_key
 
+            # Constrained answers ("2", "sim", "Opção B") skip RAG and the LLM entirely
+            if self._fast_path and user_message and not is_admin:
+                fast_answer = self._fast_path.resolve(ctx, user_message)
+                if fast_answer:
+                    return self._fast_path.apply(ctx, fast_answer)
+
+            # Decision nodes with a clear semantic winner are routed without the LLM
+            if self._semantic_router and user_message and not is_admin:
+                routed = await self._route_decision_locally(ctx, user_message, cancel_token)
+                if routed:
+                    return routed
+
             # Query RAG if available and tenant has documents
             if self._rag_service and ctx.tenant_id and user_message:
                 try:
@@ -172,6 +191,7 @@ class FlowTurnRunner:
                         chat_history=chat_history,
                         business_context=business_context,
                         thread_id=None,  # Thread ID not available in flow context
+                        cancel_token=cancel_token,
                     )
 
                     # Store RAG results in context (only on success with context)
@@ -194,6 +214,8 @@ class FlowTurnRunner:
                         else:
                             logger.info("No relevant RAG documents found or retrieval failed")
                         
+                except ProcessingCancelledException:
+                    raise
                 except Exception as e:
                     logger.warning(f"RAG query failed: {e}")
                     # Continue without RAG context on error
@@ -218,6 +240,12 @@ class FlowTurnRunner:
                 is_admin=is_admin,
                 flow_graph=flow_graph,
                 available_edges=available_edges,
+                node_ids=(
+                    self._compiled_flow.nodes.keys()
+                    if isinstance(self._compiled_flow, CompiledFlow)
+                    else None
+                ),
+                cancel_token=cancel_token,
             )
 
             # Store messages from responder in the tool result metadata
@@ -235,7 +263,9 @@ class FlowTurnRunner:
                 else []
             }
 
-            # Step 2: Process tool calls
+            # Step 2: Process tool calls (never execute actions for a superseded turn)
+            if cancel_token:
+                cancel_token.raise_if_cancelled("tool_execution")
             tool_result = await self._process_tool_calls(llm_response, ctx)
 
             # CRITICAL: Apply updates to context (fixed in commit 263aac9)
@@ -276,7 +306,7 @@ class FlowTurnRunner:
             final_response = llm_response
             if tool_result.requires_llm_feedback:
                 final_response = await self._handle_external_action_feedback(
-                    llm_response, tool_result, ctx
+                    llm_response, tool_result, ctx, cancel_token
                 )
 
             # Step 4: Return the primary, typed result, enriched with messages
@@ -302,12 +332,112 @@ class FlowTurnRunner:
 
             return tool_result
 
+        except ProcessingCancelledException:
+            raise
         except Exception as e:
             logger.error("Error in turn processing", exc_info=True)
             return ToolExecutionResult(
                 metadata={"error": str(e)},
             )
 
+    def _build_flow_graph(self, ctx: FlowContext, *, full: bool = False) -> dict[str, Any] | None:
+        """Serialize the flow for the prompt.
+
+        Customer turns only see the current node and its k-hop neighbourhood,
+        minus questions that are already answered; targets of the included
+        edges are always listed. Admins (who may edit the flow) and unknown
+        positions get the complete graph.
+        """
+        flow = self._compiled_flow
+        if not flow:
+            return None
+
+        frontier: list[str] = list(flow.nodes)
+        current = ctx.current_node_id
+        if not full and isinstance(flow, CompiledFlow) and current in flow.nodes:
+            frontier = [current] + [
+                node_id
+                for node_id in flow.neighbourhood(current)
+                if not self._is_answered(flow.nodes[node_id], ctx)
+            ]
+
+        # Outgoing edges of every frontier node are kept so that the responder
+        # can tell intermediate nodes from terminal ones; their targets are
+        # listed even when pruned (answered or beyond the neighbourhood)
+        edges = [
+            (node_id, edge) for node_id in frontier for edge in flow.edges_from.get(node_id, [])
+        ]
+        node_ids = list(dict.fromkeys([*frontier, *(edge.target for _, edge in edges)]))
+
+        graph: dict[str, Any] = {
+            "id": flow.id,
+            "entry": flow.entry,
+            "nodes": [flow.nodes[node_id].model_dump() for node_id in node_ids],
+            "edges": [
+                {
+                    "from": node_id,
+                    "to": edge.target,
+                    "condition": edge.condition_description or edge.label or "",
+                    "priority": edge.priority,
+                }
+                for node_id, edge in edges
+            ],
+        }
+        omitted = len(flow.nodes) - len(node_ids)
+        if omitted:
+            graph["omitted_nodes"] = omitted
+        return graph
+
+    @staticmethod
+    def _is_answered(node: Any, ctx: FlowContext) -> bool:
+        return isinstance(node, QuestionNode) and ctx.answers.get(node.key) not in (None, "")
+
+    async def _route_decision_locally(
+        self,
+        ctx: FlowContext,
+        user_message: str,
+        cancel_token: CancellationToken | None,
+    ) -> ToolExecutionResult | None:
+        """Route the current decision node by embedding similarity, if confident."""
+        node = self._compiled_flow.nodes.get(ctx.current_node_id)
+        if self._semantic_router is None or not isinstance(node, DecisionNode):
+            return None
+
+        try:
+            routing = self._semantic_router.route(self._compiled_flow, node.id, user_message)
+            decision = await (
+                cancel_token.run(routing, stage="routing") if cancel_token else routing
+            )
+        except ProcessingCancelledException:
+            raise
+        except Exception as e:
+            logger.warning(f"Semantic routing failed, falling back to LLM: {e}")
+            return None
+
+        target = self._compiled_flow.nodes.get(decision.target or "")
+        if not isinstance(target, QuestionNode):
+            # Ambiguous, or the target needs a generated reply (terminal/decision)
+            return None
+
+        logger.info(
+            f"🧭 Semantic routing: {node.id} -> {target.id} "
+            f"(score={decision.score:.2f}, margin={decision.margin:.2f})"
+        )
+        ctx.get_node_state(node.id).status = NodeStatus.COMPLETED
+        ctx.current_node_id = target.id
+        ctx.pending_field = target.key
+        messages = [{"text": render_prompt(target.prompt, ctx.answers), "delay_ms": 0}]
+        return ToolExecutionResult(
+            navigation={META_NAV_TYPE: target.id},
+            metadata={
+                "tool_name": "PerformAction",
+                "actions": ["navigate"],
+                "target_node_id": target.id,
+                "messages": messages,
+                "semantic_route": {"score": decision.score, "margin": decision.margin},
+            },
+        )
+
     async def _process_tool_calls(
         self,
         llm_response: dict[str, Any],
@@ -328,6 +458,7 @@ class FlowTurnRunner:
         original_response: dict[str, Any],
         tool_result: ToolExecutionResult,
         ctx: FlowContext,
+        cancel_token: CancellationToken | None = None,
     ) -> dict[str, Any]:
         """Handle feedback for external actions."""
         if not tool_result.external_action_result:
@@ -347,6 +478,7 @@ class FlowTurnRunner:
             context=ctx,
             original_messages=original_messages,
             original_instruction=original_instruction,
+            cancel_token=cancel_token,
         )
 
         return {
@@ -4,14 +4,22 @@ This module contains services that handle specific responsibilities
 in the flow processing system.
 """
 
+from .fast_path import FastPathResolver
 from .message_generator import MessageGenerationService
 from .responder import EnhancedFlowResponder, ResponderOutput
+from .semantic_router import HashingEmbedder, SemanticRouter
+from .tool_call_repair import RepairResult, ToolCallRepairer
 from .tool_executor import ToolExecutionResult, ToolExecutionService
 
 __all__ = [
     "EnhancedFlowResponder",
+    "FastPathResolver",
+    "HashingEmbedder",
     "MessageGenerationService",
+    "RepairResult",
     "ResponderOutput",
+    "SemanticRouter",
+    "ToolCallRepairer",
     "ToolExecutionResult",
     "ToolExecutionService",
 ]
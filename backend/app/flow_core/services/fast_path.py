@@ -0,0 +1,128 @@
+"""Deterministic fast path for constrained answers.
+
+When the current question only accepts a fixed set of answers (``allowed_values``
+or a boolean), an unambiguous reply such as "2", "sim" or "Opção B" can be
+resolved without calling the model. The answer is recorded and the flow is
+advanced through ``LLMFlowEngine``; the next prompt is rendered from the node
+template. Anything that would need judgment (ambiguous replies, guarded or
+multi-way transitions, decision nodes) is left to the LLM responder.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from dataclasses import dataclass
+from typing import Any
+
+from app.core.metrics import metrics
+
+from ..compiler import CompiledFlow
+from ..engine import LLMFlowEngine
+from ..ir import QuestionNode
+from ..normalize import match_constrained_option, match_yes_no
+from ..state import FlowContext
+from .tool_executor import ToolExecutionResult
+
+logger = logging.getLogger(__name__)
+
+_PLACEHOLDER = re.compile(r"\{(\w+)\}")
+
+
+@dataclass(slots=True)
+class FastPathAnswer:
+    """A locally resolved answer for the current question."""
+
+    key: str
+    value: Any
+    next_node_id: str
+
+
+def render_prompt(template: str, answers: dict[str, Any]) -> str:
+    """Fill ``{key}`` placeholders from collected answers, leaving unknown ones intact."""
+
+    def _replace(match: re.Match[str]) -> str:
+        value = answers.get(match.group(1))
+        return match.group(0) if value in (None, "") else str(value)
+
+    return _PLACEHOLDER.sub(_replace, template)
+
+
+class FastPathResolver:
+    """Resolves constrained answers and advances the flow without the LLM."""
+
+    def __init__(self, compiled_flow: CompiledFlow) -> None:
+        self._flow = compiled_flow
+        self._engine = LLMFlowEngine(compiled_flow)
+
+    def resolve(self, ctx: FlowContext, user_message: str) -> FastPathAnswer | None:
+        """Return the resolved answer if the turn can be handled locally."""
+        node = self._flow.nodes.get(ctx.current_node_id or "")
+        if not isinstance(node, QuestionNode):
+            return None
+
+        value = self._match_answer(node, user_message)
+        if value is None:
+            return None
+
+        next_node_id = self._deterministic_next_node(ctx, node)
+        if next_node_id is None:
+            metrics.inc("fast_path_misses_total", reason="transition")
+            return None
+
+        return FastPathAnswer(key=node.key, value=value, next_node_id=next_node_id)
+
+    def apply(self, ctx: FlowContext, answer: FastPathAnswer) -> ToolExecutionResult:
+        """Record the answer, advance via the engine and render the next prompt."""
+        response = self._engine.process(ctx, None, event={"answer": answer.value})
+        node = self._flow.nodes.get(response.node_id or "")
+        if response.kind != "prompt" or not isinstance(node, QuestionNode):
+            # resolve() guarantees a question target; treat anything else as a bug
+            raise RuntimeError(f"Fast path reached unexpected node {response.node_id}")
+
+        text = render_prompt(node.prompt, ctx.answers)
+        messages = [{"text": text, "delay_ms": 0}]
+        metrics.inc("fast_path_turns_total", flow_id=ctx.flow_id)
+        logger.info(f"⚡ Fast path: {answer.key}={answer.value!r}, advanced to {response.node_id}")
+        return ToolExecutionResult(
+            updates={answer.key: answer.value},
+            metadata={
+                "tool_name": "PerformAction",
+                "actions": ["update", "navigate"],
+                "updates": {answer.key: answer.value},
+                "target_node_id": response.node_id,
+                "messages": messages,
+                "fast_path": True,
+            },
+        )
+
+    def _match_answer(self, node: QuestionNode, user_message: str) -> Any:
+        if node.allowed_values:
+            return match_constrained_option(user_message, node.allowed_values)
+        if node.data_type == "boolean":
+            return match_yes_no(user_message)
+        return None
+
+    def _deterministic_next_node(self, ctx: FlowContext, node: QuestionNode) -> str | None:
+        """Next question the engine would move to, if that choice is unconditional."""
+        edges = self._flow.edges_from.get(node.id, [])
+        if len(edges) > 1:
+            return None
+
+        if edges:
+            edge = edges[0]
+            guard_name = getattr(edge.guard_fn, "__name__", None)
+            if guard_name == "guard_answers_has":
+                # Satisfied by the answer being recorded only if it guards this key
+                if edge.guard_args.get("key") != node.key:
+                    return None
+            elif edge.guard_fn is not None and guard_name != "guard_always":
+                return None
+            target_id = edge.target
+        else:
+            next_question = self._engine.next_unanswered_question(ctx, exclude=node.id)
+            if next_question is None:
+                return None
+            target_id = next_question
+
+        return target_id if isinstance(self._flow.nodes.get(target_id), QuestionNode) else None
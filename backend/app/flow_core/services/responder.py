@@ -9,9 +9,11 @@ from __future__ import annotations
 import json
 import logging
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, cast
 
 if TYPE_CHECKING:
+    from collections.abc import Collection
+
     from app.core.llm import LLMClient
     from app.services.tenant_config_service import ProjectContext
 
@@ -19,6 +21,8 @@ if TYPE_CHECKING:
 
 from langfuse import get_client
 
+from app.core.cancellation import CancellationToken, ProcessingCancelledException
+from app.core.metrics import metrics
 from app.core.prompts import (
     get_golden_rule,
     get_identity_and_style,
@@ -39,6 +43,7 @@ from ..flow_types import (
     WhatsAppMessage,
 )
 from .message_generator import MessageGenerationService
+from .tool_call_repair import ToolCallRepairer, ToolCallValidationError
 from .tool_executor import ToolExecutionResult, ToolExecutionService
 
 logger = logging.getLogger(__name__)
@@ -87,6 +92,9 @@ class EnhancedFlowResponder:
         available_edges: list[dict[str, Any]] | None = None,
         is_admin: bool = False,
         flow_graph: dict[str, Any] | None = None,
+        *,
+        cancel_token: CancellationToken | None = None,
+        node_ids: Collection[str] | None = None,
     ) -> ResponderOutput:
         """Process user message and generate response with tool calling and natural messages.
 
@@ -98,6 +106,10 @@ class EnhancedFlowResponder:
             allowed_values: Optional allowed values for validation
             project_context: Optional project context for styling
             is_completion: Whether this is a flow completion
+            cancel_token: Optional token that aborts the in-flight LLM call
+            node_ids: Every node id of the flow; navigation targets are checked
+                against it (``flow_graph`` may be pruned). Defaults to the
+                nodes of ``flow_graph``
 
         Returns:
             ResponderOutput with tool execution and natural messages
@@ -121,7 +133,19 @@ class EnhancedFlowResponder:
 
         try:
             # Call GPT-5 with enhanced schema and validation
-            validated_response = self._call_gpt5(
+            repairer = ToolCallRepairer(
+                tools[0],
+                node_ids=(
+                    set(node_ids)
+                    if node_ids is not None
+                    else {node["id"] for node in (flow_graph or {}).get("nodes", [])}
+                ),
+                available_targets=[
+                    str(edge.get("target_node_id", "")) for edge in available_edges or []
+                ],
+                pending_field=pending_field,
+            )
+            validated_response = await self._call_gpt5(
                 instruction,
                 tools,
                 context=context,
@@ -129,6 +153,8 @@ class EnhancedFlowResponder:
                 user_message=user_message,
                 is_admin=is_admin,
                 project_context=project_context,
+                repairer=repairer,
+                cancel_token=cancel_token,
             )
 
             # Process the validated response
@@ -141,6 +167,8 @@ class EnhancedFlowResponder:
 
             return output
 
+        except ProcessingCancelledException:
+            raise
         except Exception as e:
             logger.exception("Error in enhanced responder")
             # Return fallback response
@@ -295,6 +323,13 @@ Não diga "não sei" e fique parado. ESCALE para resolver a dúvida do usuário.
             "available_edges": available_edges if available_edges else [],
         }
 
+        # Customer turns receive only the frontier subgraph around the current node
+        flow_section_title = (
+            "DEFINIÇÃO DO FLUXO (trecho a partir do nó atual; perguntas já respondidas omitidas)"
+            if flow_graph and flow_graph.get("omitted_nodes")
+            else "DEFINIÇÃO COMPLETA DO FLUXO"
+        )
+
         # Build messaging instructions (inject into prompt)
         messaging_instructions = self._build_messaging_instructions(
             project_context=project_context,
@@ -461,7 +496,7 @@ Ferramenta: PerformAction (única disponível)
     - Não navegue para d.roteamento_principal, navegue para onde ele levaria
   * Resumo: Decision nodes são apenas pontos de decisão, e nunca devemos parar neles.
 
-## DEFINIÇÃO COMPLETA DO FLUXO
+## {flow_section_title}
 {json.dumps(flow_graph if flow_graph else {"note": "Flow graph not available"}, ensure_ascii=False, indent=2)}
 
 ## ESTADO ATUAL
@@ -975,7 +1010,7 @@ When an admin requests communication style changes:
 
         return tools
 
-    def _call_gpt5(
+    async def _call_gpt5(
         self,
         instruction: str,
         tools: list[type],
@@ -985,13 +1020,22 @@ When an admin requests communication style changes:
         user_message: str = "",
         is_admin: bool = False,
         project_context: ProjectContext | None = None,
+        *,
+        repairer: ToolCallRepairer | None = None,
+        cancel_token: CancellationToken | None = None,
     ) -> GPT5Response:
-        """Call GPT-5 with enhanced schema and retry on validation failures.
+        """Call GPT-5 with enhanced schema, local repair and retry on validation failures.
+
+        Invalid tool-call arguments are first repaired locally (type coercion,
+        defaults, fuzzy enum/node id matching, message splitting). The model is
+        only called again when local repair cannot produce valid arguments.
 
         Args:
             instruction: The prompt for GPT-5
             tools: Available tools for selection
             max_retries: Maximum retries for schema validation
+            repairer: Optional tool-call repairer bound to the current flow position
+            cancel_token: Optional token that aborts the in-flight LLM call
 
         Returns:
             Validated GPT5Response
@@ -999,45 +1043,39 @@ When an admin requests communication style changes:
         Raises:
             GPT5SchemaError: If validation fails after retries
         """
-        # Create enhanced schema that matches GPT5Response structure
-        enhanced_schema = {
-            "type": "object",
-            "properties": {
-                "tools": {
-                    "type": "array",
-                    "items": {"oneOf": [self._tool_to_schema(tool) for tool in tools]},
-                    "minItems": 1,
-                    "maxItems": 1,  # We only want one tool per response
-                },
-                "reasoning": {
-                    "type": "string",
-                    "description": "Overall reasoning for the response",
-                },
-            },
-            "required": ["tools", "reasoning"],
-        }
+        flow_id = context.flow_id if context else "unknown"
 
-        last_exception = None
+        last_exception: Exception | None = None
         for i in range(max_retries):
+            is_last_attempt = i == max_retries - 1
             try:
                 self._llm_call_count += 1
 
-                # Use the existing LLM interface - just call extract directly
-                result = self._llm.extract(instruction, tools)
+                result = await self._extract(instruction, tools, cancel_token)
 
-                # Convert the result to GPT5Response format if needed
-                if isinstance(result, dict):
-                    return self._convert_langchain_to_gpt5_response(result)
                 # If it's already the right format, return it
-                return result  # type: ignore[unreachable]
+                if not isinstance(result, dict):
+                    return result  # type: ignore[unreachable]
 
+                if repairer is None:
+                    return self._convert_langchain_to_gpt5_response(result)
+
+                return self._validate_or_repair(
+                    result, repairer, flow_id=flow_id, allow_lenient=is_last_attempt
+                )
+
+            except ProcessingCancelledException:
+                raise
             except Exception as e:
                 last_exception = e
                 logger.warning(f"LLM call failed on attempt {i + 1}/{max_retries}: {e}")
+                if not is_last_attempt:
+                    metrics.inc("tool_call_retries_total", flow_id=flow_id)
                 # Add error to instruction for retry
                 error_summary = f"Error: {str(e)[:500]}"
                 instruction += f"\n\n--- PREVIOUS ATTEMPT FAILED ---\nERROR: {error_summary}\nPlease try again with a valid response."
 
+        metrics.inc("tool_call_failures_total", flow_id=flow_id)
         error_msg = f"Failed to get a valid response after {max_retries} retries."
         raise GPT5SchemaError(
             message=error_msg,
@@ -1045,6 +1083,74 @@ When an admin requests communication style changes:
             validation_errors=[str(last_exception)] if last_exception else [],
         ) from last_exception
 
+    async def _extract(
+        self,
+        instruction: str,
+        tools: list[type],
+        cancel_token: CancellationToken | None,
+    ) -> dict[str, Any]:
+        """Call the LLM, preferring the async client so the request can be cancelled."""
+        aextract = getattr(self._llm, "aextract", None)
+        if aextract is None:
+            if cancel_token:
+                cancel_token.raise_if_cancelled("llm")
+            return self._llm.extract(instruction, tools)
+
+        if cancel_token:
+            result = await cancel_token.run(aextract(instruction, tools), stage="llm")
+        else:
+            result = await aextract(instruction, tools)
+        return cast("dict[str, Any]", result)
+
+    def _validate_or_repair(
+        self,
+        result: dict[str, Any],
+        repairer: ToolCallRepairer,
+        flow_id: str,
+        allow_lenient: bool = False,
+    ) -> GPT5Response:
+        """Validate the first tool call and repair it locally when invalid.
+
+        Raises the original validation error when repair fails, unless
+        ``allow_lenient`` is set (last attempt), in which case the unrepaired
+        call is passed through the lenient conversion as before.
+        """
+        metrics.inc("tool_call_responses_total", flow_id=flow_id)
+        tool_calls = result.get("tool_calls") or []
+        if not tool_calls:
+            return self._convert_langchain_to_gpt5_response(result)
+
+        arguments = dict(tool_calls[0].get("arguments") or {})
+        try:
+            repairer.validate(arguments)
+            return self._convert_langchain_to_gpt5_response(result)
+        except ToolCallValidationError as validation_error:
+            repaired = repairer.repair(arguments)
+            try:
+                repairer.validate(repaired.arguments)
+            except ToolCallValidationError:
+                if allow_lenient:
+                    logger.warning(
+                        "Tool-call repair failed on last attempt; using lenient conversion: %s",
+                        validation_error,
+                    )
+                    return self._convert_langchain_to_gpt5_response(result)
+                raise validation_error from None
+
+            # Defaulting only reasoning/confidence is not counted as a repair
+            if repaired.metadata_only:
+                metrics.inc("tool_call_metadata_defaults_total", flow_id=flow_id)
+            else:
+                metrics.inc("tool_call_repairs_total", flow_id=flow_id)
+            logger.info(
+                "Repaired tool call locally (%s) without re-invoking the model",
+                ", ".join(repaired.fixes),
+            )
+            repaired_call = {**tool_calls[0], "arguments": repaired.arguments}
+            return self._convert_langchain_to_gpt5_response(
+                {**result, "tool_calls": [repaired_call, *tool_calls[1:]]}
+            )
+
     async def _process_gpt5_response(
         self,
         response: GPT5Response,
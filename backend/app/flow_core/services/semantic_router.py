@@ -0,0 +1,236 @@
+"""Embedding-based routing for decision nodes.
+
+The candidate edges of a decision node are a small, fixed set known when the
+flow is compiled. Their condition texts are embedded once per compiled flow
+version and cached; at runtime only the user message is embedded. When the
+best edge beats the runner-up by a clear margin the turn is routed locally,
+otherwise the decision is left to the LLM responder.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import math
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Protocol
+
+from app.core.metrics import metrics
+
+from ..ir import DecisionNode
+from ..normalize import fold_text
+
+if TYPE_CHECKING:
+    from ..compiler import CompiledEdge, CompiledFlow
+
+logger = logging.getLogger(__name__)
+
+# Smallest margin at which scripts/eval_semantic_routing.py (HashingEmbedder) is
+# 100% accurate on routed turns; 0.08 sent 7% of them down the wrong edge.
+# Re-check with --embedder openai before enabling routing in production
+DEFAULT_MARGIN = 0.16
+DEFAULT_MIN_SCORE = 0.2
+# Accuracy on locally routed turns below which routing must not be enabled
+MIN_ROUTED_ACCURACY = 0.99
+
+# Boilerplate prefixes used in edge descriptions ("Caminho: viagem")
+_PATH_PREFIX = re.compile(r"^\s*(caminho|path|rota)\s*:\s*", re.IGNORECASE)
+
+
+class TextEmbedder(Protocol):
+    async def embed_texts(self, texts: list[str]) -> list[list[float]]: ...
+
+
+class HashingEmbedder:
+    """Deterministic, dependency-free embedder based on feature hashing.
+
+    Uses accent-folded word tokens and character trigrams. Intended for tests
+    and offline evaluation; it captures lexical overlap, not meaning.
+    """
+
+    def __init__(self, dimensions: int = 256) -> None:
+        self.dimensions = dimensions
+
+    async def embed_texts(self, texts: list[str]) -> list[list[float]]:
+        return [self.embed(text) for text in texts]
+
+    def embed(self, text: str) -> list[float]:
+        vector = [0.0] * self.dimensions
+        folded = fold_text(text)
+        features = folded.split()
+        for word in folded.split():
+            padded = f" {word} "
+            features.extend(padded[i : i + 3] for i in range(len(padded) - 2))
+        for feature in features:
+            digest = hashlib.blake2b(feature.encode(), digest_size=8).digest()
+            index = int.from_bytes(digest[:4], "little") % self.dimensions
+            sign = 1.0 if digest[4] & 1 else -1.0
+            vector[index] += sign
+        return _normalize(vector)
+
+
+@dataclass(slots=True, frozen=True)
+class RouteCandidate:
+    """Outgoing edge of a decision node with the text used to embed it."""
+
+    target: str
+    text: str
+
+
+@dataclass(slots=True)
+class RoutingDecision:
+    """Outcome of semantic routing for one message."""
+
+    target: str | None
+    score: float
+    runner_up_score: float
+
+    @property
+    def margin(self) -> float:
+        return self.score - self.runner_up_score
+
+    @property
+    def confident(self) -> bool:
+        return self.target is not None
+
+
+def edge_routing_text(edge: CompiledEdge, flow: CompiledFlow) -> str:
+    """Human-readable text describing when ``edge`` should be taken."""
+    parts: list[str] = []
+    if edge.condition_description:
+        parts.append(_PATH_PREFIX.sub("", edge.condition_description))
+    if edge.label:
+        parts.append(_PATH_PREFIX.sub("", edge.label))
+    condition = edge.guard_args.get("if")
+    if isinstance(condition, str):
+        parts.append(condition)
+    target = flow.nodes.get(edge.target)
+    target_label = getattr(target, "label", None)
+    if target_label:
+        parts.append(str(target_label))
+    return " | ".join(dict.fromkeys(p.strip() for p in parts if p and p.strip()))
+
+
+def routing_candidates(flow: CompiledFlow) -> dict[str, list[RouteCandidate]]:
+    """Candidate edges per decision node that has a real choice to make."""
+    candidates: dict[str, list[RouteCandidate]] = {}
+    for node_id, node in flow.nodes.items():
+        if not isinstance(node, DecisionNode):
+            continue
+        edges = flow.edges_from.get(node_id, [])
+        # Edges with deterministic guards (e.g. answers_equals) are not semantic choices
+        if len(edges) < 2 or any(
+            getattr(e.guard_fn, "__name__", "guard_always") != "guard_always" for e in edges
+        ):
+            continue
+        node_candidates = [RouteCandidate(e.target, edge_routing_text(e, flow)) for e in edges]
+        if all(c.text for c in node_candidates):
+            candidates[node_id] = node_candidates
+    return candidates
+
+
+def flow_version_key(flow: CompiledFlow, candidates: dict[str, list[RouteCandidate]]) -> str:
+    """Stable key for a compiled flow version, derived from its routing texts."""
+    digest = hashlib.sha1(flow.id.encode())
+    for node_id in sorted(candidates):
+        for candidate in candidates[node_id]:
+            digest.update(f"{node_id}>{candidate.target}:{candidate.text}\n".encode())
+    return digest.hexdigest()
+
+
+class SemanticRouter:
+    """Routes decision nodes by embedding similarity with a confidence margin."""
+
+    def __init__(
+        self,
+        embedder: TextEmbedder,
+        *,
+        margin: float = DEFAULT_MARGIN,
+        min_score: float = DEFAULT_MIN_SCORE,
+        max_cached_versions: int = 128,
+    ) -> None:
+        """Initialize the router.
+
+        Args:
+            embedder: Embedding backend (e.g. ``EmbeddingService``)
+            margin: Minimum score difference between best and runner-up edge
+            min_score: Minimum cosine similarity for the best edge
+            max_cached_versions: Number of compiled flow versions kept in cache
+        """
+        self._embedder = embedder
+        self._margin = margin
+        self._min_score = min_score
+        self._max_cached = max_cached_versions
+        self._cache: OrderedDict[str, dict[str, list[tuple[RouteCandidate, list[float]]]]] = (
+            OrderedDict()
+        )
+
+    async def prepare(
+        self, flow: CompiledFlow
+    ) -> dict[str, list[tuple[RouteCandidate, list[float]]]]:
+        """Embed all decision edges of a compiled flow version (cached)."""
+        candidates = routing_candidates(flow)
+        key = flow_version_key(flow, candidates)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return cached
+
+        ordered = [(node_id, c) for node_id, cs in candidates.items() for c in cs]
+        vectors = await self._embedder.embed_texts([c.text for _, c in ordered]) if ordered else []
+
+        embedded: dict[str, list[tuple[RouteCandidate, list[float]]]] = {}
+        for (node_id, candidate), vector in zip(ordered, vectors, strict=True):
+            embedded.setdefault(node_id, []).append((candidate, _normalize(list(vector))))
+
+        self._cache[key] = embedded
+        while len(self._cache) > self._max_cached:
+            self._cache.popitem(last=False)
+        metrics.inc("semantic_router_edge_embeddings_total", len(ordered))
+        logger.info(f"Prepared semantic routing for flow {flow.id}: {len(ordered)} edge(s)")
+        return embedded
+
+    async def route(self, flow: CompiledFlow, node_id: str, message: str) -> RoutingDecision:
+        """Pick an outgoing edge of ``node_id`` for ``message`` if confident."""
+        embedded = (await self.prepare(flow)).get(node_id)
+        if not embedded or not message.strip():
+            return RoutingDecision(target=None, score=0.0, runner_up_score=0.0)
+
+        (query,) = await self._embedder.embed_texts([message])
+        decision = self.decide(_normalize(list(query)), embedded)
+        metrics.inc(
+            "semantic_routes_total",
+            flow_id=flow.id,
+            outcome="local" if decision.confident else "fallback",
+        )
+        return decision
+
+    def decide(
+        self, query: list[float], embedded: list[tuple[RouteCandidate, list[float]]]
+    ) -> RoutingDecision:
+        scored = sorted(
+            ((_dot(query, vector), candidate) for candidate, vector in embedded),
+            key=lambda item: item[0],
+            reverse=True,
+        )
+        best_score, best = scored[0]
+        runner_up = scored[1][0] if len(scored) > 1 else 0.0
+        confident = best_score >= self._min_score and best_score - runner_up >= self._margin
+        return RoutingDecision(
+            target=best.target if confident else None,
+            score=best_score,
+            runner_up_score=runner_up,
+        )
+
+
+def _dot(a: list[float], b: list[float]) -> float:
+    return sum(x * y for x, y in zip(a, b, strict=False))
+
+
+def _normalize(vector: list[Any]) -> list[float]:
+    norm = math.sqrt(sum(float(v) * float(v) for v in vector))
+    if norm == 0:
+        return [0.0 for _ in vector]
+    return [float(v) / norm for v in vector]
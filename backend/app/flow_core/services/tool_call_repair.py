@@ -0,0 +1,431 @@
+"""Deterministic local repair of LLM tool-call arguments.
+
+Most tool-call validation failures are trivial defects (a missing field, a
+wrong enum case, a string where a list is expected, an over-long message).
+Re-invoking the model for those doubles latency and cost, so the responder
+first tries to fix the arguments locally against the tool JSON schema and the
+compiled flow. A retry LLM call only happens when repair fails.
+"""
+
+from __future__ import annotations
+
+import difflib
+import json
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Any
+
+from pydantic import BaseModel, ValidationError
+
+from ..constants import (
+    DEFAULT_DELAY_MS,
+    MAX_CONFIDENCE,
+    MAX_MESSAGE_LENGTH,
+    MAX_MESSAGES_ALLOWED,
+    MESSAGE_TRUNCATION_LENGTH,
+    NO_DELAY_MS,
+    TRUNCATION_SUFFIX,
+)
+
+logger = logging.getLogger(__name__)
+
+# Minimum similarity for fuzzy enum / node id matching
+FUZZY_MATCH_CUTOFF = 0.75
+
+# Common model slips for PerformAction actions
+ACTION_ALIASES: dict[str, str] = {
+    "navigation": "navigate",
+    "goto": "navigate",
+    "go_to": "navigate",
+    "next": "navigate",
+    "save": "update",
+    "answer": "update",
+    "escalate": "handoff",
+    "human": "handoff",
+    "finish": "complete",
+    "end": "complete",
+    "reset": "restart",
+    "wait": "stay",
+    "clarify": "stay",
+}
+
+# FlowTool bookkeeping fields: defaulting them does not change what the turn does
+METADATA_FIELDS = frozenset({"confidence", "reasoning"})
+
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?…])\s+")
+_LIST_SEPARATORS = re.compile(r"[,;|+\s]+")
+
+
+class ToolCallValidationError(ValueError):
+    """Raised when tool arguments fail the tool's model or the flow's constraints."""
+
+
+@dataclass(slots=True)
+class RepairResult:
+    """Outcome of a local repair attempt."""
+
+    arguments: dict[str, Any]
+    fixes: list[str] = field(default_factory=list)
+    # Names of the arguments whose value differs from the original call
+    changed_fields: frozenset[str] = frozenset()
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.fixes)
+
+    @property
+    def metadata_only(self) -> bool:
+        """True when only ``METADATA_FIELDS`` were changed (not a real repair)."""
+        return self.changed_fields <= METADATA_FIELDS
+
+
+class ToolCallRepairer:
+    """Validate and locally repair tool-call arguments for a single turn.
+
+    The repairer is built per turn because node ids, the pending field and the
+    available navigation targets come from the current flow position.
+    """
+
+    def __init__(
+        self,
+        tool: type[BaseModel],
+        *,
+        node_ids: set[str] | None = None,
+        available_targets: list[str] | None = None,
+        pending_field: str | None = None,
+    ) -> None:
+        self._tool = tool
+        self._schema = tool.model_json_schema()
+        self._properties: dict[str, Any] = self._schema.get("properties", {})
+        self._node_ids = node_ids or set()
+        self._available_targets = [t for t in (available_targets or []) if t]
+        self._pending_field = pending_field
+
+    # ------------------------------------------------------------------
+    # Validation
+    # ------------------------------------------------------------------
+
+    def validate(self, arguments: dict[str, Any]) -> None:
+        """Validate arguments strictly; raises on the first defect found."""
+        try:
+            self._tool.model_validate(arguments)
+        except ValidationError as e:
+            raise ToolCallValidationError(str(e)) from e
+
+        target = arguments.get("target_node_id")
+        if self._node_ids and target and target not in self._node_ids:
+            raise ToolCallValidationError(f"target_node_id '{target}' is not a node of this flow")
+
+        for msg in arguments.get("messages") or []:
+            if isinstance(msg, dict) and len(str(msg.get("text", ""))) > MAX_MESSAGE_LENGTH:
+                raise ToolCallValidationError(f"message exceeds {MAX_MESSAGE_LENGTH} characters")
+
+    # ------------------------------------------------------------------
+    # Repair
+    # ------------------------------------------------------------------
+
+    def repair(self, arguments: dict[str, Any]) -> RepairResult:
+        """Return a repaired copy of the arguments along with the fixes applied."""
+        args = dict(arguments)
+        fixes: list[str] = []
+
+        for name, prop_schema in self._properties.items():
+            if name not in args:
+                continue
+            if name == "messages":
+                continue  # handled by _repair_messages with domain knowledge
+            coerced = self._coerce(args[name], prop_schema)
+            if coerced != args[name]:
+                fixes.append(f"coerced:{name}")
+                args[name] = coerced
+
+        self._fill_defaults(args, fixes)
+        self._repair_actions(args, fixes)
+        self._repair_messages(args, fixes)
+        self._repair_target(args, fixes)
+        self._repair_updates(args, fixes)
+        self._repair_reasons(args, fixes)
+
+        if fixes:
+            logger.info("Tool-call repair applied fixes: %s", fixes)
+        changed_fields = frozenset(
+            name for name in {*arguments, *args} if arguments.get(name) != args.get(name)
+        )
+        return RepairResult(arguments=args, fixes=fixes, changed_fields=changed_fields)
+
+    def _fill_defaults(self, args: dict[str, Any], fixes: list[str]) -> None:
+        if not args.get("reasoning"):
+            args["reasoning"] = "Repaired tool call"
+            fixes.append("default:reasoning")
+        if "actions" in self._properties and not args.get("actions"):
+            args["actions"] = ["stay"]
+            fixes.append("default:actions")
+
+    def _repair_actions(self, args: dict[str, Any], fixes: list[str]) -> None:
+        actions = args.get("actions")
+        if not isinstance(actions, list):
+            return
+        allowed = self._enum_values(self._properties.get("actions", {}).get("items", {}))
+        repaired: list[str] = []
+        for action in actions:
+            matched = self._match_enum(action, allowed, ACTION_ALIASES) if allowed else action
+            if matched and matched not in repaired:
+                repaired.append(matched)
+        if not repaired:
+            repaired = ["stay"]
+        if repaired != actions:
+            args["actions"] = repaired
+            fixes.append("enum:actions")
+
+    def _repair_messages(self, args: dict[str, Any], fixes: list[str]) -> None:
+        raw = args.get("messages")
+        if raw is None:
+            return
+        if isinstance(raw, str):
+            raw = _try_json(raw, default=raw)
+        if isinstance(raw, str | dict):
+            raw = [raw]
+        if not isinstance(raw, list):
+            return
+
+        normalized: list[dict[str, Any]] = []
+        for entry in raw:
+            item = {"text": entry} if isinstance(entry, str) else entry
+            if not isinstance(item, dict):
+                continue
+            text = item.get("text") or item.get("content") or item.get("message") or ""
+            text = str(text).strip()
+            if not text:
+                continue
+            delay = _to_int(item.get("delay_ms"), NO_DELAY_MS)
+            for i, chunk in enumerate(split_message_text(text)):
+                normalized.append(
+                    {"text": chunk, "delay_ms": delay if i == 0 else DEFAULT_DELAY_MS}
+                )
+
+        max_items = self._properties.get("messages", {}).get("maxItems", MAX_MESSAGES_ALLOWED)
+        if len(normalized) > max_items:
+            overflow = " ".join(m["text"] for m in normalized[max_items - 1 :])
+            normalized = normalized[: max_items - 1]
+            normalized.append({"text": _truncate(overflow), "delay_ms": DEFAULT_DELAY_MS})
+
+        if normalized and normalized[0]["delay_ms"] != NO_DELAY_MS:
+            normalized[0]["delay_ms"] = NO_DELAY_MS
+
+        if normalized and normalized != args.get("messages"):
+            args["messages"] = normalized
+            fixes.append("messages")
+
+    def _repair_target(self, args: dict[str, Any], fixes: list[str]) -> None:
+        target = args.get("target_node_id")
+        if target and self._node_ids and target not in self._node_ids:
+            matched = self._match_node_id(str(target))
+            if matched:
+                args["target_node_id"] = matched
+                fixes.append("node_id:target_node_id")
+        elif not target and "navigate" in (args.get("actions") or []):
+            if len(self._available_targets) == 1:
+                args["target_node_id"] = self._available_targets[0]
+                fixes.append("default:target_node_id")
+
+    def _repair_updates(self, args: dict[str, Any], fixes: list[str]) -> None:
+        if "update" not in (args.get("actions") or []) or not self._pending_field:
+            return
+        updates = args.get("updates")
+        if updates is None or updates == {}:
+            return
+        if not isinstance(updates, dict):
+            args["updates"] = {self._pending_field: updates}
+            fixes.append("updates:wrap_scalar")
+            return
+        if self._pending_field in updates or len(updates) != 1:
+            return
+        key, value = next(iter(updates.items()))
+        close = difflib.get_close_matches(
+            str(key).lower(), [self._pending_field.lower()], n=1, cutoff=FUZZY_MATCH_CUTOFF
+        )
+        if close:
+            args["updates"] = {self._pending_field: value}
+            fixes.append("updates:field_name")
+
+    def _repair_reasons(self, args: dict[str, Any], fixes: list[str]) -> None:
+        actions = args.get("actions") or []
+        if "handoff" in actions and not args.get("handoff_reason"):
+            args["handoff_reason"] = args.get("reasoning") or "unspecified"
+            fixes.append("default:handoff_reason")
+
+    # ------------------------------------------------------------------
+    # Schema-driven coercion helpers
+    # ------------------------------------------------------------------
+
+    def _coerce(self, value: Any, schema: dict[str, Any]) -> Any:
+        if "anyOf" in schema:
+            options = schema["anyOf"]
+            if value is None and any(o.get("type") == "null" for o in options):
+                return None
+            non_null = [o for o in options if o.get("type") != "null"]
+            if not non_null:
+                return value
+            schema = non_null[0]
+
+        expected = schema.get("type")
+        if expected == "array":
+            items_schema = schema.get("items", {})
+            if isinstance(value, str):
+                parsed = _try_json(value, default=None)
+                if isinstance(parsed, list):
+                    value = parsed
+                elif self._enum_values(items_schema):
+                    value = [v for v in _LIST_SEPARATORS.split(value) if v]
+                else:
+                    value = [value]
+            elif not isinstance(value, list):
+                value = [value]
+            return [self._coerce(v, items_schema) for v in value]
+
+        if expected == "object":
+            if isinstance(value, str):
+                parsed = _try_json(value, default=value)
+                return parsed
+            return value
+
+        if expected == "number":
+            number = _to_float(value)
+            if number is None:
+                return value
+            maximum = schema.get("maximum")
+            minimum = schema.get("minimum")
+            if maximum == MAX_CONFIDENCE and 1 < number <= 100:
+                number = number / 100  # percentage given instead of a ratio
+            if maximum is not None:
+                number = min(number, float(maximum))
+            if minimum is not None:
+                number = max(number, float(minimum))
+            return number
+
+        if expected == "integer":
+            return _to_int(value, value)
+
+        if expected == "string":
+            allowed = self._enum_values(schema)
+            if allowed:
+                return self._match_enum(value, allowed) or value
+            if isinstance(value, dict | list):
+                return json.dumps(value, ensure_ascii=False)
+            if value is not None and not isinstance(value, str):
+                return str(value)
+        return value
+
+    @staticmethod
+    def _enum_values(schema: dict[str, Any]) -> list[str]:
+        if "enum" in schema:
+            return [str(v) for v in schema["enum"]]
+        if "const" in schema:
+            return [str(schema["const"])]
+        return []
+
+    @staticmethod
+    def _match_enum(
+        value: Any, allowed: list[str], aliases: dict[str, str] | None = None
+    ) -> str | None:
+        if not isinstance(value, str):
+            return None
+        if value in allowed:
+            return value
+        norm = value.strip().strip("'\"").lower().replace("-", "_").replace(" ", "_")
+        for candidate in allowed:
+            if candidate.lower() == norm:
+                return candidate
+        if aliases and norm in aliases and aliases[norm] in allowed:
+            return aliases[norm]
+        close = difflib.get_close_matches(norm, allowed, n=1, cutoff=FUZZY_MATCH_CUTOFF)
+        return close[0] if close else None
+
+    def _match_node_id(self, target: str) -> str | None:
+        norm = target.strip().strip("'\"")
+        if norm in self._node_ids:
+            return norm
+        lowered = {nid.lower(): nid for nid in self._node_ids}
+        if norm.lower() in lowered:
+            return lowered[norm.lower()]
+        # Prefer the navigation targets available from the current node
+        for pool in (self._available_targets, sorted(self._node_ids)):
+            close = difflib.get_close_matches(norm, pool, n=2, cutoff=FUZZY_MATCH_CUTOFF)
+            if len(close) == 1:
+                return close[0]
+            if len(close) > 1:
+                first = difflib.SequenceMatcher(None, norm, close[0]).ratio()
+                second = difflib.SequenceMatcher(None, norm, close[1]).ratio()
+                if first > second:
+                    return close[0]
+        return None
+
+
+def split_message_text(text: str, limit: int = MAX_MESSAGE_LENGTH) -> list[str]:
+    """Split text into WhatsApp-sized chunks, preferring sentence then word boundaries."""
+    if len(text) <= limit:
+        return [text]
+
+    chunks: list[str] = []
+    current = ""
+    pieces: list[str] = []
+    for sentence in _SENTENCE_BREAK.split(text):
+        if len(sentence) <= limit:
+            pieces.append(sentence)
+        else:
+            pieces.extend(sentence.split(" "))
+
+    for piece in pieces:
+        if not piece:
+            continue
+        candidate = f"{current} {piece}".strip() if current else piece
+        if len(candidate) <= limit:
+            current = candidate
+            continue
+        if current:
+            chunks.append(current)
+        current = piece if len(piece) <= limit else _truncate(piece)
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _truncate(text: str) -> str:
+    if len(text) <= MAX_MESSAGE_LENGTH:
+        return text
+    return text[:MESSAGE_TRUNCATION_LENGTH] + TRUNCATION_SUFFIX
+
+
+def _try_json(value: str, default: Any) -> Any:
+    try:
+        return json.loads(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _to_float(value: Any) -> float | None:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int | float):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value.strip().rstrip("%").replace(",", "."))
+        except ValueError:
+            return None
+    return None
+
+
+def _to_int(value: Any, default: Any) -> Any:
+    number = _to_float(value)
+    return int(number) if number is not None else default
+
+
+__all__ = [
+    "METADATA_FIELDS",
+    "RepairResult",
+    "ToolCallRepairer",
+    "ToolCallValidationError",
+    "split_message_text",
+]
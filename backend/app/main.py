@@ -16,15 +16,21 @@ from app.config.loader import load_json_config
 from app.core.app_context import AppContext, get_app_context, set_app_context
 from app.core.langchain_adapter import LangChainToolsLLM
 from app.core.logging import RequestIdMiddleware, setup_logging
+from app.core.pagination import NEXT_CURSOR_HEADER
 from app.core.session import StableSessionPolicy
 from app.core.state import InMemoryStore, RedisStore
 from app.db.base import Base
+from app.db.decryption import DecryptionCacheMiddleware
 from app.db.session import get_engine
 from app.router import api_router
 from app.services.rate_limiter import (
+    AdmissionController,
+    InMemoryAdmissionBackend,
     InMemoryRateLimiterBackend,
     RateLimiter,
+    RedisAdmissionBackend,
     RedisRateLimiterBackend,
+    TokenBucket,
 )
 from app.settings import get_settings
 
@@ -68,7 +74,11 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         redis_url = settings.redis_url
     if redis_url:
         try:
-            ctx.store = RedisStore(redis_url)
+            ctx.store = RedisStore(
+                redis_url,
+                max_connections=settings.redis_max_connections,
+                cluster=settings.redis_cluster,
+            )
             logger.info("Conversation store initialized with Redis: %s", redis_url)
         except Exception as e:
             logger.warning("Redis connection failed (%s), falling back to in-memory store", e)
@@ -77,10 +87,82 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         ctx.store = InMemoryStore()
         logger.info("Conversation store initialized with in-memory backend")
 
+    # Initialize the per-worker flow context cache (needs Redis for invalidation)
+    if isinstance(ctx.store, RedisStore) and settings.session_cache_enabled:
+        try:
+            from app.core.session_cache import SessionContextCache
+
+            ctx.session_cache = SessionContextCache(
+                max_entries=settings.session_cache_max_entries,
+                ttl_seconds=settings.session_cache_ttl_seconds,
+            )
+            await ctx.session_cache.start(ctx.store.async_redis_client)
+            logger.info("Session context cache initialized")
+        except Exception as e:
+            logger.warning("Failed to initialize session context cache: %s", e)
+            ctx.session_cache = None
+
+    # Cache ETags of admin resources; commits touching them drop the entries
+    if isinstance(ctx.store, RedisStore) and settings.etag_cache_enabled:
+        try:
+            from app.core.etags import ETagCache
+            from app.db.etag_events import set_etag_invalidator
+
+            ctx.etag_cache = ETagCache(
+                ctx.store.async_redis_client,
+                ctx.store.redis_client,
+                ttl_seconds=settings.etag_cache_ttl_seconds,
+            )
+            set_etag_invalidator(ctx.etag_cache.invalidate)
+            logger.info("ETag cache initialized")
+        except Exception as e:
+            logger.warning("Failed to initialize ETag cache: %s", e)
+            ctx.etag_cache = None
+
+    # Move idle sessions out of Redis into Postgres (rehydrated on their next message)
+    if isinstance(ctx.store, RedisStore) and settings.session_tiering_enabled:
+        try:
+            from app.services.session_tiering import (
+                PostgresColdSessionStore,
+                SessionTieringSweeper,
+            )
+
+            ctx.cold_sessions = PostgresColdSessionStore()
+            ctx.session_tiering = SessionTieringSweeper(
+                ctx.store.aio,
+                ctx.cold_sessions,
+                idle_seconds=settings.session_tiering_idle_seconds,
+                interval_seconds=settings.session_tiering_interval_seconds,
+                batch_size=settings.session_tiering_batch_size,
+            )
+            await ctx.session_tiering.start()
+            logger.info("Session tiering initialized")
+        except Exception as e:
+            logger.warning("Failed to initialize session tiering: %s", e)
+            ctx.cold_sessions = None
+            ctx.session_tiering = None
+
+    # Keep the hourly message stats rollup behind the dashboards current
+    if settings.stats_rollup_enabled:
+        try:
+            from app.services.stats_rollup import StatsRollupJob
+
+            ctx.stats_rollup = StatsRollupJob(
+                interval_seconds=settings.stats_rollup_interval_seconds,
+                lookback_hours=settings.stats_rollup_lookback_hours,
+            )
+            await ctx.stats_rollup.start()
+            logger.info("Stats rollup job initialized")
+        except Exception as e:
+            logger.warning("Failed to initialize stats rollup job: %s", e)
+            ctx.stats_rollup = None
+
     # Initialize rate limiter
     try:
         if redis_url:
-            ctx.rate_limiter = RateLimiter(RedisRateLimiterBackend(redis_url))
+            ctx.rate_limiter = RateLimiter(
+                RedisRateLimiterBackend(redis_url, cluster=settings.redis_cluster)
+            )
             logger.info("Rate limiter initialized with Redis backend")
         else:
             ctx.rate_limiter = RateLimiter(InMemoryRateLimiterBackend())
@@ -89,6 +171,30 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         logger.warning("Rate limiter initialization failed: %s", e)
         ctx.rate_limiter = None
 
+    # Initialize webhook admission control
+    if settings.admission_control_enabled:
+        try:
+            backend = (
+                RedisAdmissionBackend(ctx.store.async_redis_client)
+                if isinstance(ctx.store, RedisStore)
+                else InMemoryAdmissionBackend()
+            )
+            ctx.admission = AdmissionController(
+                backend,
+                contact=TokenBucket(
+                    settings.admission_contact_burst, settings.admission_contact_rate
+                ),
+                channel=TokenBucket(
+                    settings.admission_channel_burst, settings.admission_channel_rate
+                ),
+                tenant=TokenBucket(settings.admission_tenant_burst, settings.admission_tenant_rate),
+                max_defer_seconds=settings.admission_max_defer_ms / 1000,
+            )
+            logger.info("Admission control initialized")
+        except Exception as e:
+            logger.warning("Admission control initialization failed: %s", e)
+            ctx.admission = None
+
     # Initialize cancellation manager for rapid message handling
     try:
         from app.services.processing_cancellation_manager import ProcessingCancellationManager
@@ -121,6 +227,23 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         ctx.rag_service = None
         logger.info("RAG service not initialized (PG_VECTOR_DATABASE_URL or OPENAI_API_KEY not configured)")
 
+    # Initialize semantic routing for decision nodes (reuses the RAG embedder if present)
+    if settings.semantic_routing_enabled and settings.openai_api_key:
+        try:
+            from app.flow_core.services.semantic_router import SemanticRouter
+            from app.services.rag.embedding import EmbeddingService
+
+            embedder = (
+                ctx.rag_service.embedding_service
+                if ctx.rag_service
+                else EmbeddingService(settings.openai_api_key, dimensions=512)
+            )
+            ctx.semantic_router = SemanticRouter(embedder, margin=settings.semantic_routing_margin)
+            logger.info("Semantic decision routing initialized")
+        except Exception as e:
+            logger.warning(f"Failed to initialize semantic routing: {e}")
+            ctx.semantic_router = None
+
     # Initialize database tables
     try:
         engine = get_engine()
@@ -129,10 +252,44 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     except Exception as e:
         logger.warning("Failed to create DB tables on startup: %s", e)
 
+    # Create upcoming messages partitions (and archive expired ones) in the background
+    if settings.message_partitions_enabled:
+        try:
+            from pathlib import Path
+
+            from app.services.message_archival import MessagePartitionJob
+
+            ctx.message_partitions = MessagePartitionJob(
+                months_ahead=settings.message_partition_months_ahead,
+                archive_after_months=settings.message_archive_after_months,
+                archive_dir=Path(settings.message_archive_dir),
+            )
+            await ctx.message_partitions.start()
+        except Exception as e:
+            logger.warning("Failed to initialize messages partition maintenance: %s", e)
+            ctx.message_partitions = None
+
     yield
 
     # Shutdown (if needed)
     logger.info("Application shutting down")
+    if ctx.session_tiering is not None:
+        await ctx.session_tiering.stop()
+    if ctx.stats_rollup is not None:
+        await ctx.stats_rollup.stop()
+    if ctx.message_partitions is not None:
+        await ctx.message_partitions.stop()
+    if ctx.session_cache is not None:
+        await ctx.session_cache.stop()
+    if ctx.etag_cache is not None:
+        from app.db.etag_events import set_etag_invalidator
+
+        set_etag_invalidator(None)
+    if isinstance(ctx.store, RedisStore):
+        try:
+            await ctx.store.close_async()
+        except Exception as e:
+            logger.warning("Failed to close async Redis pool: %s", e)
 
 
 app = FastAPI(
@@ -162,9 +319,13 @@ app.add_middleware(
         "X-CSRF-Token",
         "Cache-Control",
         "Pragma",
+        "If-None-Match",
+        "If-Modified-Since",
     ],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag", "Last-Modified"],
 )
 app.add_middleware(RequestIdMiddleware)
+app.add_middleware(DecryptionCacheMiddleware, maxsize=get_settings().pii_decryption_cache_size)
 
 # Add session middleware for admin authentication
 app.add_middleware(
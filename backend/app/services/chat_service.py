@@ -6,8 +6,9 @@ from uuid import UUID
 
 from sqlalchemy.orm import Session
 
+from app.core.pagination import PageKey
 from app.db import repository
-from app.db.models import ChatThread, Contact, ThreadStatus
+from app.db.models import ChatThread, Contact, Message, ThreadStatus
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +38,7 @@ class ChatService:
         channel_instance_id: UUID | None = None,
         limit: int = 50,
         offset: int = 0,
+        after: PageKey | None = None,
     ) -> Sequence[ChatThread]:
         """Get chat threads for a tenant with optional filtering."""
         return repository.get_threads_by_tenant(
@@ -45,6 +47,7 @@ class ChatService:
             channel_instance_id=channel_instance_id,
             limit=limit,
             offset=offset,
+            after=after,
         )
 
     def get_thread_detail(self, tenant_id: UUID, thread_id: UUID) -> ChatThread:
@@ -60,10 +63,27 @@ class ChatService:
         *,
         limit: int = 100,
         offset: int = 0,
+        after: PageKey | None = None,
     ) -> Sequence[Contact]:
         """Get contacts for a tenant."""
         return repository.get_contacts_by_tenant(
-            self.session, tenant_id, limit=limit, offset=offset
+            self.session, tenant_id, limit=limit, offset=offset, after=after
+        )
+
+    def get_messages(
+        self,
+        tenant_id: UUID,
+        thread_id: UUID,
+        *,
+        limit: int = 100,
+        after: PageKey | None = None,
+    ) -> Sequence[Message]:
+        """Get a page of a thread's messages, raising error if the thread is not found."""
+        thread = repository.get_thread_by_id(self.session, tenant_id, thread_id)
+        if not thread:
+            raise ThreadNotFoundError(f"Thread {thread_id} not found")
+        return repository.get_messages_by_thread(
+            self.session, thread_id, limit=limit, after=after, since=thread.created_at
         )
 
     def update_thread_status(
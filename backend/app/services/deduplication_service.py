@@ -6,6 +6,8 @@ import logging
 import time
 from typing import TYPE_CHECKING, Any
 
+from app.core.state import AsyncRedisStore, async_store
+
 if TYPE_CHECKING:
     from app.core.state import ConversationStore
 
@@ -29,8 +31,9 @@ class MessageDeduplicationService:
 
     def __init__(self, store: ConversationStore):
         self.store = store
+        self._async_store = async_store(store)
 
-    def is_duplicate_message(
+    async def is_duplicate_message(
         self,
         message_id: str | None,
         sender_number: str,
@@ -54,42 +57,35 @@ class MessageDeduplicationService:
         current_time = time.time()
 
         if message_id:
-            return self._check_message_id_duplicate(message_id, current_time, client_ip)
+            return await self._check_message_id_duplicate(
+                message_id, sender_number, current_time, client_ip
+            )
         logger.warning(
             "No message ID found for deduplication in webhook from IP=%s, params keys: %s",
             client_ip,
             list(params.keys()),
         )
-        return self._check_fallback_duplicate(
+        return await self._check_fallback_duplicate(
             sender_number, receiver_number, params, current_time, client_ip
         )
 
-    def _check_message_id_duplicate(
-        self, message_id: str, current_time: float, client_ip: str
+    async def _check_message_id_duplicate(
+        self, message_id: str, sender_number: str, current_time: float, client_ip: str
     ) -> bool:
         """Check for duplicates using message ID."""
         logger.debug("Processing webhook with message_id=%s from IP=%s", message_id, client_ip)
 
         dedup_key = f"webhook_processed:{message_id}"
-        existing = self.store.load("system", dedup_key)
+        if await self._claim(sender_number, dedup_key, current_time, self.MESSAGE_ID_TTL_SECONDS):
+            logger.debug("Marked message %s as processed for deduplication", message_id)
+            return False
 
-        if existing and isinstance(existing, dict):
-            processed_at = existing.get("processed_at", 0)
-            if current_time - processed_at < self.MESSAGE_ID_TTL_SECONDS:
-                logger.info(
-                    "Skipping duplicate webhook for message_id=%s from IP=%s (processed %ds ago)",
-                    message_id,
-                    client_ip,
-                    int(current_time - processed_at),
-                )
-                return True
-
-        # Mark message as being processed
-        self.store.save("system", dedup_key, {"processed_at": int(current_time)})
-        logger.debug("Marked message %s as processed for deduplication", message_id)
-        return False
-
-    def _check_fallback_duplicate(
+        logger.info(
+            "Skipping duplicate webhook for message_id=%s from IP=%s", message_id, client_ip
+        )
+        return True
+
+    async def _check_fallback_duplicate(
         self,
         sender_number: str,
         receiver_number: str,
@@ -101,17 +97,31 @@ class MessageDeduplicationService:
         fallback_key = f"{sender_number}:{receiver_number}:{hash(str(params))}"
         dedup_key = f"webhook_processed:{fallback_key}"
 
-        existing = self.store.load("system", dedup_key)
+        # Mark as processed with shorter TTL
+        if await self._claim(sender_number, dedup_key, current_time, self.FALLBACK_TTL_SECONDS):
+            return False
+
+        logger.info("Skipping likely duplicate webhook (no message_id) from IP=%s", client_ip)
+        return True
+
+    async def _claim(
+        self, sender_number: str, dedup_key: str, current_time: float, ttl_seconds: int
+    ) -> bool:
+        """Mark ``dedup_key`` as processed; False if it was processed within ``ttl_seconds``.
+
+        Markers are stored under the sender so they share the conversation's
+        Redis Cluster slot.
+        """
+        owner = sender_number or "system"
+        marker = {"processed_at": int(current_time)}
+        if isinstance(self._async_store, AsyncRedisStore):
+            # One round trip (SET NX EX); the key expires with the dedup window
+            return await self._async_store.claim(owner, dedup_key, marker, ttl_seconds)
+
+        existing = await self._async_store.load(owner, dedup_key)
         if existing and isinstance(existing, dict):
             processed_at = existing.get("processed_at", 0)
-            if current_time - processed_at < self.FALLBACK_TTL_SECONDS:
-                logger.info(
-                    "Skipping likely duplicate webhook (no message_id) from IP=%s (processed %ds ago)",
-                    client_ip,
-                    int(current_time - processed_at),
-                )
-                return True
-
-        # Mark as processed with shorter TTL
-        self.store.save("system", dedup_key, {"processed_at": int(current_time)})
-        return False
+            if current_time - processed_at < ttl_seconds:
+                return False
+        await self._async_store.save(owner, dedup_key, marker)
+        return True
@@ -6,19 +6,21 @@ using batch actions from the LLM in a single tool call.
 
 from __future__ import annotations
 
-import copy
 import logging
+from collections import deque
 from dataclasses import dataclass
 from enum import Enum
 from typing import Any, TypedDict
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
 from sqlalchemy.orm import Session
 
 from app.db import repository
 from app.flow_core.compiler import FlowCompiler
+from app.flow_core.ir import Edge as EdgeIR
 from app.flow_core.ir import Flow as FlowIR
+from app.flow_core.ir import Node
 
 logger = logging.getLogger(__name__)
 
@@ -67,6 +69,7 @@ class ActionResult:
     success: bool
     message: str
     error: str | None = None
+    warning: str | None = None
 
 
 @dataclass
@@ -79,6 +82,124 @@ class BatchActionResult:
     error: str | None = None
 
 
+class _FlowDraft:
+    """Copy-on-write working copy of a flow definition.
+
+    Nodes and edges are shared with the original definition until an action
+    modifies them, at which point only that node/edge dict is copied. Lookups
+    by node id and edge endpoints are O(1), and each action is validated
+    locally against the draft instead of recompiling the whole flow.
+    """
+
+    def __init__(self, flow: dict[str, Any]) -> None:
+        self._base = flow
+        self.entry: str | None = flow.get("entry")
+        self.nodes: dict[str, dict[str, Any]] = {}
+        self._extra_nodes: list[dict[str, Any]] = []
+        for node in flow.get("nodes", []):
+            if node.get("id") in self.nodes:
+                # Keep duplicates so that full validation can still report them
+                self._extra_nodes.append(node)
+            else:
+                self.nodes[node.get("id")] = node
+        self._edges: dict[int, dict[str, Any]] = {}
+        self._edge_keys: dict[tuple[str, str], list[int]] = {}
+        self._outgoing: dict[str, dict[str, int]] = {}
+        self._incident: dict[str, set[tuple[str, str]]] = {}
+        self._next_key = 0
+        for edge in flow.get("edges", []):
+            self.add_edge(edge)
+
+    # Nodes
+
+    def replace_node(self, node_id: str, node: dict[str, Any]) -> None:
+        new_id: str = node["id"]
+        if new_id == node_id:
+            self.nodes[node_id] = node
+            return
+        # Renames keep the node's position
+        self.nodes = {
+            (new_id if key == node_id else key): (node if key == node_id else value)
+            for key, value in self.nodes.items()
+        }
+
+    def remove_node(self, node_id: str) -> None:
+        del self.nodes[node_id]
+        for pair in list(self._incident.get(node_id, ())):
+            self.remove_edge(pair)
+        self._incident.pop(node_id, None)
+
+    def is_referenced(self, node_id: str) -> bool:
+        return bool(self._incident.get(node_id)) or self.entry == node_id
+
+    # Edges
+
+    def edge(self, source: str, target: str) -> dict[str, Any] | None:
+        keys = self._edge_keys.get((source, target))
+        return self._edges[keys[0]] if keys else None
+
+    def add_edge(self, edge: dict[str, Any]) -> None:
+        # Edges loaded with a missing endpoint are kept for full validation
+        source: str = edge.get("source", "")
+        target: str = edge.get("target", "")
+        key = self._next_key
+        self._next_key += 1
+        self._edges[key] = edge
+        self._edge_keys.setdefault((source, target), []).append(key)
+        self._outgoing.setdefault(source, {})
+        self._outgoing[source][target] = self._outgoing[source].get(target, 0) + 1
+        for node_id in (source, target):
+            self._incident.setdefault(node_id, set()).add((source, target))
+
+    def replace_edge(self, source: str, target: str, edge: dict[str, Any]) -> None:
+        """Replace the first edge between ``source`` and ``target``."""
+        key = self._edge_keys[(source, target)][0]
+        if (edge.get("source"), edge.get("target")) == (source, target):
+            self._edges[key] = edge
+            return
+        self.remove_edge((source, target), first_only=True)
+        self.add_edge(edge)
+
+    def remove_edge(self, pair: tuple[str, str], *, first_only: bool = False) -> None:
+        keys = self._edge_keys.get(pair, [])
+        removed = keys[:1] if first_only else list(keys)
+        for key in removed:
+            del self._edges[key]
+            keys.remove(key)
+        source, target = pair
+        counts = self._outgoing.get(source, {})
+        counts[target] = counts.get(target, 0) - len(removed)
+        if counts.get(target, 0) <= 0:
+            counts.pop(target, None)
+        if not keys:
+            self._edge_keys.pop(pair, None)
+            for node_id in pair:
+                self._incident.get(node_id, set()).discard(pair)
+
+    def reaches(self, start: str, goal: str) -> bool:
+        """Whether ``goal`` is reachable from ``start`` in the draft graph."""
+        if start == goal:
+            return True
+        visited = {start}
+        queue = deque([start])
+        while queue:
+            for target in self._outgoing.get(queue.popleft(), {}):
+                if target == goal:
+                    return True
+                if target not in visited:
+                    visited.add(target)
+                    queue.append(target)
+        return False
+
+    def materialize(self) -> dict[str, Any]:
+        """Build the resulting flow definition (untouched entries are shared)."""
+        flow = dict(self._base)
+        flow["entry"] = self.entry
+        flow["nodes"] = list(self.nodes.values()) + self._extra_nodes
+        flow["edges"] = list(self._edges.values())
+        return flow
+
+
 class FlowModificationService:
     """Service for executing batch flow modifications atomically.
 
@@ -106,16 +227,23 @@ class FlowModificationService:
             flow_id: Optional flow ID for persistence
             persist: Whether to persist changes to database
 
+        Actions are applied to a copy-on-write draft and validated locally
+        (node/edge schema, endpoints, dangling references). The full
+        ``Flow`` validation and compilation only runs when the change is
+        persisted.
+
         Returns:
-            BatchActionResult with success status and modified flow
+            BatchActionResult with success status and modified flow. Unchanged
+            nodes and edges of the modified flow are shared with ``flow``.
         """
         if not actions:
             return BatchActionResult(
                 success=False, modified_flow=None, action_results=[], error="No actions provided"
             )
 
-        # Work on a deep copy to ensure atomicity of nested structures (nodes/edges)
-        working_flow = copy.deepcopy(flow)
+        # Copy-on-write draft: the caller's definition is never mutated, so a
+        # failed batch needs no rollback
+        draft = _FlowDraft(flow)
         action_results = []
 
         logger.info("=" * 80)
@@ -131,7 +259,7 @@ class FlowModificationService:
                 action_type = ActionType(action.get("action", ""))
                 logger.info(f"Action {i + 1}/{len(actions)}: {action_type.value}")
 
-                result = self._execute_single_action(working_flow, action)
+                result = self._execute_single_action(draft, action)
                 action_results.append(result)
 
                 if not result.success:
@@ -162,17 +290,31 @@ class FlowModificationService:
                     error=f"Unexpected error in action {i + 1}: {e!s}",
                 )
 
-        # Validate the modified flow
-        validation_result = self._validate_flow(working_flow)
-        if not validation_result.success:
-            logger.error(f"Flow validation failed after modifications: {validation_result.error}")
+        # Actions validate locally; only the entry reference is checked per batch
+        if draft.entry not in draft.nodes:
             return BatchActionResult(
                 success=False,
                 modified_flow=None,
                 action_results=action_results,
-                error=f"Flow validation failed: {validation_result.error}",
+                error=f"Flow validation failed: Entry node '{draft.entry}' not found",
             )
 
+        working_flow = draft.materialize()
+
+        # Full validation/compilation only when committing the change
+        if persist and flow_id and self.session:
+            validation_result = self._validate_flow(working_flow)
+            if not validation_result.success:
+                logger.error(
+                    f"Flow validation failed after modifications: {validation_result.error}"
+                )
+                return BatchActionResult(
+                    success=False,
+                    modified_flow=None,
+                    action_results=action_results,
+                    error=f"Flow validation failed: {validation_result.error}",
+                )
+
         # Persist if requested and we have the necessary context
         if persist and flow_id and self.session:
             logger.info(f"💾 Attempting to persist flow {flow_id} to database...")
@@ -206,25 +348,25 @@ class FlowModificationService:
             success=True, modified_flow=working_flow, action_results=action_results, error=None
         )
 
-    def _execute_single_action(self, flow: dict[str, Any], action: FlowAction) -> ActionResult:
-        """Execute a single action on the flow (mutates flow in place)."""
+    def _execute_single_action(self, draft: _FlowDraft, action: FlowAction) -> ActionResult:
+        """Execute and locally validate a single action on the draft."""
         action_type = ActionType(action.get("action", ""))
 
         try:
             if action_type == ActionType.ADD_NODE:
-                return self._add_node(flow, action)
+                return self._add_node(draft, action)
             if action_type == ActionType.UPDATE_NODE:
-                return self._update_node(flow, action)
+                return self._update_node(draft, action)
             if action_type == ActionType.DELETE_NODE:
-                return self._delete_node(flow, action)
+                return self._delete_node(draft, action)
             if action_type == ActionType.ADD_EDGE:
-                return self._add_edge(flow, action)
+                return self._add_edge(draft, action)
             if action_type == ActionType.UPDATE_EDGE:
-                return self._update_edge(flow, action)
+                return self._update_edge(draft, action)
             if action_type == ActionType.DELETE_EDGE:
-                return self._delete_edge(flow, action)
+                return self._delete_edge(draft, action)
             if action_type == ActionType.SET_ENTRY:
-                return self._set_entry(flow, action)
+                return self._set_entry(draft, action)
             return ActionResult(
                 action_type=action_type,
                 success=False,
@@ -235,7 +377,7 @@ class FlowModificationService:
             logger.error(f"Error executing {action_type.value}: {e}", exc_info=True)
             return ActionResult(action_type=action_type, success=False, message="", error=str(e))
 
-    def _add_node(self, flow: dict[str, Any], action: FlowAction) -> ActionResult:
+    def _add_node(self, draft: _FlowDraft, action: FlowAction) -> ActionResult:
         """Add a node to the flow."""
         node_def = action.get("node_definition")
         if not node_def:
@@ -255,10 +397,8 @@ class FlowModificationService:
                 error="node_definition must include 'id' field",
             )
 
-        nodes = flow.setdefault("nodes", [])
-
         # Check if node already exists
-        if any(n.get("id") == node_id for n in nodes):
+        if node_id in draft.nodes:
             return ActionResult(
                 action_type=ActionType.ADD_NODE,
                 success=False,
@@ -266,7 +406,13 @@ class FlowModificationService:
                 error=f"Node '{node_id}' already exists",
             )
 
-        nodes.append(node_def)
+        error = _node_error(node_def)
+        if error:
+            return ActionResult(
+                action_type=ActionType.ADD_NODE, success=False, message="", error=error
+            )
+
+        draft.nodes[node_id] = dict(node_def)
 
         return ActionResult(
             action_type=ActionType.ADD_NODE,
@@ -275,7 +421,7 @@ class FlowModificationService:
             error=None,
         )
 
-    def _update_node(self, flow: dict[str, Any], action: FlowAction) -> ActionResult:
+    def _update_node(self, draft: _FlowDraft, action: FlowAction) -> ActionResult:
         """Update an existing node in the flow."""
         node_id = action.get("node_id")
         updates = action.get("updates", {})
@@ -288,17 +434,8 @@ class FlowModificationService:
                 error="node_id is required for update_node action",
             )
 
-        nodes = flow.get("nodes", [])
-        node_found = False
-
-        for node in nodes:
-            if node.get("id") == node_id:
-                # Merge updates with existing node, prioritizing new values
-                node.update(updates)
-                node_found = True
-                break
-
-        if not node_found:
+        node = draft.nodes.get(node_id)
+        if node is None:
             return ActionResult(
                 action_type=ActionType.UPDATE_NODE,
                 success=False,
@@ -306,6 +443,29 @@ class FlowModificationService:
                 error=f"Node '{node_id}' not found",
             )
 
+        # Merge updates into a copy of the node, prioritizing new values
+        updated = {**node, **(updates or {})}
+        new_id = updated.get("id")
+        if new_id != node_id:
+            if new_id in draft.nodes:
+                error = f"Cannot rename '{node_id}': node '{new_id}' already exists"
+            elif draft.is_referenced(node_id):
+                error = f"Cannot rename '{node_id}': it is referenced by edges or the entry"
+            else:
+                error = None
+            if error:
+                return ActionResult(
+                    action_type=ActionType.UPDATE_NODE, success=False, message="", error=error
+                )
+
+        error = _node_error(updated)
+        if error:
+            return ActionResult(
+                action_type=ActionType.UPDATE_NODE, success=False, message="", error=error
+            )
+
+        draft.replace_node(node_id, updated)
+
         return ActionResult(
             action_type=ActionType.UPDATE_NODE,
             success=True,
@@ -313,7 +473,7 @@ class FlowModificationService:
             error=None,
         )
 
-    def _delete_node(self, flow: dict[str, Any], action: FlowAction) -> ActionResult:
+    def _delete_node(self, draft: _FlowDraft, action: FlowAction) -> ActionResult:
         """Delete a node and its connected edges from the flow."""
         node_id = action.get("node_id")
 
@@ -325,14 +485,7 @@ class FlowModificationService:
                 error="node_id is required for delete_node action",
             )
 
-        nodes = flow.get("nodes", [])
-        edges = flow.get("edges", [])
-
-        # Remove the node
-        original_count = len(nodes)
-        flow["nodes"] = [n for n in nodes if n.get("id") != node_id]
-
-        if len(flow["nodes"]) == original_count:
+        if node_id not in draft.nodes:
             return ActionResult(
                 action_type=ActionType.DELETE_NODE,
                 success=False,
@@ -340,10 +493,8 @@ class FlowModificationService:
                 error=f"Node '{node_id}' not found",
             )
 
-        # Remove all edges connected to this node
-        flow["edges"] = [
-            e for e in edges if e.get("source") != node_id and e.get("target") != node_id
-        ]
+        # Remove the node and all edges connected to it
+        draft.remove_node(node_id)
 
         return ActionResult(
             action_type=ActionType.DELETE_NODE,
@@ -352,7 +503,7 @@ class FlowModificationService:
             error=None,
         )
 
-    def _add_edge(self, flow: dict[str, Any], action: FlowAction) -> ActionResult:
+    def _add_edge(self, draft: _FlowDraft, action: FlowAction) -> ActionResult:
         """Add an edge to the flow."""
         source = action.get("source")
         target = action.get("target")
@@ -365,10 +516,8 @@ class FlowModificationService:
                 error="source and target are required for add_edge action",
             )
 
-        edges = flow.setdefault("edges", [])
-
         # Check if edge already exists
-        if any(e.get("source") == source and e.get("target") == target for e in edges):
+        if draft.edge(source, target) is not None:
             return ActionResult(
                 action_type=ActionType.ADD_EDGE,
                 success=False,
@@ -386,16 +535,24 @@ class FlowModificationService:
         if action.get("condition_description"):
             new_edge["condition_description"] = action["condition_description"]
 
-        edges.append(new_edge)
+        error = _edge_error(draft, new_edge)
+        if error:
+            return ActionResult(
+                action_type=ActionType.ADD_EDGE, success=False, message="", error=error
+            )
+
+        warning = _cycle_warning(draft, source, target)
+        draft.add_edge(new_edge)
 
         return ActionResult(
             action_type=ActionType.ADD_EDGE,
             success=True,
             message=f"Added edge from '{source}' to '{target}'",
             error=None,
+            warning=warning,
         )
 
-    def _update_edge(self, flow: dict[str, Any], action: FlowAction) -> ActionResult:
+    def _update_edge(self, draft: _FlowDraft, action: FlowAction) -> ActionResult:
         """Update an existing edge in the flow."""
         source = action.get("source")
         target = action.get("target")
@@ -409,16 +566,8 @@ class FlowModificationService:
                 error="source and target are required for update_edge action",
             )
 
-        edges = flow.get("edges", [])
-        edge_found = False
-
-        for edge in edges:
-            if edge.get("source") == source and edge.get("target") == target:
-                edge.update(updates)
-                edge_found = True
-                break
-
-        if not edge_found:
+        edge = draft.edge(source, target)
+        if edge is None:
             return ActionResult(
                 action_type=ActionType.UPDATE_EDGE,
                 success=False,
@@ -426,14 +575,28 @@ class FlowModificationService:
                 error=f"Edge from '{source}' to '{target}' not found",
             )
 
+        updated = {**edge, **(updates or {})}
+        error = _edge_error(draft, updated)
+        if error:
+            return ActionResult(
+                action_type=ActionType.UPDATE_EDGE, success=False, message="", error=error
+            )
+
+        new_pair: tuple[str, str] = (updated["source"], updated["target"])
+        warning = None
+        if new_pair != (source, target):
+            warning = _cycle_warning(draft, *new_pair)
+        draft.replace_edge(source, target, updated)
+
         return ActionResult(
             action_type=ActionType.UPDATE_EDGE,
             success=True,
             message=f"Updated edge from '{source}' to '{target}'",
             error=None,
+            warning=warning,
         )
 
-    def _delete_edge(self, flow: dict[str, Any], action: FlowAction) -> ActionResult:
+    def _delete_edge(self, draft: _FlowDraft, action: FlowAction) -> ActionResult:
         """Delete an edge from the flow."""
         source = action.get("source")
         target = action.get("target")
@@ -446,14 +609,7 @@ class FlowModificationService:
                 error="source and target are required for delete_edge action",
             )
 
-        edges = flow.get("edges", [])
-        original_count = len(edges)
-
-        flow["edges"] = [
-            e for e in edges if not (e.get("source") == source and e.get("target") == target)
-        ]
-
-        if len(flow["edges"]) == original_count:
+        if draft.edge(source, target) is None:
             return ActionResult(
                 action_type=ActionType.DELETE_EDGE,
                 success=False,
@@ -461,6 +617,8 @@ class FlowModificationService:
                 error=f"Edge from '{source}' to '{target}' not found",
             )
 
+        draft.remove_edge((source, target))
+
         return ActionResult(
             action_type=ActionType.DELETE_EDGE,
             success=True,
@@ -500,7 +658,7 @@ class FlowModificationService:
         except Exception as e:
             return ActionResult(action_type="validate", success=False, message="", error=str(e))
 
-    def _set_entry(self, flow: dict[str, Any], action: FlowAction) -> ActionResult:
+    def _set_entry(self, draft: _FlowDraft, action: FlowAction) -> ActionResult:
         """Set the entry point of the flow."""
         entry_node = action.get("entry_node")
 
@@ -513,8 +671,7 @@ class FlowModificationService:
             )
 
         # Verify the node exists
-        nodes = flow.get("nodes", [])
-        if not any(n.get("id") == entry_node for n in nodes):
+        if entry_node not in draft.nodes:
             return ActionResult(
                 action_type=ActionType.SET_ENTRY,
                 success=False,
@@ -522,7 +679,7 @@ class FlowModificationService:
                 error=f"Node '{entry_node}' not found in flow",
             )
 
-        flow["entry"] = entry_node
+        draft.entry = entry_node
 
         return ActionResult(
             action_type=ActionType.SET_ENTRY,
@@ -554,3 +711,42 @@ class FlowModificationService:
         except Exception as e:
             logger.error(f"❌ Repository update failed: {e}", exc_info=True)
             raise
+
+
+_NODE_ADAPTER: TypeAdapter[Any] = TypeAdapter(Node)
+
+
+def _validation_message(error: ValidationError) -> str:
+    first = error.errors()[0]
+    location = ".".join(str(part) for part in first.get("loc", ()))
+    return f"{location}: {first.get('msg')}" if location else str(first.get("msg"))
+
+
+def _node_error(node: dict[str, Any]) -> str | None:
+    """Validate a single node definition against the flow IR."""
+    try:
+        _NODE_ADAPTER.validate_python(node)
+    except ValidationError as e:
+        return f"Invalid node '{node.get('id')}': {_validation_message(e)}"
+    return None
+
+
+def _edge_error(draft: _FlowDraft, edge: dict[str, Any]) -> str | None:
+    """Validate an edge definition and that both endpoints exist in the draft."""
+    try:
+        EdgeIR.model_validate(edge)
+    except ValidationError as e:
+        return f"Invalid edge: {_validation_message(e)}"
+    for endpoint in ("source", "target"):
+        if edge[endpoint] not in draft.nodes:
+            return f"Edge {endpoint} '{edge[endpoint]}' not found"
+    return None
+
+
+def _cycle_warning(draft: _FlowDraft, source: str, target: str) -> str | None:
+    """Cycles are allowed (e.g. retry loops) but worth surfacing to the editor."""
+    if draft.reaches(target, source):
+        message = f"Edge from '{source}' to '{target}' creates a cycle"
+        logger.warning(message)
+        return message
+    return None
@@ -28,9 +28,11 @@ from tenacity import (
 )
 from uuid_v7.base import uuid7
 
+from app.core.pagination import PageKey
 from app.core.redis_keys import redis_keys
 from app.db.models import HandoffRequest
-from app.db.session import get_db_session
+from app.db.repository import get_handoff_requests_by_tenant
+from app.db.session import db_read_session, get_db_session
 from app.services.handoff_types import HandoffContext, HandoffReason
 
 logger = logging.getLogger(__name__)
@@ -266,22 +268,21 @@ class HandoffService:
         acknowledged: bool | None = None,
         limit: int = 100,
         offset: int = 0,
+        after: PageKey | None = None,
     ) -> list[HandoffRequest]:
-        """Get handoff requests from database."""
+        """Get handoff requests from database (read replica when fresh), newest first."""
         try:
-            with next(get_db_session()) as session:
-                query = session.query(HandoffRequest).filter(HandoffRequest.tenant_id == tenant_id)
-
-                if acknowledged is not None:
-                    if acknowledged:
-                        query = query.filter(HandoffRequest.acknowledged_at.is_not(None))
-                    else:
-                        query = query.filter(HandoffRequest.acknowledged_at.is_(None))
-
-                query = query.order_by(HandoffRequest.created_at.desc())
-                query = query.offset(offset).limit(limit)
-
-                return query.all()
+            with db_read_session() as session:
+                return list(
+                    get_handoff_requests_by_tenant(
+                        session,
+                        tenant_id,
+                        acknowledged=acknowledged,
+                        limit=limit,
+                        offset=offset,
+                        after=after,
+                    )
+                )
 
         except Exception as e:
             logger.error("Failed to retrieve handoff requests: %s", str(e))
@@ -0,0 +1,144 @@
+"""Maintenance of the monthly ``messages`` partitions.
+
+One worker per interval (elected with a Postgres advisory lock) creates the
+partitions of the coming months and, when archival is enabled, moves the
+months older than the retention window to compressed files. See
+``app/db/partitions.py`` for the partition layout.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL_SECONDS = 6 * 3600.0
+DEFAULT_MONTHS_AHEAD = 3
+# Key of the advisory lock electing the worker that maintains partitions
+PARTITION_LOCK_KEY = 0x4D534750
+
+
+@dataclass(slots=True)
+class MaintenanceResult:
+    created: list[str] = field(default_factory=list)
+    archived: list[str] = field(default_factory=list)
+
+
+def maintain_message_partitions(
+    *,
+    months_ahead: int = DEFAULT_MONTHS_AHEAD,
+    archive_after_months: int | None = None,
+    archive_dir: Path | None = None,
+    dry_run: bool = False,
+    now: datetime | None = None,
+) -> MaintenanceResult | None:
+    """Create upcoming partitions and archive expired ones (blocking; call via a thread).
+
+    Archival runs only with both ``archive_after_months`` and ``archive_dir``.
+    With ``dry_run`` nothing is changed and ``archived`` lists the partitions
+    that would be archived.
+    Returns None when another worker holds the maintenance lock.
+    """
+    from sqlalchemy import text
+
+    from app.db.partitions import (
+        archive_partition,
+        ensure_partitions,
+        list_detached_partitions,
+        list_partitions,
+        partitions_to_archive,
+    )
+    from app.db.session import get_engine
+
+    now = now or datetime.now(UTC)
+    result = MaintenanceResult()
+    with get_engine().connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        lock = {"key": PARTITION_LOCK_KEY}
+        if not connection.execute(text("SELECT pg_try_advisory_lock(:key)"), lock).scalar():
+            return None
+        try:
+            if not dry_run:
+                result.created = ensure_partitions(connection, months_ahead=months_ahead, now=now)
+
+            if archive_after_months is None or archive_dir is None:
+                return result
+            expired = partitions_to_archive(
+                list_partitions(connection),
+                list_detached_partitions(connection),
+                keep_months=archive_after_months,
+                now=now,
+            )
+            if dry_run:
+                result.archived = expired
+                return result
+            for name in expired:
+                archived = archive_partition(connection, name, archive_dir)
+                result.archived.append(archived.name)
+                metrics.inc("message_partitions_archived_total")
+                metrics.inc("messages_archived_total", archived.rows)
+        finally:
+            connection.execute(text("SELECT pg_advisory_unlock(:key)"), lock)
+    return result
+
+
+class MessagePartitionJob:
+    """Runs ``maintain_message_partitions`` every interval."""
+
+    def __init__(
+        self,
+        *,
+        interval_seconds: float = DEFAULT_INTERVAL_SECONDS,
+        months_ahead: int = DEFAULT_MONTHS_AHEAD,
+        archive_after_months: int | None = None,
+        archive_dir: Path | None = None,
+        maintain: Callable[..., MaintenanceResult | None] = maintain_message_partitions,
+    ) -> None:
+        self._interval = interval_seconds
+        self._months_ahead = months_ahead
+        self._archive_after_months = archive_after_months
+        self._archive_dir = archive_dir
+        self._maintain = maintain
+        self._task: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Messages partition maintenance failed: %s", e)
+            await asyncio.sleep(self._interval)
+
+    async def run_once(self) -> MaintenanceResult | None:
+        result = await asyncio.to_thread(
+            self._maintain,
+            months_ahead=self._months_ahead,
+            archive_after_months=self._archive_after_months,
+            archive_dir=self._archive_dir,
+        )
+        if result and (result.created or result.archived):
+            logger.info(
+                "Messages partitions: created %s, archived %s", result.created, result.archived
+            )
+        return result
@@ -11,12 +11,20 @@ Requires Redis - no in-memory fallback (simpler = fewer bugs).
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
 from datetime import UTC
-from typing import TYPE_CHECKING, Literal
+from typing import TYPE_CHECKING, Any, Literal
 
+from app.core.async_redis import async_redis_client
+from app.core.cancellation import CancellationToken, ProcessingCancelledException
+from app.core.redis_cluster import open_pubsub
+from app.core.redis_keys import RedisKeyBuilder
+from app.core.redis_unit_of_work import Deferred, RedisUnitOfWork
 from app.whatsapp.types import BufferedMessage
 
 if TYPE_CHECKING:
@@ -38,8 +46,10 @@ class ProcessingCancellationManager:
     MESSAGE_BUFFER_PREFIX = "debounce:buffer:"
     SEQUENCE_PREFIX = "debounce:seq:"
     LAST_MESSAGE_TIME_PREFIX = "debounce:last_time:"
+    CANCEL_CHANNEL_PREFIX = "debounce:cancel:"
     
     BUFFER_TTL_SECONDS = 300
+    CANCEL_LISTEN_TIMEOUT_S = 1.0
     MAX_INACTIVITY_MS = 120000
     MIN_INACTIVITY_MS = 100
     
@@ -55,29 +65,105 @@ class ProcessingCancellationManager:
                 "Ensure REDIS_URL is configured."
             )
         self._store = store
+        self._async_client: Any = None
+
+    @property
+    def _aio(self) -> Any:
+        """Async Redis client shared with the store (resolved on first use)."""
+        if self._async_client is None:
+            self._async_client = async_redis_client(self._store)
+        return self._async_client
+
+    def unit_of_work(self, name: str = "turn") -> RedisUnitOfWork:
+        """Start a unit of work on the Redis connection shared with the store."""
+        return RedisUnitOfWork(self._aio, name=name)
+
+    # The synchronous methods below are kept for scripts and tests; request
+    # handlers use the ``*_async`` variants so polling never blocks the loop.
 
     def add_message_to_buffer(self, session_id: str, message: str) -> str:
         timestamp = time.time()
-        
-        buffer_key = f"{self.MESSAGE_BUFFER_PREFIX}{session_id}"
-        seq_key = f"{self.SEQUENCE_PREFIX}{session_id}"
-        time_key = f"{self.LAST_MESSAGE_TIME_PREFIX}{session_id}"
+        buffer_key, seq_key, time_key = self._keys(session_id)
         
         sequence = self._store._r.incr(seq_key)
         existing_messages = self._store._r.lrange(buffer_key, 0, -1)
-        
+        retry_id = self._find_buffered_retry(
+            session_id, existing_messages, message, f"{sequence}:{timestamp:.6f}"
+        )
+        if retry_id is not None:
+            return retry_id
+
+        message_id, body = self._new_buffer_entry(sequence, message, timestamp)
+        pipeline = self._store._r.pipeline()
+        for command, *args in self._buffer_write_commands(session_id, body, timestamp):
+            getattr(pipeline, command)(*args)
+        pipeline.execute()
+
+        logger.info(f"[{session_id}] Buffered message #{sequence}: {message[:50]}...")
+        self._publish_cancellation(session_id, sequence)
+        return message_id
+
+    async def add_message_to_buffer_async(self, session_id: str, message: str) -> str:
+        """Buffer ``message`` in two round trips.
+
+        The sequence bump and buffer snapshot run as one MULTI/EXEC; the
+        append, TTL refresh and cancellation publish as a second one.
+        """
+        timestamp = time.time()
+        buffer_key, seq_key, _ = self._keys(session_id)
+
+        uow = self.unit_of_work("debounce")
+        sequence_result = uow.queue("incr", seq_key, parse=int)
+        existing_result = uow.queue("lrange", buffer_key, 0, -1)
+        await uow.execute(transaction=True)
+        sequence = sequence_result.result()
+
+        retry_id = self._find_buffered_retry(
+            session_id, existing_result.result(), message, f"{sequence}:{timestamp:.6f}"
+        )
+        if retry_id is not None:
+            return retry_id
+
+        message_id, body = self._new_buffer_entry(sequence, message, timestamp)
+        for command, *args in self._buffer_write_commands(session_id, body, timestamp):
+            uow.queue(command, *args)
+        uow.queue("publish", f"{self.CANCEL_CHANNEL_PREFIX}{session_id}", str(sequence))
+        await uow.execute(transaction=True)
+
+        logger.info(f"[{session_id}] Buffered message #{sequence}: {message[:50]}...")
+        return message_id
+
+    @staticmethod
+    def _key(prefix: str, session_id: str) -> str:
+        # Hash-tagged with the contact so the session's debounce keys share a
+        # Redis Cluster slot with its conversation state
+        return f"{prefix}{RedisKeyBuilder.session_hash_tag(session_id)}:{session_id}"
+
+    def _keys(self, session_id: str) -> tuple[str, str, str]:
+        return (
+            self._key(self.MESSAGE_BUFFER_PREFIX, session_id),
+            self._key(self.SEQUENCE_PREFIX, session_id),
+            self._key(self.LAST_MESSAGE_TIME_PREFIX, session_id),
+        )
+
+    @staticmethod
+    def _find_buffered_retry(
+        session_id: str, existing_messages: list[Any], message: str, fallback_id: str
+    ) -> str | None:
         for existing_msg_json in existing_messages:
             try:
                 existing_data: dict[str, object] = json.loads(existing_msg_json)
                 if existing_data.get("content") == message:
-                    msg_id = str(existing_data.get("id", f"{sequence}:{timestamp:.6f}"))
                     logger.debug(
                         f"[{session_id}] Message already in buffer (webhook retry?): {message[:50]}..."
                     )
-                    return msg_id
+                    return str(existing_data.get("id", fallback_id))
             except (json.JSONDecodeError, KeyError):
                 continue
-        
+        return None
+
+    @staticmethod
+    def _new_buffer_entry(sequence: int, message: str, timestamp: float) -> tuple[str, str]:
         message_id = f"{sequence}:{timestamp:.6f}"
         msg_data: dict[str, object] = {
             "id": message_id,
@@ -85,20 +171,133 @@ class ProcessingCancellationManager:
             "content": message,
             "timestamp": timestamp,
         }
-        
-        pipeline = self._store._r.pipeline()
-        pipeline.rpush(buffer_key, json.dumps(msg_data))
-        pipeline.expire(buffer_key, self.BUFFER_TTL_SECONDS)
-        pipeline.set(time_key, str(timestamp))
-        pipeline.expire(time_key, self.BUFFER_TTL_SECONDS)
-        pipeline.expire(seq_key, self.BUFFER_TTL_SECONDS)
-        pipeline.execute()
-        
-        logger.info(
-            f"[{session_id}] Buffered message #{sequence}: {message[:50]}..."
-        )
-        return message_id
+        return message_id, json.dumps(msg_data)
+
+    def _buffer_write_commands(
+        self, session_id: str, body: str, timestamp: float
+    ) -> list[tuple[Any, ...]]:
+        buffer_key, seq_key, time_key = self._keys(session_id)
+        return [
+            ("rpush", buffer_key, body),
+            ("expire", buffer_key, self.BUFFER_TTL_SECONDS),
+            ("set", time_key, str(timestamp)),
+            ("expire", time_key, self.BUFFER_TTL_SECONDS),
+            ("expire", seq_key, self.BUFFER_TTL_SECONDS),
+        ]
     
+    def restore_cancelled_message(
+        self, session_id: str, message: str, *, persisted: bool = False
+    ) -> bool:
+        """Put the input of a cancelled turn back in front of the buffer.
+
+        The newer message that cancelled the turn is still being debounced, so
+        the restored input is aggregated with it instead of being lost. The
+        sequence counter and last-message time are left untouched so the
+        pending waiter is not reset or superseded.
+
+        Args:
+            session_id: Session identifier
+            message: Message text the cancelled turn was processing
+            persisted: Whether the message was already saved to the database
+                (restored entries are then skipped when saving the aggregate)
+
+        Returns:
+            True if restored, False if the buffer was already consumed
+        """
+        existing = self.get_individual_messages(session_id)
+        body = self._restored_entry(session_id, existing, message, persisted)
+        if body is None:
+            return False
+        self._store._r.lpush(self._key(self.MESSAGE_BUFFER_PREFIX, session_id), body)
+        logger.info(f"[{session_id}] Restored cancelled input: {message[:50]}...")
+        return True
+
+    async def restore_cancelled_message_async(
+        self, session_id: str, message: str, *, persisted: bool = False
+    ) -> bool:
+        existing = await self.get_individual_messages_async(session_id)
+        body = self._restored_entry(session_id, existing, message, persisted)
+        if body is None:
+            return False
+        await self._aio.lpush(self._key(self.MESSAGE_BUFFER_PREFIX, session_id), body)
+        logger.info(f"[{session_id}] Restored cancelled input: {message[:50]}...")
+        return True
+
+    @staticmethod
+    def _restored_entry(
+        session_id: str, existing: list[BufferedMessage], message: str, persisted: bool
+    ) -> str | None:
+        if not existing:
+            logger.info(f"[{session_id}] Buffer already consumed; cancelled input not restored")
+            return None
+
+        timestamp = min(msg.timestamp for msg in existing)
+        msg_data: dict[str, object] = {
+            "id": f"restored:{timestamp:.6f}",
+            "sequence": 0,
+            "content": message,
+            "timestamp": timestamp,
+            "restored": persisted,
+        }
+        return json.dumps(msg_data)
+
+    @asynccontextmanager
+    async def cancellation_scope(self, session_id: str) -> AsyncIterator[CancellationToken]:
+        """Provide a token that is cancelled when a newer message arrives.
+
+        Subscribes to the per-session cancel channel for the duration of the
+        turn, so cancellation reaches the worker processing the turn even when
+        the newer webhook lands on a different process.
+
+        Args:
+            session_id: Session identifier
+
+        Yields:
+            Cancellation token for the turn
+        """
+        token = CancellationToken(session_id)
+        channel = f"{self.CANCEL_CHANNEL_PREFIX}{session_id}"
+
+        pubsub: Any = None
+        listener: asyncio.Task[None] | None = None
+        try:
+            pubsub = open_pubsub(self._aio, ignore_subscribe_messages=True)
+            if pubsub is not None:
+                await pubsub.subscribe(channel)
+                listener = asyncio.create_task(self._listen_for_cancellation(pubsub, token))
+        except Exception as e:
+            logger.warning(f"[{session_id}] Cancellation listener unavailable: {e}")
+
+        try:
+            yield token
+        finally:
+            if listener:
+                listener.cancel()
+            if pubsub is not None:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+    async def _listen_for_cancellation(self, pubsub: Any, token: CancellationToken) -> None:
+        while not token.cancelled:
+            try:
+                message = await pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=self.CANCEL_LISTEN_TIMEOUT_S
+                )
+            except Exception as e:
+                logger.warning(f"[{token.session_id}] Cancellation listener failed: {e}")
+                return
+            if message and message.get("type") == "message":
+                token.cancel("newer_message")
+                return
+
+    def _publish_cancellation(self, session_id: str, sequence: int) -> None:
+        try:
+            self._store._r.publish(f"{self.CANCEL_CHANNEL_PREFIX}{session_id}", str(sequence))
+        except Exception as e:
+            logger.warning(f"[{session_id}] Failed to publish cancellation: {e}")
+
     async def wait_for_inactivity(
         self,
         session_id: str,
@@ -106,6 +305,8 @@ class ProcessingCancellationManager:
         inactivity_ms: int,
         *,
         check_interval_ms: int = 1000,
+        quiet_threshold_ms: int | None = None,
+        on_quiet: Callable[[], Awaitable[None]] | None = None,
     ) -> Literal["exit", "process_aggregated", "process_single"]:
         """Wait for inactivity period, resetting timer on new messages.
         
@@ -119,14 +320,16 @@ class ProcessingCancellationManager:
             since_message_id: ID of current message
             inactivity_ms: Milliseconds of inactivity required
             check_interval_ms: How often to check for new messages
+            quiet_threshold_ms: Shorter quiet period after which ``on_quiet`` fires
+            on_quiet: Awaited once when the buffer has been quiet for
+                ``quiet_threshold_ms`` but the full inactivity period has not
+                elapsed yet (used to start speculative turn precomputation)
             
         Returns:
             - "exit": Newer message arrived, caller should exit
             - "process_aggregated": Inactivity period elapsed, multiple messages buffered
             - "process_single": Inactivity period elapsed, single message buffered
         """
-        import asyncio
-        
         inactivity_ms = max(self.MIN_INACTIVITY_MS, min(inactivity_ms, self.MAX_INACTIVITY_MS))
         
         try:
@@ -140,21 +343,19 @@ class ProcessingCancellationManager:
         )
         
         check_count = 0
+        quiet_fired = False
         while True:
             await asyncio.sleep(check_interval_ms / 1000.0)
             check_count += 1
-            
-            latest_sequence = self._get_latest_sequence(session_id)
+
+            latest_sequence, time_since_last_ms, count = await self._poll_buffer_async(session_id)
             if latest_sequence > my_sequence:
                 logger.info(
                     f"[{session_id}] Message #{my_sequence}: Newer message #{latest_sequence} arrived, exiting"
                 )
                 return "exit"
             
-            time_since_last_ms = self._get_time_since_last_message_ms(session_id)
-            
             if time_since_last_ms >= inactivity_ms:
-                count = self.get_message_count(session_id)
                 logger.info(
                     f"[{session_id}] Message #{my_sequence}: Inactivity period reached "
                     f"({time_since_last_ms:.0f}ms >= {inactivity_ms}ms), "
@@ -162,6 +363,18 @@ class ProcessingCancellationManager:
                 )
                 return "process_aggregated" if count > 1 else "process_single"
             
+            if (
+                on_quiet
+                and not quiet_fired
+                and quiet_threshold_ms is not None
+                and time_since_last_ms >= quiet_threshold_ms
+            ):
+                quiet_fired = True
+                try:
+                    await on_quiet()
+                except Exception as e:
+                    logger.warning(f"[{session_id}] on_quiet callback failed: {e}")
+
             if check_count % 10 == 0:
                 logger.debug(
                     f"[{session_id}] Message #{my_sequence}: Still waiting... "
@@ -169,16 +382,23 @@ class ProcessingCancellationManager:
                 )
     
     def get_individual_messages(self, session_id: str) -> list[BufferedMessage]:
-        buffer_key = f"{self.MESSAGE_BUFFER_PREFIX}{session_id}"
-        msg_data_list = self._store._r.lrange(buffer_key, 0, -1)
-        
+        buffer_key = self._key(self.MESSAGE_BUFFER_PREFIX, session_id)
+        return self._parse_buffer(session_id, self._store._r.lrange(buffer_key, 0, -1))
+
+    async def get_individual_messages_async(self, session_id: str) -> list[BufferedMessage]:
+        buffer_key = self._key(self.MESSAGE_BUFFER_PREFIX, session_id)
+        return self._parse_buffer(session_id, await self._aio.lrange(buffer_key, 0, -1))
+
+    @staticmethod
+    def _parse_buffer(session_id: str, msg_data_list: list[Any] | None) -> list[BufferedMessage]:
         if not msg_data_list:
             return []
         
         messages: list[BufferedMessage] = []
         for msg_json in msg_data_list:
             try:
-                data: dict[str, object] = json.loads(str(msg_json))
+                # Redis returns bytes unless the client decodes responses
+                data: dict[str, object] = json.loads(msg_json)
                 content = str(data.get("content", ""))
                 
                 if content.strip():
@@ -192,6 +412,7 @@ class ProcessingCancellationManager:
                             timestamp=timestamp,
                             sequence=sequence,
                             id=str(data.get("id", "")),
+                            restored=bool(data.get("restored", False)),
                         )
                     )
             except (json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
@@ -200,6 +421,25 @@ class ProcessingCancellationManager:
         
         return messages
     
+    async def peek_aggregated_messages_async(self, session_id: str) -> str | None:
+        """Aggregate the buffered messages without clearing the buffer.
+
+        Produces exactly what ``get_and_clear_messages`` would return for the
+        same buffer contents, so a result computed from it can be reused.
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            Aggregated message string or None
+        """
+        messages = await self.get_individual_messages_async(session_id)
+        if not messages:
+            return None
+        return self._aggregate_messages(
+            [(msg.content, msg.timestamp, msg.sequence) for msg in messages]
+        )
+
     def get_and_clear_messages(self, session_id: str) -> str | None:
         """Atomically retrieve and clear all buffered messages.
         
@@ -212,59 +452,56 @@ class ProcessingCancellationManager:
         Returns:
             Aggregated message string or None
         """
-        buffer_key = f"{self.MESSAGE_BUFFER_PREFIX}{session_id}"
-        seq_key = f"{self.SEQUENCE_PREFIX}{session_id}"
-        time_key = f"{self.LAST_MESSAGE_TIME_PREFIX}{session_id}"
+        buffer_key, seq_key, time_key = self._keys(session_id)
         
         pipeline = self._store._r.pipeline()
         pipeline.lrange(buffer_key, 0, -1)
         pipeline.delete(buffer_key, seq_key, time_key)
         results = pipeline.execute()
+        return self._aggregate_buffer(session_id, results[0])
+
+    async def get_and_clear_messages_async(self, session_id: str) -> str | None:
+        return self.aggregate_buffered(session_id, await self.drain_messages_async(session_id))
+
+    async def drain_messages_async(self, session_id: str) -> list[BufferedMessage]:
+        """Atomically take every buffered message and reset the debounce state.
         
-        msg_data_list: list[object] = results[0]
-        
-        if not msg_data_list:
+        Returns the individual messages; ``aggregate_buffered`` turns them into
+        the text ``get_and_clear_messages`` would have returned.
+        """
+        buffer_key, seq_key, time_key = self._keys(session_id)
+        uow = self.unit_of_work("debounce")
+        raw_messages = uow.queue("lrange", buffer_key, 0, -1)
+        uow.queue("delete", buffer_key, seq_key, time_key)
+        await uow.execute(transaction=True)
+        return self._parse_buffer(session_id, raw_messages.result())
+
+    def _aggregate_buffer(self, session_id: str, msg_data_list: list[Any] | None) -> str | None:
+        return self.aggregate_buffered(session_id, self._parse_buffer(session_id, msg_data_list))
+
+    def aggregate_buffered(self, session_id: str, messages: list[BufferedMessage]) -> str | None:
+        """Aggregate already-drained messages (see ``drain_messages_async``)."""
+        if not messages:
             logger.debug(f"[{session_id}] No messages to aggregate")
             return None
-        
-        messages_with_timestamps: list[tuple[str, float, int]] = []
-        for msg_json in msg_data_list:
-            try:
-                data: dict[str, object] = json.loads(str(msg_json))
-                content = str(data.get("content", ""))
-                timestamp_raw = data.get("timestamp", 0.0)
-                sequence_raw = data.get("sequence", 0)
-                timestamp = float(timestamp_raw) if isinstance(timestamp_raw, (int, float, str)) else 0.0
-                sequence = int(sequence_raw) if isinstance(sequence_raw, (int, float, str)) else 0
-                
-                if content.strip():
-                    messages_with_timestamps.append((content, timestamp, sequence))
-            except (json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
-                logger.warning(f"[{session_id}] Failed to parse message: {e}")
-                continue
-        
-        if not messages_with_timestamps:
-            logger.debug(f"[{session_id}] No valid messages to aggregate")
-            return None
-        
-        aggregated = self._aggregate_messages(messages_with_timestamps)
-        logger.info(
-            f"[{session_id}] Aggregated {len(messages_with_timestamps)} message(s): "
-            f"{aggregated[:100]}..."
+
+        aggregated = self._aggregate_messages(
+            [(msg.content, msg.timestamp, msg.sequence) for msg in messages]
         )
+        logger.info(f"[{session_id}] Aggregated {len(messages)} message(s): {aggregated[:100]}...")
         return aggregated
-    
+
     def mark_processing_complete(self, session_id: str) -> None:
         """Clear all state for a session after successful processing.
-        
+
         Args:
             session_id: Session identifier
         """
-        buffer_key = f"{self.MESSAGE_BUFFER_PREFIX}{session_id}"
-        seq_key = f"{self.SEQUENCE_PREFIX}{session_id}"
-        time_key = f"{self.LAST_MESSAGE_TIME_PREFIX}{session_id}"
-        
-        self._store._r.delete(buffer_key, seq_key, time_key)
+        self._store._r.delete(*self._keys(session_id))
+        logger.debug(f"[{session_id}] Cleared all Redis state")
+
+    async def mark_processing_complete_async(self, session_id: str) -> None:
+        await self._aio.delete(*self._keys(session_id))
         logger.debug(f"[{session_id}] Cleared all Redis state")
     
     def _extract_sequence(self, message_id: str) -> int:
@@ -285,6 +522,10 @@ class ProcessingCancellationManager:
         except (ValueError, IndexError) as e:
             raise ValueError(f"Invalid message ID format: {message_id}") from e
     
+    def get_latest_sequence(self, session_id: str) -> int:
+        """Public accessor for the latest buffered sequence number."""
+        return self._get_latest_sequence(session_id)
+
     def _get_latest_sequence(self, session_id: str) -> int:
         """Get the sequence number of the most recent message.
         
@@ -294,80 +535,126 @@ class ProcessingCancellationManager:
         Returns:
             Latest sequence number, or 0 if no messages
         """
-        seq_key = f"{self.SEQUENCE_PREFIX}{session_id}"
+        seq_key = self._key(self.SEQUENCE_PREFIX, session_id)
         seq_str = self._store._r.get(seq_key)
         return int(seq_str) if seq_str else 0
     
+    async def get_latest_sequence_async(self, session_id: str) -> int:
+        seq_str = await self._aio.get(self._key(self.SEQUENCE_PREFIX, session_id))
+        return int(seq_str) if seq_str else 0
+
     def _get_time_since_last_message_ms(self, session_id: str) -> float:
         """Get milliseconds elapsed since last message.
-        
+
         Uses stored timestamp (not local clock) to avoid clock skew.
-        
+
         Args:
             session_id: Session identifier
-            
+
         Returns:
             Milliseconds since last message, or infinity if no messages
         """
-        time_key = f"{self.LAST_MESSAGE_TIME_PREFIX}{session_id}"
-        last_time_str = self._store._r.get(time_key)
-        
+        time_key = self._key(self.LAST_MESSAGE_TIME_PREFIX, session_id)
+        return self._elapsed_ms(self._store._r.get(time_key))
+
+    async def _get_time_since_last_message_ms_async(self, session_id: str) -> float:
+        time_key = self._key(self.LAST_MESSAGE_TIME_PREFIX, session_id)
+        return self._elapsed_ms(await self._aio.get(time_key))
+
+    @staticmethod
+    def _elapsed_ms(last_time_str: Any) -> float:
         if not last_time_str:
             return float("inf")
-        
+
         last_time = float(last_time_str)
         elapsed_ms = (time.time() - last_time) * 1000
         return elapsed_ms
-    
+
     def get_message_count(self, session_id: str) -> int:
         """Get number of messages in buffer.
-        
+
         Args:
             session_id: Session identifier
-            
+
         Returns:
             Message count
         """
-        buffer_key = f"{self.MESSAGE_BUFFER_PREFIX}{session_id}"
+        buffer_key = self._key(self.MESSAGE_BUFFER_PREFIX, session_id)
         count = self._store._r.llen(buffer_key)
         return int(count) if count else 0
-    
-    def _aggregate_messages(
-        self, 
-        messages_with_metadata: list[tuple[str, float, int]]
-    ) -> str:
+
+    async def get_message_count_async(self, session_id: str) -> int:
+        count = await self._aio.llen(self._key(self.MESSAGE_BUFFER_PREFIX, session_id))
+        return int(count) if count else 0
+
+    def queue_message_count(self, uow: RedisUnitOfWork, session_id: str) -> Deferred[int]:
+        """Queue a buffer length read on ``uow`` (see ``get_message_count``)."""
+        return uow.queue("llen", self._key(self.MESSAGE_BUFFER_PREFIX, session_id), parse=_to_int)
+
+    async def _poll_buffer_async(self, session_id: str) -> tuple[int, float, int]:
+        """Latest sequence, ms since the last message and buffer length.
+
+        Read together in one MULTI/EXEC, so each debounce poll costs a single
+        round trip and sees a consistent snapshot.
+        """
+        buffer_key, seq_key, time_key = self._keys(session_id)
+        uow = self.unit_of_work("debounce")
+        sequence = uow.queue("get", seq_key, parse=_to_int)
+        elapsed_ms = uow.queue("get", time_key, parse=self._elapsed_ms)
+        count = self.queue_message_count(uow, session_id)
+        await uow.execute(transaction=True)
+        return sequence.result(), elapsed_ms.result(), count.result()
+
+    def _aggregate_messages(self, messages_with_metadata: list[tuple[str, float, int]]) -> str:
         """Aggregate messages with actual timestamps.
-        
+
         Args:
             messages_with_metadata: List of (content, timestamp, sequence) tuples
-            
+
         Returns:
             Formatted aggregated message with HH:MM:SS timestamps
         """
         from datetime import datetime
-        
+
         if not messages_with_metadata:
             return ""
-        
+
         if len(messages_with_metadata) == 1:
             return messages_with_metadata[0][0]
-        
+
         sorted_msgs = sorted(messages_with_metadata, key=lambda x: x[2])
-        
+
         formatted_messages = []
         for content, timestamp, sequence in sorted_msgs:
             dt = datetime.fromtimestamp(timestamp, UTC)
             time_str = dt.strftime("%H:%M:%S")
             formatted_messages.append(f"[{time_str}] {content.strip()}")
-        
+
         return "\n".join(formatted_messages)
-    
+
     def check_cancellation_and_raise(self, session_id: str, stage: str = "processing") -> None:
-        if self.get_message_count(session_id) > 0:
+        self.raise_if_pending(session_id, self.get_message_count(session_id), stage)
+
+    async def check_cancellation_and_raise_async(
+        self, session_id: str, stage: str = "processing"
+    ) -> None:
+        self.raise_if_pending(session_id, await self.get_message_count_async(session_id), stage)
+
+    @staticmethod
+    def raise_if_pending(session_id: str, pending_count: int, stage: str = "processing") -> None:
+        """Raise if messages are buffered (``pending_count`` from ``queue_message_count``)."""
+        if pending_count > 0:
             raise ProcessingCancelledException(
                 f"Processing cancelled at {stage}: newer message arrived for session {session_id}"
             )
 
 
-class ProcessingCancelledException(Exception):
-    """Exception raised when processing is cancelled due to newer message."""
+def _to_int(value: Any) -> int:
+    return int(value) if value else 0
+
+
+__all__ = [
+    "CancellationToken",
+    "ProcessingCancellationManager",
+    "ProcessingCancelledException",
+]
@@ -11,6 +11,7 @@ from uuid import UUID
 
 from langgraph.graph import END, START, StateGraph
 
+from app.core.cancellation import CancellationToken, ProcessingCancelledException
 from app.services.rag.chunking import ChunkingService
 from app.services.rag.document_parser import DocumentParserService
 from app.services.rag.embedding import EmbeddingService
@@ -208,7 +209,9 @@ class RAGService:
         query: str,
         chat_history: list[dict] | None = None,
         business_context: dict | None = None,
-        thread_id: UUID | None = None
+        thread_id: UUID | None = None,
+        *,
+        cancel_token: CancellationToken | None = None,
     ) -> str:
         """Query the RAG system for relevant context.
         
@@ -218,6 +221,7 @@ class RAGService:
             chat_history: Previous conversation messages
             business_context: Tenant business configuration
             thread_id: Optional chat thread ID for tracking
+            cancel_token: Optional token that aborts the retrieval/judge loop
             
         Returns:
             Context string for the tool caller LLM or error message
@@ -230,6 +234,7 @@ class RAGService:
             chat_history=chat_history,
             business_context=business_context,
             thread_id=thread_id,
+            cancel_token=cancel_token,
         )
 
         if structured["no_documents"]:
@@ -246,8 +251,14 @@ class RAGService:
         chat_history: list[dict] | None = None,
         business_context: dict | None = None,
         thread_id: UUID | None = None,
+        *,
+        cancel_token: CancellationToken | None = None,
     ) -> RAGQueryResult:
-        """Structured query method to prevent leaking internal errors to callers."""
+        """Structured query method to prevent leaking internal errors to callers.
+
+        Raises:
+            ProcessingCancelledException: If ``cancel_token`` fires mid-retrieval
+        """
         # Check if tenant has documents
         if not await self.has_documents(tenant_id):
             return {
@@ -276,7 +287,12 @@ class RAGService:
         }
 
         try:
-            result = await self.retrieval_app.ainvoke(initial_state)
+            if cancel_token:
+                result = await cancel_token.run(
+                    self.retrieval_app.ainvoke(initial_state), stage="rag"
+                )
+            else:
+                result = await self.retrieval_app.ainvoke(initial_state)
 
             # Save retrieval session for analytics
             retrieved_chunks = result.get("chunks") or []
@@ -340,6 +356,8 @@ class RAGService:
                 "error": None,
             }
 
+        except ProcessingCancelledException:
+            raise
         except Exception as e:
             logger.error(f"Error in RAG query: {e}")
             return {
@@ -12,6 +12,7 @@ from sqlalchemy import func, or_, select, text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from app.db.models import ChunkRelationship, DocumentChunk, RetrievalSession, TenantDocument
+from app.db.pool import async_engine_options, instrument_checkouts
 
 logger = logging.getLogger(__name__)
 
@@ -62,14 +63,13 @@ class VectorStoreRepository:
         elif database_url.startswith("postgresql+psycopg://"):
             database_url = database_url.replace("postgresql+psycopg://", "postgresql+asyncpg://")
         
+        # Sized from the process's share of DB_MAX_CONNECTIONS
         self.engine = create_async_engine(
             database_url,
             echo=False,
-            pool_size=30,
-            max_overflow=50,
-            pool_pre_ping=True,
-            pool_recycle=3600,
+            **async_engine_options("vector"),
         )
+        instrument_checkouts(self.engine)
         self.async_session = async_sessionmaker(self.engine, class_=AsyncSession, expire_on_commit=False)
     
     async def initialize(self):
@@ -1,8 +1,17 @@
+"""Request rate limiting.
+
+``RateLimiter`` applies fixed-window counters to agent turns.
+``AdmissionController`` guards the live webhook path with token buckets per
+contact, channel instance and tenant, checked in a single Redis round trip.
+"""
+
 from __future__ import annotations
 
+import asyncio
+import logging
 import time
 from dataclasses import dataclass
-from typing import Protocol
+from typing import Any, Protocol
 
 # Optional redis import for Redis backend
 try:
@@ -10,6 +19,21 @@ try:
 except Exception:  # pragma: no cover - optional import
     redis = None  # type: ignore[assignment,unused-ignore]
 
+from app.core.metrics import metrics
+from app.core.redis_cluster import create_sync_client
+from app.core.redis_keys import RedisKeyBuilder, redis_keys
+
+logger = logging.getLogger(__name__)
+
+# Increments a fixed-window counter and starts its window on first use
+_INCR_WITH_TTL = """
+local count = redis.call('INCR', KEYS[1])
+if count == 1 or redis.call('TTL', KEYS[1]) < 0 then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+return count
+"""
+
 
 @dataclass(slots=True)
 class RateLimitParams:
@@ -40,22 +64,16 @@ class InMemoryRateLimiterBackend:
 
 
 class RedisRateLimiterBackend:
-    def __init__(self, redis_url: str) -> None:
+    def __init__(self, redis_url: str, *, cluster: bool = False) -> None:
         if redis is None:  # pragma: no cover
             message = "redis-py is not installed"
             raise RuntimeError(message)
-        self._r = redis.from_url(redis_url)
+        self._r = create_sync_client(redis_url, cluster=cluster)
+        self._incr = self._r.register_script(_INCR_WITH_TTL)
 
     def incr_with_ttl(self, key: str, ttl_seconds: int) -> int:
-        # Use INCR and set EXPIRE on first increment within the window
-        pipe = self._r.pipeline()
-        pipe.incr(key)
-        pipe.ttl(key)
-        cnt, ttl = pipe.execute()
-        # If key had no TTL (new key or persisted), set it now
-        if ttl is None or ttl < 0:
-            self._r.expire(key, ttl_seconds)
-        return int(cnt)
+        # INCR and the first EXPIRE in one round trip
+        return int(self._incr(keys=[key], args=[ttl_seconds]))
 
 
 class RateLimiter:
@@ -87,3 +105,160 @@ class RateLimiter:
             and tenant_count <= params.max_requests_per_tenant
         )
         return allowed, remaining_user, remaining_tenant
+
+
+# --- Admission control (webhook path)
+
+# Token buckets checked and charged atomically: either every bucket has
+# ``cost`` tokens and all are charged, or none is. Returns
+# {admitted, index of the bucket that refused (1-based), retry after ms}.
+_TAKE_TOKENS = """
+local now = tonumber(ARGV[1])
+local cost = tonumber(ARGV[2])
+local tokens = {}
+local wait, refused = 0, 0
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[1 + 2 * i])
+    local rate = tonumber(ARGV[2 + 2 * i])
+    local state = redis.call('HMGET', key, 't', 'ts')
+    local t = tonumber(state[1]) or capacity
+    local elapsed = math.max(0, now - (tonumber(state[2]) or now))
+    t = math.min(capacity, t + elapsed * rate / 1000)
+    tokens[i] = t
+    if t < cost and (cost - t) * 1000 / rate > wait then
+        wait, refused = (cost - t) * 1000 / rate, i
+    end
+end
+if refused > 0 then
+    return {0, refused, math.ceil(wait)}
+end
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[1 + 2 * i])
+    local rate = tonumber(ARGV[2 + 2 * i])
+    redis.call('HSET', key, 't', tostring(tokens[i] - cost), 'ts', ARGV[1])
+    redis.call('PEXPIRE', key, math.ceil(capacity * 1000 / rate))
+end
+return {1, 0, 0}
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class TokenBucket:
+    """Allows ``capacity`` requests at once, refilled at ``refill_per_second``."""
+
+    capacity: float
+    refill_per_second: float
+
+
+@dataclass(frozen=True, slots=True)
+class BucketDecision:
+    admitted: bool
+    # Index of the bucket that refused the request (None when admitted)
+    refused_by: int | None = None
+    retry_after_s: float = 0.0
+
+
+class AdmissionBackend(Protocol):
+    async def take(
+        self, keys: list[str], buckets: list[TokenBucket], cost: float = 1.0
+    ) -> BucketDecision: ...
+
+
+class InMemoryAdmissionBackend:
+    """Per-process token buckets (single worker / no Redis)."""
+
+    def __init__(self) -> None:
+        # key -> (tokens, updated_at_monotonic)
+        self._buckets: dict[str, tuple[float, float]] = {}
+
+    async def take(
+        self, keys: list[str], buckets: list[TokenBucket], cost: float = 1.0
+    ) -> BucketDecision:
+        now = time.monotonic()
+        levels: list[float] = []
+        wait, refused = 0.0, None
+        for index, (key, bucket) in enumerate(zip(keys, buckets, strict=True)):
+            tokens, updated_at = self._buckets.get(key, (bucket.capacity, now))
+            tokens = min(bucket.capacity, tokens + (now - updated_at) * bucket.refill_per_second)
+            levels.append(tokens)
+            if tokens < cost and (cost - tokens) / bucket.refill_per_second > wait:
+                wait, refused = (cost - tokens) / bucket.refill_per_second, index
+        if refused is not None:
+            return BucketDecision(admitted=False, refused_by=refused, retry_after_s=wait)
+        for key, tokens in zip(keys, levels, strict=True):
+            self._buckets[key] = (tokens - cost, now)
+        return BucketDecision(admitted=True)
+
+
+class RedisAdmissionBackend:
+    """Token buckets in Redis, checked and charged by one Lua script call."""
+
+    def __init__(self, client: Any) -> None:
+        self._take = client.register_script(_TAKE_TOKENS)
+
+    async def take(
+        self, keys: list[str], buckets: list[TokenBucket], cost: float = 1.0
+    ) -> BucketDecision:
+        args: list[Any] = [int(time.time() * 1000), cost]
+        for bucket in buckets:
+            args.extend((bucket.capacity, bucket.refill_per_second))
+        admitted, refused, retry_after_ms = await self._take(keys=keys, args=args)
+        if int(admitted):
+            return BucketDecision(admitted=True)
+        return BucketDecision(
+            admitted=False, refused_by=int(refused) - 1, retry_after_s=int(retry_after_ms) / 1000
+        )
+
+
+class AdmissionController:
+    """Admits inbound webhook messages against per-contact, channel and tenant buckets.
+
+    A request the buckets refuse is deferred (held, then checked once more)
+    when tokens are due within ``max_defer_seconds``, and dropped otherwise.
+    Backend failures admit the request: limiting must never stop a turn.
+    """
+
+    SCOPES = ("contact", "channel", "tenant")
+
+    def __init__(
+        self,
+        backend: AdmissionBackend,
+        *,
+        contact: TokenBucket,
+        channel: TokenBucket,
+        tenant: TokenBucket,
+        max_defer_seconds: float = 2.0,
+        key_builder: RedisKeyBuilder = redis_keys,
+    ) -> None:
+        self._backend = backend
+        self._buckets = [contact, channel, tenant]
+        self._max_defer = max_defer_seconds
+        self._keys = key_builder
+
+    async def admit(self, tenant_id: str, channel_instance_id: str, contact_id: str) -> str:
+        """Charge one request; returns ``"admitted"``, ``"deferred"`` or ``"dropped"``."""
+        keys = [
+            self._keys.admission_bucket_key(tenant_id, "contact", contact_id),
+            self._keys.admission_bucket_key(tenant_id, "channel", channel_instance_id),
+            self._keys.admission_bucket_key(tenant_id, "tenant", tenant_id),
+        ]
+        try:
+            outcome, scope = await self._check(keys)
+        except Exception:
+            logger.warning("Admission check failed; admitting request", exc_info=True)
+            outcome, scope = "admitted", "error"
+        metrics.inc("admission_requests_total", outcome=outcome, scope=scope)
+        return outcome
+
+    async def _check(self, keys: list[str]) -> tuple[str, str | None]:
+        decision = await self._backend.take(keys, self._buckets)
+        if decision.admitted:
+            return "admitted", None
+        scope = self.SCOPES[decision.refused_by or 0]
+        if decision.retry_after_s <= self._max_defer:
+            await asyncio.sleep(decision.retry_after_s)
+            decision = await self._backend.take(keys, self._buckets)
+            if decision.admitted:
+                return "deferred", scope
+            scope = self.SCOPES[decision.refused_by or 0]
+        return "dropped", scope
@@ -2,24 +2,51 @@
 
 from __future__ import annotations
 
+import json
 import logging
 import time
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
+from app.core.redis_keys import RedisKeyBuilder
+from app.core.redis_unit_of_work import Deferred, RedisUnitOfWork
 from app.core.session import SessionManager
+from app.core.state import AsyncRedisStore, async_store
 from app.flow_core.state import FlowContext
+from app.services.session_tiering import rehydrate_state, rehydrate_state_async
 
 if TYPE_CHECKING:
+    from app.core.session_cache import SessionContextCache
     from app.core.state import ConversationStore
+    from app.services.session_tiering import PostgresColdSessionStore
 
 logger = logging.getLogger(__name__)
 
 
 class RedisSessionManager(SessionManager):
-    """Redis-based implementation of session management."""
+    """Redis-based implementation of session management.
 
-    def __init__(self, store: ConversationStore):
+    With a ``SessionContextCache`` (shared by the worker), contexts saved by a
+    turn are reused by the next turn of the session without a Redis read. With
+    a cold store, sessions the tiering sweeper moved out of Redis are moved
+    back on their next load.
+    """
+
+    def __init__(
+        self,
+        store: ConversationStore,
+        cache: SessionContextCache | None = None,
+        cold_store: PostgresColdSessionStore | None = None,
+    ):
         self._store = store
+        self._async_store = async_store(store)
+        # Versions and invalidations are written through the async Redis store
+        self._cache = cache if isinstance(self._async_store, AsyncRedisStore) else None
+        self._cold_store = cold_store
+
+    @staticmethod
+    def _user_id(session_id: str) -> str | None:
+        # Session ids look like "flow:{user_id}:{flow_id}"
+        return RedisKeyBuilder.session_user_id(session_id)
 
     def create_session(self, user_id: str, flow_id: str) -> str:
         """Create a new flow session."""
@@ -42,46 +69,221 @@ class RedisSessionManager(SessionManager):
 
     def load_context(self, session_id: str) -> FlowContext | None:
         """Load existing flow context."""
-        # Extract user_id from session_id for compatibility
-        parts = session_id.split(":")
-        if len(parts) >= 2:
-            user_id = parts[1]
-            existing_context_data = self._store.load(user_id, session_id)
-
-            if existing_context_data and isinstance(existing_context_data, dict):
-                try:
-                    context = FlowContext.from_dict(existing_context_data)
-                    logger.debug("Loaded existing flow context for session %s", session_id)
-                    return context
-                except Exception as e:
-                    logger.warning("Failed to deserialize flow context, creating new: %s", e)
+        user_id = self._user_id(session_id)
+        if user_id is None:
+            return None
+        data: object = self._store.load(user_id, session_id)
+        if data is None and self._cold_store is not None:
+            data = self._rehydrate(user_id, session_id)
+        return self._deserialize(session_id, data)
+
+    async def load_context_async(self, session_id: str) -> FlowContext | None:
+        """Load existing flow context through the shared async Redis pool."""
+        user_id = self._user_id(session_id)
+        if user_id is None:
+            return None
+        if self._cache is not None and (cached := self._cache.take(session_id)) is not None:
+            return cached
+        data: object = await self._async_store.load(user_id, session_id)
+        if data is None and self._cold_store is not None:
+            data = await self._rehydrate_async(user_id, session_id)
+        return self._deserialize(session_id, data)
 
+    def _rehydrate(self, user_id: str, session_id: str) -> dict[str, Any] | None:
+        if self._cold_store is None:
+            return None
+        try:
+            return rehydrate_state(self._store, self._cold_store, user_id, session_id)
+        except Exception as e:
+            logger.warning("Failed to rehydrate session %s from cold storage: %s", session_id, e)
+            return None
+
+    async def _rehydrate_async(self, user_id: str, session_id: str) -> dict[str, Any] | None:
+        if self._cold_store is None:
+            return None
+        try:
+            return await rehydrate_state_async(
+                self._async_store, self._cold_store, user_id, session_id
+            )
+        except Exception as e:
+            logger.warning("Failed to rehydrate session %s from cold storage: %s", session_id, e)
+            return None
+
+    @staticmethod
+    def _deserialize(session_id: str, data: object) -> FlowContext | None:
+        if data and isinstance(data, dict):
+            try:
+                context = FlowContext.from_dict(data)
+                logger.debug("Loaded existing flow context for session %s", session_id)
+                return context
+            except Exception as e:
+                logger.warning("Failed to deserialize flow context, creating new: %s", e)
         return None
 
     def get_context(self, session_id: str) -> FlowContext | None:
         """Get flow context for a session (alias for load_context)."""
         return self.load_context(session_id)
 
+    async def get_context_async(self, session_id: str) -> FlowContext | None:
+        return await self.load_context_async(session_id)
+
+    def queue_load_context(
+        self, uow: RedisUnitOfWork, session_id: str
+    ) -> Deferred[FlowContext | None]:
+        user_id = self._user_id(session_id)
+        if user_id is None or not isinstance(self._async_store, AsyncRedisStore):
+            return super().queue_load_context(uow, session_id)
+        if self._cache is not None and (cached := self._cache.take(session_id)) is not None:
+            return Deferred.resolved(cached)
+        loaded = self._async_store.queue_load(uow, user_id, session_id)
+        if self._cold_store is None:
+            return loaded.map(lambda data: self._deserialize(session_id, data))
+
+        async def load_or_rehydrate() -> FlowContext | None:
+            # Runs once the batched GET resolved; only misses touch the cold store
+            data: object = loaded.result()
+            if data is None:
+                data = await self._rehydrate_async(user_id, session_id)
+            return self._deserialize(session_id, data)
+
+        return uow.defer(load_or_rehydrate())
+
+    def queue_save_context(
+        self,
+        uow: RedisUnitOfWork,
+        session_id: str,
+        context: FlowContext,
+        *,
+        tenant_id: str | None = None,
+    ) -> None:
+        user_id = self._user_id(session_id)
+        if user_id is None or not isinstance(self._async_store, AsyncRedisStore):
+            super().queue_save_context(uow, session_id, context, tenant_id=tenant_id)
+            return
+        self._queue_write(uow, user_id, session_id, context, tenant_id=tenant_id)
+
+    def _queue_write(
+        self,
+        uow: RedisUnitOfWork,
+        user_id: str,
+        session_id: str,
+        context: FlowContext | None,
+        *,
+        tenant_id: str | None = None,
+    ) -> None:
+        """Queue saving ``context`` (None clears it) and keep the L1 cache coherent."""
+        payload = context.to_dict() if context is not None else {}
+        if self._cache is None:
+            self._async_store.queue_save(uow, user_id, session_id, payload, tenant_id=tenant_id)
+            return
+
+        cache = self._cache
+        version = cache.new_version()
+        version_key = self._async_store.version_key(user_id, session_id)
+        self._async_store.queue_save(
+            uow, user_id, session_id, payload, tenant_id=tenant_id, version=version
+        )
+        uow.queue("publish", cache.channel, cache.invalidation_message(session_id, version))
+        cache.invalidate(session_id)
+        if context is not None:
+            uow.after(lambda: cache.put(session_id, context, version, version_key))
+
+    async def _write_async(self, session_id: str, context: FlowContext | None) -> None:
+        user_id = self._user_id(session_id)
+        if user_id is None:
+            return
+        uow = RedisUnitOfWork(self._async_store.redis_client, name="session")
+        self._queue_write(uow, user_id, session_id, context)
+        await uow.execute(transaction=True)
+
+    def _invalidate_sync(self, session_id: str) -> None:
+        # Writes through the synchronous client bypass versioning; evict everywhere
+        if self._cache is None:
+            return
+        self._cache.invalidate(session_id)
+        redis_client = getattr(self._store, "redis_client", None)
+        if redis_client is not None:
+            redis_client.publish(self._cache.channel, json.dumps({"session_id": session_id}))
+
     def save_context(self, session_id: str, context: FlowContext) -> None:
         """Save flow context."""
-        # Extract user_id from session_id for compatibility
-        parts = session_id.split(":")
-        if len(parts) >= 2:
-            user_id = parts[1]
-            try:
-                self._store.save(user_id, session_id, context.to_dict())
-                logger.debug("Saved flow context for session %s", session_id)
-            except Exception as e:
-                logger.error("Failed to save flow context: %s", e)
+        user_id = self._user_id(session_id)
+        if user_id is None:
+            return
+        try:
+            self._store.save(user_id, session_id, context.to_dict())
+            self._invalidate_sync(session_id)
+            logger.debug("Saved flow context for session %s", session_id)
+        except Exception as e:
+            logger.error("Failed to save flow context: %s", e)
+
+    async def save_context_async(self, session_id: str, context: FlowContext) -> None:
+        user_id = self._user_id(session_id)
+        if user_id is None:
+            return
+        try:
+            if self._cache is not None:
+                await self._write_async(session_id, context)
+            else:
+                await self._async_store.save(user_id, session_id, context.to_dict())
+            logger.debug("Saved flow context for session %s", session_id)
+        except Exception as e:
+            logger.error("Failed to save flow context: %s", e)
+
+    async def save_context_if_unchanged_async(
+        self, session_id: str, context: FlowContext, base_version: str | None
+    ) -> bool:
+        user_id = self._user_id(session_id)
+        if user_id is None or not isinstance(self._async_store, AsyncRedisStore):
+            return await super().save_context_if_unchanged_async(session_id, context, base_version)
+        cache = self._cache
+        version = cache.new_version() if cache is not None else None
+        try:
+            saved = await self._async_store.save_if_unchanged(
+                user_id,
+                session_id,
+                context.to_dict(),
+                field="updated_at",
+                expected=base_version,
+                version=version,
+            )
+            if saved and cache is not None and version is not None:
+                cache.invalidate(session_id)
+                await self._async_store.redis_client.publish(
+                    cache.channel, cache.invalidation_message(session_id, version)
+                )
+                cache.put(
+                    session_id,
+                    context,
+                    version,
+                    self._async_store.version_key(user_id, session_id),
+                )
+        except Exception as e:
+            logger.error("Failed to save flow context: %s", e)
+            return False
+        return bool(saved)
 
     def clear_context(self, session_id: str) -> None:
         """Clear flow context."""
-        # Extract user_id from session_id for compatibility
-        parts = session_id.split(":")
-        if len(parts) >= 2:
-            user_id = parts[1]
-            try:
-                self._store.save(user_id, session_id, {})
-                logger.debug("Cleared flow context for session %s", session_id)
-            except Exception as e:
-                logger.warning("Failed to clear flow context: %s", e)
+        user_id = self._user_id(session_id)
+        if user_id is None:
+            return
+        try:
+            self._store.save(user_id, session_id, {})
+            self._invalidate_sync(session_id)
+            logger.debug("Cleared flow context for session %s", session_id)
+        except Exception as e:
+            logger.warning("Failed to clear flow context: %s", e)
+
+    async def clear_context_async(self, session_id: str) -> None:
+        user_id = self._user_id(session_id)
+        if user_id is None:
+            return
+        try:
+            if self._cache is not None:
+                await self._write_async(session_id, None)
+            else:
+                await self._async_store.save(user_id, session_id, {})
+            logger.debug("Cleared flow context for session %s", session_id)
+        except Exception as e:
+            logger.warning("Failed to clear flow context: %s", e)
@@ -0,0 +1,330 @@
+"""Cold-state tiering of idle flow sessions.
+
+Flow state stays in Redis for the whole state TTL (30 days), so Redis memory
+grows with every contact who ever wrote in although most sessions go quiet
+within a day. A background sweeper moves sessions idle for longer than a
+threshold into the compressed, encrypted ``cold_sessions`` table, and
+``RedisSessionManager`` moves them back when the contact writes again.
+
+Idle time is derived from the remaining TTL (every save refreshes it) or,
+for stores without a state TTL, from ``OBJECT IDLETIME``. The hot copy is
+only deleted if it is unchanged since the sweeper read it, so a turn racing
+the sweep keeps its state in Redis and the archived copy is discarded. A hot
+copy that is already gone (e.g. moved by an overlapping sweep) keeps its
+archived copy.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from app.core.metrics import metrics
+from app.core.redis_key_index import decode_key, scan_keys_async
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from app.core.state import AsyncRedisStore
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_IDLE_SECONDS = 24 * 3600
+DEFAULT_INTERVAL_SECONDS = 300.0
+DEFAULT_BATCH_SIZE = 200
+
+# Deletes the state and its version token if nobody wrote the state since it
+# was read; returns 0 if the state is gone and -1 if it holds another value
+_DELETE_IF_UNCHANGED = """
+local current = redis.call('GET', KEYS[1])
+if current == ARGV[1] then
+    return redis.call('DEL', KEYS[1], KEYS[2])
+end
+if not current then
+    return 0
+end
+return -1
+"""
+_STATE_CHANGED = -1
+
+# Extends the sweep lock if this worker still holds it
+_RENEW_LOCK = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+class PostgresColdSessionStore:
+    """Archived flow states in the ``cold_sessions`` table (blocking; call via a thread)."""
+
+    def archive(self, entries: Sequence[tuple[str, str, dict[str, Any]]]) -> None:
+        """Store ``(session_id, user_id, state)`` entries, replacing older copies."""
+        from app.db.repository import upsert_cold_sessions
+        from app.db.session import db_transaction
+        from app.db.types import blind_index
+
+        rows = [
+            {
+                "session_key": blind_index(session_id),
+                "user_key": blind_index(user_id),
+                "state": state,
+            }
+            for session_id, user_id, state in entries
+        ]
+        with db_transaction() as session:
+            upsert_cold_sessions(session, rows)
+
+    def pop(self, session_id: str) -> dict[str, Any] | None:
+        """Remove and return the archived state of a session."""
+        from app.db.repository import pop_cold_session
+        from app.db.session import db_transaction
+        from app.db.types import blind_index
+
+        with db_transaction() as session:
+            return pop_cold_session(session, blind_index(session_id))
+
+    def discard(self, session_ids: Sequence[str]) -> None:
+        from app.db.repository import delete_cold_sessions
+        from app.db.session import db_transaction
+        from app.db.types import blind_index
+
+        if not session_ids:
+            return
+        with db_transaction() as session:
+            delete_cold_sessions(session, session_keys=[blind_index(s) for s in session_ids])
+
+    def delete_user(self, user_id: str) -> int:
+        """Drop every archived session of a user (conversation resets)."""
+        from app.db.repository import delete_cold_sessions
+        from app.db.session import db_transaction
+        from app.db.types import blind_index
+
+        with db_transaction() as session:
+            return delete_cold_sessions(session, user_key=blind_index(user_id))
+
+    def count(self) -> int:
+        from app.db.repository import count_cold_sessions
+        from app.db.session import db_session
+
+        with db_session() as session:
+            return count_cold_sessions(session)
+
+
+@dataclass(slots=True)
+class SweepResult:
+    hot: int = 0
+    tiered: int = 0
+    cold: int | None = None
+
+
+@dataclass(slots=True)
+class _Candidate:
+    key: str
+    user_id: str
+    session_id: str
+
+
+class SessionTieringSweeper:
+    """Periodically moves idle sessions from Redis into a cold store.
+
+    One worker sweeps per interval (a Redis lock elects it); the others skip.
+    The lock is renewed before every batch, and a sweeper that lost it stops.
+    """
+
+    def __init__(
+        self,
+        store: AsyncRedisStore,
+        cold_store: PostgresColdSessionStore,
+        *,
+        idle_seconds: int = DEFAULT_IDLE_SECONDS,
+        interval_seconds: float = DEFAULT_INTERVAL_SECONDS,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> None:
+        self._store = store
+        self._r = store.redis_client
+        self._keys = store.key_builder
+        self._cold = cold_store
+        self._idle = idle_seconds
+        self._interval = interval_seconds
+        self._lock_ttl = max(int(interval_seconds), 1)
+        self._batch_size = batch_size
+        self._owner = uuid.uuid4().hex
+        self._task: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Session tiering sweep failed: %s", e)
+            await asyncio.sleep(self._interval)
+
+    async def run_once(self) -> SweepResult | None:
+        """Sweep the keyspace once; returns None when another worker holds the lock."""
+        lock_key = self._keys.session_tiering_lock_key()
+        if not await self._r.set(lock_key, self._owner, nx=True, ex=self._lock_ttl):
+            return None
+
+        result = SweepResult()
+        batch: list[_Candidate] = []
+        async for raw_key in scan_keys_async(self._r, f"{self._keys.namespace}:state:*"):
+            candidate = self._candidate(decode_key(raw_key))
+            if candidate is None:
+                continue
+            batch.append(candidate)
+            if len(batch) >= self._batch_size:
+                if not await self._renew_lock(lock_key):
+                    return result
+                await self._sweep(batch, result)
+                batch = []
+        if batch:
+            if not await self._renew_lock(lock_key):
+                return result
+            await self._sweep(batch, result)
+
+        metrics.set_gauge("sessions_hot", result.hot)
+        try:
+            result.cold = await asyncio.to_thread(self._cold.count)
+            metrics.set_gauge("sessions_cold", result.cold)
+        except Exception as e:
+            logger.warning("Failed to count cold sessions: %s", e)
+        logger.info("Session tiering: %d hot, %d moved to cold storage", result.hot, result.tiered)
+        return result
+
+    async def _renew_lock(self, lock_key: str) -> bool:
+        if await self._r.eval(_RENEW_LOCK, 1, lock_key, self._owner, self._lock_ttl):
+            return True
+        logger.warning("Session tiering lock lost mid-sweep; leaving the rest to its holder")
+        return False
+
+    def _candidate(self, key: str) -> _Candidate | None:
+        parsed = self._keys.parse_conversation_key(key)
+        # Flow state only; version tokens go together with their state
+        if parsed is None or key.endswith(":v") or not parsed["session_id"].startswith("flow:"):
+            return None
+        return _Candidate(key, parsed["user_id"], parsed["session_id"])
+
+    async def _sweep(self, batch: list[_Candidate], result: SweepResult) -> None:
+        idle_seconds = await self._idle_seconds(batch)
+        idle = [
+            candidate
+            for candidate, seconds in zip(batch, idle_seconds, strict=True)
+            if seconds is not None and seconds >= self._idle
+        ]
+        result.hot += len(batch) - len(idle)
+        if not idle:
+            return
+
+        pipeline = self._r.pipeline(transaction=False)
+        for candidate in idle:
+            pipeline.get(candidate.key)
+        raw_values = await pipeline.execute()
+
+        moving: list[tuple[_Candidate, Any]] = []
+        archive: list[tuple[str, str, dict[str, Any]]] = []
+        for candidate, raw in zip(idle, raw_values, strict=True):
+            if raw is None:
+                continue  # expired meanwhile
+            try:
+                state = json.loads(raw)
+            except ValueError:
+                result.hot += 1
+                continue
+            moving.append((candidate, raw))
+            # Cleared sessions ({}) are just dropped
+            if state:
+                archive.append((candidate.session_id, candidate.user_id, state))
+        if archive:
+            await asyncio.to_thread(self._cold.archive, archive)
+
+        pipeline = self._r.pipeline(transaction=False)
+        for candidate, raw in moving:
+            version_key = self._store.version_key(candidate.user_id, candidate.session_id)
+            pipeline.eval(_DELETE_IF_UNCHANGED, 2, candidate.key, version_key, raw)
+        deleted = await pipeline.execute()
+
+        changed = [
+            c.session_id for (c, _), n in zip(moving, deleted, strict=True) if n == _STATE_CHANGED
+        ]
+        if changed:
+            # Written by a turn while we archived; Redis holds the newer state
+            await asyncio.to_thread(self._cold.discard, changed)
+        tiered = sum(1 for n in deleted if n > 0)
+        result.hot += len(changed)
+        result.tiered += tiered
+        metrics.inc("sessions_tiered_total", tiered)
+
+    async def _idle_seconds(self, batch: list[_Candidate]) -> list[int | None]:
+        state_ttl = self._store.state_ttl
+        pipeline = self._r.pipeline(transaction=False)
+        for candidate in batch:
+            if state_ttl:
+                pipeline.ttl(candidate.key)
+            else:
+                pipeline.object("idletime", candidate.key)
+        values = await pipeline.execute()
+        if not state_ttl:
+            return [int(v) if v is not None else None for v in values]
+        # Keys without a TTL (-1) or already gone (-2) are left alone
+        return [state_ttl - int(v) if v is not None and int(v) >= 0 else None for v in values]
+
+
+def _record_rehydration(started: float) -> None:
+    metrics.inc("session_rehydrations_total")
+    metrics.observe("session_rehydration_ms", (time.perf_counter() - started) * 1000)
+
+
+def rehydrate_state(
+    store: Any, cold_store: PostgresColdSessionStore, user_id: str, session_id: str
+) -> dict[str, Any] | None:
+    """Move an archived session back into ``store``; returns its state (None if not archived)."""
+    started = time.perf_counter()
+    state = cold_store.pop(session_id)
+    if state is None:
+        return None
+    try:
+        store.save(user_id, session_id, state)
+    except Exception:
+        cold_store.archive([(session_id, user_id, state)])
+        raise
+    _record_rehydration(started)
+    return state
+
+
+async def rehydrate_state_async(
+    store: Any, cold_store: PostgresColdSessionStore, user_id: str, session_id: str
+) -> dict[str, Any] | None:
+    """Async variant of ``rehydrate_state`` for an async store."""
+    started = time.perf_counter()
+    state = await asyncio.to_thread(cold_store.pop, session_id)
+    if state is None:
+        return None
+    try:
+        await store.save(user_id, session_id, state)
+    except Exception:
+        await asyncio.to_thread(cold_store.archive, [(session_id, user_id, state)])
+        raise
+    _record_rehydration(started)
+    return state
@@ -0,0 +1,124 @@
+"""Speculative turn precomputation during the debounce window.
+
+While the debouncer waits ``wait_time_before_replying_ms`` for the user to stop
+typing, the worker is idle. Once the buffer has been quiet for a short
+threshold, a full turn is started on the current aggregate without committing
+any state. If no further message arrives, the precomputed result is used at the
+deadline; otherwise it is discarded. Validity is decided with the same
+monotonic buffer sequence numbers used by ``ProcessingCancellationManager``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable, Coroutine
+from typing import TYPE_CHECKING, Any
+
+from app.core.metrics import metrics
+
+if TYPE_CHECKING:
+    from app.core.flow_response import FlowResponse
+    from app.services.processing_cancellation_manager import ProcessingCancellationManager
+
+logger = logging.getLogger(__name__)
+
+TurnComputation = Callable[[str], Coroutine[Any, Any, "FlowResponse"]]
+
+
+class SpeculativeTurn:
+    """A single speculative turn bound to one debounce wait."""
+
+    def __init__(
+        self,
+        cancellation_manager: ProcessingCancellationManager,
+        session_id: str,
+        compute: TurnComputation,
+    ) -> None:
+        """Initialize the speculative turn.
+
+        Args:
+            cancellation_manager: Debounce manager owning the message buffer
+            session_id: Session identifier
+            compute: Runs a non-committing turn for an aggregated message
+        """
+        self._manager = cancellation_manager
+        self._session_id = session_id
+        self._compute = compute
+        self._task: asyncio.Task[FlowResponse] | None = None
+        self._sequence: int | None = None
+        self._message: str | None = None
+        self._started_at = 0.0
+
+    @property
+    def started(self) -> bool:
+        return self._task is not None
+
+    async def start(self) -> None:
+        """Snapshot the buffer and start computing the turn in the background.
+
+        Designed to be passed as ``on_quiet`` to ``wait_for_inactivity``.
+        """
+        if self._task is not None:
+            return
+
+        message = await self._manager.peek_aggregated_messages_async(self._session_id)
+        if not message:
+            return
+
+        self._sequence = await self._manager.get_latest_sequence_async(self._session_id)
+        self._message = message
+        self._started_at = time.perf_counter()
+        self._task = asyncio.create_task(self._compute(message))
+        metrics.inc("speculative_turns_started_total")
+        logger.info(f"[{self._session_id}] Started speculative turn at sequence #{self._sequence}")
+
+    async def is_current(self) -> bool:
+        """Whether the snapshot still matches the buffer (no newer message arrived)."""
+        if self._task is None or self._sequence is None:
+            return False
+        return await self._manager.get_latest_sequence_async(self._session_id) == self._sequence
+
+    def discard(self, reason: str) -> None:
+        """Cancel the speculative computation; cheap when nothing was started."""
+        if self._task is None:
+            return
+        if not self._task.done():
+            self._task.cancel()
+        self._task = None
+        metrics.inc("speculative_turns_discarded_total", reason=reason)
+        logger.info(f"[{self._session_id}] Discarded speculative turn ({reason})")
+
+    async def take(self, final_message: str | None) -> FlowResponse | None:
+        """Return the precomputed response if it was computed for ``final_message``.
+
+        Must be called after ``is_current`` confirmed the snapshot; the final
+        aggregate is compared as a second guard against buffer changes.
+        """
+        if self._task is None:
+            return None
+        if final_message != self._message:
+            self.discard("message_changed")
+            return None
+
+        try:
+            response = await self._task
+        except asyncio.CancelledError:
+            return None
+        except Exception as e:
+            logger.warning(f"[{self._session_id}] Speculative turn failed: {e}")
+            self.discard("failed")
+            return None
+
+        if not response.is_success:
+            self.discard("unsuccessful")
+            return None
+
+        elapsed_ms = (time.perf_counter() - self._started_at) * 1000
+        metrics.observe("speculative_turn_age_ms", elapsed_ms)
+        return response
+
+    def mark_committed(self) -> None:
+        metrics.inc("speculative_turns_committed_total")
+        self._task = None
@@ -0,0 +1,130 @@
+"""Hourly message statistics rollup.
+
+Dashboards used to count ``messages`` and ``chat_threads`` on every request,
+which slows down as history grows and competes with the webhook writes. The
+``message_stats_hourly`` table holds one row per tenant, channel, flow and
+hour; a background job recomputes the most recent hours every interval and
+``backfill_message_stats`` (``scripts/backfill_stats_rollups.py``) fills in
+history. Stats endpoints then read O(buckets) rows.
+
+Rollup rows lag the messages by up to one interval.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Callable, Iterator
+from datetime import UTC, datetime, timedelta
+
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL_SECONDS = 300.0
+DEFAULT_LOOKBACK_HOURS = 2
+BACKFILL_CHUNK = timedelta(days=1)
+
+
+def floor_hour(moment: datetime) -> datetime:
+    return moment.astimezone(UTC).replace(minute=0, second=0, microsecond=0)
+
+
+def hour_windows(
+    start: datetime, end: datetime, chunk: timedelta = BACKFILL_CHUNK
+) -> Iterator[tuple[datetime, datetime]]:
+    """Split ``[start, end)`` into hour-aligned windows of at most ``chunk``."""
+    window_start = floor_hour(start)
+    last_hour = floor_hour(end)
+    if last_hour < end:
+        last_hour += timedelta(hours=1)
+    while window_start < last_hour:
+        window_end = min(window_start + chunk, last_hour)
+        yield window_start, window_end
+        window_start = window_end
+
+
+def rollup_window(start: datetime, end: datetime, *, wait_for_lock: bool = False) -> bool:
+    """Recompute one window in its own transaction (blocking; call via a thread).
+
+    Returns False when another worker holds the rollup lock.
+    """
+    from app.db.repository import rollup_message_stats, try_lock_stats_rollup
+    from app.db.session import db_transaction
+
+    with db_transaction() as session:
+        if not wait_for_lock and not try_lock_stats_rollup(session):
+            return False
+        rollup_message_stats(session, start, end)
+    return True
+
+
+def backfill_message_stats(
+    start: datetime,
+    end: datetime,
+    *,
+    chunk: timedelta = BACKFILL_CHUNK,
+    rollup: Callable[..., bool] = rollup_window,
+) -> int:
+    """Rebuild the rollup for ``[start, end)`` one chunk per transaction; returns the chunk count."""
+    done = 0
+    for window_start, window_end in hour_windows(start, end, chunk):
+        rollup(window_start, window_end, wait_for_lock=True)
+        done += 1
+        logger.info("Rolled up message stats for %s - %s", window_start, window_end)
+    return done
+
+
+class StatsRollupJob:
+    """Periodically recomputes the last few hours of the stats rollup.
+
+    Recomputing (rather than incrementing) makes the job idempotent, and an
+    advisory lock keeps the other workers from repeating the same scan.
+    """
+
+    def __init__(
+        self,
+        *,
+        interval_seconds: float = DEFAULT_INTERVAL_SECONDS,
+        lookback_hours: int = DEFAULT_LOOKBACK_HOURS,
+        rollup: Callable[[datetime, datetime], bool] = rollup_window,
+        clock: Callable[[], datetime] = lambda: datetime.now(UTC),
+    ) -> None:
+        self._interval = interval_seconds
+        self._lookback = timedelta(hours=lookback_hours)
+        self._rollup = rollup
+        self._clock = clock
+        self._task: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Stats rollup failed: %s", e)
+            await asyncio.sleep(self._interval)
+
+    async def run_once(self) -> bool:
+        """Recompute from ``lookback_hours`` ago through the current hour."""
+        current = floor_hour(self._clock())
+        ran = await asyncio.to_thread(
+            self._rollup, current - self._lookback, current + timedelta(hours=1)
+        )
+        if ran:
+            metrics.inc("stats_rollup_runs_total")
+        return ran
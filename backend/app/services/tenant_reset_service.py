@@ -0,0 +1,161 @@
+"""Tenant-wide conversation reset as a background job.
+
+Resetting a large tenant takes many UNLINK batches (plus, while keys written
+before the key indexes existed may remain, a SCAN of the keyspace), so the
+admin endpoint starts a job and returns its id. Progress lives in a Redis hash
+so any worker can report it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import uuid
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Any
+
+from app.core.metrics import metrics
+from app.core.redis_key_index import (
+    clear_user_keys_async,
+    decode_key,
+    scan_keys_async,
+    unlink_keys_async,
+)
+from app.core.redis_keys import RedisKeyBuilder
+from app.core.session_cache import publish_invalidation
+
+if TYPE_CHECKING:
+    from app.services.session_tiering import PostgresColdSessionStore
+
+logger = logging.getLogger(__name__)
+
+# How long finished job progress stays readable
+JOB_TTL_SECONDS = 86400
+# Write progress to Redis every N users
+PROGRESS_EVERY = 50
+
+# Strong references to running jobs; asyncio only keeps weak ones
+_running_jobs: set[asyncio.Task[None]] = set()
+
+
+def _phone(user_id: str) -> str:
+    return user_id.replace("whatsapp:", "").replace("+", "")
+
+
+class TenantResetJob:
+    """Deletes the Redis conversation state of every user of a tenant.
+
+    Users come from the tenant's key index set plus ``user_ids`` (the tenant's
+    contacts), which covers users whose state predates the index. With a
+    ``cold_store`` their sessions tiered out of Redis are deleted as well.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        key_builder: RedisKeyBuilder,
+        tenant_id: str,
+        user_ids: Iterable[str] = (),
+        *,
+        scan_legacy: bool = True,
+        job_id: str | None = None,
+        cold_store: PostgresColdSessionStore | None = None,
+    ) -> None:
+        self._r = client
+        self._keys = key_builder
+        self.tenant_id = tenant_id
+        self._user_ids = set(user_ids)
+        self._scan_legacy = scan_legacy
+        self.job_id = job_id or uuid.uuid4().hex
+        self._cold = cold_store
+
+    @property
+    def job_key(self) -> str:
+        return self._keys.tenant_reset_job_key(self.job_id)
+
+    async def start(self) -> str:
+        """Record the job as pending and run it in the background; returns its id."""
+        await self._update(
+            status="pending",
+            tenant_id=self.tenant_id,
+            total_users=0,
+            processed_users=0,
+            deleted_keys=0,
+            created_at=int(time.time()),
+        )
+        task = asyncio.create_task(self.run())
+        _running_jobs.add(task)
+        task.add_done_callback(_running_jobs.discard)
+        return self.job_id
+
+    async def run(self) -> None:
+        deleted = 0
+        try:
+            await self._update(status="running")
+            tenant_index = self._keys.tenant_user_index(self.tenant_id)
+            users = self._user_ids | {
+                decode_key(member) for member in await self._r.smembers(tenant_index)
+            }
+            await self._update(total_users=len(users))
+
+            for processed, user_id in enumerate(sorted(users), start=1):
+                deleted += await clear_user_keys_async(
+                    self._r, self._keys, user_id, scan_legacy=False
+                )
+                if self._cold is not None:
+                    await asyncio.to_thread(self._cold.delete_user, user_id)
+                if processed % PROGRESS_EVERY == 0 or processed == len(users):
+                    await self._update(processed_users=processed, deleted_keys=deleted)
+
+            if self._scan_legacy:
+                deleted += await self._clear_legacy_keys(users)
+            await self._r.unlink(tenant_index)
+            # Cached contexts of the tenant's users are gone from Redis now
+            await publish_invalidation(self._r, self._keys.namespace)
+
+            await self._update(
+                status="completed", deleted_keys=deleted, finished_at=int(time.time())
+            )
+            metrics.inc("tenant_reset_jobs_total", status="completed")
+            logger.info(
+                "Tenant reset %s finished: %d users, %d keys", self.job_id, len(users), deleted
+            )
+        except Exception as e:
+            logger.exception("Tenant reset %s failed", self.job_id)
+            metrics.inc("tenant_reset_jobs_total", status="failed")
+            await self._update(
+                status="failed", error=str(e), deleted_keys=deleted, finished_at=int(time.time())
+            )
+
+    async def _clear_legacy_keys(self, users: set[str]) -> int:
+        """One SCAN pass per key family, deleting keys that mention any tenant user."""
+        phones = {_phone(user_id) for user_id in users}
+        if not phones:
+            return 0
+
+        namespace = self._keys.namespace
+        matched: list[str] = []
+        for pattern in (f"{namespace}:state:*", f"{namespace}:history:*"):
+            async for raw_key in scan_keys_async(self._r, pattern):
+                key = decode_key(raw_key)
+                if any(token.lstrip("+") in phones for token in key.split(":")):
+                    matched.append(key)
+        return await unlink_keys_async(self._r, matched)
+
+    async def _update(self, **fields: Any) -> None:
+        try:
+            await self._r.hset(self.job_key, mapping={k: str(v) for k, v in fields.items()})
+            await self._r.expire(self.job_key, JOB_TTL_SECONDS)
+        except Exception as e:
+            logger.warning("Failed to record progress of tenant reset %s: %s", self.job_id, e)
+
+
+async def get_tenant_reset_progress(
+    client: Any, key_builder: RedisKeyBuilder, job_id: str
+) -> dict[str, str] | None:
+    """Return the progress hash of a tenant reset job, or None if unknown/expired."""
+    raw = await client.hgetall(key_builder.tenant_reset_job_key(job_id))
+    if not raw:
+        return None
+    return {decode_key(k): decode_key(v) for k, v in raw.items()}
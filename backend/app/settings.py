@@ -28,17 +28,93 @@ class Settings(BaseSettings):
     redis_port: int | None = Field(default=None, alias="REDIS_PORT")
     redis_db: int | None = Field(default=None, alias="REDIS_DB")
     redis_password: str | None = Field(default=None, alias="REDIS_PASSWORD")
+    # Size of the shared async Redis pool used by request handlers (per worker)
+    redis_max_connections: int = Field(default=50, alias="REDIS_MAX_CONNECTIONS")
+    # Connect with Redis Cluster clients (REDIS_URL points at any cluster node)
+    redis_cluster: bool = Field(default=False, alias="REDIS_CLUSTER")
+    # Also SCAN for conversation keys written before per-user key indexes existed
+    redis_legacy_key_scan: bool = Field(default=True, alias="REDIS_LEGACY_KEY_SCAN")
+    # In-process cache of decoded flow contexts, invalidated across workers via pub/sub
+    session_cache_enabled: bool = Field(default=True, alias="SESSION_CACHE_ENABLED")
+    session_cache_max_entries: int = Field(default=10_000, alias="SESSION_CACHE_MAX_ENTRIES")
+    session_cache_ttl_seconds: float = Field(default=60.0, alias="SESSION_CACHE_TTL_SECONDS")
+    # ETag/Last-Modified validators of admin resources cached in Redis; commits
+    # invalidate them, the TTL bounds staleness from writes outside the ORM.
+    # Conversation lists have no cheap validator and cache their body's ETag briefly
+    etag_cache_enabled: bool = Field(default=True, alias="ETAG_CACHE_ENABLED")
+    etag_cache_ttl_seconds: int = Field(default=300, alias="ETAG_CACHE_TTL_SECONDS")
+    etag_volatile_ttl_seconds: int = Field(default=5, alias="ETAG_VOLATILE_TTL_SECONDS")
+    # Token-bucket admission control on the webhook path (burst size, refill per second)
+    admission_control_enabled: bool = Field(default=True, alias="ADMISSION_CONTROL_ENABLED")
+    admission_contact_burst: float = Field(default=10, alias="ADMISSION_CONTACT_BURST")
+    admission_contact_rate: float = Field(default=0.2, alias="ADMISSION_CONTACT_RATE")
+    admission_channel_burst: float = Field(default=100, alias="ADMISSION_CHANNEL_BURST")
+    admission_channel_rate: float = Field(default=5, alias="ADMISSION_CHANNEL_RATE")
+    admission_tenant_burst: float = Field(default=300, alias="ADMISSION_TENANT_BURST")
+    admission_tenant_rate: float = Field(default=15, alias="ADMISSION_TENANT_RATE")
+    # Over-limit messages whose tokens are due within this wait are held, not dropped
+    admission_max_defer_ms: int = Field(default=2000, alias="ADMISSION_MAX_DEFER_MS")
+    # Move flow state idle longer than the threshold from Redis to Postgres (cold_sessions)
+    session_tiering_enabled: bool = Field(default=False, alias="SESSION_TIERING_ENABLED")
+    session_tiering_idle_seconds: int = Field(default=86_400, alias="SESSION_TIERING_IDLE_SECONDS")
+    session_tiering_interval_seconds: float = Field(
+        default=300.0, alias="SESSION_TIERING_INTERVAL_SECONDS"
+    )
+    session_tiering_batch_size: int = Field(default=200, alias="SESSION_TIERING_BATCH_SIZE")
+    # Recompute the hourly message stats rollup (message_stats_hourly) in the background
+    stats_rollup_enabled: bool = Field(default=True, alias="STATS_ROLLUP_ENABLED")
+    stats_rollup_interval_seconds: float = Field(
+        default=300.0, alias="STATS_ROLLUP_INTERVAL_SECONDS"
+    )
+    stats_rollup_lookback_hours: int = Field(default=2, alias="STATS_ROLLUP_LOOKBACK_HOURS")
+    # Monthly messages partitions: create ahead, archive (to gzipped CSV) and drop old ones
+    message_partitions_enabled: bool = Field(default=True, alias="MESSAGE_PARTITIONS_ENABLED")
+    message_partition_months_ahead: int = Field(default=3, alias="MESSAGE_PARTITION_MONTHS_AHEAD")
+    message_archive_after_months: int | None = Field(
+        default=None, alias="MESSAGE_ARCHIVE_AFTER_MONTHS"
+    )
+    message_archive_dir: str = Field(default="archive/messages", alias="MESSAGE_ARCHIVE_DIR")
     # Database
     database_url: str | None = Field(default=None, alias="DATABASE_URL")
+    # Connection budget: connections all processes together may hold on the
+    # database, split evenly across WEB_CONCURRENCY workers (see app/db/connection_budget.py)
+    db_max_connections: int = Field(default=80, alias="DB_MAX_CONNECTIONS")
+    web_concurrency: int = Field(default=1, alias="WEB_CONCURRENCY")
+    db_vector_pool_share: float = Field(default=0.3, alias="DB_VECTOR_POOL_SHARE")
+    db_pool_timeout_seconds: float = Field(default=30.0, alias="DB_POOL_TIMEOUT_SECONDS")
+    # Connect through PgBouncer in transaction pooling mode (no prepared statements)
+    db_pgbouncer_mode: bool = Field(default=False, alias="DB_PGBOUNCER_MODE")
+    # Optional read replica for read-only endpoints; reads fall back to the
+    # primary while it lags more than the max or cannot be reached
+    database_replica_url: str | None = Field(default=None, alias="DATABASE_REPLICA_URL")
+    database_replica_max_lag_seconds: float = Field(
+        default=5.0, alias="DATABASE_REPLICA_MAX_LAG_SECONDS"
+    )
+    database_replica_check_interval_seconds: float = Field(
+        default=5.0, alias="DATABASE_REPLICA_CHECK_INTERVAL_SECONDS"
+    )
     # Vector database URL for pgvector
     pg_vector_database_url: str | None = Field(default=None, alias="PG_VECTOR_DATABASE_URL")
     # Legacy debug flag - DEPRECATED: Use DEVELOPMENT_MODE instead
     debug: bool = Field(default=False, alias="DEBUG")
     # Development mode flag - THE UNIFIED FLAG for all development features
     development_mode: bool = Field(default=False, alias="DEVELOPMENT_MODE")
+    # Per-request LRU of decrypted PII values (0 disables) and the threads
+    # that decrypt export batches
+    pii_decryption_cache_size: int = Field(default=4096, alias="PII_DECRYPTION_CACHE_SIZE")
+    pii_decrypt_workers: int = Field(default=4, alias="PII_DECRYPT_WORKERS")
     # Admin authentication
     admin_username: str = Field(default="super@inboxed.com", alias="ADMIN_USERNAME")
     admin_password: str | None = Field(default=None, alias="ADMIN_PASSWORD")
+    # Speculative turns: precompute the reply once the debounce buffer has been
+    # quiet for this long, so it is ready when the reply window closes
+    speculative_turns_enabled: bool = Field(default=True, alias="SPECULATIVE_TURNS_ENABLED")
+    speculation_quiet_ms: int = Field(default=1500, alias="SPECULATION_QUIET_MS")
+    # Embedding-based routing at decision nodes (falls back to the LLM when ambiguous).
+    # Off by default: enable only after scripts/eval_semantic_routing.py --embedder openai
+    # reports at least 99% accuracy on the routed turns for the chosen margin
+    semantic_routing_enabled: bool = Field(default=False, alias="SEMANTIC_ROUTING_ENABLED")
+    semantic_routing_margin: float = Field(default=0.16, alias="SEMANTIC_ROUTING_MARGIN")
     # Audio validation
     max_audio_duration_seconds: int = Field(
         default=300, alias="MAX_AUDIO_DURATION_SECONDS"
@@ -17,9 +17,12 @@ from fastapi import Request, Response
 from fastapi.responses import PlainTextResponse
 
 from app.core.app_context import AppContext, get_app_context
+from app.core.async_redis import async_redis_client
 from app.core.flow_processor import FlowProcessor
 from app.core.flow_request import FlowRequest
 from app.core.flow_response import FlowProcessingResult, FlowResponse
+from app.core.redis_keys import redis_keys
+from app.core.state import async_store
 from app.db.models import MessageDirection, MessageStatus
 from app.services.audio_validation_service import AudioValidationService
 from app.services.deduplication_service import MessageDeduplicationService
@@ -29,6 +32,7 @@ from app.services.processing_cancellation_manager import (
     ProcessingCancelledException,
 )
 from app.services.session_manager import RedisSessionManager
+from app.services.speculative_turn import SpeculativeTurn
 from app.services.speech_to_text_service import SpeechToTextService
 from app.services.tenant_config_service import ProjectContext
 from app.settings import get_settings
@@ -95,7 +99,7 @@ class WhatsAppMessageProcessor:
             return PlainTextResponse("ok")
 
         # Step 3: Check WhatsApp-specific duplicates
-        if self._is_duplicate_whatsapp_message(message_data, app_context):
+        if await self._is_duplicate_whatsapp_message(message_data, app_context):
             logger.debug(
                 "WhatsApp message %s from %s is duplicate - already processed",
                 message_data.get("message_id", "unknown"),
@@ -122,6 +126,20 @@ class WhatsAppMessageProcessor:
             message_data["sender_number"], conversation_setup.flow_id or "unknown"
         )
 
+        # Step 7.5: Admission control; over-limit traffic never reaches the buffer
+        if app_context.admission is not None:
+            outcome = await app_context.admission.admit(
+                str(conversation_setup.tenant_id),
+                str(conversation_setup.channel_instance_id),
+                str(conversation_setup.contact_id),
+            )
+            if outcome == "dropped":
+                logger.warning(
+                    "Dropping message for session %s: admission limit exceeded", session_id
+                )
+                await self._save_rate_limited_message(message_data, conversation_setup)
+                return PlainTextResponse("ok")
+
         # Step 8: Debounced message handling with aggregation (centralized)
         cancellation_manager = getattr(app_context, "cancellation_manager", None)
         if not cancellation_manager:
@@ -130,18 +148,30 @@ class WhatsAppMessageProcessor:
             except Exception:
                 cancellation_manager = None
 
+        flow_response: FlowResponse | None = None
         if cancellation_manager and message_data.get("message_text"):
-            message_id = cancellation_manager.add_message_to_buffer(
+            speculation_valid = False
+            message_id = await cancellation_manager.add_message_to_buffer_async(
                 session_id, message_data["message_text"]
             )
             
             wait_ms = self._extract_wait_time_ms(project_context)
+            speculation = self._create_speculative_turn(
+                cancellation_manager,
+                session_id,
+                wait_ms=wait_ms,
+                message_data=message_data,
+                conversation_setup=conversation_setup,
+                app_context=app_context,
+            )
             # Use centralized inactivity waiter
             result = await cancellation_manager.wait_for_inactivity(
                 session_id=session_id,
                 since_message_id=message_id,
                 inactivity_ms=wait_ms,
                 check_interval_ms=1000,
+                quiet_threshold_ms=self.settings.speculation_quiet_ms if speculation else None,
+                on_quiet=speculation.start if speculation else None,
             )
             
             from app.whatsapp.types import is_debounce_result
@@ -152,11 +182,15 @@ class WhatsAppMessageProcessor:
             
             if result == "exit":
                 # A newer message arrived, let it handle processing
+                if speculation:
+                    speculation.discard("superseded")
                 logger.info(f"Newer message detected for session {session_id}, exiting this webhook")
                 return PlainTextResponse("ok")
             if result == "process_aggregated":
-                # Save individual messages to database BEFORE aggregation
-                individual_messages = cancellation_manager.get_individual_messages(session_id)
+                # Take the buffer in one MULTI; individual messages are saved to
+                # the database BEFORE aggregation
+                speculation_valid = bool(speculation and await speculation.is_current())
+                individual_messages = await cancellation_manager.drain_messages_async(session_id)
                 
                 from app.whatsapp.types import is_buffered_message
                 
@@ -170,7 +204,9 @@ class WhatsAppMessageProcessor:
                 )
                 
                 # Get aggregated message for LLM processing
-                aggregated_message = cancellation_manager.get_and_clear_messages(session_id)
+                aggregated_message = cancellation_manager.aggregate_buffered(
+                    session_id, individual_messages
+                )
                 if aggregated_message:
                     logger.info(
                         f"Processing aggregated messages for {session_id}: {aggregated_message[:100]}..."
@@ -181,13 +217,23 @@ class WhatsAppMessageProcessor:
                     message_data["skip_inbound_logging"] = True  # Don't log aggregated version
             elif result == "process_single":
                 # Single message - clear buffer to prevent false cancellation detection
-                cancellation_manager.get_and_clear_messages(session_id)
+                speculation_valid = bool(speculation and await speculation.is_current())
+                await cancellation_manager.get_and_clear_messages_async(session_id)
                 logger.debug(f"Cleared buffer for single message processing: {session_id}")
 
+            if speculation:
+                if speculation_valid:
+                    flow_response = await self._commit_speculative_turn(
+                        speculation, message_data, app_context
+                    )
+                else:
+                    speculation.discard("superseded")
+
         # Step 9: Process through flow processor with dependency injection
-        flow_response = await self._process_through_flow_processor(
-            message_data, conversation_setup, app_context
-        )
+        if flow_response is None:
+            flow_response = await self._process_through_flow_processor(
+                message_data, conversation_setup, app_context
+            )
 
         # Step 8: Build WhatsApp response
         return await self._build_whatsapp_response(
@@ -384,12 +430,12 @@ class WhatsAppMessageProcessor:
         
         return validate_extracted_message_data(result)
 
-    def _is_duplicate_whatsapp_message(
+    async def _is_duplicate_whatsapp_message(
         self, message_data: ExtractedMessageData, app_context: AppContext
     ) -> bool:
         """Check for WhatsApp-specific duplicate messages."""
         dedup_service = MessageDeduplicationService(app_context.store)
-        return dedup_service.is_duplicate_message(
+        return await dedup_service.is_duplicate_message(
             message_data["message_id"],
             message_data["sender_number"],
             message_data["receiver_number"],
@@ -455,14 +501,16 @@ class WhatsAppMessageProcessor:
         except Exception as e:
             logger.warning(f"Failed to log webhook data: {e}")
 
-    def _is_likely_retry(self, message_data: ExtractedMessageData, app_context: AppContext) -> bool:
+    async def _is_likely_retry(
+        self, message_data: ExtractedMessageData, app_context: AppContext
+    ) -> bool:
         """Check if this is likely a webhook retry based on timing and patterns."""
         # Check if we've recently processed a message from this user
         if not app_context.store:
             return False
 
         try:
-            redis_client = app_context.store.redis_client
+            redis_client = async_redis_client(app_context.store)
             if not redis_client:
                 return False
 
@@ -475,15 +523,12 @@ class WhatsAppMessageProcessor:
 
             message_hash = hashlib.md5(message_text.encode()).hexdigest()[:16]
 
-            retry_key = f"webhook_processed:{sender}:{message_hash}"
+            retry_key = redis_keys.retry_marker_key(sender, message_hash)
 
-            # Check if we've seen this exact message recently (within 2 minutes)
-            if redis_client.get(retry_key):
-                return True
-
-            # Mark this message as processed for 2 minutes (webhook retry window)
-            redis_client.setex(retry_key, 120, "1")
-            return False
+            # Claim the key for 2 minutes (webhook retry window); if it already
+            # exists we've seen this exact message recently
+            claimed = await redis_client.set(retry_key, "1", nx=True, ex=120)
+            return not claimed
         except Exception as e:
             logger.warning(f"Failed to check retry status: {e}")
             return False
@@ -533,8 +578,17 @@ class WhatsAppMessageProcessor:
             f"Processing message for session {session_id}: {message_data.get('message_text', '')[:100]}"
         )
 
-        # Create flow request
-        flow_request = FlowRequest(
+        flow_request = self._build_flow_request(message_data, conversation_setup)
+        flow_processor = self._create_flow_processor(app_context)
+
+        # Process through flow processor
+        return await flow_processor.process_flow(flow_request, app_context)
+
+    def _build_flow_request(
+        self, message_data: ExtractedMessageData, conversation_setup: ConversationSetup
+    ) -> FlowRequest:
+        """Create the flow request for a (possibly aggregated) inbound message."""
+        return FlowRequest(
             user_id=message_data["sender_number"],
             user_message=message_data["message_text"],
             flow_definition=conversation_setup.flow_definition,
@@ -550,8 +604,13 @@ class WhatsAppMessageProcessor:
             ],  # WhatsApp business number for customer traceability
         )
 
-        # Create dependencies with dependency injection
-        session_manager = RedisSessionManager(app_context.store)
+    def _create_flow_processor(self, app_context: AppContext) -> FlowProcessor:
+        """Create a flow processor with injected dependencies."""
+        session_manager = RedisSessionManager(
+            app_context.store,
+            cache=app_context.session_cache,
+            cold_store=app_context.cold_sessions,
+        )
 
         # Create clean flow processor with injected dependencies
         if not app_context.llm:
@@ -564,9 +623,77 @@ class WhatsAppMessageProcessor:
             session_manager=session_manager,
             cancellation_manager=app_context.cancellation_manager,
         )
+        return flow_processor
 
-        # Process through flow processor
-        return await flow_processor.process_flow(flow_request, app_context)
+    def _create_speculative_turn(
+        self,
+        cancellation_manager: ProcessingCancellationManager,
+        session_id: str,
+        *,
+        wait_ms: int,
+        message_data: ExtractedMessageData,
+        conversation_setup: ConversationSetup,
+        app_context: AppContext,
+    ) -> SpeculativeTurn | None:
+        """Create a speculative turn for this debounce wait, if worthwhile.
+
+        Only useful when the reply window is longer than the quiet threshold,
+        otherwise the speculative turn could never finish ahead of the deadline.
+        """
+        if not self.settings.speculative_turns_enabled:
+            return None
+        if wait_ms <= self.settings.speculation_quiet_ms:
+            return None
+        if not app_context.llm or not app_context.cancellation_manager:
+            return None
+
+        async def compute(aggregated_message: str) -> FlowResponse:
+            speculative_data = dict(message_data)
+            speculative_data["message_text"] = aggregated_message
+            flow_request = self._build_flow_request(speculative_data, conversation_setup)  # type: ignore[arg-type]
+            flow_processor = self._create_flow_processor(app_context)
+            return await flow_processor.process_flow(flow_request, app_context, commit=False)
+
+        return SpeculativeTurn(cancellation_manager, session_id, compute)
+
+    async def _commit_speculative_turn(
+        self,
+        speculation: SpeculativeTurn,
+        message_data: ExtractedMessageData,
+        app_context: AppContext,
+    ) -> FlowResponse | None:
+        """Use the speculative result if it matches the final message and state."""
+        response = await speculation.take(message_data.get("message_text"))
+        if response is None:
+            return None
+
+        flow_processor = self._create_flow_processor(app_context)
+        if not await flow_processor.commit_speculative(response):
+            speculation.discard("stale_context")
+            return None
+
+        speculation.mark_committed()
+        return response
+
+    async def _restore_cancelled_input(
+        self,
+        flow_response: FlowResponse,
+        message_data: ExtractedMessageData,
+        app_context: AppContext,
+    ) -> None:
+        """Hand the input of a cancelled turn over to the newer pending webhook."""
+        session_id = flow_response.metadata.get("session_id") if flow_response.metadata else None
+        cancellation_manager = getattr(app_context, "cancellation_manager", None)
+        if not session_id or not cancellation_manager:
+            return
+        try:
+            await cancellation_manager.restore_cancelled_message_async(
+                session_id,
+                message_data["message_text"],
+                persisted=bool(message_data.get("skip_inbound_logging")),
+            )
+        except Exception as e:
+            logger.warning(f"Failed to restore cancelled input for {session_id}: {e}")
 
     def _build_session_id(self, user_id: str, flow_id: str) -> str:
         """Build consistent session ID for cancellation coordination."""
@@ -589,10 +716,11 @@ class WhatsAppMessageProcessor:
                     message_data["sender_number"],
                 )
                 # Don't send error message for cancellations - messages are being aggregated
+                await self._restore_cancelled_input(flow_response, message_data, app_context)
                 return PlainTextResponse("ok")
 
             # Check if this might be a duplicate/retry webhook to avoid sending multiple error messages
-            if self._is_likely_retry(message_data, app_context):
+            if await self._is_likely_retry(message_data, app_context):
                 logger.warning(
                     "Likely webhook retry detected for user %s, not sending duplicate error message",
                     message_data["sender_number"],
@@ -636,12 +764,14 @@ class WhatsAppMessageProcessor:
             )
 
             if cancellation_manager and session_id:
-                cancellation_manager.check_cancellation_and_raise(session_id, "naturalizing")
+                await cancellation_manager.check_cancellation_and_raise_async(
+                    session_id, "naturalizing"
+                )
         except ProcessingCancelledException:
             logger.info("Message processing cancelled before naturalization")
             # Mark this cancelled processing as complete
             if cancellation_manager and session_id:
-                cancellation_manager.mark_processing_complete(session_id)
+                await cancellation_manager.mark_processing_complete_async(session_id)
             return PlainTextResponse("ok")  # Don't send anything if cancelled
 
         # Get messages directly from flow response
@@ -654,12 +784,12 @@ class WhatsAppMessageProcessor:
         # Final cancellation check before sending
         try:
             if cancellation_manager and session_id:
-                cancellation_manager.check_cancellation_and_raise(session_id, "sending")
+                await cancellation_manager.check_cancellation_and_raise_async(session_id, "sending")
         except ProcessingCancelledException:
             logger.info("Message processing cancelled before sending")
             # Mark this cancelled processing as complete
             if cancellation_manager and session_id:
-                cancellation_manager.mark_processing_complete(session_id)
+                await cancellation_manager.mark_processing_complete_async(session_id)
             return PlainTextResponse("ok")  # Don't send anything if cancelled
 
         logger.info("Sending WhatsApp reply: %r (total messages: %d)", sync_reply, len(messages))
@@ -691,7 +821,7 @@ class WhatsAppMessageProcessor:
         # Mark processing complete AFTER message is sent
         # This ensures the cancellation window stays open until the message is actually delivered
         if cancellation_manager and session_id:
-            cancellation_manager.mark_processing_complete(session_id)
+            await cancellation_manager.mark_processing_complete_async(session_id)
             logger.debug(f"Marked processing complete for session {session_id}")
 
         return self.adapter.build_sync_response(sync_reply)
@@ -717,6 +847,9 @@ class WhatsAppMessageProcessor:
     ) -> None:
         try:
             for msg in individual_messages:
+                if msg.restored:
+                    # Input of a cancelled turn that its own webhook already saved
+                    continue
                 await message_logging_service.save_message_async(
                     tenant_id=conversation_setup.tenant_id,
                     channel_instance_id=conversation_setup.channel_instance_id,
@@ -736,6 +869,28 @@ class WhatsAppMessageProcessor:
         except Exception as exc:
             logger.warning("Failed to save individual messages: %s", exc)
 
+    async def _save_rate_limited_message(
+        self, message_data: ExtractedMessageData, conversation_setup: ConversationSetup
+    ) -> None:
+        """Keep the inbound message of a webhook dropped by admission control."""
+        try:
+            params_obj = message_data["params"]
+            provider_id = str(params_obj.get("SmsMessageSid") or params_obj.get("MessageSid") or "")
+            await message_logging_service.save_message_async(
+                tenant_id=conversation_setup.tenant_id,
+                channel_instance_id=conversation_setup.channel_instance_id,
+                thread_id=conversation_setup.thread_id,
+                contact_id=conversation_setup.contact_id,
+                text=message_data["message_text"],
+                direction=MessageDirection.inbound,
+                provider_message_id=provider_id or None,
+                payload={"admission": "dropped"},
+                status=MessageStatus.delivered,
+                delivered_at=datetime.now(UTC),
+            )
+        except Exception as exc:
+            logger.warning("Failed to save rate-limited message: %s", exc)
+
     async def _log_whatsapp_messages(
         self, message_data: ExtractedMessageData, conversation_setup: ConversationSetup, sync_reply: str
     ) -> None:
@@ -796,7 +951,7 @@ class WhatsAppMessageProcessor:
             current_reply_key = redis_keys.current_reply_key(message_data["sender_number"])
             key_suffix = current_reply_key.replace("chatai:state:system:", "")
             state_data = cast("AgentState", {"reply_id": reply_id, "timestamp": int(datetime.now().timestamp())})
-            app_context.store.save("system", key_suffix, state_data)
+            await async_store(app_context.store).save("system", key_suffix, state_data)
 
             self.adapter.send_followups(
                 message_data["sender_number"],
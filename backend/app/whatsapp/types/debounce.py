@@ -12,6 +12,7 @@ class BufferedMessage:
     timestamp: float
     sequence: int
     id: str
+    restored: bool = False
 
 
 def is_buffered_message(data: Any) -> TypeGuard[BufferedMessage]:
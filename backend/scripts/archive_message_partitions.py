@@ -0,0 +1,60 @@
+"""Create upcoming messages partitions and archive expired ones.
+
+The application does this in the background (MESSAGE_PARTITIONS_ENABLED);
+run it by hand for a one-off archive or to see what would be archived.
+Archived months are written to <archive-dir>/<partition>.csv.gz with the
+message text still encrypted, then dropped from the database.
+
+Usage:
+    python scripts/archive_message_partitions.py --keep-months 12 [--archive-dir DIR] [--dry-run]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.services.message_archival import (
+    DEFAULT_MONTHS_AHEAD,
+    maintain_message_partitions,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Maintain the monthly messages partitions")
+    parser.add_argument(
+        "--keep-months",
+        type=int,
+        required=True,
+        help="Archive partitions older than this many months",
+    )
+    parser.add_argument(
+        "--archive-dir",
+        type=Path,
+        default=Path(os.getenv("MESSAGE_ARCHIVE_DIR", "archive/messages")),
+        help="Directory for the exported partitions (defaults to $MESSAGE_ARCHIVE_DIR)",
+    )
+    parser.add_argument("--months-ahead", type=int, default=DEFAULT_MONTHS_AHEAD)
+    parser.add_argument("--dry-run", action="store_true", help="Only list what would change")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    result = maintain_message_partitions(
+        months_ahead=args.months_ahead,
+        archive_after_months=args.keep_months,
+        archive_dir=args.archive_dir,
+        dry_run=args.dry_run,
+    )
+    if result is None:
+        print("another worker is maintaining the partitions; try again later")
+        sys.exit(1)
+    print(f"created={result.created} archived={result.archived}")
+
+
+if __name__ == "__main__":
+    main()
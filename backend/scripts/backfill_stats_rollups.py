@@ -0,0 +1,47 @@
+"""Rebuild the hourly message stats rollup from message history.
+
+Run once after the ``message_stats_rollup`` migration (and again after any
+bulk import or deletion); it is safe to re-run over the same range. The
+background rollup job only keeps the last few hours current.
+
+Usage:
+    python scripts/backfill_stats_rollups.py [--days N | --since ISO [--until ISO]]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.services.stats_rollup import backfill_message_stats
+
+
+def _aware(value: str) -> datetime:
+    moment = datetime.fromisoformat(value)
+    return moment if moment.tzinfo else moment.replace(tzinfo=UTC)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Backfill the hourly message stats rollup")
+    parser.add_argument("--days", type=int, default=90, help="Backfill the last N days")
+    parser.add_argument("--since", type=_aware, help="Start (ISO date/time, UTC if naive)")
+    parser.add_argument("--until", type=_aware, help="End (ISO date/time); defaults to now")
+    parser.add_argument(
+        "--chunk-hours", type=int, default=24, help="Hours recomputed per transaction"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    until = args.until or datetime.now(UTC)
+    since = args.since or until - timedelta(days=args.days)
+    chunks = backfill_message_stats(since, until, chunk=timedelta(hours=args.chunk_hours))
+    print(f"rolled up {since.isoformat()} - {until.isoformat()} in {chunks} chunks")
+
+
+if __name__ == "__main__":
+    main()
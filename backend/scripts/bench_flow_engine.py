@@ -0,0 +1,158 @@
+"""Benchmark flow compilation, engine navigation and batch edits on large flows.
+
+Builds synthetic flows with N question nodes (default 1000) and measures:
+- compile time (lookup indexes and cycle detection)
+- a full conversation answering every question through ``LLMFlowEngine``
+  (edgeless flows exercise the unanswered-question index, chained flows
+  exercise edge navigation)
+- a batch of node/edge edits through ``FlowModificationService``
+- the edit-then-preview loop: a small batch on a large flow, without and with
+  the full validation that runs at commit time
+
+Usage:
+    python scripts/bench_flow_engine.py [--nodes 1000] [--repeat 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.flow_core.compiler import FlowCompiler
+from app.flow_core.engine import LLMFlowEngine
+from app.flow_core.ir import Flow
+from app.services.flow_modification_service import FlowModificationService
+
+
+def synthetic_flow(size: int, *, chained: bool) -> dict[str, Any]:
+    """Flow with ``size`` questions, priorities in reverse declaration order."""
+    nodes: list[dict[str, Any]] = [
+        {
+            "id": f"q.{i}",
+            "kind": "Question",
+            "key": f"campo_{i}",
+            "prompt": f"Pergunta {i}?",
+            "priority": size - i,
+            "dependencies": [f"campo_{i - 1}"] if i else [],
+        }
+        for i in range(size)
+    ]
+    nodes.append({"id": "t.fim", "kind": "Terminal", "reason": "fim"})
+    edges: list[dict[str, Any]] = []
+    if chained:
+        edges = [{"source": f"q.{i}", "target": f"q.{i + 1}"} for i in range(size - 1)]
+        edges.append({"source": f"q.{size - 1}", "target": "t.fim"})
+    entry = "q.0" if chained else f"q.{size - 1}"
+    return {
+        "schema_version": "v1",
+        "id": "flow.bench",
+        "entry": entry,
+        "nodes": nodes,
+        "edges": edges,
+    }
+
+
+def run_conversation(definition: dict[str, Any]) -> int:
+    compiled = FlowCompiler().compile(Flow.model_validate(definition))
+    engine = LLMFlowEngine(compiled)
+    ctx = engine.initialize_context()
+    turns = 0
+    response = engine.process(ctx)
+    while response.kind == "prompt":
+        response = engine.process(ctx, None, event={"answer": "ok"})
+        turns += 1
+    return turns
+
+
+def run_batch_edits(definition: dict[str, Any]) -> int:
+    size = len(definition["nodes"]) - 1
+    actions: list[dict[str, Any]] = []
+    for i in range(0, size, 2):
+        actions.append(
+            {"action": "update_node", "node_id": f"q.{i}", "updates": {"prompt": "Nova?"}}
+        )
+        actions.append(
+            {
+                "action": "update_edge",
+                "source": f"q.{i}",
+                "target": f"q.{i + 1}",
+                "updates": {"priority": 1},
+            }
+        )
+    result = FlowModificationService().execute_batch_actions(definition, actions, persist=False)  # type: ignore[arg-type]
+    if not result.success:
+        raise RuntimeError(result.error)
+    return len(actions)
+
+
+def run_preview_edit(definition: dict[str, Any]) -> None:
+    actions: list[dict[str, Any]] = [
+        {"action": "update_node", "node_id": "q.10", "updates": {"prompt": "Nova pergunta?"}},
+        {
+            "action": "add_node",
+            "node_definition": {
+                "id": "q.extra",
+                "kind": "Question",
+                "key": "extra",
+                "prompt": "Extra?",
+            },
+        },
+        {"action": "add_edge", "source": "q.10", "target": "q.extra"},
+    ]
+    result = FlowModificationService().execute_batch_actions(definition, actions, persist=False)  # type: ignore[arg-type]
+    if not result.success:
+        raise RuntimeError(result.error)
+
+
+def run_commit_validation(definition: dict[str, Any]) -> None:
+    result = FlowModificationService()._validate_flow(definition)
+    if not result.success:
+        raise RuntimeError(result.error)
+
+
+def timed(fn: Callable[[], Any], repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark flow engine on synthetic large flows")
+    parser.add_argument("--nodes", type=int, default=1000, help="Question nodes per flow")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions (median reported)")
+    args = parser.parse_args()
+
+    edgeless = synthetic_flow(args.nodes, chained=False)
+    chained = synthetic_flow(args.nodes, chained=True)
+    compiler = FlowCompiler()
+
+    results = {
+        "compile (chained)": timed(
+            lambda: compiler.compile(Flow.model_validate(chained)), args.repeat
+        ),
+        "conversation (edgeless, priority order)": timed(
+            lambda: run_conversation(edgeless), args.repeat
+        ),
+        "conversation (chained edges)": timed(lambda: run_conversation(chained), args.repeat),
+        "batch edits (chained)": timed(lambda: run_batch_edits(chained), args.repeat),
+        "preview edit, 3 actions (chained)": timed(lambda: run_preview_edit(chained), args.repeat),
+        "commit validation (chained)": timed(lambda: run_commit_validation(chained), args.repeat),
+    }
+
+    print(f"Synthetic flows with {args.nodes} question nodes (median of {args.repeat} runs)")
+    for name, elapsed_ms in results.items():
+        print(f"  {name:<42} {elapsed_ms:10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
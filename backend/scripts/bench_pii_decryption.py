@@ -0,0 +1,94 @@
+"""Benchmark PII decryption of exported message rows.
+
+Each synthetic row carries the message text (unique per row) and the
+contact's display name and phone (shared by every message of a contact),
+all Fernet-encrypted as stored by ``EncryptedString``. Measures rows per
+second for:
+- row by row: ``process_result_value`` on every field (no cache)
+- request cache: the same inside ``decryption_cache()``
+- batched: ``decrypt_tokens`` per column on the shared executor
+
+Usage:
+    python scripts/bench_pii_decryption.py [--rows 20000] [--contacts 200] [--repeat 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from cryptography.fernet import Fernet
+
+os.environ.setdefault("PII_ENCRYPTION_KEY", Fernet.generate_key().decode())
+
+from app.db.decryption import decrypt_tokens, decryption_cache, pii_executor
+from app.db.types import EncryptedString, pii_encryption_key
+
+Row = tuple[str, str, str]
+
+
+def synthetic_rows(rows: int, contacts: int) -> list[Row]:
+    fernet = EncryptedString().fernet
+
+    def encrypt(value: str) -> str:
+        return fernet.encrypt(value.encode()).decode()
+
+    people = [(encrypt(f"Cliente {i}"), encrypt(f"+5511999{i:06d}")) for i in range(contacts)]
+    return [
+        (encrypt(f"Mensagem {i}: quero saber o horário"), *people[i % contacts])
+        for i in range(rows)
+    ]
+
+
+def row_by_row(rows: list[Row]) -> None:
+    column = EncryptedString()
+    for row in rows:
+        [column.process_result_value(value, None) for value in row]
+
+
+def request_cache(rows: list[Row]) -> None:
+    with decryption_cache():
+        row_by_row(rows)
+
+
+def batched(rows: list[Row]) -> None:
+    key = pii_encryption_key()
+    with decryption_cache():
+        for values in zip(*rows, strict=True):
+            decrypt_tokens(key, values, executor=pii_executor())
+
+
+def rows_per_second(run: Callable[[list[Row]], None], rows: list[Row], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run(rows)
+        timings.append(time.perf_counter() - started)
+    return len(rows) / statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--contacts", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rows = synthetic_rows(args.rows, args.contacts)
+    baseline = rows_per_second(row_by_row, rows, args.repeat)
+    print(f"{args.rows} rows, {args.contacts} contacts, 3 encrypted fields per row")
+    print(f"  {'row by row':<14} {baseline:>10,.0f} rows/s")
+    for name, run in (("request cache", request_cache), ("batched", batched)):
+        rate = rows_per_second(run, rows, args.repeat)
+        print(f"  {name:<14} {rate:>10,.0f} rows/s  ({rate / baseline:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
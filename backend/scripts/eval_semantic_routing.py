@@ -0,0 +1,185 @@
+"""Offline evaluation of embedding-based decision routing.
+
+Compiles every flow under ``playground/`` and generates short user replies from
+each decision edge's own wording (condition description and ``if`` fragments,
+e.g. "quadra/tênis" -> "tênis"). Each reply is routed and reported as routed
+locally (correct / wrong) or left to the LLM.
+
+The default ``hashing`` embedder is deterministic and needs no network access;
+``--embedder openai`` uses the ``EmbeddingService`` the application routes
+with (requires OPENAI_API_KEY). The script exits with status 1 when accuracy
+on the routed turns is below ``--min-accuracy``.
+
+Usage:
+    python scripts/eval_semantic_routing.py [--playground DIR] [--margin 0.16]
+        [--embedder hashing|openai] [--min-accuracy 0.99]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import re
+import sys
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.flow_core.compiler import FlowCompiler
+from app.flow_core.ir import Flow
+from app.flow_core.services.semantic_router import (
+    DEFAULT_MARGIN,
+    MIN_ROUTED_ACCURACY,
+    HashingEmbedder,
+    SemanticRouter,
+    TextEmbedder,
+    routing_candidates,
+)
+
+_PREFIX = re.compile(r"^\s*(caminho|path|rota)\s*:\s*", re.IGNORECASE)
+_STOPWORDS = {"projeto", "indica", "busca", "foco", "em", "de", "do", "da", "o", "a"}
+
+DEFAULT_PLAYGROUND = Path(__file__).resolve().parents[1] / "playground"
+
+
+def utterances_for_edge(edge: Any) -> list[str]:
+    """Short replies a user might send to pick ``edge``."""
+    sources: list[str] = []
+    if edge.condition_description:
+        sources.append(_PREFIX.sub("", edge.condition_description))
+    condition = edge.guard_args.get("if")
+    if isinstance(condition, str):
+        sources.append(condition)
+
+    replies: list[str] = []
+    for source in sources:
+        for fragment in re.split(r"[/,]", source):
+            words = [w for w in fragment.split() if w.lower() not in _STOPWORDS]
+            if words:
+                replies.append(" ".join(words))
+    return list(dict.fromkeys(r for r in replies if r))
+
+
+def load_flows(directory: Path) -> list[tuple[str, Flow]]:
+    flows: list[tuple[str, Flow]] = []
+    for path in sorted(directory.glob("*.json")):
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if not isinstance(data, dict) or "nodes" not in data:
+            continue
+        try:
+            flows.append((path.name, Flow.model_validate(data)))
+        except ValueError as exc:
+            print(f"{path.name}: skipped ({exc.__class__.__name__})")
+    return flows
+
+
+async def evaluate(
+    directory: Path, margin: float, embedder: TextEmbedder
+) -> dict[str, dict[str, int]]:
+    router = SemanticRouter(embedder, margin=margin)
+    compiler = FlowCompiler()
+    report: dict[str, dict[str, int]] = {}
+
+    for name, flow in load_flows(directory):
+        compiled = compiler.compile(flow)
+        stats = {"cases": 0, "local": 0, "correct": 0, "fallback": 0}
+        for node_id in routing_candidates(compiled):
+            for edge in compiled.edges_from[node_id]:
+                for reply in utterances_for_edge(edge):
+                    decision = await router.route(compiled, node_id, reply)
+                    stats["cases"] += 1
+                    if decision.confident:
+                        stats["local"] += 1
+                        stats["correct"] += int(decision.target == edge.target)
+                    else:
+                        stats["fallback"] += 1
+        report[name] = stats
+    return report
+
+
+def totals(report: dict[str, dict[str, int]]) -> dict[str, int]:
+    summed = {"cases": 0, "local": 0, "correct": 0, "fallback": 0}
+    for stats in report.values():
+        for key in summed:
+            summed[key] += stats[key]
+    return summed
+
+
+def routed_accuracy(stats: dict[str, int]) -> float:
+    """Share of locally routed turns that took the expected edge (1.0 if none)."""
+    return stats["correct"] / stats["local"] if stats["local"] else 1.0
+
+
+def _embedder(name: str, dimensions: int) -> TextEmbedder:
+    if name == "hashing":
+        return HashingEmbedder(dimensions)
+    from app.services.rag.embedding import EmbeddingService
+    from app.settings import get_settings
+
+    api_key = get_settings().openai_api_key
+    if not api_key:
+        raise SystemExit("OPENAI_API_KEY is required for --embedder openai")
+    # Same embedder as app/main.py wires in when RAG is not configured
+    return EmbeddingService(api_key, dimensions=dimensions)
+
+
+def _summary(name: str, stats: dict[str, int]) -> str:
+    return (
+        f"{name}: {stats['cases']} cases, "
+        f"local {stats['local'] / stats['cases']:.0%}, "
+        f"accuracy {routed_accuracy(stats):.0%}, "
+        f"fallback {stats['fallback'] / stats['cases']:.0%}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Evaluate semantic decision routing offline")
+    parser.add_argument(
+        "--playground",
+        type=Path,
+        default=DEFAULT_PLAYGROUND,
+        help="Directory with flow JSON files",
+    )
+    parser.add_argument("--margin", type=float, default=DEFAULT_MARGIN, help="Confidence margin")
+    parser.add_argument(
+        "--embedder",
+        choices=("hashing", "openai"),
+        default="hashing",
+        help="Embedding backend (openai calls the OpenAI API)",
+    )
+    parser.add_argument(
+        "--dimensions",
+        type=int,
+        default=None,
+        help="Embedding size (default 256 for hashing, 512 for openai)",
+    )
+    parser.add_argument(
+        "--min-accuracy",
+        type=float,
+        default=MIN_ROUTED_ACCURACY,
+        help="Fail when accuracy on routed turns is below this",
+    )
+    args = parser.parse_args()
+
+    dimensions = args.dimensions or (256 if args.embedder == "hashing" else 512)
+    embedder = _embedder(args.embedder, dimensions)
+    report = asyncio.run(evaluate(args.playground, args.margin, embedder))
+
+    for name, stats in report.items():
+        if not stats["cases"]:
+            print(f"{name}: no semantic decision nodes")
+            continue
+        print(_summary(name, stats))
+
+    overall = totals(report)
+    if overall["cases"]:
+        print(_summary("TOTAL", overall))
+    if routed_accuracy(overall) < args.min_accuracy:
+        print(f"Routed accuracy is below {args.min_accuracy:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Move conversation keys to the hash-tagged (Redis Cluster) layout.
+
+Run once against the existing Redis before (or right after) deploying the
+hash-tagged key layout; it is safe to run again. See
+``app/core/redis_key_migration.py`` for which keys move.
+
+Usage:
+    python scripts/migrate_redis_keys.py [--redis-url URL] [--cluster] [--dry-run]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core.redis_cluster import create_sync_client
+from app.core.redis_key_migration import (
+    DEFAULT_INDEX_TTL_SECONDS,
+    migrate_keys,
+)
+from app.core.redis_keys import RedisKeyBuilder
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Migrate Redis keys to the hash-tagged layout")
+    parser.add_argument(
+        "--redis-url",
+        default=os.getenv("REDIS_URL", "redis://localhost:6379/0"),
+        help="Redis URL (defaults to $REDIS_URL)",
+    )
+    parser.add_argument(
+        "--cluster",
+        action="store_true",
+        default=os.getenv("REDIS_CLUSTER", "").lower() in ("1", "true", "yes"),
+        help="Connect with a Redis Cluster client (defaults to $REDIS_CLUSTER)",
+    )
+    parser.add_argument("--namespace", default="chatai", help="Key namespace")
+    parser.add_argument(
+        "--index-ttl",
+        type=int,
+        default=DEFAULT_INDEX_TTL_SECONDS,
+        help="TTL in seconds of the rebuilt per-user key index sets",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Only count the keys to move")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    client = create_sync_client(args.redis_url, cluster=args.cluster)
+    report = migrate_keys(
+        client,
+        RedisKeyBuilder(namespace=args.namespace),
+        dry_run=args.dry_run,
+        index_ttl=args.index_ttl,
+    )
+    print(
+        f"scanned={report.scanned} migrated={report.migrated} "
+        f"deleted={report.deleted} superseded={report.superseded}"
+    )
+
+
+if __name__ == "__main__":
+    main()
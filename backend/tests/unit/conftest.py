@@ -0,0 +1,62 @@
+import sys
+
+import pytest
+from cryptography.fernet import Fernet
+
+_REAL_PREFIXES = ("sqlalchemy", "app.db")
+# Real modules after their first import; SQLAlchemy's compiled extensions do
+# not survive being imported a second time in the same process
+_real_modules: dict[str, object] = {}
+_PII_KEY = Fernet.generate_key().decode()
+
+
+def _is_swapped(name: str) -> bool:
+    return any(name == p or name.startswith(f"{p}.") for p in _REAL_PREFIXES)
+
+
+@pytest.fixture
+def sqlite_db(monkeypatch):  # type: ignore[no-untyped-def]
+    """In-memory SQLite with the chat tables, using the real SQLAlchemy and repository.
+
+    tests/conftest.py stubs both for the rest of the suite; they are swapped back in
+    for the duration of the test.
+    """
+    import app
+
+    monkeypatch.setenv("PII_ENCRYPTION_KEY", _PII_KEY)
+    saved = {name: sys.modules.pop(name) for name in list(sys.modules) if _is_swapped(name)}
+    saved_db_package = getattr(app, "db", None)
+    sys.modules.update(_real_modules)  # type: ignore[arg-type]
+    if "app.db" in _real_modules:
+        app.db = _real_modules["app.db"]  # type: ignore[attr-defined]
+    try:
+        from sqlalchemy import create_engine
+        from sqlalchemy.dialects.postgresql import JSONB
+        from sqlalchemy.ext.compiler import compiles
+        from sqlalchemy.orm import Session
+
+        from app.db import models
+        from app.db.base import Base
+
+        compiles(JSONB, "sqlite")(lambda *_a, **_k: "JSON")
+        engine = create_engine("sqlite://")
+        tables = [
+            models.Tenant,
+            models.TenantProjectConfig,
+            models.ChannelInstance,
+            models.Flow,
+            models.Contact,
+            models.ChatThread,
+            models.Message,
+        ]
+        Base.metadata.create_all(engine, tables=[t.__table__ for t in tables])
+        with Session(engine) as session:
+            yield engine, session, models
+    finally:
+        for name in [name for name in sys.modules if _is_swapped(name)]:
+            _real_modules[name] = sys.modules.pop(name)
+        sys.modules.update(saved)
+        if saved_db_package is not None:
+            app.db = saved_db_package
+        elif hasattr(app, "db"):
+            del app.db
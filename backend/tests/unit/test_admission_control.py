@@ -0,0 +1,124 @@
+import pytest
+
+
+def _controller(backend, **overrides):  # type: ignore[no-untyped-def]
+    from app.services.rate_limiter import AdmissionController, TokenBucket
+
+    buckets = {
+        "contact": TokenBucket(2, 0.001),
+        "channel": TokenBucket(100, 100),
+        "tenant": TokenBucket(100, 100),
+        **overrides,
+    }
+    return AdmissionController(backend, max_defer_seconds=0.05, **buckets)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_contact_bucket_drops_bursts_beyond_capacity():
+    from app.core.metrics import metrics
+    from app.services.rate_limiter import InMemoryAdmissionBackend
+
+    metrics.reset()
+    controller = _controller(InMemoryAdmissionBackend())
+
+    outcomes = [await controller.admit("t1", "ch1", "c1") for _ in range(3)]
+    assert outcomes == ["admitted", "admitted", "dropped"]
+    # Other contacts of the channel have their own bucket
+    assert await controller.admit("t1", "ch1", "c2") == "admitted"
+    assert metrics.get("admission_requests_total", outcome="admitted") == 3
+    assert metrics.get("admission_requests_total", outcome="dropped", scope="contact") == 1
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_short_waits_are_deferred_instead_of_dropped():
+    from app.core.metrics import metrics
+    from app.services.rate_limiter import InMemoryAdmissionBackend, TokenBucket
+
+    metrics.reset()
+    controller = _controller(
+        InMemoryAdmissionBackend(),
+        contact=TokenBucket(100, 100),
+        channel=TokenBucket(1, 50),
+    )
+
+    assert await controller.admit("t1", "ch1", "c1") == "admitted"
+    assert await controller.admit("t1", "ch1", "c2") == "deferred"
+    assert metrics.get("admission_requests_total", outcome="deferred", scope="channel") == 1
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_redis_backend_charges_all_buckets_in_one_script_call():
+    from app.services.rate_limiter import RedisAdmissionBackend
+
+    calls = []
+
+    class _Client:
+        def register_script(self, script):  # type: ignore[no-untyped-def]
+            async def run(keys, args):  # type: ignore[no-untyped-def]
+                calls.append((keys, args))
+                return [0, 3, 1500]
+
+            return run
+
+    controller = _controller(RedisAdmissionBackend(_Client()))
+    assert await controller.admit("t1", "ch1", "c1") == "dropped"
+    keys, args = calls[0]
+    assert keys == [
+        "chatai:admission:{t1}:contact:c1",
+        "chatai:admission:{t1}:channel:ch1",
+        "chatai:admission:{t1}:tenant:t1",
+    ]
+    assert args[1:] == [1.0, 2, 0.001, 100, 100, 100, 100]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_backend_failures_admit_requests():
+    from app.services.rate_limiter import BucketDecision
+
+    class _Broken:
+        async def take(self, keys, buckets, cost=1.0) -> BucketDecision:  # type: ignore[no-untyped-def]
+            raise ConnectionError("redis down")
+
+    assert await _controller(_Broken()).admit("t1", "ch1", "c1") == "admitted"
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_dropped_messages_are_still_saved(sqlite_db, monkeypatch):  # type: ignore[no-untyped-def]
+    from uuid import uuid4
+
+    from app.whatsapp import message_processor
+    from app.whatsapp.types import ConversationSetup
+
+    saved = []
+
+    async def save_message_async(**kwargs):  # type: ignore[no-untyped-def]
+        saved.append(kwargs)
+
+    monkeypatch.setattr(
+        message_processor.message_logging_service, "save_message_async", save_message_async
+    )
+    setup = ConversationSetup(
+        tenant_id=uuid4(),
+        channel_instance_id=uuid4(),
+        thread_id=uuid4(),
+        contact_id=uuid4(),
+        flow_id="flow.a",
+        flow_name="A",
+        selected_flow_id="flow.a",
+        flow_definition={},
+        project_context=None,  # type: ignore[arg-type]
+    )
+    processor = message_processor.WhatsAppMessageProcessor(adapter=None)  # type: ignore[arg-type]
+    await processor._save_rate_limited_message(
+        {"message_text": "oi", "params": {"MessageSid": "SM1"}},  # type: ignore[typeddict-item]
+        setup,
+    )
+
+    assert [(m["text"], m["provider_message_id"], m["payload"]) for m in saved] == [
+        ("oi", "SM1", {"admission": "dropped"})
+    ]
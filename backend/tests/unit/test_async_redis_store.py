@@ -0,0 +1,163 @@
+import json
+
+import pytest
+
+
+class _AsyncFakePipeline:
+    def __init__(self, redis):  # type: ignore[no-untyped-def]
+        self._redis = redis
+        self._commands: list = []
+
+    def __getattr__(self, name):  # type: ignore[no-untyped-def]
+        def queue(*args):  # type: ignore[no-untyped-def]
+            self._commands.append((name, args))
+            return self
+
+        return queue
+
+    async def execute(self):  # type: ignore[no-untyped-def]
+        return [await getattr(self._redis, name)(*args) for name, args in self._commands]
+
+
+class _AsyncFakeRedis:
+    def __init__(self):
+        self.data: dict[str, str] = {}
+        self.ttls: dict[str, int] = {}
+        self.sets: dict[str, set] = {}
+
+    def pipeline(self, transaction: bool = True):  # type: ignore[no-untyped-def]
+        return _AsyncFakePipeline(self)
+
+    async def sadd(self, key, *members):  # type: ignore[no-untyped-def]
+        self.sets.setdefault(key, set()).update(members)
+
+    async def expire(self, key, ttl):  # type: ignore[no-untyped-def]
+        self.ttls[key] = ttl
+
+    async def get(self, key):  # type: ignore[no-untyped-def]
+        return self.data.get(key)
+
+    async def set(self, key, value):  # type: ignore[no-untyped-def]
+        self.data[key] = value
+
+    async def setex(self, key, ttl, value):  # type: ignore[no-untyped-def]
+        self.data[key] = value
+        self.ttls[key] = ttl
+
+    async def delete(self, *keys):  # type: ignore[no-untyped-def]
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    async def eval(self, script, numkeys, *args):  # type: ignore[no-untyped-def]
+        # Compare-and-set of a state field, as the Lua script does it server side
+        state_key, version_key, field, expected, encoded, ttl, version = args
+        raw = self.data.get(state_key)
+        current = json.loads(raw).get(field, "") if raw else ""
+        if current != expected:
+            return 0
+        for key, value in ((state_key, encoded), (version_key, version)):
+            if key == version_key and not version:
+                continue
+            self.data[key] = value
+            if ttl:
+                self.ttls[key] = ttl
+        return 1
+
+
+@pytest.mark.unit
+def test_redis_store_shares_one_async_pool():
+    from app.core.state import AsyncRedisStore, RedisStore
+
+    # Constructing clients does not connect, so no server is needed
+    store = RedisStore("redis://localhost:6379/0", namespace="ns", max_connections=7)
+
+    assert isinstance(store.aio, AsyncRedisStore)
+    assert store.aio is store.aio
+    assert store.aio.redis_client is store.async_redis_client
+    assert store.async_redis_client.connection_pool.max_connections == 7
+    assert store.aio._state_key("u", "s") == store._state_key("u", "s")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_async_store_roundtrip_and_escalation_helpers():
+    from app.core.state import AsyncRedisStore
+
+    client = _AsyncFakeRedis()
+    store = AsyncRedisStore(client, namespace="ns", state_ttl=60)
+
+    await store.save("u1", "flow:u1:f1", {"answers": {"a": 1}})
+    assert client.ttls["ns:state:{u1}:flow:u1:f1"] == 60
+    assert client.sets["ns:keys:user:{u1}"] == {"ns:state:{u1}:flow:u1:f1"}
+    assert await store.load("u1", "flow:u1:f1") == {"answers": {"a": 1}}
+    assert await store.load("u1", "missing") is None
+
+    await store.set_escalation_timestamp("u1", "agent")
+    assert await store.get_escalation_timestamp("u1", "agent") is not None
+    assert not await store.should_clear_context_after_escalation("u1", "agent", 60)
+    await store.clear_escalation_timestamp("u1", "agent")
+    assert await store.get_escalation_timestamp("u1", "agent") is None
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_session_manager_async_api_wraps_sync_stores():
+    from app.core.state import InMemoryStore
+    from app.flow_core.state import FlowContext
+    from app.services.session_manager import RedisSessionManager
+
+    store = InMemoryStore()
+    mgr = RedisSessionManager(store)
+
+    ctx = FlowContext(flow_id="f1")
+    await mgr.save_context_async("flow:u1:f1", ctx)
+    loaded = await mgr.get_context_async("flow:u1:f1")
+    assert loaded is not None and loaded.flow_id == "f1"
+    # The sync compatibility API sees the same data
+    assert mgr.load_context("flow:u1:f1").flow_id == "f1"
+
+    await mgr.clear_context_async("flow:u1:f1")
+    assert await mgr.get_context_async("flow:u1:f1") is None
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_save_if_unchanged_rejects_contexts_saved_meanwhile():
+    from datetime import timedelta
+
+    from app.core.state import AsyncRedisStore
+    from app.flow_core.state import FlowContext
+    from app.services.session_manager import RedisSessionManager
+
+    client = _AsyncFakeRedis()
+    store = AsyncRedisStore(client, namespace="ns", state_ttl=60)
+
+    class _Store:
+        aio = store
+
+    mgr = RedisSessionManager(_Store())  # type: ignore[arg-type]
+    session_id = "flow:u1:f1"
+
+    # No context yet: the speculative base was "none"
+    first = FlowContext(flow_id="f1")
+    assert await mgr.save_context_if_unchanged_async(session_id, first, None)
+    base = first.updated_at.isoformat()
+    assert not await mgr.save_context_if_unchanged_async(session_id, first, None)
+
+    # Another turn saves between the speculative load and the commit
+    concurrent = FlowContext(flow_id="f1")
+    concurrent.answers["a"] = 1
+    concurrent.updated_at = first.updated_at + timedelta(seconds=1)
+    await mgr.save_context_async(session_id, concurrent)
+    stale = FlowContext(flow_id="f1")
+    assert not await mgr.save_context_if_unchanged_async(session_id, stale, base)
+    loaded = await mgr.load_context_async(session_id)
+    assert loaded is not None and loaded.answers == {"a": 1}
+
+    fresh = FlowContext(flow_id="f1")
+    fresh.answers["b"] = 2
+    assert await mgr.save_context_if_unchanged_async(
+        session_id, fresh, concurrent.updated_at.isoformat()
+    )
+    assert client.ttls["ns:state:{u1}:flow:u1:f1"] == 60
+    loaded = await mgr.load_context_async(session_id)
+    assert loaded is not None and loaded.answers == {"b": 2}
@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_cancellation_token_aborts_inflight_work():
+    from app.core.cancellation import CancellationToken, ProcessingCancelledException
+    from app.core.metrics import metrics
+
+    metrics.reset()
+    token = CancellationToken("flow:user:fid")
+    finished = False
+
+    async def slow_llm_call():
+        nonlocal finished
+        await asyncio.sleep(5)
+        finished = True
+        return "late"
+
+    async def cancel_soon():
+        await asyncio.sleep(0.02)
+        token.cancel()
+
+    canceller = asyncio.create_task(cancel_soon())
+    with pytest.raises(ProcessingCancelledException):
+        await token.run(slow_llm_call(), stage="llm")
+    await canceller
+
+    assert not finished
+    assert metrics.get("cancelled_work_total", stage="llm") == 1
+    assert metrics.get("turns_cancelled_total", stage="llm") == 1
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_cancellation_token_does_not_start_work_after_cancel():
+    from app.core.cancellation import CancellationToken, ProcessingCancelledException
+
+    token = CancellationToken("flow:user:fid")
+    token.cancel("newer_message")
+    started = False
+
+    async def rag_query():
+        nonlocal started
+        started = True
+
+    with pytest.raises(ProcessingCancelledException):
+        await token.run(rag_query(), stage="rag")
+    assert not started
+    assert token.reason == "newer_message"
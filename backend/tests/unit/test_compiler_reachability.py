@@ -0,0 +1,107 @@
+import pytest
+
+
+def _chain_flow(length: int, *, loop_back: bool = False):  # type: ignore[no-untyped-def]
+    from app.flow_core.ir import Flow
+
+    nodes = [
+        {"id": f"q.{i}", "kind": "Question", "key": f"k{i}", "prompt": f"Pergunta {i}?"}
+        for i in range(length)
+    ]
+    nodes.append({"id": "t.done", "kind": "Terminal", "reason": "fim"})
+    edges = [{"source": f"q.{i}", "target": f"q.{i + 1}"} for i in range(length - 1)]
+    edges.append({"source": f"q.{length - 1}", "target": "t.done"})
+    if loop_back:
+        edges.append({"source": f"q.{length - 1}", "target": "q.0"})
+    return Flow.model_validate(
+        {"schema_version": "v1", "id": "flow.chain", "entry": "q.0", "nodes": nodes, "edges": edges}
+    )
+
+
+@pytest.mark.unit
+def test_compiler_emits_neighbourhoods():
+    from app.flow_core.compiler import FlowCompiler
+
+    compiled = FlowCompiler(neighbourhood_hops=2).compile(_chain_flow(5))
+
+    assert compiled.neighbourhood("q.1") == ("q.2", "q.3")
+    assert compiled.neighbourhood("q.3") == ("q.4", "t.done")
+    assert compiled.neighbourhood("t.done") == ()
+    assert not compiled.has_cycles
+
+
+@pytest.mark.unit
+def test_compiler_handles_deep_graphs_and_cycles_without_recursion():
+    from app.flow_core.compiler import FlowCompiler
+
+    # Deeper than the default recursion limit
+    compiled = FlowCompiler().compile(_chain_flow(3000, loop_back=True))
+
+    assert compiled.has_cycles
+    assert compiled.neighbourhood("q.2999") == ("t.done", "q.0", "q.1", "q.2")
+    assert not compiled.has_unreachable_nodes
+
+
+@pytest.mark.unit
+def test_runner_sends_only_frontier_subgraph():
+    from app.flow_core.compiler import FlowCompiler
+    from app.flow_core.runner import FlowTurnRunner
+    from app.flow_core.state import FlowContext
+
+    class DummyLLM:
+        pass
+
+    runner = FlowTurnRunner(
+        llm_client=DummyLLM(),
+        compiled_flow=FlowCompiler(neighbourhood_hops=2).compile(_chain_flow(10)),
+    )
+    ctx = FlowContext(flow_id="flow.chain", current_node_id="q.4", answers={"k5": "ok"})
+
+    graph = runner._build_flow_graph(ctx)
+    # The answered q.5 and q.7 (beyond two hops) are only listed as edge targets
+    assert [n["id"] for n in graph["nodes"]] == ["q.4", "q.6", "q.5", "q.7"]
+    assert graph["omitted_nodes"] == 7
+    assert {(e["from"], e["to"]) for e in graph["edges"]} == {("q.4", "q.5"), ("q.6", "q.7")}
+
+    # Admins keep the complete definition
+    full = runner._build_flow_graph(ctx, full=True)
+    assert len(full["nodes"]) == 11
+    assert "omitted_nodes" not in full
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_runner_validates_targets_against_the_whole_flow():
+    from app.flow_core.compiler import FlowCompiler
+    from app.flow_core.runner import FlowTurnRunner
+    from app.flow_core.state import FlowContext
+
+    class DummyLLM:
+        pass
+
+    runner = FlowTurnRunner(
+        llm_client=DummyLLM(),
+        compiled_flow=FlowCompiler(neighbourhood_hops=2).compile(_chain_flow(10)),
+        enable_fast_path=False,
+    )
+    ctx = FlowContext(flow_id="flow.chain", current_node_id="q.4", answers={"k5": "ok"})
+    captured = {}
+
+    async def fake_call_gpt5(instruction, tools, **kwargs):  # type: ignore[no-untyped-def]
+        captured["repairer"] = kwargs["repairer"]
+        raise RuntimeError("stop")
+
+    runner._responder._call_gpt5 = fake_call_gpt5  # type: ignore[method-assign]
+    await runner.process_turn(ctx, "quero voltar")
+
+    # Earlier and answered nodes are pruned from the prompt but remain valid targets
+    repairer = captured["repairer"]
+    for target in ("q.1", "q.5", "q.9"):
+        repairer.validate(
+            {
+                "actions": ["navigate"],
+                "target_node_id": target,
+                "messages": [{"text": "Ok", "delay_ms": 0}],
+                "reasoning": "r",
+            }
+        )
@@ -0,0 +1,30 @@
+import pytest
+
+
+def _settings(**values):  # type: ignore[no-untyped-def]
+    from app.settings import Settings
+
+    return Settings.model_validate(values)
+
+
+@pytest.mark.unit
+def test_budget_is_split_across_workers_and_engines():
+    from app.db.connection_budget import pool_sizes
+
+    settings = _settings(DB_MAX_CONNECTIONS=200, WEB_CONCURRENCY=4, DB_VECTOR_POOL_SHARE=0.3)
+    primary = pool_sizes("primary", settings)
+    vector = pool_sizes("vector", settings)
+
+    assert primary.total + vector.total == 50
+    assert (primary.pool_size, primary.max_overflow) == (23, 12)
+    assert (vector.pool_size, vector.max_overflow) == (10, 5)
+    assert pool_sizes("replica", settings) == primary
+
+
+@pytest.mark.unit
+def test_tiny_budget_keeps_one_connection_per_engine():
+    from app.db.connection_budget import pool_sizes
+
+    settings = _settings(DB_MAX_CONNECTIONS=10, WEB_CONCURRENCY=8)
+    assert pool_sizes("primary", settings).total == 1
+    assert pool_sizes("vector", settings).total == 1
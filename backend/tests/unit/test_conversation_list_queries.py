@@ -0,0 +1,85 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+
+def _seed(session, models, *, threads: int, messages_per_thread: int):  # type: ignore[no-untyped-def]
+    tenant = models.Tenant(owner_first_name="A", owner_last_name="B", owner_email="a@b.c")
+    session.add(tenant)
+    session.flush()
+    channel = models.ChannelInstance(
+        tenant_id=tenant.id,
+        channel_type=models.ChannelType.whatsapp,
+        identifier="whatsapp:+100",
+    )
+    session.add(channel)
+    session.flush()
+    flow = models.Flow(
+        tenant_id=tenant.id,
+        channel_instance_id=channel.id,
+        name="Atendimento",
+        flow_id="flow.atendimento",
+        definition={},
+    )
+    session.add(flow)
+    session.flush()
+
+    start = datetime(2025, 10, 1, tzinfo=UTC)
+    for n in range(threads):
+        contact = models.Contact(tenant_id=tenant.id, external_id=f"whatsapp:+55{n}")
+        session.add(contact)
+        session.flush()
+        thread = models.ChatThread(
+            tenant_id=tenant.id,
+            channel_instance_id=channel.id,
+            contact_id=contact.id,
+            flow_id=flow.id if n % 2 else None,
+            status=models.ThreadStatus.open,
+            last_message_at=start + timedelta(minutes=n),
+        )
+        session.add(thread)
+        session.flush()
+        session.add_all(
+            models.Message(
+                tenant_id=tenant.id,
+                channel_instance_id=channel.id,
+                thread_id=thread.id,
+                contact_id=contact.id,
+                direction=models.MessageDirection.inbound,
+                text=f"message {m}",
+            )
+            for m in range(messages_per_thread + n % 3)
+        )
+    session.commit()
+
+
+@pytest.mark.unit
+def test_conversation_list_is_a_single_query(sqlite_db):  # type: ignore[no-untyped-def]
+    from sqlalchemy import event
+
+    from app.core.pagination import PageKey
+    from app.db.repository import list_conversation_summaries
+
+    engine, session, models = sqlite_db
+    _seed(session, models, threads=60, messages_per_thread=20)
+
+    statements: list[str] = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    rows = list_conversation_summaries(session, limit=50)
+
+    assert len(statements) == 1
+    assert len(rows) == 50
+    newest = rows[0]
+    assert newest.external_id == "whatsapp:+5559"
+    assert newest.flow_name == "Atendimento"
+    assert newest.message_count == 20 + 59 % 3
+    assert rows[1].flow_name is None
+
+    statements.clear()
+    last = rows[-1]
+    rest = list_conversation_summaries(
+        session, limit=50, after=PageKey(last.last_message_at, last.id)
+    )
+    assert len(statements) == 1
+    assert [row.external_id for row in rest] == [f"whatsapp:+55{n}" for n in range(9, -1, -1)]
@@ -92,6 +92,12 @@ def create_mock_redis_store() -> Any:
         def set(self, key: str, value: str) -> None:
             self.commands.append(("set", (key, value), {}))
         
+        def get(self, key: str) -> None:
+            self.commands.append(("get", (key,), {}))
+
+        def llen(self, key: str) -> None:
+            self.commands.append(("llen", (key,), {}))
+
         def execute(self) -> list[Any]:
             results = []
             for cmd_name, args, kwargs in self.commands:
@@ -0,0 +1,216 @@
+from datetime import UTC, datetime
+from types import SimpleNamespace
+
+import pytest
+
+
+class _FakeRedis:
+    """Hashes plus the two ETag cache scripts, told apart by their argument count."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, dict[str, str]] = {}
+
+    async def hmget(self, key, fields):  # type: ignore[no-untyped-def]
+        entry = self.data.get(key, {})
+        return [entry.get(field) for field in fields]
+
+    async def eval(self, script, numkeys, key, *args):  # type: ignore[no-untyped-def]
+        return self.eval_sync(key, *args)
+
+    def eval_sync(self, key, *args):  # type: ignore[no-untyped-def]
+        entry = self.data.setdefault(key, {})
+        if len(args) == 1:  # invalidate
+            entry.pop("validators", None)
+            entry["gen"] = str(int(entry.get("gen", "0")) + 1)
+            return 1
+        generation, validators, _ttl = args
+        if generation and entry.get("gen", "0") != generation:
+            return 0
+        entry["validators"] = validators
+        return 1
+
+
+class _FakeSyncRedis:
+    def __init__(self, redis: _FakeRedis) -> None:
+        self._redis = redis
+
+    def eval(self, script, numkeys, key, *args):  # type: ignore[no-untyped-def]
+        return self._redis.eval_sync(key, *args)
+
+
+def _request(headers=None, ctx=None):  # type: ignore[no-untyped-def]
+    from fastapi import FastAPI
+    from starlette.requests import Request
+
+    app = FastAPI()
+    if ctx is not None:
+        app.state.ctx = ctx
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "query_string": b"",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()],
+        "app": app,
+    }
+    return Request(scope)
+
+
+@pytest.mark.unit
+def test_etags_are_weak_and_compared_weakly():
+    from app.core.etags import etag_matches, make_etag
+
+    etag = make_etag("flow", "abc", 3)
+    assert etag.startswith('W/"')
+    assert etag == make_etag("flow", "abc", 3)
+    assert etag != make_etag("flow", "abc", 4)
+
+    assert etag_matches(f'"other", {etag}', etag)
+    assert etag_matches(etag[2:], etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(None, etag)
+
+
+@pytest.mark.unit
+def test_if_modified_since_is_ignored_when_if_none_match_is_sent():
+    from app.core.etags import Validators, is_not_modified
+
+    validators = Validators('W/"v2"', datetime(2025, 10, 1, 12, 0, 0, 500_000, tzinfo=UTC))
+    since = "Wed, 01 Oct 2025 12:00:00 GMT"
+    earlier = "Wed, 01 Oct 2025 11:59:59 GMT"
+
+    assert is_not_modified({"if-modified-since": since}, validators)
+    assert not is_not_modified({"if-modified-since": earlier}, validators)
+    assert not is_not_modified({"if-modified-since": "garbage"}, validators)
+    assert not is_not_modified({"if-none-match": 'W/"v1"', "if-modified-since": since}, validators)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_cached_validators_answer_304_without_validating():
+    from fastapi import Response
+
+    from app.core.etags import ETagCache, Validators, conditional_get
+
+    redis = _FakeRedis()
+    cache = ETagCache(redis, _FakeSyncRedis(redis), ttl_seconds=60)
+    ctx = SimpleNamespace(etag_cache=cache)
+    modified = datetime(2025, 10, 1, tzinfo=UTC)
+    calls = []
+
+    def validate():  # type: ignore[no-untyped-def]
+        calls.append(1)
+        return Validators('W/"v1"', modified)
+
+    response = Response()
+    assert await conditional_get(_request(ctx=ctx), response, "flow:1", validate) is None
+    assert response.headers["ETag"] == 'W/"v1"'
+    assert response.headers["Last-Modified"] == "Wed, 01 Oct 2025 00:00:00 GMT"
+    assert calls == [1]
+
+    revalidate = _request({"If-None-Match": 'W/"v1"'}, ctx=ctx)
+    not_modified = await conditional_get(revalidate, Response(), "flow:1", validate)
+    assert not_modified is not None and not_modified.status_code == 304
+    assert not_modified.headers["ETag"] == 'W/"v1"'
+    assert calls == [1]
+
+    cache.invalidate(["flow:1"])
+    await conditional_get(revalidate, Response(), "flow:1", validate)
+    assert calls == [1, 1]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_validators_superseded_by_a_concurrent_commit_are_not_cached():
+    from fastapi import Response
+
+    from app.core.etags import ETagCache, Validators, conditional_get
+
+    redis = _FakeRedis()
+    cache = ETagCache(redis, _FakeSyncRedis(redis), ttl_seconds=60)
+    ctx = SimpleNamespace(etag_cache=cache)
+
+    def validate_while_committing():  # type: ignore[no-untyped-def]
+        # Another request commits a new version after this one read the flow
+        cache.invalidate(["flow:1"])
+        return Validators('W/"v1"')
+
+    await conditional_get(_request(ctx=ctx), Response(), "flow:1", validate_while_committing)
+    assert (await cache.get("flow:1"))[0] is None
+
+    response = Response()
+    await conditional_get(_request(ctx=ctx), response, "flow:1", lambda: Validators('W/"v2"'))
+    assert response.headers["ETag"] == 'W/"v2"'
+    assert (await cache.get("flow:1"))[0] == Validators('W/"v2"')
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_without_redis_every_request_validates_and_missing_resources_fall_through():
+    from fastapi import Response
+
+    from app.core.etags import Validators, conditional_body, conditional_get
+
+    request = _request({"If-None-Match": 'W/"v1"'})
+    not_modified = await conditional_get(
+        request, Response(), "flow:1", lambda: Validators('W/"v1"')
+    )
+    assert not_modified is not None and not_modified.status_code == 304
+    assert await conditional_get(request, Response(), "flow:2", lambda: None) is None
+    assert await conditional_get(request, Response(), "conversations:x") is None
+
+    response = Response()
+    assert await conditional_body(request, response, "conversations:x", '{"a":1}') is None
+    resent = _request({"If-None-Match": response.headers["ETag"]})
+    not_modified = await conditional_body(resent, Response(), "conversations:x", '{"a":1}')
+    assert not_modified is not None and not_modified.status_code == 304
+
+
+@pytest.mark.unit
+def test_commits_invalidate_changed_flows_and_tenants(sqlite_db):  # type: ignore[no-untyped-def]
+    _engine, session, models = sqlite_db
+    from app.core.etags import flow_resource, tenant_flows_resource, tenant_resource
+    from app.db import repository
+    from app.db.etag_events import set_etag_invalidator
+
+    invalidated: list[set[str]] = []
+    set_etag_invalidator(lambda resources: invalidated.append(set(resources)))
+    try:
+        tenant = models.Tenant(owner_first_name="A", owner_last_name="B", owner_email="a@b.c")
+        session.add(tenant)
+        session.flush()
+        channel = models.ChannelInstance(
+            tenant_id=tenant.id,
+            channel_type=models.ChannelType.whatsapp,
+            identifier="whatsapp:+100",
+        )
+        session.add(channel)
+        session.flush()
+        flow = models.Flow(
+            tenant_id=tenant.id,
+            channel_instance_id=channel.id,
+            name="Atendimento",
+            flow_id="flow.atendimento",
+            definition={"nodes": []},
+        )
+        session.add(flow)
+        session.commit()
+        assert invalidated == [
+            {flow_resource(flow.id), tenant_flows_resource(tenant.id), tenant_resource(tenant.id)}
+        ]
+
+        before = repository.get_flow_validators(session, flow.id)
+        tenant_before = repository.get_tenant_validators(session, tenant.id)
+        assert tenant_before.channel_count == 1 and tenant_before.flow_count == 1
+
+        repository.update_flow_definition(session, flow.id, {"nodes": [{"id": "q1"}]})
+        session.rollback()
+        assert len(invalidated) == 1
+
+        repository.update_flow_definition(session, flow.id, {"nodes": [{"id": "q1"}]})
+        session.commit()
+        assert len(invalidated) == 2 and flow_resource(flow.id) in invalidated[1]
+        assert repository.get_flow_validators(session, flow.id).version == before.version + 1
+    finally:
+        set_etag_invalidator(None)
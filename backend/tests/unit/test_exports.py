@@ -0,0 +1,131 @@
+import csv
+import io
+import json
+from contextlib import contextmanager
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+
+def _seed(session, models):  # type: ignore[no-untyped-def]
+    tenant = models.Tenant(owner_first_name="A", owner_last_name="B", owner_email="a@b.c")
+    session.add(tenant)
+    session.flush()
+    channel = models.ChannelInstance(
+        tenant_id=tenant.id, channel_type=models.ChannelType.whatsapp, identifier="whatsapp:+100"
+    )
+    session.add(channel)
+    session.flush()
+    start = datetime(2025, 10, 1, tzinfo=UTC)
+    for n in range(2):
+        contact = models.Contact(
+            tenant_id=tenant.id, external_id=f"whatsapp:+55{n}", display_name=f"Cliente {n}"
+        )
+        session.add(contact)
+        session.flush()
+        thread = models.ChatThread(
+            tenant_id=tenant.id,
+            channel_instance_id=channel.id,
+            contact_id=contact.id,
+            status=models.ThreadStatus.open,
+        )
+        session.add(thread)
+        session.flush()
+        session.add_all(
+            models.Message(
+                tenant_id=tenant.id,
+                channel_instance_id=channel.id,
+                thread_id=thread.id,
+                contact_id=contact.id,
+                direction=models.MessageDirection.inbound,
+                text=f"mensagem {n}.{m}",
+                created_at=start + timedelta(minutes=10 * m + n),
+            )
+            for m in range(3)
+        )
+    session.commit()
+    return tenant.id
+
+
+@pytest.fixture
+def export_db(sqlite_db, monkeypatch):  # type: ignore[no-untyped-def]
+    import app.db.session
+    from app.services import export_service
+
+    _engine, session, models = sqlite_db
+
+    @contextmanager
+    def read_session():  # type: ignore[no-untyped-def]
+        yield session
+
+    monkeypatch.setattr(app.db.session, "db_read_session", read_session)
+    monkeypatch.setattr(export_service, "BATCH_SIZE", 4)
+    return _seed(session, models)
+
+
+@pytest.mark.unit
+def test_message_export_streams_decrypted_ndjson_and_resumes(export_db):  # type: ignore[no-untyped-def]
+    from app.core.pagination import decode_cursor
+    from app.services.export_service import stream_message_export
+
+    chunks = list(stream_message_export(export_db, "ndjson"))
+    rows = [json.loads(line) for line in b"".join(chunks).decode().splitlines()]
+
+    assert len(chunks) == 2  # batches of 4 rows
+    assert [row["text"] for row in rows] == [
+        f"mensagem {n}.{m}" for m in range(3) for n in range(2)
+    ]
+    assert rows[0]["direction"] == "inbound"
+
+    after = decode_cursor(rows[3]["cursor"])
+    resumed = list(stream_message_export(export_db, "ndjson", after=after))
+    rest = [json.loads(line) for line in b"".join(resumed).decode().splitlines()]
+    assert [row["id"] for row in rest] == [row["id"] for row in rows[4:]]
+
+
+@pytest.mark.unit
+def test_thread_export_as_csv(export_db):  # type: ignore[no-untyped-def]
+    from app.services.export_service import THREAD_FIELDS, stream_thread_export
+
+    body = b"".join(stream_thread_export(export_db, "csv")).decode()
+    rows = list(csv.DictReader(io.StringIO(body)))
+
+    assert list(rows[0]) == [*THREAD_FIELDS, "cursor"]
+    assert [(row["contact_external_id"], row["contact_display_name"]) for row in rows] == [
+        ("whatsapp:+550", "Cliente 0"),
+        ("whatsapp:+551", "Cliente 1"),
+    ]
+    assert rows[0]["contact_phone_number"] == ""
+
+
+@pytest.mark.unit
+def test_exports_require_an_admin_session(sqlite_db, monkeypatch):  # type: ignore[no-untyped-def]
+    import secrets
+    from uuid import uuid4
+
+    from fastapi import FastAPI, Request
+    from fastapi.testclient import TestClient
+    from starlette.middleware.sessions import SessionMiddleware
+
+    from app.api import chats
+
+    def stream(*_args, **_kwargs):  # type: ignore[no-untyped-def]
+        yield "{}\n"
+
+    monkeypatch.setattr(chats, "stream_thread_export", stream)
+    monkeypatch.setattr(chats, "stream_message_export", stream)
+    app = FastAPI()
+    app.include_router(chats.router)
+
+    @app.post("/login")
+    def login(request: Request) -> None:
+        request.session["is_admin"] = True
+        request.session["admin_expires_at"] = (datetime.now() + timedelta(hours=1)).isoformat()
+
+    app.add_middleware(SessionMiddleware, secret_key=secrets.token_hex())
+    client = TestClient(app)
+    paths = [f"/chats/tenants/{uuid4()}/exports/{kind}" for kind in ("threads", "messages")]
+
+    assert [client.get(path).status_code for path in paths] == [401, 401]
+    client.post("/login")
+    assert [client.get(path).status_code for path in paths] == [200, 200]
@@ -0,0 +1,136 @@
+import pytest
+
+
+def _compiled_menu_flow():  # type: ignore[no-untyped-def]
+    from app.flow_core.compiler import FlowCompiler
+    from app.flow_core.ir import Flow
+
+    flow = Flow.model_validate(
+        {
+            "schema_version": "v1",
+            "id": "flow.menu",
+            "entry": "q.plano",
+            "nodes": [
+                {
+                    "id": "q.plano",
+                    "kind": "Question",
+                    "key": "plano",
+                    "prompt": "Qual plano? Básico, Intermediário ou Premium",
+                    "allowed_values": ["Básico", "Intermediário", "Premium"],
+                },
+                {
+                    "id": "q.whatsapp",
+                    "kind": "Question",
+                    "key": "quer_whatsapp",
+                    "prompt": "Plano {plano} anotado! Quer receber pelo WhatsApp?",
+                    "data_type": "boolean",
+                },
+                {
+                    "id": "q.nome",
+                    "kind": "Question",
+                    "key": "nome",
+                    "prompt": "Qual é o seu nome?",
+                },
+            ],
+            "edges": [
+                {
+                    "source": "q.plano",
+                    "target": "q.whatsapp",
+                    "guard": {"fn": "answers_has", "args": {"key": "plano"}},
+                },
+                {"source": "q.whatsapp", "target": "q.nome"},
+            ],
+        }
+    )
+    return FlowCompiler().compile(flow)
+
+
+@pytest.mark.unit
+def test_match_constrained_option_is_strict():
+    from app.flow_core.normalize import match_constrained_option, match_yes_no
+
+    options = ["Básico", "Intermediário", "Premium"]
+
+    assert match_constrained_option("basico", options) == "Básico"
+    assert match_constrained_option("2", options) == "Intermediário"
+    assert match_constrained_option("Opção C", options) == "Premium"
+    assert match_constrained_option("a segunda", options) == "Intermediário"
+    assert match_constrained_option("último", options) == "Premium"
+    assert match_constrained_option("quero o premium!", options) == "Premium"
+    assert match_constrained_option("sim", ["Sim", "Não"]) == "Sim"
+    assert match_constrained_option("nao", ["Sim", "Não"]) == "Não"
+
+    # Ambiguous or free-text answers are left to the LLM
+    assert match_constrained_option("premium ou básico?", options) is None
+    assert match_constrained_option("qual a diferença do premium?", options) is None
+    assert match_constrained_option("4", options) is None
+
+    # Numbers inside the options are values, not positions
+    rooms = ["2 quartos", "3 quartos", "4 quartos"]
+    assert match_constrained_option("3", rooms) == "3 quartos"
+    assert match_constrained_option("quero 3 quartos", rooms) == "3 quartos"
+    assert match_constrained_option("1", rooms) is None
+    assert match_constrained_option("terceira", rooms) == "4 quartos"
+
+    # Letters need an option prefix; "a" and "e" are ordinary Portuguese words
+    letters = ["Um", "Dois", "Três", "Quatro", "Cinco"]
+    assert match_constrained_option("e", letters) is None
+    assert match_constrained_option("a", letters) is None
+    assert match_constrained_option("letra b", letters) == "Dois"
+    assert match_constrained_option("opção e", letters) == "Cinco"
+
+    assert match_yes_no("Sim!") is True
+    assert match_yes_no("não, obrigado") is False
+    assert match_yes_no("depende do preço") is None
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_runner_fast_path_skips_llm_for_exact_option():
+    from app.flow_core.runner import FlowTurnRunner
+    from app.flow_core.state import FlowContext
+
+    class NoCallLLM:
+        def extract(self, *_a, **_k):  # type: ignore[no-untyped-def]
+            raise AssertionError("LLM must not be called on the fast path")
+
+    runner = FlowTurnRunner(llm_client=NoCallLLM(), compiled_flow=_compiled_menu_flow())
+    ctx = FlowContext(flow_id="flow.menu", current_node_id="q.plano")
+
+    result = await runner.process_turn(ctx=ctx, user_message="Opção 3")
+
+    assert ctx.answers["plano"] == "Premium"
+    assert ctx.current_node_id == "q.whatsapp"
+    assert result.metadata["fast_path"] is True
+    assert result.metadata["messages"][0]["text"] == (
+        "Plano Premium anotado! Quer receber pelo WhatsApp?"
+    )
+
+    result = await runner.process_turn(ctx=ctx, user_message="claro")
+    assert ctx.answers["quer_whatsapp"] is True
+    assert ctx.current_node_id == "q.nome"
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_runner_falls_back_to_llm_for_free_text():
+    from app.flow_core.runner import FlowTurnRunner
+    from app.flow_core.state import FlowContext
+
+    class DummyLLM:
+        pass
+
+    runner = FlowTurnRunner(llm_client=DummyLLM(), compiled_flow=_compiled_menu_flow())
+    called = []
+
+    async def fake_respond(*args, **kwargs):  # type: ignore[no-untyped-def]
+        called.append(kwargs["user_message"])
+        raise RuntimeError("stop after responder call")
+
+    runner._responder.respond = fake_respond  # type: ignore[method-assign]
+    ctx = FlowContext(flow_id="flow.menu", current_node_id="q.plano")
+
+    await runner.process_turn(ctx=ctx, user_message="qual a diferença entre eles?")
+
+    assert called == ["qual a diferença entre eles?"]
+    assert "plano" not in ctx.answers
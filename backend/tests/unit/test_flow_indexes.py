@@ -0,0 +1,117 @@
+import pytest
+
+
+def _definition():  # type: ignore[no-untyped-def]
+    return {
+        "schema_version": "v1",
+        "id": "flow.idx",
+        "entry": "q.nome",
+        "nodes": [
+            {"id": "q.nome", "kind": "Question", "key": "nome", "prompt": "Nome?", "priority": 10},
+            {
+                "id": "q.email",
+                "kind": "Question",
+                "key": "email",
+                "prompt": "Email?",
+                "priority": 30,
+                "dependencies": ["nome"],
+            },
+            {
+                "id": "q.cidade",
+                "kind": "Question",
+                "key": "cidade",
+                "prompt": "Cidade?",
+                "priority": 20,
+            },
+            {"id": "t.fim", "kind": "Terminal", "reason": "fim"},
+        ],
+        "edges": [
+            {"source": "q.nome", "target": "q.cidade"},
+            {"source": "q.cidade", "target": "t.fim"},
+        ],
+    }
+
+
+@pytest.mark.unit
+def test_compiled_flow_exposes_indexes():
+    from app.flow_core.compiler import FlowCompiler
+    from app.flow_core.ir import Flow
+
+    compiled = FlowCompiler().compile(Flow.model_validate(_definition()))
+
+    assert compiled.questions_by_priority == ("q.nome", "q.cidade", "q.email")
+
+
+@pytest.mark.unit
+def test_unanswered_questions_follow_answer_diffs():
+    from app.flow_core.compiler import FlowCompiler
+    from app.flow_core.engine import LLMFlowEngine
+    from app.flow_core.ir import Flow
+    from app.flow_core.state import FlowContext
+
+    definition = _definition()
+    definition["edges"] = []
+    engine = LLMFlowEngine(FlowCompiler().compile(Flow.model_validate(definition)))
+    ctx = FlowContext(flow_id="flow.idx", current_node_id="q.nome")
+
+    assert [q["id"] for q in engine._get_unanswered_questions(ctx)] == [
+        "q.nome",
+        "q.cidade",
+        "q.email",
+    ]
+
+    response = engine.process(ctx, None, event={"answer": "Ana"})
+    assert response.node_id == "q.cidade"
+
+    ctx.answers["email"] = "ana@example.com"
+    assert engine.next_unanswered_question(ctx) == "q.cidade"
+    assert engine.next_unanswered_question(ctx, exclude="q.cidade") is None
+
+    # Clearing an answer makes the question pending again
+    ctx.answers["nome"] = ""
+    assert [q["id"] for q in engine._get_unanswered_questions(ctx)] == ["q.nome", "q.cidade"]
+
+    ctx.answers.update({"nome": "Ana", "cidade": "Recife"})
+    assert engine.process(ctx, None, event={"answer": "Recife"}).kind == "terminal"
+
+
+@pytest.mark.unit
+def test_flow_modification_batch_uses_consistent_index():
+    from app.services.flow_modification_service import FlowModificationService
+
+    result = FlowModificationService().execute_batch_actions(
+        _definition(),
+        [
+            {"action": "update_node", "node_id": "q.cidade", "updates": {"prompt": "Qual cidade?"}},
+            {"action": "add_edge", "source": "q.email", "target": "t.fim"},
+            {"action": "delete_node", "node_id": "q.cidade"},
+            {"action": "add_edge", "source": "q.nome", "target": "q.email"},
+            {
+                "action": "update_edge",
+                "source": "q.nome",
+                "target": "q.email",
+                "updates": {"priority": 1},
+            },
+            {"action": "set_entry", "entry_node": "q.nome"},
+        ],
+        persist=False,
+    )
+
+    assert result.success, result.error
+    flow = result.modified_flow
+    assert [n["id"] for n in flow["nodes"]] == ["q.nome", "q.email", "t.fim"]
+    assert flow["edges"] == [
+        {"source": "q.email", "target": "t.fim"},
+        {"source": "q.nome", "target": "q.email", "priority": 1},
+    ]
+
+    failed = FlowModificationService().execute_batch_actions(
+        _definition(),
+        [
+            {"action": "delete_node", "node_id": "q.cidade"},
+            {"action": "update_edge", "source": "q.nome", "target": "q.cidade", "updates": {}},
+        ],
+        persist=False,
+    )
+    assert not failed.success
+    assert "not found" in (failed.error or "")
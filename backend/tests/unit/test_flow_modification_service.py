@@ -0,0 +1,87 @@
+import copy
+import uuid
+
+import pytest
+
+
+def _flow():  # type: ignore[no-untyped-def]
+    return {
+        "schema_version": "v1",
+        "id": "flow.edit",
+        "entry": "q.a",
+        "nodes": [
+            {"id": "q.a", "kind": "Question", "key": "a", "prompt": "A?"},
+            {"id": "q.b", "kind": "Question", "key": "b", "prompt": "B?"},
+            {"id": "t.fim", "kind": "Terminal", "reason": "fim"},
+        ],
+        "edges": [
+            {"source": "q.a", "target": "q.b"},
+            {"source": "q.b", "target": "t.fim"},
+        ],
+    }
+
+
+@pytest.mark.unit
+def test_batch_is_copy_on_write_and_validates_locally():
+    from app.services.flow_modification_service import FlowModificationService
+
+    original = _flow()
+    snapshot = copy.deepcopy(original)
+    service = FlowModificationService()
+
+    result = service.execute_batch_actions(
+        original,
+        [
+            {"action": "update_node", "node_id": "q.b", "updates": {"prompt": "Bê?"}},
+            {"action": "add_edge", "source": "q.b", "target": "q.a"},
+        ],
+        persist=False,
+    )
+
+    assert result.success, result.error
+    assert original == snapshot
+    assert result.modified_flow["nodes"][1]["prompt"] == "Bê?"
+    # Untouched nodes are shared rather than copied
+    assert result.modified_flow["nodes"][0] is original["nodes"][0]
+    assert "cycle" in (result.action_results[1].warning or "")
+
+    failures = {
+        "dangling edge": [{"action": "add_edge", "source": "q.a", "target": "q.x"}],
+        "invalid node": [
+            {"action": "add_node", "node_definition": {"id": "q.c", "kind": "Question"}}
+        ],
+        "referenced rename": [
+            {"action": "update_node", "node_id": "q.b", "updates": {"id": "q.bb"}}
+        ],
+        "entry removed": [{"action": "delete_node", "node_id": "q.a"}],
+    }
+    for name, actions in failures.items():
+        failed = service.execute_batch_actions(original, actions, persist=False)
+        assert not failed.success, name
+    assert original == snapshot
+
+
+@pytest.mark.unit
+def test_full_validation_runs_only_on_commit(monkeypatch):  # type: ignore[no-untyped-def]
+    from app.services.flow_modification_service import FlowModificationService
+
+    service = FlowModificationService(session=object())  # type: ignore[arg-type]
+    validated = []
+    persisted = []
+    real_validate = service._validate_flow
+
+    def spy_validate(flow):  # type: ignore[no-untyped-def]
+        validated.append(flow)
+        return real_validate(flow)
+
+    monkeypatch.setattr(service, "_validate_flow", spy_validate)
+    monkeypatch.setattr(service, "_persist_flow", lambda flow, flow_id: persisted.append(flow_id))
+    actions = [{"action": "update_node", "node_id": "q.a", "updates": {"prompt": "A!"}}]
+
+    preview = service.execute_batch_actions(_flow(), actions, persist=False)
+    assert preview.success and validated == []
+
+    flow_id = uuid.uuid4()
+    committed = service.execute_batch_actions(_flow(), actions, flow_id=flow_id)
+    assert committed.success
+    assert len(validated) == 1 and persisted == [flow_id]
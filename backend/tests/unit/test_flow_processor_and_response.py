@@ -4,6 +4,9 @@ import pytest
 @pytest.mark.unit
 @pytest.mark.asyncio
 async def test_flow_processor_happy_path_builds_response_and_saves_context():
+    from contextlib import asynccontextmanager
+
+    from app.core.cancellation import CancellationToken
     from app.core.flow_processor import FlowProcessor
     from app.core.flow_request import FlowRequest
     from app.core.flow_response import FlowProcessingResult
@@ -21,10 +24,42 @@ async def test_flow_processor_happy_path_builds_response_and_saves_context():
         def save_context(self, session_id: str, context):  # type: ignore[no-untyped-def]
             self.saved[session_id] = context
 
+        async def get_context_async(self, session_id: str):  # type: ignore[no-untyped-def]
+            return self.get_context(session_id)
+
+        async def save_context_async(self, session_id: str, context):  # type: ignore[no-untyped-def]
+            self.save_context(session_id, context)
+
+        def queue_load_context(self, uow, session_id: str):  # type: ignore[no-untyped-def]
+            return uow.defer(self.get_context_async(session_id))
+
+        def queue_save_context(self, uow, session_id: str, context, tenant_id=None):  # type: ignore[no-untyped-def]
+            uow.defer(self.save_context_async(session_id, context))
+
     class DummyCancel:
         def check_cancellation_and_raise(self, *a, **k):  # type: ignore[no-untyped-def]
             return None
 
+        async def check_cancellation_and_raise_async(self, *a, **k):  # type: ignore[no-untyped-def]
+            return None
+
+        def unit_of_work(self):  # type: ignore[no-untyped-def]
+            from app.core.redis_unit_of_work import RedisUnitOfWork
+
+            return RedisUnitOfWork(None)
+
+        def queue_message_count(self, uow, session_id: str):  # type: ignore[no-untyped-def]
+            from app.core.redis_unit_of_work import Deferred
+
+            return Deferred.resolved(0)
+
+        def raise_if_pending(self, *a, **k):  # type: ignore[no-untyped-def]
+            return None
+
+        @asynccontextmanager
+        async def cancellation_scope(self, session_id: str):  # type: ignore[no-untyped-def]
+            yield CancellationToken(session_id)
+
     # Monkeypatch FlowTurnRunner within processor to avoid deep deps
     class DummyTurnResult:
         assistant_message = "oi"
@@ -0,0 +1,112 @@
+import itertools
+
+import pytest
+
+
+def _flow(prompts):  # type: ignore[no-untyped-def]
+    return {
+        "id": "flow.x",
+        "entry": "q.0",
+        "nodes": [
+            {"id": f"q.{i}", "kind": "Question", "key": f"k{i}", "prompt": p}
+            for i, p in enumerate(prompts)
+        ],
+        "edges": [{"source": f"q.{i}", "target": f"q.{i + 1}"} for i in range(len(prompts) - 1)],
+        "metadata": {"name": "x", "a/b": 1, "til~de": True},
+    }
+
+
+@pytest.mark.unit
+def test_make_patch_roundtrips_and_stays_small():
+    from app.core.json_patch import apply_patch, make_patch
+
+    before = _flow(["A?", "B?", "C?", "D?"])
+    after = _flow(["A?", "B?", "Nova?", "C?", "D?"])
+    after["metadata"]["a/b"] = 2
+    del after["metadata"]["til~de"]
+    after["policies"] = {"strict": False}
+
+    patch = make_patch(before, after)
+
+    assert apply_patch(before, patch) == after
+    assert before == _flow(["A?", "B?", "C?", "D?"])  # input untouched
+    assert {"op": "replace", "path": "/metadata/a~1b", "value": 2} in patch
+    assert {"op": "remove", "path": "/metadata/til~0de"} in patch
+    # Only the changed tail of the lists is patched, not the whole document
+    assert len(patch) < 12
+    assert make_patch(after, after) == []
+    # Booleans are not confused with integers
+    assert make_patch({"v": 1}, {"v": True}) == [{"op": "replace", "path": "/v", "value": True}]
+
+
+@pytest.mark.unit
+def test_apply_patch_supports_rfc_operations_and_chains():
+    from app.core.json_patch import JsonPatchError, apply_patch, make_patch
+
+    doc = {"a": [1, 2, 3], "b": {"c": "x"}}
+    patched = apply_patch(
+        doc,
+        [
+            {"op": "test", "path": "/b/c", "value": "x"},
+            {"op": "move", "from": "/b/c", "path": "/d"},
+            {"op": "copy", "from": "/a/0", "path": "/a/-"},
+            {"op": "add", "path": "/a/1", "value": 9},
+        ],
+    )
+    assert patched == {"a": [1, 9, 2, 3, 1], "b": {}, "d": "x"}
+
+    with pytest.raises(JsonPatchError):
+        apply_patch(doc, [{"op": "remove", "path": "/missing"}])
+    with pytest.raises(JsonPatchError):
+        apply_patch(doc, [{"op": "test", "path": "/a/0", "value": True}])
+
+    # Snapshot + chain of patches reconstructs every version
+    versions = [_flow(["A?"] * n) for n in range(1, 6)]
+    versions[3]["nodes"][0]["prompt"] = "Editada?"
+    patches = [make_patch(a, b) for a, b in itertools.pairwise(versions)]
+    current = apply_patch(versions[0], [])
+    for expected, patch in zip(versions[1:], patches, strict=True):
+        current = apply_patch(current, patch, in_place=True)
+        assert current == expected
+
+
+@pytest.mark.unit
+def test_flow_version_compaction_keeps_a_snapshot_after_a_gap(sqlite_db):
+    # sqlite_db swaps in the real SQLAlchemy the migration and the repository import
+    import importlib.util
+    from pathlib import Path
+    from types import SimpleNamespace
+
+    from app.core.json_patch import apply_patch
+    from app.db.repository import replay_flow_versions
+
+    migration = (
+        Path(__file__).resolve().parents[2]
+        / "alembic"
+        / "versions"
+        / "20251018_flow_version_patches.py"
+    )
+    spec = importlib.util.spec_from_file_location("flow_version_patches", migration)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    # Version 4 was deleted by hand
+    numbers = [1, 2, 3, 5, 6, 11, 12]
+    definitions = {n: _flow(["A?"] * n) for n in numbers}
+    rows = [
+        SimpleNamespace(id=f"v{n}", version_number=n, definition_snapshot=definitions[n])
+        for n in numbers
+    ]
+
+    patches = dict(module.compaction_patches(rows))
+
+    assert sorted(patches) == ["v12", "v2", "v3", "v6"]
+    stored = [
+        (n, None if f"v{n}" in patches else definitions[n], patches.get(f"v{n}")) for n in numbers
+    ]
+    for number in numbers:
+        base = max(i for i, (n, snapshot, _) in enumerate(stored) if n <= number and snapshot)
+        chain = [row for row in stored[base:] if row[0] <= number]
+        assert replay_flow_versions(chain, number) == definitions[number]
+    assert apply_patch(definitions[5], patches["v6"]) == definitions[6]
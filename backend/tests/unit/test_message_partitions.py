@@ -0,0 +1,165 @@
+from datetime import UTC, date, datetime
+
+import pytest
+
+
+class _FakeConnection:
+    def __init__(self, attached):  # type: ignore[no-untyped-def]
+        self.attached = list(attached)
+        self.statements: list[str] = []
+
+    def execute(self, statement, params=None):  # type: ignore[no-untyped-def]
+        statement = str(statement)
+        if "pg_inherits" in statement:
+            return [(name,) for name in self.attached]
+        self.statements.append(statement)
+        return []
+
+
+@pytest.mark.unit
+def test_month_arithmetic_and_partition_names():
+    from app.db.partitions import add_months, month_start, partition_month, partition_name
+
+    assert month_start(datetime(2025, 12, 31, 23, 30, tzinfo=UTC)) == date(2025, 12, 1)
+    assert add_months(date(2025, 11, 1), 3) == date(2026, 2, 1)
+    assert add_months(date(2025, 1, 1), -1) == date(2024, 12, 1)
+    assert partition_name(date(2026, 2, 1)) == "messages_y2026m02"
+    assert partition_month("messages_y2026m02") == date(2026, 2, 1)
+    assert partition_month("messages_default") is None
+
+
+@pytest.mark.unit
+def test_ensure_partitions_creates_missing_months_ahead():
+    from app.db.partitions import ensure_partitions
+
+    connection = _FakeConnection(["messages_default", "messages_y2025m11"])
+    created = ensure_partitions(connection, months_ahead=2, now=datetime(2025, 11, 20, tzinfo=UTC))
+
+    assert created == ["messages_y2025m12", "messages_y2026m01"]
+    assert connection.statements[0] == (
+        "CREATE TABLE messages_y2025m12 PARTITION OF messages "
+        "FOR VALUES FROM ('2025-12-01T00:00:00+00:00') TO ('2026-01-01T00:00:00+00:00')"
+    )
+
+
+@pytest.mark.unit
+def test_only_months_past_retention_are_archived():
+    from app.db.partitions import partitions_to_archive
+
+    expired = partitions_to_archive(
+        ["messages_default", "messages_y2024m10", "messages_y2024m11", "messages_y2025m10"],
+        ["messages_y2024m09"],
+        keep_months=12,
+        now=datetime(2025, 11, 5, tzinfo=UTC),
+    )
+    assert expired == ["messages_y2024m09", "messages_y2024m10"]
+
+
+class _FakeResult:
+    def __init__(self, value):  # type: ignore[no-untyped-def]
+        self.value = value
+
+    def scalar_one(self):  # type: ignore[no-untyped-def]
+        return self.value
+
+
+class _FakeCopy:
+    def __init__(self, chunks):  # type: ignore[no-untyped-def]
+        self.chunks = chunks
+
+    def __enter__(self):  # type: ignore[no-untyped-def]
+        return iter(self.chunks)
+
+    def __exit__(self, *exc):  # type: ignore[no-untyped-def]
+        return False
+
+
+class _FakeDriver:
+    def __init__(self, exports):  # type: ignore[no-untyped-def]
+        self.exports = exports
+        self.transactions: list[list[str]] = []
+
+    def cursor(self):  # type: ignore[no-untyped-def]
+        return self
+
+    def copy(self, statement):  # type: ignore[no-untyped-def]
+        key = "attachments" if "message_attachments" in statement else "messages"
+        return _FakeCopy(self.exports[key])
+
+    def transaction(self):  # type: ignore[no-untyped-def]
+        driver = self
+
+        class _Transaction:
+            def __enter__(self):  # type: ignore[no-untyped-def]
+                driver.transactions.append([])
+
+            def __exit__(self, *exc):  # type: ignore[no-untyped-def]
+                return False
+
+        return _Transaction()
+
+    def execute(self, statement):  # type: ignore[no-untyped-def]
+        self.transactions[-1].append(statement)
+
+
+class _FakeArchiveConnection(_FakeConnection):
+    def __init__(self, attached, exports, counts):  # type: ignore[no-untyped-def]
+        super().__init__(attached)
+        self.counts = counts
+        self.driver = _FakeDriver(exports)
+        self.connection = type("_Pooled", (), {"driver_connection": self.driver})()
+
+    def execute(self, statement, params=None):  # type: ignore[no-untyped-def]
+        statement = str(statement)
+        if statement.startswith("SELECT count(*)"):
+            key = "attachments" if "message_attachments" in statement else "messages"
+            return _FakeResult(self.counts[key])
+        return super().execute(statement, params)
+
+
+@pytest.mark.unit
+def test_archive_partition_exports_and_deletes_the_month_attachments(tmp_path):
+    import gzip
+
+    from app.db.partitions import archive_partition
+
+    connection = _FakeArchiveConnection(
+        ["messages_default", "messages_y2024m09"],
+        {
+            "messages": [b"id,created_at\n", b"m1,2024-09-02\nm2,2024-09-03\n"],
+            "attachments": [b"id,message_id\n", b"a1,m1\n"],
+        },
+        {"messages": 2, "attachments": 1},
+    )
+
+    archived = archive_partition(connection, "messages_y2024m09", tmp_path)
+
+    assert (archived.rows, archived.attachments) == (2, 1)
+    assert gzip.decompress(archived.attachments_path.read_bytes()) == b"id,message_id\na1,m1\n"
+    assert "DETACH PARTITION messages_y2024m09" in connection.statements[1]
+    # The attachments go in the same transaction as the drop, never after it
+    assert connection.driver.transactions == [
+        [
+            (
+                "DELETE FROM message_attachments "
+                "WHERE message_id IN (SELECT id FROM messages_y2024m09)"
+            ),
+            "DROP TABLE messages_y2024m09",
+        ]
+    ]
+    assert not list(tmp_path.glob("*.partial"))
+
+
+@pytest.mark.unit
+def test_archive_partition_keeps_the_month_when_the_attachment_export_is_short(tmp_path):
+    from app.db.partitions import archive_partition
+
+    connection = _FakeArchiveConnection(
+        ["messages_y2024m09"],
+        {"messages": [b"id\n", b"m1\n"], "attachments": [b"id\n"]},
+        {"messages": 1, "attachments": 1},
+    )
+
+    with pytest.raises(RuntimeError, match="attachments"):
+        archive_partition(connection, "messages_y2024m09", tmp_path)
+    assert connection.driver.transactions == []
@@ -0,0 +1,42 @@
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from uuid import UUID
+
+import pytest
+
+ROW_ID = UUID("01920000-0000-7000-8000-000000000001")
+
+
+@pytest.mark.unit
+def test_cursor_round_trips_sort_key_and_id():
+    from app.core.pagination import PageKey, decode_cursor, encode_cursor
+
+    dated = PageKey(datetime(2025, 10, 20, 12, 30, tzinfo=UTC), ROW_ID)
+    undated = PageKey(None, ROW_ID)
+
+    cursor = encode_cursor(dated)
+    assert "=" not in cursor and "/" not in cursor
+    assert decode_cursor(cursor) == dated
+    assert decode_cursor(encode_cursor(undated)) == undated
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "W10", "WyJ4Il0", "!!!"])
+def test_tampered_cursors_are_rejected(cursor):
+    from app.core.pagination import InvalidCursorError, decode_cursor
+
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor)
+
+
+@pytest.mark.unit
+def test_split_page_only_issues_a_cursor_when_rows_remain():
+    from app.core.pagination import PageKey, decode_cursor, split_page
+
+    rows = [SimpleNamespace(at=None, id=UUID(int=n)) for n in range(3)]
+
+    page, cursor = split_page(rows, 2, lambda r: PageKey(r.at, r.id))
+    assert page == rows[:2]
+    assert cursor is not None and decode_cursor(cursor) == PageKey(None, UUID(int=1))
+
+    assert split_page(rows, 3, lambda r: PageKey(r.at, r.id)) == (rows, None)
@@ -0,0 +1,39 @@
+import pytest
+
+
+@pytest.mark.unit
+def test_request_cache_decrypts_each_ciphertext_once():
+    from cryptography.fernet import Fernet
+
+    from app.db.decryption import decrypt_token, decryption_cache
+
+    fernet = Fernet(Fernet.generate_key())
+    name = fernet.encrypt(b"Maria").decode()
+
+    with decryption_cache(maxsize=2) as cache:
+        assert [decrypt_token(fernet, name) for _ in range(3)] == ["Maria"] * 3
+        assert (cache.hits, cache.misses) == (2, 1)
+        for value in (b"a", b"b"):
+            decrypt_token(fernet, fernet.encrypt(value).decode())
+        assert cache.get(name) is None  # evicted as least recently used
+
+
+@pytest.mark.unit
+def test_batched_decryption_keeps_order_and_nulls():
+    from concurrent.futures import ThreadPoolExecutor
+
+    from cryptography.fernet import Fernet
+
+    from app.db.decryption import decrypt_tokens, decryption_cache
+
+    key = Fernet.generate_key()
+    fernet = Fernet(key)
+    shared = fernet.encrypt(b"+5511999000000").decode()
+    tokens = [fernet.encrypt(f"m{i}".encode()).decode() for i in range(5)]
+    column = [tokens[0], None, shared, tokens[1], shared, *tokens[2:]]
+    expected = ["m0", None, "+5511999000000", "m1", "+5511999000000", "m2", "m3", "m4"]
+
+    with ThreadPoolExecutor(2) as executor, decryption_cache() as cache:
+        assert decrypt_tokens(key, column, executor=executor, batch_size=2) == expected
+        assert cache.get(shared) == "+5511999000000"
+        assert decrypt_tokens(key, [shared]) == ["+5511999000000"]
@@ -11,6 +11,7 @@ class FakeRedis:
         self._lists = {}
         self._strings = {}
         self._counters = {}
+        self._subscribers = {}
 
     def lrange(self, key, start, end):
         items = self._lists.get(key, [])
@@ -21,6 +22,9 @@ class FakeRedis:
     def rpush(self, key, value):
         self._lists.setdefault(key, []).append(value)
 
+    def lpush(self, key, value):
+        self._lists.setdefault(key, []).insert(0, value)
+
     def llen(self, key):
         return len(self._lists.get(key, []))
 
@@ -52,6 +56,36 @@ class FakeRedis:
     def pipeline(self):
         return FakeRedisPipeline(self)
 
+    def publish(self, channel, message):
+        subscribers = self._subscribers.get(channel, [])
+        for pubsub in subscribers:
+            pubsub._messages.append({"type": "message", "channel": channel, "data": message})
+        return len(subscribers)
+
+    def pubsub(self, ignore_subscribe_messages=False):
+        return FakePubSub(self)
+
+
+class FakePubSub:
+    """Fake Redis pub/sub connection."""
+
+    def __init__(self, redis):
+        self._redis = redis
+        self._messages = []
+        self._channels = []
+
+    def subscribe(self, channel):
+        self._channels.append(channel)
+        self._redis._subscribers.setdefault(channel, []).append(self)
+
+    def get_message(self, timeout=0):
+        return self._messages.pop(0) if self._messages else None
+
+    def close(self):
+        for channel in self._channels:
+            self._redis._subscribers[channel].remove(self)
+        self._channels = []
+
 
 class FakeRedisPipeline:
     """Fake Redis pipeline for atomic operations."""
@@ -84,6 +118,14 @@ class FakeRedisPipeline:
         self._commands.append(("delete", keys))
         return self
 
+    def get(self, key):
+        self._commands.append(("get", key))
+        return self
+
+    def llen(self, key):
+        self._commands.append(("llen", key))
+        return self
+
     def execute(self):
         results = []
         for cmd in self._commands:
@@ -104,6 +146,10 @@ class FakeRedisPipeline:
             elif cmd[0] == "delete":
                 self._redis.delete(*cmd[1])
                 results.append(len(cmd[1]))
+            elif cmd[0] == "get":
+                results.append(self._redis.get(cmd[1]))
+            elif cmd[0] == "llen":
+                results.append(self._redis.llen(cmd[1]))
         return results
 
 
@@ -202,3 +248,149 @@ async def test_get_and_clear_messages_aggregates_with_timestamps():
     count = pcm.get_message_count(session_id)
     assert count == 0
 
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_speculative_turn_reused_when_no_new_message_arrives():
+    from app.core.flow_response import FlowProcessingResult, FlowResponse
+    from app.services.processing_cancellation_manager import ProcessingCancellationManager
+    from app.services.speculative_turn import SpeculativeTurn
+
+    store = FakeStore()
+    pcm = ProcessingCancellationManager(store=store)
+
+    session_id = "flow:user:flowid"
+    computed: list[str] = []
+
+    async def compute(message):
+        computed.append(message)
+        return FlowResponse(result=FlowProcessingResult.CONTINUE, message=f"re: {message}")
+
+    speculation = SpeculativeTurn(pcm, session_id, compute)
+    mid = pcm.add_message_to_buffer(session_id, "quero um orçamento")
+
+    result = await pcm.wait_for_inactivity(
+        session_id,
+        mid,
+        inactivity_ms=150,
+        check_interval_ms=20,
+        quiet_threshold_ms=40,
+        on_quiet=speculation.start,
+    )
+
+    assert result == "process_single"
+    assert speculation.started
+    assert await speculation.is_current()
+
+    final_message = pcm.get_and_clear_messages(session_id)
+    response = await speculation.take(final_message)
+
+    assert computed == ["quero um orçamento"]
+    assert response is not None
+    assert response.message == "re: quero um orçamento"
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_speculative_turn_invalidated_by_newer_message():
+    from app.core.flow_response import FlowProcessingResult, FlowResponse
+    from app.services.processing_cancellation_manager import ProcessingCancellationManager
+    from app.services.speculative_turn import SpeculativeTurn
+
+    store = FakeStore()
+    pcm = ProcessingCancellationManager(store=store)
+
+    session_id = "flow:user:flowid"
+
+    async def compute(message):
+        await asyncio.sleep(0.01)
+        return FlowResponse(result=FlowProcessingResult.CONTINUE, message=message)
+
+    speculation = SpeculativeTurn(pcm, session_id, compute)
+    pcm.add_message_to_buffer(session_id, "oi")
+    await speculation.start()
+    assert await pcm.peek_aggregated_messages_async(session_id) == "oi"
+
+    pcm.add_message_to_buffer(session_id, "tudo bem?")
+
+    assert not await speculation.is_current()
+    speculation.discard("superseded")
+    assert not speculation.started
+    assert await speculation.take(pcm.get_and_clear_messages(session_id)) is None
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_newer_message_cancels_inflight_turn_via_pubsub():
+    from app.core.metrics import metrics
+    from app.services.processing_cancellation_manager import (
+        ProcessingCancellationManager,
+        ProcessingCancelledException,
+    )
+
+    metrics.reset()
+    store = FakeStore()
+    pcm = ProcessingCancellationManager(store=store)
+    session_id = "flow:user:flowid"
+
+    async def slow_llm_call():
+        await asyncio.sleep(5)
+
+    async def newer_message():
+        await asyncio.sleep(0.05)
+        pcm.add_message_to_buffer(session_id, "mudei de ideia")
+
+    async with pcm.cancellation_scope(session_id) as token:
+        sender = asyncio.create_task(newer_message())
+        start = time.time()
+        with pytest.raises(ProcessingCancelledException):
+            await token.run(slow_llm_call(), stage="llm")
+        await sender
+
+    assert (time.time() - start) < 1
+    assert metrics.get("cancelled_work_total", stage="llm") == 1
+    assert store._r._subscribers[f"{pcm.CANCEL_CHANNEL_PREFIX}{session_id}"] == []
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_cancellation_scope_without_pubsub_still_runs_the_turn():
+    from app.services.processing_cancellation_manager import ProcessingCancellationManager
+
+    class NoPubSubClient:
+        """Async client without ``pubsub`` (redis.asyncio.RedisCluster on older redis-py)."""
+
+    pcm = ProcessingCancellationManager(store=FakeStore())
+    pcm._async_client = NoPubSubClient()
+
+    async def llm_call():
+        return "ok"
+
+    async with pcm.cancellation_scope("flow:user:flowid") as token:
+        assert await token.run(llm_call(), stage="llm") == "ok"
+    assert not token.cancelled
+
+
+@pytest.mark.unit
+def test_restore_cancelled_message_is_aggregated_first():
+    from app.services.processing_cancellation_manager import ProcessingCancellationManager
+
+    store = FakeStore()
+    pcm = ProcessingCancellationManager(store=store)
+    session_id = "flow:user:flowid"
+
+    assert pcm.restore_cancelled_message(session_id, "primeira") is False
+
+    pcm.add_message_to_buffer(session_id, "segunda")
+    sequence = pcm.get_latest_sequence(session_id)
+    assert pcm.restore_cancelled_message(session_id, "primeira", persisted=True) is True
+
+    # The pending waiter is neither reset nor superseded
+    assert pcm.get_latest_sequence(session_id) == sequence
+
+    messages = pcm.get_individual_messages(session_id)
+    assert [m.restored for m in messages] == [True, False]
+
+    aggregated = pcm.get_and_clear_messages(session_id)
+    assert aggregated.index("primeira") < aggregated.index("segunda")
@@ -0,0 +1,46 @@
+import pytest
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.unit
+def test_replica_health_is_cached_per_interval():
+    from app.db.replica import ReplicaHealth
+
+    lags = [1.0, 30.0]
+    calls = []
+
+    def measure():  # type: ignore[no-untyped-def]
+        calls.append(1)
+        return lags[len(calls) - 1]
+
+    clock = _Clock()
+    health = ReplicaHealth(measure, max_lag_seconds=5, check_interval_seconds=10, clock=clock)
+
+    assert health.is_healthy() is True
+    clock.now = 9.0
+    assert health.is_healthy() is True
+    assert len(calls) == 1
+
+    clock.now = 10.0
+    assert health.is_healthy() is False
+    assert len(calls) == 2
+
+
+@pytest.mark.unit
+def test_replica_unreachable_or_unknown_lag_reads_from_primary():
+    from app.db.replica import ReplicaHealth
+
+    def unreachable():  # type: ignore[no-untyped-def]
+        raise ConnectionError("replica down")
+
+    assert not ReplicaHealth(unreachable, max_lag_seconds=5, check_interval_seconds=10).is_healthy()
+    assert not ReplicaHealth(
+        lambda: None, max_lag_seconds=5, check_interval_seconds=10
+    ).is_healthy()
@@ -0,0 +1,193 @@
+import fnmatch
+
+import pytest
+
+USER = "whatsapp:+5511999"
+SESSION = f"flow:{USER}:flow.a"
+
+
+class _FakeRedis:
+    """Synchronous dict-backed Redis with the commands the key migration uses."""
+
+    def __init__(self):
+        self.data: dict[str, object] = {}
+        self.ttls: dict[str, int] = {}
+
+    def scan(self, cursor=0, match=None, count=None):  # type: ignore[no-untyped-def]
+        names = sorted(self.data)
+        page = names[cursor : cursor + count]
+        next_cursor = cursor + count if cursor + count < len(names) else 0
+        return next_cursor, [name.encode() for name in page if fnmatch.fnmatchcase(name, match)]
+
+    def pipeline(self, transaction=True):  # type: ignore[no-untyped-def]
+        return _FakePipeline(self)
+
+    def exists(self, *keys):  # type: ignore[no-untyped-def]
+        return sum(key in self.data for key in keys)
+
+    def pttl(self, key):  # type: ignore[no-untyped-def]
+        if key not in self.data:
+            return -2
+        return self.ttls.get(key, -1)
+
+    def dump(self, key):  # type: ignore[no-untyped-def]
+        return self.data.get(key)
+
+    def restore(self, key, ttl, value):  # type: ignore[no-untyped-def]
+        assert key not in self.data
+        self.data[key] = value
+        if ttl:
+            self.ttls[key] = ttl
+
+    def unlink(self, *keys):  # type: ignore[no-untyped-def]
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    def sadd(self, key, *members):  # type: ignore[no-untyped-def]
+        self.data.setdefault(key, set()).update(members)  # type: ignore[union-attr]
+
+    def expire(self, key, ttl):  # type: ignore[no-untyped-def]
+        self.ttls[key] = ttl * 1000
+
+
+class _FakePipeline:
+    def __init__(self, redis):  # type: ignore[no-untyped-def]
+        self._redis = redis
+        self._commands: list = []
+
+    def __getattr__(self, name):  # type: ignore[no-untyped-def]
+        def queue(*args):  # type: ignore[no-untyped-def]
+            self._commands.append((name, args))
+            return self
+
+        return queue
+
+    def execute(self):  # type: ignore[no-untyped-def]
+        return [getattr(self._redis, name)(*args) for name, args in self._commands]
+
+
+@pytest.mark.unit
+def test_contact_keys_share_a_hash_tag():
+    from app.core.redis_cluster import hash_slot_key
+    from app.core.redis_keys import RedisKeyBuilder
+    from app.services.processing_cancellation_manager import ProcessingCancellationManager
+
+    builder = RedisKeyBuilder()
+    assert RedisKeyBuilder.session_user_id(SESSION) == USER
+    keys = [
+        builder.conversation_state_key(USER, SESSION),
+        builder.conversation_meta_key(USER, "flow"),
+        builder.user_key_index(USER),
+        builder.events_key(USER),
+        builder.escalation_key(USER, "flow"),
+        ProcessingCancellationManager._key(
+            ProcessingCancellationManager.MESSAGE_BUFFER_PREFIX, SESSION
+        ),
+    ]
+    assert {hash_slot_key(key) for key in keys} == {USER}
+    assert builder.conversation_state_key("system", "current_reply:x") == (
+        "chatai:state:system:current_reply:x"
+    )
+    parsed = builder.parse_conversation_key(keys[0])
+    assert parsed is not None
+    assert (parsed["user_id"], parsed["session_id"], parsed["flow_id"]) == (USER, SESSION, "flow.a")
+
+
+@pytest.mark.unit
+def test_split_by_slot_separates_cross_slot_commands():
+    from app.core.redis_cluster import split_by_slot
+
+    same, other = split_by_slot(
+        [
+            ("setex", ("chatai:state:{u1}:flow:u1:f", 60, "{}")),
+            ("sadd", ("chatai:keys:user:{u1}", "k")),
+            ("sadd", ("chatai:keys:tenant:t1", "u1")),
+            ("publish", ("chatai:session_cache:invalidate", "{}")),
+            ("delete", ("debounce:seq:{u1}:flow:u1:f", "debounce:seq:{u2}:flow:u2:f")),
+            ("expire", ("chatai:keys:user:{u1}", 60)),
+        ]
+    )
+    assert same == [0, 1, 5]
+    assert other == [2, 3, 4]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_unit_of_work_splits_transactions_on_cluster(monkeypatch):
+    import app.core.redis_unit_of_work as uow_module
+
+    class _AsyncPipeline:
+        def __init__(self, transaction):  # type: ignore[no-untyped-def]
+            self.transaction = transaction
+            self.commands: list = []
+
+        def __getattr__(self, name):  # type: ignore[no-untyped-def]
+            return lambda *args, **kwargs: self.commands.append((name, args))
+
+        async def execute(self):  # type: ignore[no-untyped-def]
+            return [f"{name}:{args[0]}" for name, args in self.commands]
+
+    class _Client:
+        def __init__(self):
+            self.pipelines: list = []
+
+        def pipeline(self, transaction=True):  # type: ignore[no-untyped-def]
+            self.pipelines.append(_AsyncPipeline(transaction))
+            return self.pipelines[-1]
+
+    monkeypatch.setattr(uow_module, "is_cluster_client", lambda client: True)
+    client = _Client()
+    uow = uow_module.RedisUnitOfWork(client)
+    state = uow.queue("set", "chatai:state:{u1}:s")
+    tenant = uow.queue("sadd", "chatai:keys:tenant:t1", "u1")
+    index = uow.queue("sadd", "chatai:keys:user:{u1}", "k")
+    await uow.execute(transaction=True)
+
+    assert [(p.transaction, len(p.commands)) for p in client.pipelines] == [(True, 2), (False, 1)]
+    assert state.result() == "set:chatai:state:{u1}:s"
+    assert tenant.result() == "sadd:chatai:keys:tenant:t1"
+    assert index.result() == "sadd:chatai:keys:user:{u1}"
+
+
+@pytest.mark.unit
+def test_migration_moves_keys_to_tagged_layout():
+    from app.core.redis_key_migration import migrate_keys
+    from app.core.redis_keys import RedisKeyBuilder
+
+    redis = _FakeRedis()
+    # Flow state filed under the channel name by the old session manager
+    redis.data[f"chatai:state:whatsapp:{SESSION}"] = b"state"
+    redis.ttls[f"chatai:state:whatsapp:{SESSION}"] = 5000
+    redis.data[f"chatai:state:whatsapp:{SESSION}:v"] = b"v1"
+    redis.data[f"chatai:state:{USER}:meta:flow"] = b"meta"
+    redis.data[f"chatai:events:{USER}"] = b"events"
+    redis.data[f"chatai:escalation:{USER}:flow"] = b"123"
+    redis.data["chatai:keys:user:whatsapp"] = {"old"}
+    redis.data["chatai:state:system:current_reply:x"] = b"reply"
+    # Written after the deploy: newer than the old copy
+    redis.data["chatai:state:{whatsapp:+5522888}:chat"] = b"new"
+    redis.data["chatai:state:whatsapp:+5522888:chat"] = b"old"
+
+    builder = RedisKeyBuilder()
+    report = migrate_keys(redis, builder, dry_run=True)
+    assert (report.migrated, report.deleted) == (5, 2)
+    assert len(redis.data) == 9
+
+    report = migrate_keys(redis, builder, index_ttl=60)
+    assert (report.migrated, report.deleted, report.superseded) == (4, 2, 1)
+    state_key = builder.conversation_state_key(USER, SESSION)
+    assert redis.data[state_key] == b"state"
+    assert redis.ttls[state_key] == 5000
+    assert redis.data[builder.conversation_meta_key(USER, "flow")] == b"meta"
+    assert redis.data[builder.events_key(USER)] == b"events"
+    assert redis.data[builder.escalation_key(USER, "flow")] == b"123"
+    assert redis.data[builder.user_key_index(USER)] == {
+        state_key,
+        builder.conversation_meta_key(USER, "flow"),
+        builder.events_key(USER),
+        builder.escalation_key(USER, "flow"),
+    }
+    assert redis.data["chatai:state:{whatsapp:+5522888}:chat"] == b"new"
+    assert "chatai:state:system:current_reply:x" in redis.data
+    assert len(redis.data) == 7
+
+    assert migrate_keys(redis, builder).migrated == 0
@@ -0,0 +1,114 @@
+import fnmatch
+
+import pytest
+
+
+class _FakeRedis:
+    """Synchronous dict-backed Redis; used through ``AsyncRedisFacade``."""
+
+    def __init__(self):
+        self.data: dict[str, object] = {}
+        self.scan_calls = 0
+
+    def keys(self, pattern):  # type: ignore[no-untyped-def]
+        raise AssertionError("KEYS must not be used")
+
+    def scan(self, cursor=0, match=None, count=None):  # type: ignore[no-untyped-def]
+        self.scan_calls += 1
+        names = sorted(self.data)
+        page = names[cursor : cursor + count]
+        next_cursor = cursor + count if cursor + count < len(names) else 0
+        return next_cursor, [name.encode() for name in page if fnmatch.fnmatchcase(name, match)]
+
+    def set(self, key, value):  # type: ignore[no-untyped-def]
+        self.data[key] = value
+
+    def unlink(self, *keys):  # type: ignore[no-untyped-def]
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    def sadd(self, key, *members):  # type: ignore[no-untyped-def]
+        self.data.setdefault(key, set()).update(members)  # type: ignore[union-attr]
+
+    def srem(self, key, *members):  # type: ignore[no-untyped-def]
+        self.data.get(key, set()).difference_update(members)  # type: ignore[union-attr]
+
+    def smembers(self, key):  # type: ignore[no-untyped-def]
+        return {member.encode() for member in self.data.get(key, set())}  # type: ignore[union-attr]
+
+    def hset(self, key, mapping):  # type: ignore[no-untyped-def]
+        self.data.setdefault(key, {}).update(mapping)  # type: ignore[union-attr]
+
+    def hgetall(self, key):  # type: ignore[no-untyped-def]
+        return dict(self.data.get(key, {}))  # type: ignore[call-overload]
+
+    def expire(self, key, ttl):  # type: ignore[no-untyped-def]
+        return True
+
+
+USER = "whatsapp:+5511999"
+
+
+def _seed(redis):  # type: ignore[no-untyped-def]
+    indexed = [
+        f"chatai:state:{{{USER}}}:flow:{USER}:flow.a",
+        f"chatai:state:{{{USER}}}:flow:{USER}:flow.b",
+    ]
+    for key in indexed:
+        redis.set(key, "{}")
+    redis.sadd(f"chatai:keys:user:{{{USER}}}", *indexed)
+    # Written before the index existed / by LangChain
+    redis.set(f"chatai:history:flow:{USER}:flow.a", "[]")
+    redis.set("chatai:state:whatsapp:+5522888:flow:whatsapp:+5522888:flow.a", "{}")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_clear_user_keys_uses_index_and_bounded_scan():
+    from app.core.async_redis import AsyncRedisFacade
+    from app.core.redis_key_index import clear_user_keys_async
+    from app.core.redis_keys import RedisKeyBuilder
+
+    redis = _FakeRedis()
+    _seed(redis)
+    client = AsyncRedisFacade(redis)
+    builder = RedisKeyBuilder()
+
+    deleted = await clear_user_keys_async(
+        client, builder, USER, flow_id="flow.a", scan_legacy=False
+    )
+    assert deleted == 1
+    assert redis.scan_calls == 0
+    assert redis.data[f"chatai:keys:user:{{{USER}}}"] == {
+        f"chatai:state:{{{USER}}}:flow:{USER}:flow.b"
+    }
+
+    deleted = await clear_user_keys_async(client, builder, USER)
+    assert deleted == 2  # flow.b state plus the legacy history key
+    assert redis.scan_calls > 0
+    assert list(redis.data) == ["chatai:state:whatsapp:+5522888:flow:whatsapp:+5522888:flow.a"]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_tenant_reset_job_reports_progress():
+    from app.core.async_redis import AsyncRedisFacade
+    from app.core.redis_keys import RedisKeyBuilder
+    from app.services.tenant_reset_service import TenantResetJob, get_tenant_reset_progress
+
+    redis = _FakeRedis()
+    _seed(redis)
+    redis.sadd("chatai:keys:tenant:t1", USER)
+    client = AsyncRedisFacade(redis)
+    builder = RedisKeyBuilder()
+
+    job = TenantResetJob(client, builder, "t1", ["whatsapp:+5522888"])
+    await job.run()
+
+    progress = await get_tenant_reset_progress(client, builder, job.job_id)
+    assert progress is not None
+    assert progress["status"] == "completed"
+    assert progress["total_users"] == "2"
+    assert progress["processed_users"] == "2"
+    assert progress["deleted_keys"] == "4"
+    assert [key for key in redis.data if not key.startswith("chatai:jobs:")] == []
+    assert await get_tenant_reset_progress(client, builder, "unknown") is None
@@ -0,0 +1,134 @@
+import pytest
+
+
+class _FakePipeline:
+    def __init__(self, redis, transaction: bool):  # type: ignore[no-untyped-def]
+        self._redis = redis
+        self.transaction = transaction
+        self._commands: list = []
+
+    def __getattr__(self, name):  # type: ignore[no-untyped-def]
+        def queue(*args, **kwargs):  # type: ignore[no-untyped-def]
+            self._commands.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    async def execute(self):  # type: ignore[no-untyped-def]
+        self._redis.round_trips.append((self.transaction, [c[0] for c in self._commands]))
+        return [
+            getattr(self._redis, name)(*args, **kwargs) for name, args, kwargs in self._commands
+        ]
+
+
+class _FakeAsyncRedis:
+    """Pipeline-only async client; plain commands are applied synchronously."""
+
+    def __init__(self):
+        self.data: dict[str, object] = {}
+        self.round_trips: list = []
+
+    def pipeline(self, transaction: bool = True):  # type: ignore[no-untyped-def]
+        return _FakePipeline(self, transaction)
+
+    def get(self, key):  # type: ignore[no-untyped-def]
+        return self.data.get(key)
+
+    def set(self, key, value, nx=False, ex=None):  # type: ignore[no-untyped-def]
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    def setex(self, key, ttl, value):  # type: ignore[no-untyped-def]
+        self.data[key] = value
+        return True
+
+    def llen(self, key):  # type: ignore[no-untyped-def]
+        return len(self.data.get(key, []))  # type: ignore[arg-type]
+
+    def sadd(self, key, *members):  # type: ignore[no-untyped-def]
+        current = self.data.setdefault(key, set())
+        current.update(members)  # type: ignore[union-attr]
+        return len(members)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_unit_of_work_batches_queued_commands_into_one_round_trip():
+    from app.core.redis_unit_of_work import RedisUnitOfWork
+
+    redis = _FakeAsyncRedis()
+    redis.data.update({"a": "1", "queue": ["x", "y"]})
+    uow = RedisUnitOfWork(redis)
+
+    first = uow.queue("get", "a", parse=int)
+    length = uow.queue("llen", "queue")
+    doubled = first.map(lambda value: value * 2)
+    with pytest.raises(RuntimeError):
+        first.result()
+
+    await uow.execute()
+
+    assert (first.result(), doubled.result(), length.result()) == (1, 2, 2)
+    assert redis.round_trips == [(False, ["get", "llen"])]
+    assert uow.round_trips == 1
+
+    # Writes go out as MULTI/EXEC; an empty unit of work costs nothing
+    uow.queue("set", "b", "2")
+    await uow.execute(transaction=True)
+    await uow.execute()
+    assert redis.round_trips[-1] == (True, ["set"])
+    assert uow.round_trips == 2
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_session_manager_loads_and_saves_through_the_unit_of_work():
+    from app.core.redis_unit_of_work import RedisUnitOfWork
+    from app.core.state import AsyncRedisStore
+    from app.flow_core.state import FlowContext
+    from app.services.session_manager import RedisSessionManager
+
+    redis = _FakeAsyncRedis()
+
+    class _Store:
+        aio = AsyncRedisStore(redis, namespace="ns", state_ttl=60)
+
+    mgr = RedisSessionManager(_Store())  # type: ignore[arg-type]
+
+    uow = RedisUnitOfWork(redis)
+    loaded = mgr.queue_load_context(uow, "flow:u1:f1")
+    await uow.execute()
+    assert loaded.result() is None
+
+    mgr.queue_save_context(uow, "flow:u1:f1", FlowContext(flow_id="f1"), tenant_id="t1")
+    await uow.execute(transaction=True)
+    assert redis.data["ns:keys:tenant:t1"] == {"u1"}
+
+    loaded = mgr.queue_load_context(uow, "flow:u1:f1")
+    await uow.execute()
+    assert loaded.result() is not None and loaded.result().flow_id == "f1"
+    # The save and its key index entries share the write round trip
+    assert [commands for _, commands in redis.round_trips] == [
+        ["get"],
+        ["setex", "sadd", "sadd"],
+        ["get"],
+    ]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_unit_of_work_without_client_runs_deferred_awaitables():
+    from app.core.redis_unit_of_work import Deferred, RedisUnitOfWork
+
+    async def load() -> str:
+        return "context"
+
+    uow = RedisUnitOfWork(None)
+    deferred = uow.defer(load())
+    await uow.execute()
+
+    assert deferred.result() == "context"
+    assert Deferred.resolved(3).map(str).result() == "3"
+    assert uow.round_trips == 0
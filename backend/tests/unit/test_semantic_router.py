@@ -0,0 +1,148 @@
+import pytest
+
+
+def _compiled_routing_flow():  # type: ignore[no-untyped-def]
+    from app.flow_core.compiler import FlowCompiler
+    from app.flow_core.ir import Flow
+
+    flow = Flow.model_validate(
+        {
+            "schema_version": "v1",
+            "id": "flow.quadras",
+            "entry": "d.uso",
+            "nodes": [
+                {"id": "d.uso", "kind": "Decision", "decision_type": "llm_assisted"},
+                {
+                    "id": "q.quadra",
+                    "kind": "Question",
+                    "key": "tipo_quadra",
+                    "prompt": "Qual o tipo da quadra de tênis?",
+                },
+                {
+                    "id": "q.campo",
+                    "kind": "Question",
+                    "key": "tamanho_campo",
+                    "prompt": "Qual o tamanho do campo de futebol?",
+                },
+            ],
+            "edges": [
+                {
+                    "source": "d.uso",
+                    "target": "q.quadra",
+                    "guard": {"fn": "always", "args": {"if": "projeto indica quadra/tênis"}},
+                    "condition_description": "Caminho: quadra de tênis",
+                },
+                {
+                    "source": "d.uso",
+                    "target": "q.campo",
+                    "guard": {"fn": "always", "args": {"if": "projeto indica campo/futebol"}},
+                    "condition_description": "Caminho: campo de futebol",
+                },
+            ],
+        }
+    )
+    return FlowCompiler().compile(flow)
+
+
+class CountingEmbedder:
+    def __init__(self) -> None:
+        from app.flow_core.services.semantic_router import HashingEmbedder
+
+        self._inner = HashingEmbedder()
+        self.calls: list[list[str]] = []
+
+    async def embed_texts(self, texts):  # type: ignore[no-untyped-def]
+        self.calls.append(list(texts))
+        return await self._inner.embed_texts(texts)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_router_routes_clear_messages_and_caches_edge_embeddings():
+    from app.flow_core.services.semantic_router import SemanticRouter
+
+    flow = _compiled_routing_flow()
+    embedder = CountingEmbedder()
+    router = SemanticRouter(embedder)
+
+    decision = await router.route(flow, "d.uso", "é para uma quadra de tênis")
+    assert decision.target == "q.quadra"
+    assert decision.margin >= 0.08
+
+    decision = await router.route(flow, "d.uso", "campo de futebol society")
+    assert decision.target == "q.campo"
+
+    # Edge texts embedded once per compiled version; afterwards only queries
+    assert len(embedder.calls[0]) == 2
+    assert [len(c) for c in embedder.calls[1:]] == [1, 1]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_router_falls_back_when_ambiguous():
+    from app.flow_core.services.semantic_router import HashingEmbedder, SemanticRouter
+
+    router = SemanticRouter(HashingEmbedder())
+    flow = _compiled_routing_flow()
+
+    assert not (await router.route(flow, "d.uso", "ainda não sei")).confident
+    assert not (await router.route(flow, "d.uso", "quadra ou campo de futebol ou tênis")).confident
+    # Non-decision nodes have no candidates
+    assert not (await router.route(flow, "q.quadra", "quadra")).confident
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_runner_routes_decision_node_without_llm():
+    from app.flow_core.runner import FlowTurnRunner
+    from app.flow_core.services.semantic_router import HashingEmbedder, SemanticRouter
+    from app.flow_core.state import FlowContext, NodeStatus
+
+    class NoCallLLM:
+        def extract(self, *_a, **_k):  # type: ignore[no-untyped-def]
+            raise AssertionError("LLM must not be called for a confident route")
+
+    runner = FlowTurnRunner(
+        llm_client=NoCallLLM(),
+        compiled_flow=_compiled_routing_flow(),
+        semantic_router=SemanticRouter(HashingEmbedder()),
+    )
+    ctx = FlowContext(flow_id="flow.quadras", current_node_id="d.uso")
+
+    result = await runner.process_turn(ctx=ctx, user_message="quadra de tênis")
+
+    assert ctx.current_node_id == "q.quadra"
+    assert ctx.pending_field == "tipo_quadra"
+    assert ctx.get_node_state("d.uso").status == NodeStatus.COMPLETED
+    assert result.metadata["target_node_id"] == "q.quadra"
+    assert result.metadata["messages"][0]["text"] == "Qual o tipo da quadra de tênis?"
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_default_margin_keeps_routed_accuracy_above_the_bar():
+    import importlib.util
+    from pathlib import Path
+
+    from app.flow_core.services.semantic_router import (
+        DEFAULT_MARGIN,
+        MIN_ROUTED_ACCURACY,
+        HashingEmbedder,
+    )
+
+    script = Path(__file__).resolve().parents[2] / "scripts" / "eval_semantic_routing.py"
+    spec = importlib.util.spec_from_file_location("eval_semantic_routing", script)
+    assert spec is not None and spec.loader is not None
+    evaluation = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(evaluation)
+
+    report = await evaluation.evaluate(
+        evaluation.DEFAULT_PLAYGROUND, DEFAULT_MARGIN, HashingEmbedder()
+    )
+    overall = evaluation.totals(report)
+
+    assert overall["local"] > 0
+    assert evaluation.routed_accuracy(overall) >= MIN_ROUTED_ACCURACY
+    # Every flow on its own, not just the total
+    for name, stats in report.items():
+        assert evaluation.routed_accuracy(stats) >= MIN_ROUTED_ACCURACY, name
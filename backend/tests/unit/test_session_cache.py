@@ -0,0 +1,188 @@
+import asyncio
+
+import pytest
+
+
+class _FakePubSub:
+    def __init__(self, redis):  # type: ignore[no-untyped-def]
+        self._redis = redis
+        self.queue: asyncio.Queue = asyncio.Queue()
+
+    async def subscribe(self, channel):  # type: ignore[no-untyped-def]
+        self._redis.subscribers.setdefault(channel, []).append(self)
+
+    async def get_message(self, ignore_subscribe_messages=False, timeout=0.0):  # type: ignore[no-untyped-def]
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except TimeoutError:
+            return None
+
+    async def aclose(self):  # type: ignore[no-untyped-def]
+        return None
+
+
+class _FakePipeline:
+    def __init__(self, redis):  # type: ignore[no-untyped-def]
+        self._redis = redis
+        self._commands: list = []
+
+    def __getattr__(self, name):  # type: ignore[no-untyped-def]
+        def queue(*args, **kwargs):  # type: ignore[no-untyped-def]
+            self._commands.append((name, args))
+            return self
+
+        return queue
+
+    async def execute(self):  # type: ignore[no-untyped-def]
+        self._redis.round_trips += 1
+        return [await getattr(self._redis, name)(*args) for name, args in self._commands]
+
+
+class _FakeAsyncRedis:
+    def __init__(self):
+        self.data: dict[str, object] = {}
+        self.subscribers: dict[str, list] = {}
+        self.round_trips = 0
+
+    def pipeline(self, transaction: bool = True):  # type: ignore[no-untyped-def]
+        return _FakePipeline(self)
+
+    def pubsub(self):  # type: ignore[no-untyped-def]
+        return _FakePubSub(self)
+
+    async def get(self, key):  # type: ignore[no-untyped-def]
+        return self.data.get(key)
+
+    async def set(self, key, value):  # type: ignore[no-untyped-def]
+        self.data[key] = value
+
+    async def sadd(self, key, *members):  # type: ignore[no-untyped-def]
+        self.data.setdefault(key, set()).update(members)  # type: ignore[union-attr]
+
+    async def mget(self, keys):  # type: ignore[no-untyped-def]
+        return [self.data.get(key) for key in keys]
+
+    async def publish(self, channel, message):  # type: ignore[no-untyped-def]
+        for pubsub in self.subscribers.get(channel, []):
+            pubsub.queue.put_nowait({"type": "message", "data": message})
+        return len(self.subscribers.get(channel, []))
+
+
+async def _wait_until(predicate):  # type: ignore[no-untyped-def]
+    for _ in range(100):
+        if predicate():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition not reached")
+
+
+def _manager(redis, cache):  # type: ignore[no-untyped-def]
+    from app.core.state import AsyncRedisStore
+    from app.services.session_manager import RedisSessionManager
+
+    class _Store:
+        aio = AsyncRedisStore(redis)
+
+    return RedisSessionManager(_Store(), cache=cache)  # type: ignore[arg-type]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_saved_context_is_reused_without_redis_read():
+    from app.core.redis_unit_of_work import RedisUnitOfWork
+    from app.core.session_cache import SessionContextCache
+    from app.flow_core.state import FlowContext
+
+    redis = _FakeAsyncRedis()
+    cache = SessionContextCache()
+    await cache.start(redis)
+    await _wait_until(lambda: cache.listening)
+    mgr = _manager(redis, cache)
+
+    ctx = FlowContext(flow_id="f1")
+    uow = RedisUnitOfWork(redis)
+    mgr.queue_save_context(uow, "flow:u1:f1", ctx)
+    await uow.execute(transaction=True)
+    assert redis.data["chatai:state:{u1}:flow:u1:f1:v"]
+    trips = redis.round_trips
+
+    loaded = mgr.queue_load_context(uow, "flow:u1:f1")
+    await uow.execute()
+    assert loaded.result() is ctx
+    assert redis.round_trips == trips
+
+    # Checked out: a second load (e.g. a concurrent turn) goes to Redis
+    loaded = mgr.queue_load_context(uow, "flow:u1:f1")
+    await uow.execute()
+    assert loaded.result() is not ctx and loaded.result().flow_id == "f1"
+    await cache.stop()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_saves_on_other_workers_invalidate_entries():
+    from app.core.redis_unit_of_work import RedisUnitOfWork
+    from app.core.session_cache import SessionContextCache, publish_invalidation
+    from app.flow_core.state import FlowContext
+
+    redis = _FakeAsyncRedis()
+    local, remote = SessionContextCache(), SessionContextCache()
+    await local.start(redis)
+    await _wait_until(lambda: local.listening)
+    local_mgr, remote_mgr = _manager(redis, local), _manager(redis, remote)
+
+    for session_id in ("flow:u1:f1", "flow:u1:f2", "flow:u2:f1"):
+        uow = RedisUnitOfWork(redis)
+        local_mgr.queue_save_context(uow, session_id, FlowContext(flow_id="f"))
+        await uow.execute(transaction=True)
+    # Our own invalidations are ignored
+    await asyncio.sleep(0.05)
+    assert len(local) == 3
+
+    await remote_mgr.save_context_async("flow:u1:f1", FlowContext(flow_id="f"))
+    await _wait_until(lambda: len(local) == 2)
+    assert local.take("flow:u1:f1") is None
+
+    await publish_invalidation(redis, "chatai", user_id="u1")
+    await _wait_until(lambda: len(local) == 1)
+    assert local.take("flow:u2:f1") is not None
+    await local.stop()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_resync_drops_entries_changed_while_disconnected():
+    from app.core.session_cache import SessionContextCache
+    from app.flow_core.state import FlowContext
+
+    redis = _FakeAsyncRedis()
+    redis.data.update({"k1:v": b"v1", "k2:v": b"changed"})
+    cache = SessionContextCache()
+    cache.put("flow:u1:a", FlowContext(flow_id="a"), "v1", "k1:v")
+    cache.put("flow:u1:b", FlowContext(flow_id="b"), "v2", "k2:v")
+    assert cache.take("flow:u1:a") is None  # not listening yet
+
+    await cache.start(redis)
+    await _wait_until(lambda: cache.listening)
+    assert cache.take("flow:u1:b") is None
+    assert cache.take("flow:u1:a") is not None
+    await cache.stop()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_cache_stays_disabled_without_pubsub():
+    from app.core.session_cache import SessionContextCache
+    from app.flow_core.state import FlowContext
+
+    class _NoPubSubRedis(_FakeAsyncRedis):
+        pubsub = None  # e.g. redis.asyncio.RedisCluster on older redis-py
+
+    cache = SessionContextCache()
+    await cache.start(_NoPubSubRedis())
+    await asyncio.sleep(0.01)
+
+    assert not cache.listening
+    cache.put("flow:u1:f1", FlowContext(flow_id="f1"), "v1", "chatai:v")
+    assert cache.take("flow:u1:f1") is None
+    await cache.stop()
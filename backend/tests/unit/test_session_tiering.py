@@ -0,0 +1,233 @@
+import fnmatch
+import json
+
+import pytest
+
+USER = "whatsapp:+5511999"
+
+
+class _FakePipeline:
+    def __init__(self, redis):  # type: ignore[no-untyped-def]
+        self._redis = redis
+        self._commands: list = []
+
+    def __getattr__(self, name):  # type: ignore[no-untyped-def]
+        def queue(*args, **kwargs):  # type: ignore[no-untyped-def]
+            self._commands.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    async def execute(self):  # type: ignore[no-untyped-def]
+        return [await getattr(self._redis, n)(*a, **kw) for n, a, kw in self._commands]
+
+
+class _FakeAsyncRedis:
+    def __init__(self):
+        self.data: dict[str, object] = {}
+        self.ttls: dict[str, int] = {}
+
+    def pipeline(self, transaction=True):  # type: ignore[no-untyped-def]
+        return _FakePipeline(self)
+
+    async def scan(self, cursor=0, match=None, count=None):  # type: ignore[no-untyped-def]
+        return 0, [key.encode() for key in sorted(self.data) if fnmatch.fnmatchcase(key, match)]
+
+    async def get(self, key):  # type: ignore[no-untyped-def]
+        value = self.data.get(key)
+        return value.encode() if isinstance(value, str) else value
+
+    async def set(self, key, value, nx=False, ex=None):  # type: ignore[no-untyped-def]
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    async def setex(self, key, ttl, value):  # type: ignore[no-untyped-def]
+        self.data[key] = value
+        self.ttls[key] = ttl
+
+    async def ttl(self, key):  # type: ignore[no-untyped-def]
+        return self.ttls.get(key, -1) if key in self.data else -2
+
+    async def sadd(self, key, *members):  # type: ignore[no-untyped-def]
+        self.data.setdefault(key, set()).update(members)  # type: ignore[union-attr]
+
+    async def expire(self, key, ttl):  # type: ignore[no-untyped-def]
+        return True
+
+    async def eval(self, script, numkeys, *args):  # type: ignore[no-untyped-def]
+        if numkeys == 1:  # lock renewal
+            lock_key, owner, _ttl = args
+            return int(self.data.get(lock_key) == owner)
+        state_key, version_key, expected = args
+        current = await self.get(state_key)
+        if current is None:
+            return 0
+        if current != expected:
+            return -1
+        return sum(self.data.pop(key, None) is not None for key in (state_key, version_key))
+
+
+class _MemoryColdStore:
+    def __init__(self):
+        self.rows: dict[str, tuple[str, dict]] = {}
+
+    def archive(self, entries):  # type: ignore[no-untyped-def]
+        for session_id, user_id, state in entries:
+            self.rows[session_id] = (user_id, state)
+
+    def pop(self, session_id):  # type: ignore[no-untyped-def]
+        row = self.rows.pop(session_id, None)
+        return row[1] if row else None
+
+    def discard(self, session_ids):  # type: ignore[no-untyped-def]
+        for session_id in session_ids:
+            self.rows.pop(session_id, None)
+
+    def delete_user(self, user_id):  # type: ignore[no-untyped-def]
+        doomed = [s for s, (u, _) in self.rows.items() if u == user_id]
+        self.discard(doomed)
+        return len(doomed)
+
+    def count(self):  # type: ignore[no-untyped-def]
+        return len(self.rows)
+
+
+def _seed(redis, store, session_id, state, idle_seconds):  # type: ignore[no-untyped-def]
+    key = store.key_builder.conversation_state_key(USER, session_id)
+    redis.data[key] = json.dumps(state)
+    redis.ttls[key] = store.state_ttl - idle_seconds
+    redis.data[store.version_key(USER, session_id)] = "v1"
+    return key
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_sweeper_moves_idle_sessions_to_cold_store():
+    from app.core.metrics import metrics
+    from app.core.state import AsyncRedisStore
+    from app.services.session_tiering import SessionTieringSweeper
+
+    metrics.reset()
+    redis = _FakeAsyncRedis()
+    store = AsyncRedisStore(redis, state_ttl=30 * 86400)
+    cold = _MemoryColdStore()
+    idle_key = _seed(redis, store, f"flow:{USER}:flow.a", {"answers": {"a": 1}}, 2 * 86400)
+    cleared_key = _seed(redis, store, f"flow:{USER}:flow.b", {}, 2 * 86400)
+    active_key = _seed(redis, store, f"flow:{USER}:flow.c", {"answers": {}}, 60)
+
+    sweeper = SessionTieringSweeper(store, cold, idle_seconds=86400, batch_size=2)
+    result = await sweeper.run_once()
+    assert result is not None
+    assert (result.hot, result.tiered, result.cold) == (1, 2, 1)
+    assert idle_key not in redis.data and cleared_key not in redis.data
+    assert store.version_key(USER, f"flow:{USER}:flow.a") not in redis.data
+    assert active_key in redis.data
+    assert cold.rows == {f"flow:{USER}:flow.a": (USER, {"answers": {"a": 1}})}
+    assert metrics.snapshot()["gauges"]["sessions_cold"][0]["value"] == 1
+
+    # Another worker holds the sweep lock for this interval
+    assert await SessionTieringSweeper(store, cold).run_once() is None
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_sweeper_keeps_sessions_written_during_the_sweep():
+    from app.core.state import AsyncRedisStore
+    from app.services.session_tiering import SessionTieringSweeper
+
+    redis = _FakeAsyncRedis()
+    store = AsyncRedisStore(redis, state_ttl=30 * 86400)
+    key = _seed(redis, store, f"flow:{USER}:flow.a", {"answers": {"a": 1}}, 2 * 86400)
+
+    class _RacingColdStore(_MemoryColdStore):
+        def archive(self, entries):  # type: ignore[no-untyped-def]
+            super().archive(entries)
+            redis.data[key] = json.dumps({"answers": {"a": 2}})
+
+    cold = _RacingColdStore()
+    result = await SessionTieringSweeper(store, cold).run_once()
+    assert result is not None and result.tiered == 0
+    assert json.loads(redis.data[key]) == {"answers": {"a": 2}}
+    assert cold.rows == {}
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_sweeper_keeps_archive_of_sessions_moved_by_an_overlapping_sweep():
+    from app.core.state import AsyncRedisStore
+    from app.services.session_tiering import SessionTieringSweeper
+
+    redis = _FakeAsyncRedis()
+    store = AsyncRedisStore(redis, state_ttl=30 * 86400)
+    session_id = f"flow:{USER}:flow.a"
+    key = _seed(redis, store, session_id, {"answers": {"a": 1}}, 2 * 86400)
+
+    class _OverlappingColdStore(_MemoryColdStore):
+        def archive(self, entries):  # type: ignore[no-untyped-def]
+            super().archive(entries)
+            # Another sweeper archived and deleted the same state meanwhile
+            redis.data.pop(key)
+
+    cold = _OverlappingColdStore()
+    result = await SessionTieringSweeper(store, cold).run_once()
+    assert result is not None and result.hot == 0
+    assert cold.rows == {session_id: (USER, {"answers": {"a": 1}})}
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_sweeper_stops_when_its_lock_is_taken_over():
+    from app.core.state import AsyncRedisStore
+    from app.services.session_tiering import SessionTieringSweeper
+
+    redis = _FakeAsyncRedis()
+    store = AsyncRedisStore(redis, state_ttl=30 * 86400)
+    first = _seed(redis, store, f"flow:{USER}:flow.a", {"answers": {"a": 1}}, 2 * 86400)
+    second = _seed(redis, store, f"flow:{USER}:flow.b", {"answers": {"b": 1}}, 2 * 86400)
+    lock_key = store.key_builder.session_tiering_lock_key()
+
+    class _SlowColdStore(_MemoryColdStore):
+        def archive(self, entries):  # type: ignore[no-untyped-def]
+            super().archive(entries)
+            # The lock expired during a slow batch and another worker took it
+            redis.data[lock_key] = "other-worker"
+
+    cold = _SlowColdStore()
+    result = await SessionTieringSweeper(store, cold, batch_size=1).run_once()
+    assert result is not None and result.tiered == 1
+    assert first not in redis.data
+    assert second in redis.data
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_session_manager_rehydrates_cold_sessions():
+    from app.core.metrics import metrics
+    from app.core.redis_unit_of_work import RedisUnitOfWork
+    from app.core.state import AsyncRedisStore
+    from app.flow_core.state import FlowContext
+    from app.services.session_manager import RedisSessionManager
+
+    metrics.reset()
+    redis = _FakeAsyncRedis()
+    store = AsyncRedisStore(redis, state_ttl=30 * 86400)
+    cold = _MemoryColdStore()
+    session_id = f"flow:{USER}:flow.a"
+    cold.archive([(session_id, USER, FlowContext(flow_id="flow.a").to_dict())])
+
+    class _Store:
+        aio = store
+
+    manager = RedisSessionManager(_Store(), cold_store=cold)  # type: ignore[arg-type]
+    uow = RedisUnitOfWork(redis)
+    loaded = manager.queue_load_context(uow, session_id)
+    missing = manager.queue_load_context(uow, f"flow:{USER}:flow.b")
+    await uow.execute()
+
+    assert loaded.result().flow_id == "flow.a"
+    assert missing.result() is None
+    assert cold.rows == {}
+    assert store.key_builder.conversation_state_key(USER, session_id) in redis.data
+    assert metrics.get("session_rehydrations_total") == 1
@@ -0,0 +1,54 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+
+@pytest.mark.unit
+def test_backfill_recomputes_hour_aligned_chunks():
+    from app.services.stats_rollup import backfill_message_stats
+
+    windows = []
+
+    def rollup(start, end, *, wait_for_lock):  # type: ignore[no-untyped-def]
+        assert wait_for_lock
+        windows.append((start.hour, end - start))
+        return True
+
+    chunks = backfill_message_stats(
+        datetime(2025, 10, 1, 9, 30, tzinfo=UTC),
+        datetime(2025, 10, 1, 20, 5, tzinfo=UTC),
+        chunk=timedelta(hours=5),
+        rollup=rollup,
+    )
+    assert chunks == 3
+    assert windows == [(9, timedelta(hours=5)), (14, timedelta(hours=5)), (19, timedelta(hours=2))]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_rollup_job_recomputes_recent_hours():
+    from app.core.metrics import metrics
+    from app.services.stats_rollup import StatsRollupJob
+
+    metrics.reset()
+    windows = []
+    locked = False
+
+    def rollup(start, end):  # type: ignore[no-untyped-def]
+        windows.append((start, end))
+        return not locked
+
+    job = StatsRollupJob(
+        lookback_hours=2,
+        rollup=rollup,
+        clock=lambda: datetime(2025, 10, 1, 12, 40, tzinfo=UTC),
+    )
+    assert await job.run_once()
+    assert windows == [
+        (datetime(2025, 10, 1, 10, tzinfo=UTC), datetime(2025, 10, 1, 13, tzinfo=UTC))
+    ]
+
+    # Another worker holds the rollup lock
+    locked = True
+    assert not await job.run_once()
+    assert metrics.get("stats_rollup_runs_total") == 1
@@ -0,0 +1,164 @@
+import pytest
+
+
+def _repairer(**kwargs):  # type: ignore[no-untyped-def]
+    from app.flow_core.services.tool_call_repair import ToolCallRepairer
+    from app.flow_core.tools import PerformAction
+
+    return ToolCallRepairer(PerformAction, **kwargs)
+
+
+@pytest.mark.unit
+def test_repair_coerces_types_enums_and_node_ids():
+    from app.flow_core.services.tool_call_repair import ToolCallValidationError
+
+    repairer = _repairer(
+        node_ids={"q.nome", "q.email", "t.fim"},
+        available_targets=["q.email"],
+        pending_field="nome",
+    )
+    args = {
+        "actions": "Update, NAVIGATION",
+        "messages": "Prazer, Ana!",
+        "updates": "Ana",
+        "target_node_id": "q.emial",
+        "confidence": "90",
+    }
+
+    with pytest.raises(ToolCallValidationError):
+        repairer.validate(args)
+
+    result = repairer.repair(args)
+    repairer.validate(result.arguments)
+
+    assert result.arguments["actions"] == ["update", "navigate"]
+    assert result.arguments["messages"] == [{"text": "Prazer, Ana!", "delay_ms": 0}]
+    assert result.arguments["updates"] == {"nome": "Ana"}
+    assert result.arguments["target_node_id"] == "q.email"
+    assert result.arguments["confidence"] == pytest.approx(0.9)
+    assert result.changed
+
+
+@pytest.mark.unit
+def test_repair_splits_overlong_messages():
+    from app.flow_core.constants import MAX_MESSAGE_LENGTH
+
+    repairer = _repairer()
+    long_text = "Temos várias opções de luminárias para galpões. " * 6
+    result = repairer.repair(
+        {"actions": ["stay"], "messages": [{"text": long_text, "delay_ms": 0}], "reasoning": "r"}
+    )
+
+    messages = result.arguments["messages"]
+    assert len(messages) > 1
+    assert all(len(m["text"]) <= MAX_MESSAGE_LENGTH for m in messages)
+    assert messages[0]["delay_ms"] == 0
+    repairer.validate(result.arguments)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_responder_uses_local_repair_before_retrying_llm():
+    from app.core.metrics import metrics
+    from app.flow_core.services.responder import EnhancedFlowResponder
+    from app.flow_core.services.tool_call_repair import ToolCallRepairer
+    from app.flow_core.state import FlowContext
+    from app.flow_core.tools import PerformAction
+
+    class CountingLLM:
+        calls = 0
+
+        def extract(self, instruction, tools):  # type: ignore[no-untyped-def]
+            CountingLLM.calls += 1
+            return {
+                "tool_calls": [
+                    {
+                        "name": "PerformAction",
+                        "arguments": {
+                            "actions": ["Navigate"],
+                            "messages": [{"text": "Vamos lá", "delay_ms": 0}],
+                            "reasoning": "next",
+                        },
+                    }
+                ],
+                "content": "",
+            }
+
+    metrics.reset()
+    responder = EnhancedFlowResponder(CountingLLM())
+    repairer = ToolCallRepairer(PerformAction, node_ids={"q.a", "q.b"}, available_targets=["q.b"])
+
+    response = await responder._call_gpt5(
+        "instruction", [PerformAction], context=FlowContext(flow_id="f1"), repairer=repairer
+    )
+
+    assert CountingLLM.calls == 1
+    assert response.tools[0].actions == ["navigate"]
+    assert response.tools[0].target_node_id == "q.b"
+    assert metrics.get("tool_call_repairs_total", flow_id="f1") == 1
+    assert metrics.get("tool_call_retries_total", flow_id="f1") == 0
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_responder_retries_when_repair_fails():
+    from app.core.metrics import metrics
+    from app.flow_core.services.responder import EnhancedFlowResponder
+    from app.flow_core.services.tool_call_repair import ToolCallRepairer
+    from app.flow_core.state import FlowContext
+    from app.flow_core.tools import PerformAction
+
+    responses = [
+        # "update" without any value cannot be repaired locally
+        {"actions": ["update"], "messages": [{"text": "Ok", "delay_ms": 0}], "reasoning": "r"},
+        {
+            "actions": ["update"],
+            "updates": {"nome": "Ana"},
+            "messages": [{"text": "Ok", "delay_ms": 0}],
+            "reasoning": "r",
+        },
+    ]
+
+    class SequenceLLM:
+        def extract(self, instruction, tools):  # type: ignore[no-untyped-def]
+            return {"tool_calls": [{"name": "PerformAction", "arguments": responses.pop(0)}]}
+
+    metrics.reset()
+    responder = EnhancedFlowResponder(SequenceLLM())
+    repairer = ToolCallRepairer(PerformAction, pending_field="nome")
+
+    response = await responder._call_gpt5(
+        "instruction", [PerformAction], context=FlowContext(flow_id="f2"), repairer=repairer
+    )
+
+    assert response.tools[0].updates == {"nome": "Ana"}
+    assert metrics.get("tool_call_retries_total", flow_id="f2") == 1
+    assert metrics.get("tool_call_repairs_total", flow_id="f2") == 0
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_defaulting_only_metadata_is_not_counted_as_a_repair():
+    from app.core.metrics import metrics
+    from app.flow_core.services.responder import EnhancedFlowResponder
+    from app.flow_core.services.tool_call_repair import ToolCallRepairer
+    from app.flow_core.state import FlowContext
+    from app.flow_core.tools import PerformAction
+
+    class NoReasoningLLM:
+        def extract(self, instruction, tools):  # type: ignore[no-untyped-def]
+            arguments = {"actions": ["stay"], "messages": [{"text": "Ok", "delay_ms": 0}]}
+            return {"tool_calls": [{"name": "PerformAction", "arguments": arguments}]}
+
+    metrics.reset()
+    responder = EnhancedFlowResponder(NoReasoningLLM())
+    repairer = ToolCallRepairer(PerformAction)
+
+    response = await responder._call_gpt5(
+        "instruction", [PerformAction], context=FlowContext(flow_id="f3"), repairer=repairer
+    )
+
+    assert response.tools[0].actions == ["stay"]
+    assert metrics.get("tool_call_repairs_total", flow_id="f3") == 0
+    assert metrics.get("tool_call_metadata_defaults_total", flow_id="f3") == 1
+    assert metrics.get("tool_call_retries_total", flow_id="f3") == 0